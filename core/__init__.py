@@ -12,6 +12,7 @@ from .logging_config import (
     log_warning,
     log_error,
     log_debug,
+    debug_enabled,
 )
 from .exceptions import *
 from .utils import *
@@ -42,6 +43,7 @@ __all__ = [
     "CHROMA_DB_NAME",
     "ENABLE_CACHING",
     "OLLAMA_BASE_URL",
+    "OLLAMA_NODES",
     "OLLAMA_API_TIMEOUT",
     "ENGLISH_CODE",
     "BANGLA_CODE",
@@ -62,6 +64,7 @@ __all__ = [
     "log_error",
     "log_debug",
     "log_critical",
+    "debug_enabled",
     # Exceptions
     "BanglaRAGException",
     "DatabaseException",
@@ -71,8 +74,13 @@ __all__ = [
     "AudioException",
     "FileProcessingException",
     "NetworkException",
+    "NodeUnreachableException",
     "ConfigurationException",
     "ValidationException",
+    "JobException",
+    "JobCancelledException",
+    "DeadlineExceededException",
+    "OverloadedException",
     # Utils
     "validate_not_empty",
     "validate_file_exists",
@@ -90,8 +98,13 @@ __all__ = [
     "timeout_handler",
     "measure_performance",
     "SimpleCache",
+    "PriorityLimiter",
+    "Deadline",
+    "CircuitBreaker",
     "create_temp_file",
     "find_pdf_files",
+    "find_test_reports",
+    "load_test_report_entries",
     "sanitize_text",
     "chunk_list",
     "merge_dicts",
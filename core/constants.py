@@ -71,6 +71,44 @@ BANGLA_CHUNK_SIZE = 800
 DEFAULT_RETRIEVAL_COUNT = 3
 MAX_RETRIEVAL_COUNT = 10
 
+# Vector store backend: "chroma" (HNSW) or "memmap" (exact float32 matrix)
+VECTOR_BACKEND = "chroma"
+# Optional memmap first-stage index: None, "int8", "pca" or "truncate" (Matryoshka)
+VECTOR_COMPRESSION = None
+COMPRESSED_DIMENSIONS = 256  # Target size for "pca" / "truncate"
+RESCORE_FACTOR = 5  # Candidates per result rescored at full precision
+
+# Collections searched by the chatbot (label tags results, weight scales scores)
+SEARCH_COLLECTIONS = {
+    "banglarag": {"label": "pdf", "weight": 1.0, "timeout": 5.0},
+    "course_materials": {"label": "course", "weight": 0.8, "timeout": 5.0},
+}
+SEARCH_FUSION_METHOD = "weighted"  # "weighted" (weight x raw score) or "rrf"
+RRF_K = 60
+
+# Relevance Gate (fitted offline by tools/calibrate_relevance.py)
+RELEVANCE_MAX_FALSE_REFUSAL = 0.02  # Share of on-topic questions we may refuse
+RELEVANCE_MAX_FALSE_ACCEPT = 0.05  # Share of off-topic questions we may answer
+RELEVANCE_MIN_LANGUAGE_SAMPLES = 30  # Questions a language needs for its own thresholds
+
+# Question Generation (AQG) Settings
+AQG_SHARD_SIZE = 2  # Questions requested per LLM call
+AQG_SHARD_RETRIES = 2  # Extra attempts for a shard that fails validation
+AQG_TOKENS_PER_QUESTION = 300
+AQG_CONTEXT_CHARS_PER_SHARD = 1500
+AQG_CHUNKS_PER_QUESTION = 2  # Course chunks sampled as context per question
+COURSE_COLLECTION = "course_materials"
+
+# Background Jobs (lower priority value runs first)
+PRIORITY_INTERACTIVE = 0  # Chat requests
+PRIORITY_BATCH = 10  # Question generation
+PRIORITY_MAINTENANCE = 20  # Ingestion and re-indexing
+JOB_WORKERS = 2
+JOB_POLL_INTERVAL = 0.5  # Seconds between progress checks when streaming a job
+JOB_LEASE_SECONDS = 60.0  # A running job whose lease lapses is requeued
+JOB_HEARTBEAT_SECONDS = 15.0  # How often workers renew leases and look for orphans
+JOB_MAX_ATTEMPTS = 3  # Claims before a job whose worker keeps dying is failed
+
 # Audio Settings
 AUDIO_CHUNK_SIZE = 1024
 AUDIO_FORMAT = "paInt16"  # pyaudio.paInt16
@@ -97,8 +135,144 @@ CACHE_TTL_SECONDS = 3600
 
 # Ollama Configuration
 OLLAMA_BASE_URL = "http://localhost:11434"
+# Ollama servers requests are balanced across; add URLs to scale out
+OLLAMA_NODES = [OLLAMA_BASE_URL]
+OLLAMA_NODE_REFRESH_SECONDS = 15.0  # How often node health and loaded models are polled
+OLLAMA_NODE_LATENCY_SAMPLES = 50  # Recent first-token times kept per node
+# Model residency: sent as keep_alive so Ollama keeps a used model loaded
+# (its default is 5 minutes); resident models are preloaded at startup and
+# reloaded on every node that evicted them
+OLLAMA_KEEP_ALIVE_SECONDS = 1800
+OLLAMA_PRELOAD_MODELS = True
+OLLAMA_RESIDENT_MODELS: list = []  # Kept loaded besides the active and embedding models
+OLLAMA_RESIDENCY_REFRESH_SECONDS = 60.0  # How often residency is checked and extended
+OLLAMA_PRELOAD_TIMEOUT = 120.0  # Seconds a model load may take
+OLLAMA_RESIDENCY_EVENTS = 50  # Recent load events kept for /api/health
 OLLAMA_API_TIMEOUT = 30
+OLLAMA_MODEL_INFO_RETRY_SECONDS = 30.0  # A failed /api/show is retried after this
 OLLAMA_MAX_RETRIES = 3
+OLLAMA_MAX_CONCURRENCY = 4  # Per node; match OLLAMA_NUM_PARALLEL on the servers
+OLLAMA_INTERACTIVE_RESERVED_SLOTS = 1  # Slots batch work may never occupy
+OLLAMA_COMPLETION_SAMPLES = 50  # Recent stream lengths used to estimate tokens saved
+OLLAMA_REQUEST_BUDGET = 90.0  # Seconds for one answer across retries and fallbacks
+OLLAMA_MIN_ATTEMPT_SECONDS = 5.0  # Don't start an attempt with less budget left
+OLLAMA_BREAKER_FAILURES = 3  # Consecutive failures before a model is skipped
+OLLAMA_BREAKER_RESET_SECONDS = 30.0  # Wait before probing a skipped model again
+
+# Hedged requests: if the first token is later than the model's usual
+# (OLLAMA_HEDGE_PERCENTILE) time to first token, race a backup request and
+# keep whichever answers first. Hedges add at most OLLAMA_HEDGE_MAX_FRACTION
+# extra requests (plus a small burst) and only use spare model slots.
+OLLAMA_HEDGING = True
+OLLAMA_HEDGE_PERCENTILE = 90
+OLLAMA_HEDGE_MAX_FRACTION = 0.1
+OLLAMA_HEDGE_BURST = 2.0
+OLLAMA_HEDGE_MIN_DELAY = 1.0  # Never hedge sooner than this (seconds)
+OLLAMA_HEDGE_MIN_SAMPLES = 20  # First-token times needed before hedging a model
+OLLAMA_TTFT_SAMPLES = 200  # Recent first-token times kept per model
+
+# Server-Sent Events (tokens are coalesced; a 0 ms interval sends one frame per token)
+SSE_FLUSH_INTERVAL_MS = 50  # Send pending tokens at least this often
+SSE_FLUSH_BYTES = 512  # ...or as soon as this many bytes are pending
+SSE_MAX_FLUSH_INTERVAL_MS = 250  # Upper bound a client may negotiate
+SSE_HEARTBEAT_INTERVAL = 15.0  # Seconds of silence before a keep-alive comment
+
+# Admission Control: requests the pipeline cannot finish before their deadline
+# are shed with 503 + Retry-After instead of piling up behind Ollama.
+# "deadline" is the default client budget in seconds (None waits forever),
+# "service_time" seeds the per-lane estimate until real requests are measured.
+ADMISSION_SLOTS = OLLAMA_MAX_CONCURRENCY * len(OLLAMA_NODES)
+ADMISSION_LANES = {
+    "chat": {
+        "priority": PRIORITY_INTERACTIVE,
+        "max_queue": 32,
+        "deadline": TIMEOUT_SECONDS,
+        "service_time": 10.0,
+    },
+    "aqg": {
+        "priority": PRIORITY_INTERACTIVE + 5,
+        "max_queue": 8,
+        "deadline": 180.0,
+        "service_time": 45.0,
+    },
+    "batch": {
+        "priority": PRIORITY_BATCH,
+        "max_queue": 64,
+        "deadline": None,
+        "service_time": 45.0,
+    },
+}
+ADMISSION_SAMPLE_WINDOW = 50  # Recent service times used for the rate estimate
+ADMISSION_STATUS_INTERVAL = 2.0  # Seconds between "queued, position N" events
+
+# Cache warm-up: after a restart, replay the most frequent logged questions and
+# the bundled evaluation questions through retrieval and generation at
+# maintenance priority, so the first students do not pay cold-cache latency
+WARMUP_ENABLED = True
+WARMUP_TOP_N = 50  # Most frequent query-log questions to replay
+WARMUP_MAX_QUESTIONS = 150  # Stay below the 200-entry response cache
+WARMUP_TIME_BUDGET = 600.0  # Seconds before warm-up gives up
+WARMUP_QUERY_LOG_LINES = 20000  # Most recent query-log lines considered
+WARMUP_BACKOFF_SECONDS = 1.0  # Pause while live requests are queued
+
+# Evaluation runs: questions in flight per model (match OLLAMA_NUM_PARALLEL)
+EVAL_CONCURRENCY = 2
+
+# Query routing: a model and generation budget (num_predict) per query type.
+# "models" are candidates in order of preference. Once evaluation stats exist
+# (ROUTING_STATS_FILE, from tools/fit_routing.py), the fastest candidate whose
+# pass rate is within ROUTING_QUALITY_TOLERANCE of the best evaluated model is
+# used and the budget follows the length of its passing answers.
+ROUTING_ENABLED = True
+ROUTING_RULES = {
+    "definition": {
+        "models": ["qwen2:1.5b", "phi3:latest", PREFERRED_LLM_MODEL],
+        "max_tokens": 160,
+    },
+    "complexity": {
+        "models": ["qwen2:1.5b", "phi3:latest", PREFERRED_LLM_MODEL],
+        "max_tokens": 200,
+    },
+    "purpose": {"models": [PREFERRED_LLM_MODEL, "phi3:latest"], "max_tokens": 260},
+    "process": {
+        "models": [PREFERRED_LLM_MODEL, "mistral:latest", "llama3.1:latest"],
+        "max_tokens": 400,
+    },
+    "general": {"models": [PREFERRED_LLM_MODEL, "phi3:latest"], "max_tokens": 300},
+}
+ROUTING_BANGLA_TOKEN_FACTOR = 2.0  # Bangla script needs about twice the tokens
+ROUTING_HIGH_LOAD = 0.75  # Model slot usage (queued included) counted as high load
+ROUTING_LOAD_TOKEN_FACTOR = 0.75  # Budget scale under high load
+ROUTING_QUALITY_TOLERANCE = 0.05  # Pass-rate drop accepted for a faster model
+ROUTING_LOAD_QUALITY_TOLERANCE = 0.15  # ...and under high load
+ROUTING_MIN_SAMPLES = 10  # Evaluated answers per route before its stats count
+ROUTING_TOKEN_HEADROOM = 1.25  # Budget over the p90 length of passing answers
+ROUTING_MIN_TOKENS = 64
+ROUTING_MAX_TOKENS = 1024
+
+# Extractive fast path: a cited answer made of the retrieved sentences that
+# best match the question, served in milliseconds when the LLM cannot answer
+# in time (breakers open, model slots saturated, generation failed)
+EXTRACTIVE_ENABLED = True
+EXTRACTIVE_MAX_SENTENCES = 3
+EXTRACTIVE_MAX_CHARS = 600
+EXTRACTIVE_MIN_SENTENCE_WORDS = 5
+EXTRACTIVE_OVERLOAD_LOAD = (
+    1.0  # Model load (queued included) that diverts every question
+)
+EXTRACTIVE_DEFINITION_LOAD = (
+    ROUTING_HIGH_LOAD  # ...definitions with a defining sentence
+)
+EXTRACTIVE_BM25_K1 = 1.2
+EXTRACTIVE_BM25_B = 0.5
+EXTRACTIVE_CUE_WEIGHT = 0.5  # Bonus for "X is a ..." sentences on definition questions
+EXTRACTIVE_POSITION_WEIGHT = 0.1  # Bonus for sentences early in a chunk
+
+# Answer grading (fitted offline by tools/grade_reports.py --calibrate)
+GRADING_TERM_WEIGHT = 0.3  # Share of the score from key-term overlap
+GRADING_MAX_FALSE_PASS = 0.05  # Share of judged-wrong answers we may pass outright
+GRADING_MAX_FALSE_FAIL = 0.02  # Share of judged-right answers we may fail outright
+GRADING_BATCH_SIZE = 64  # Texts per embedding request
 
 # Translation Service
 TRANSLATION_SERVICE_TIMEOUT = 10
@@ -116,6 +290,16 @@ SUPPORTED_LANGUAGES = [ENGLISH_CODE, BANGLA_CODE]
 MIN_TEXT_LENGTH_FOR_DETECTION = 50
 LANGUAGE_DETECTION_CONFIDENCE_THRESHOLD = 0.8
 
+# Language-partitioned indexes: one sub-collection per language, each embedded
+# with its own model ("banglarag" for English, "banglarag_bn" for Bangla)
+LANGUAGE_PARTITIONED_INDEXES = True
+INDEX_LANGUAGES = [ENGLISH_CODE, BANGLA_CODE]
+LANGUAGE_ROUTING_THRESHOLD = 0.7  # Script share needed to route to one partition
+# Raw cosine score each partition's embedding model gives unrelated text.
+# Partition results are rescaled to (score - floor) / (1 - floor), so scores
+# from different models share one scale; English keeps its raw scores.
+PARTITION_SCORE_FLOORS = {ENGLISH_CODE: 0.0, BANGLA_CODE: 0.5}
+
 # Translation Settings
 SKIP_TRANSLATION_FOR_ENGLISH = True
 CACHE_TRANSLATIONS = True
@@ -131,6 +315,13 @@ DB_DIR = ROOT_DIR / DATABASE_DIRECTORY
 LOGS_DIR = ROOT_DIR / "logs"
 TEMP_DIR = ROOT_DIR / "temp"
 TEST_REPORTS_DIR = ROOT_DIR / "Test Reports"
+TEST_REPORT_PATTERN = "*_test_report_*.json"
+RELEVANCE_THRESHOLDS_FILE = DB_DIR / "relevance_thresholds.json"
+GRADING_THRESHOLDS_FILE = DB_DIR / "grading_thresholds.json"
+ROUTING_STATS_FILE = DB_DIR / "routing_stats.json"
+MODULE_INDEX_FILE = DB_DIR / "course_module_index.json"
+JOBS_DB_FILE = DB_DIR / "jobs.sqlite3"
+QUERY_LOG_FILE = LOGS_DIR / "query_log.txt"  # One answered question per line
 
 # Log Files
 MAIN_LOG_FILE = "banglarag.log"
@@ -239,6 +430,20 @@ LOG_LEVELS = {"DEBUG": 10, "INFO": 20, "WARNING": 30, "ERROR": 40, "CRITICAL": 5
 LOG_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
 LOG_DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
 
+# Queued logging: request threads only enqueue records; a listener thread
+# formats and writes them. Records are dropped (and counted) when full.
+LOG_QUEUE_ENABLED = True
+LOG_QUEUE_SIZE = 10000
+
+# DEBUG records kept per component (logger name), e.g. 0.1 keeps 1 in 10
+DEBUG_LOG_SAMPLE_RATES = {
+    "api": 0.1,
+    "retrieval": 0.1,
+    "database": 0.1,
+    "embedding": 0.05,
+}
+DEFAULT_DEBUG_SAMPLE_RATE = 1.0
+
 # ============================================================================
 # PERFORMANCE THRESHOLDS
 # ============================================================================
@@ -303,6 +508,7 @@ __all__ = [
     "DATABASE_DIRECTORY",
     "DEFAULT_RETRIEVAL_COUNT",
     "OLLAMA_BASE_URL",
+    "OLLAMA_NODES",
     "ERROR_MESSAGES",
     "SUCCESS_MESSAGES",
     "get_project_root",
@@ -53,6 +53,12 @@ class NetworkException(BanglaRAGException):
     pass
 
 
+class NodeUnreachableException(NetworkException):
+    """Exception raised when an Ollama server cannot be connected to."""
+
+    pass
+
+
 class ConfigurationException(BanglaRAGException):
     """Exception raised for configuration errors."""
 
@@ -63,3 +69,29 @@ class ValidationException(BanglaRAGException):
     """Exception raised for input validation errors."""
 
     pass
+
+
+class JobException(BanglaRAGException):
+    """Exception raised for background job errors."""
+
+    pass
+
+
+class JobCancelledException(JobException):
+    """Exception raised inside a job that has been cancelled."""
+
+    pass
+
+
+class DeadlineExceededException(BanglaRAGException):
+    """Exception raised when a request's time budget runs out."""
+
+    pass
+
+
+class OverloadedException(BanglaRAGException):
+    """Exception raised when a request is shed because the system is saturated."""
+
+    def __init__(self, message: str, retry_after: float = 1.0):
+        super().__init__(message)
+        self.retry_after = retry_after
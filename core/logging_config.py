@@ -4,12 +4,14 @@ Centralized logging configuration for BanglaRAG system.
 Provides structured logging with different levels and file outputs.
 """
 
+import atexit
 import logging
 import logging.handlers
+import queue
 import sys
+import time
 from pathlib import Path
-from typing import Optional
-from datetime import datetime
+from typing import Optional, Dict, Any, List
 
 from core.constants import (
     LOGS_DIR,
@@ -19,23 +21,107 @@ from core.constants import (
     LOG_FORMAT,
     LOG_DATE_FORMAT,
     LOG_LEVELS,
+    LOG_QUEUE_ENABLED,
+    LOG_QUEUE_SIZE,
+    DEBUG_LOG_SAMPLE_RATES,
+    DEFAULT_DEBUG_SAMPLE_RATE,
 )
 
 
+class DebugSampler(logging.Filter):
+    """
+    Keep a fraction of DEBUG records per component.
+
+    The component is the first part of the logger name. Sampling is
+    counter-based (a rate of 0.1 keeps every 10th record), so it is cheap and
+    steady; records at INFO and above always pass.
+    """
+
+    def __init__(
+        self,
+        rates: Optional[Dict[str, float]] = None,
+        default_rate: float = DEFAULT_DEBUG_SAMPLE_RATE,
+    ):
+        super().__init__()
+        self.rates = DEBUG_LOG_SAMPLE_RATES if rates is None else rates
+        self.default_rate = default_rate
+        self._seen: Dict[str, int] = {}
+        self.sampled_out = 0
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno > logging.DEBUG:
+            return True
+
+        component = record.name.split(".", 1)[0]
+        rate = self.rates.get(component, self.default_rate)
+        if rate >= 1.0:
+            return True
+
+        # Unlocked on purpose: a lost increment only shifts which record is kept
+        seen = self._seen.get(component, 0)
+        self._seen[component] = seen + 1
+        if rate > 0 and seen % max(round(1 / rate), 1) == 0:
+            return True
+        self.sampled_out += 1
+        return False
+
+
+class DroppingQueueHandler(logging.handlers.QueueHandler):
+    """
+    Queue handler that never blocks the logging thread.
+
+    Records are handed over unformatted (the listener thread formats them)
+    and dropped, with a count, when the bounded queue is full.
+    """
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Same process: no need to pre-format or strip args for pickling
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
 class BanglaRAGLogger:
     """Centralized logger for the BanglaRAG system."""
 
     _loggers = {}
     _initialized = False
+    _queue_handler: Optional[DroppingQueueHandler] = None
+    _listener: Optional[logging.handlers.QueueListener] = None
+    _handlers: List[logging.Handler] = []
+    _sampler: Optional[DebugSampler] = None
 
     @classmethod
-    def setup_logging(cls, log_level: str = "INFO") -> None:
-        """Set up logging configuration for the entire application."""
-        if cls._initialized:
+    def setup_logging(
+        cls,
+        log_level: str = "INFO",
+        queued: bool = LOG_QUEUE_ENABLED,
+        log_dir: Path = LOGS_DIR,
+        force: bool = False,
+    ) -> None:
+        """
+        Set up logging configuration for the entire application.
+
+        With ``queued`` the root logger only gets a queue handler, and the
+        console and file handlers run on a listener thread, so request
+        threads never wait on disk or stdout. ``force`` tears down an existing
+        setup first (used by benchmarks to compare configurations).
+        """
+        if cls._initialized and not force:
             return
+        cls.shutdown()
 
         # Ensure logs directory exists
-        LOGS_DIR.mkdir(parents=True, exist_ok=True)
+        log_dir = Path(log_dir)
+        log_dir.mkdir(parents=True, exist_ok=True)
 
         # Configure root logger
         root_logger = logging.getLogger()
@@ -55,32 +141,93 @@ class BanglaRAGLogger:
         console_handler = logging.StreamHandler(sys.stdout)
         console_handler.setLevel(logging.INFO)
         console_handler.setFormatter(console_formatter)
-        root_logger.addHandler(console_handler)
 
         # Main log file handler (all logs)
         main_file_handler = logging.handlers.RotatingFileHandler(
-            filename=LOGS_DIR / MAIN_LOG_FILE,
+            filename=log_dir / MAIN_LOG_FILE,
             maxBytes=10 * 1024 * 1024,  # 10MB
             backupCount=5,
             encoding="utf-8",
         )
         main_file_handler.setLevel(logging.DEBUG)
         main_file_handler.setFormatter(detailed_formatter)
-        root_logger.addHandler(main_file_handler)
 
         # Error log file handler (errors only)
         error_file_handler = logging.handlers.RotatingFileHandler(
-            filename=LOGS_DIR / ERROR_LOG_FILE,
+            filename=log_dir / ERROR_LOG_FILE,
             maxBytes=5 * 1024 * 1024,  # 5MB
             backupCount=3,
             encoding="utf-8",
         )
         error_file_handler.setLevel(logging.ERROR)
         error_file_handler.setFormatter(detailed_formatter)
-        root_logger.addHandler(error_file_handler)
+
+        # Performance metrics ("performance" logger only)
+        perf_handler = logging.handlers.RotatingFileHandler(
+            filename=log_dir / PERFORMANCE_LOG_FILE,
+            maxBytes=5 * 1024 * 1024,  # 5MB
+            backupCount=3,
+            encoding="utf-8",
+            delay=True,
+        )
+        perf_handler.setFormatter(
+            logging.Formatter(
+                fmt="%(asctime)s - PERF - %(message)s", datefmt=LOG_DATE_FORMAT
+            )
+        )
+        perf_handler.setLevel(logging.INFO)
+        perf_handler.addFilter(logging.Filter("performance"))
+
+        cls._handlers = [
+            console_handler,
+            main_file_handler,
+            error_file_handler,
+            perf_handler,
+        ]
+        cls._sampler = DebugSampler()
+
+        if queued:
+            cls._queue_handler = DroppingQueueHandler(queue.Queue(LOG_QUEUE_SIZE))
+            cls._queue_handler.addFilter(cls._sampler)
+            root_logger.addHandler(cls._queue_handler)
+            cls._listener = logging.handlers.QueueListener(
+                cls._queue_handler.queue, *cls._handlers, respect_handler_level=True
+            )
+            cls._listener.start()
+        else:
+            for handler in cls._handlers:
+                handler.addFilter(cls._sampler)
+                root_logger.addHandler(handler)
 
         cls._initialized = True
 
+    @classmethod
+    def shutdown(cls) -> None:
+        """Flush queued records and close all handlers."""
+        if cls._listener:
+            cls._listener.stop()
+            cls._listener = None
+        root_logger = logging.getLogger()
+        for handler in cls._handlers + [cls._queue_handler]:
+            if handler:
+                root_logger.removeHandler(handler)
+                handler.close()
+        cls._handlers = []
+        cls._queue_handler = None
+        cls._initialized = False
+
+    @classmethod
+    def get_stats(cls) -> Dict[str, Any]:
+        """Get log queue depth, dropped and sampled-out record counts."""
+        handler = cls._queue_handler
+        return {
+            "queued": handler is not None,
+            "queue_depth": handler.queue.qsize() if handler else 0,
+            "queue_size": handler.queue.maxsize if handler else 0,
+            "dropped": handler.dropped if handler else 0,
+            "debug_sampled_out": cls._sampler.sampled_out if cls._sampler else 0,
+        }
+
     @classmethod
     def get_logger(cls, name: str) -> logging.Logger:
         """Get a logger for a specific module."""
@@ -96,33 +243,7 @@ class BanglaRAGLogger:
     @classmethod
     def get_performance_logger(cls) -> logging.Logger:
         """Get a specialized logger for performance metrics."""
-        if not cls._initialized:
-            cls.setup_logging()
-
-        perf_logger = logging.getLogger("performance")
-
-        # Add performance file handler if not already added
-        if not any(
-            isinstance(h, logging.handlers.RotatingFileHandler)
-            and PERFORMANCE_LOG_FILE in str(h.baseFilename)
-            for h in perf_logger.handlers
-        ):
-
-            perf_handler = logging.handlers.RotatingFileHandler(
-                filename=LOGS_DIR / PERFORMANCE_LOG_FILE,
-                maxBytes=5 * 1024 * 1024,  # 5MB
-                backupCount=3,
-                encoding="utf-8",
-            )
-
-            perf_formatter = logging.Formatter(
-                fmt="%(asctime)s - PERF - %(message)s", datefmt=LOG_DATE_FORMAT
-            )
-            perf_handler.setFormatter(perf_formatter)
-            perf_handler.setLevel(logging.INFO)
-            perf_logger.addHandler(perf_handler)
-
-        return perf_logger
+        return cls.get_logger("performance")
 
 
 class PerformanceTracker:
@@ -134,20 +255,23 @@ class PerformanceTracker:
         self.logger = BanglaRAGLogger.get_performance_logger()
 
     def __enter__(self):
-        self.start_time = datetime.now()
-        self.logger.info(f"Started: {self.operation_name}")
+        self.start_time = time.perf_counter()
+        self.logger.info("Started: %s", self.operation_name)
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb):
         if self.start_time:
-            duration = (datetime.now() - self.start_time).total_seconds()
+            duration = time.perf_counter() - self.start_time
             if exc_type is None:
                 self.logger.info(
-                    f"Completed: {self.operation_name} - Duration: {duration:.2f}s"
+                    "Completed: %s - Duration: %.2fs", self.operation_name, duration
                 )
             else:
                 self.logger.error(
-                    f"Failed: {self.operation_name} - Duration: {duration:.2f}s - Error: {exc_val}"
+                    "Failed: %s - Duration: %.2fs - Error: %s",
+                    self.operation_name,
+                    duration,
+                    exc_val,
                 )
 
 
@@ -188,31 +312,39 @@ def suppress_third_party_logs():
 logger = BanglaRAGLogger.get_logger("banglarag")
 
 
-def log_info(message: str, component: str = "system") -> None:
-    """Log an info message."""
-    BanglaRAGLogger.get_logger(component).info(message)
+def log_info(message: str, component: str = "system", *args) -> None:
+    """Log an info message (``args`` are %-formatted only if it is emitted)."""
+    BanglaRAGLogger.get_logger(component).info(message, *args)
 
 
-def log_warning(message: str, component: str = "system") -> None:
+def log_warning(message: str, component: str = "system", *args) -> None:
     """Log a warning message."""
-    BanglaRAGLogger.get_logger(component).warning(message)
+    BanglaRAGLogger.get_logger(component).warning(message, *args)
 
 
-def log_error(message: str, component: str = "system", exc_info: bool = False) -> None:
+def log_error(
+    message: str, component: str = "system", *args, exc_info: bool = False
+) -> None:
     """Log an error message."""
-    BanglaRAGLogger.get_logger(component).error(message, exc_info=exc_info)
+    BanglaRAGLogger.get_logger(component).error(message, *args, exc_info=exc_info)
+
+
+def debug_enabled(component: str = "system") -> bool:
+    """Whether DEBUG is on for a component; guard costly debug arguments."""
+    return BanglaRAGLogger.get_logger(component).isEnabledFor(logging.DEBUG)
 
 
-def log_debug(message: str, component: str = "system") -> None:
-    """Log a debug message."""
-    BanglaRAGLogger.get_logger(component).debug(message)
+def log_debug(message: str, component: str = "system", *args) -> None:
+    """Log a debug message (sampled per component, see ``DebugSampler``)."""
+    BanglaRAGLogger.get_logger(component).debug(message, *args)
 
 
-def log_critical(message: str, component: str = "system") -> None:
+def log_critical(message: str, component: str = "system", *args) -> None:
     """Log a critical message."""
-    BanglaRAGLogger.get_logger(component).critical(message)
+    BanglaRAGLogger.get_logger(component).critical(message, *args)
 
 
 # Initialize logging on import
 BanglaRAGLogger.setup_logging()
 suppress_third_party_logs()
+atexit.register(BanglaRAGLogger.shutdown)
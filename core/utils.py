@@ -10,12 +10,29 @@ import hashlib
 import tempfile
 import time
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Union, Callable
+from typing import Any, Dict, List, Optional, Union, Callable, Iterable, Iterator
 from functools import wraps
+from contextlib import contextmanager
+import heapq
+import queue
 import threading
 
 from core.logging_config import BanglaRAGLogger, PerformanceTracker
-from core.exceptions import ValidationException, FileProcessingException
+from core.exceptions import (
+    ValidationException,
+    FileProcessingException,
+    DeadlineExceededException,
+)
+from core.constants import (
+    ROOT_DIR,
+    TEST_REPORTS_DIR,
+    TEST_REPORT_PATTERN,
+    PRIORITY_INTERACTIVE,
+    SSE_FLUSH_INTERVAL_MS,
+    SSE_FLUSH_BYTES,
+    SSE_MAX_FLUSH_INTERVAL_MS,
+    SSE_HEARTBEAT_INTERVAL,
+)
 
 logger = BanglaRAGLogger.get_logger("utils")
 
@@ -263,6 +280,388 @@ class SimpleCache:
         return len(self._cache)
 
 
+class PriorityLimiter:
+    """
+    Concurrency limiter that hands free slots to the most urgent waiter.
+
+    Lower priority values go first; waiters of equal priority are served in
+    arrival order. ``reserved`` slots are kept for interactive callers, so
+    batch work can never occupy every slot.
+    """
+
+    def __init__(self, slots: int, reserved: int = 0):
+        self.slots = slots
+        self.reserved = min(reserved, slots - 1) if slots > 1 else 0
+        self._in_use = 0
+        self._waiters: List[tuple] = []
+        self._counter = 0
+        self._condition = threading.Condition()
+
+    def _capacity(self, priority: int) -> int:
+        """Slots usable at a given priority."""
+        if priority <= PRIORITY_INTERACTIVE:
+            return self.slots
+        return self.slots - self.reserved
+
+    def acquire(
+        self, priority: int = PRIORITY_INTERACTIVE, timeout: Optional[float] = None
+    ) -> bool:
+        """Wait for a slot. Returns False if ``timeout`` expires first."""
+        with self._condition:
+            self._counter += 1
+            ticket = (priority, self._counter)
+            heapq.heappush(self._waiters, ticket)
+            deadline = None if timeout is None else time.time() + timeout
+
+            try:
+                while not (
+                    self._waiters[0] == ticket
+                    and self._in_use < self._capacity(priority)
+                ):
+                    remaining = None if deadline is None else deadline - time.time()
+                    if remaining is not None and remaining <= 0:
+                        return False
+                    self._condition.wait(remaining)
+
+                self._in_use += 1
+                return True
+            finally:
+                self._waiters.remove(ticket)
+                heapq.heapify(self._waiters)
+                self._condition.notify_all()
+
+    def release(self) -> None:
+        """Free a slot."""
+        with self._condition:
+            self._in_use -= 1
+            self._condition.notify_all()
+
+    @contextmanager
+    def slot(
+        self, priority: int = PRIORITY_INTERACTIVE, timeout: Optional[float] = None
+    ):
+        """
+        Hold a slot for the duration of a ``with`` block.
+
+        Raises:
+            DeadlineExceededException: If no slot frees up within ``timeout``
+        """
+        if not self.acquire(priority, timeout):
+            raise DeadlineExceededException(
+                f"No model slot became free within {timeout:.1f}s"
+            )
+        try:
+            yield
+        finally:
+            self.release()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get slot usage."""
+        with self._condition:
+            return {
+                "slots": self.slots,
+                "reserved": self.reserved,
+                "in_use": self._in_use,
+                "waiting": len(self._waiters),
+            }
+
+
+class Deadline:
+    """
+    Absolute time budget shared by every step of one request.
+
+    Created once per request and passed down, so each retry or fallback sees
+    what is actually left instead of starting a fresh timeout. ``at`` is a
+    ``time.time()`` timestamp, matching admission tickets; None means no limit.
+    """
+
+    def __init__(self, at: Optional[float] = None):
+        self.at = at
+
+    @classmethod
+    def after(cls, seconds: Optional[float]) -> "Deadline":
+        """Deadline ``seconds`` from now (None for no limit)."""
+        return cls(None if seconds is None else time.time() + seconds)
+
+    def remaining(self) -> Optional[float]:
+        """Seconds left (never negative), or None without a limit."""
+        if self.at is None:
+            return None
+        return max(self.at - time.time(), 0.0)
+
+    @property
+    def expired(self) -> bool:
+        """Whether the budget is used up."""
+        return self.at is not None and time.time() >= self.at
+
+    def timeout(self, cap: float) -> float:
+        """Timeout for one step: ``cap``, shortened to what is left."""
+        remaining = self.remaining()
+        return cap if remaining is None else min(cap, remaining)
+
+
+class CircuitBreaker:
+    """
+    Stops calling a dependency after consecutive failures.
+
+    After ``failure_threshold`` failures in a row the breaker opens and
+    ``allow`` refuses calls. Once ``reset_seconds`` have passed, a single
+    probe call is let through (half-open): success closes the breaker,
+    failure opens it again for another ``reset_seconds``.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int = 3, reset_seconds: float = 30.0):
+        self.failure_threshold = max(failure_threshold, 1)
+        self.reset_seconds = reset_seconds
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probing = False
+        self._probe_started = 0.0
+        self._lock = threading.Lock()
+        self._stats = {"opened": 0, "rejected": 0, "probes": 0}
+
+    @property
+    def state(self) -> str:
+        """Current state, moving from open to half-open once the wait is over."""
+        with self._lock:
+            self._refresh()
+            return self._state
+
+    def _refresh(self) -> None:
+        """Half-open an open breaker whose wait is over (caller holds the lock)."""
+        if (
+            self._state == self.OPEN
+            and time.monotonic() - self._opened_at >= self.reset_seconds
+        ):
+            self._state = self.HALF_OPEN
+            self._probing = False
+
+    def allow(self) -> bool:
+        """Whether a call may go ahead (claims the probe when half-open)."""
+        with self._lock:
+            self._refresh()
+            if self._state == self.CLOSED:
+                return True
+            # A probe that never reported back (e.g. a cancelled stream)
+            # stops blocking new probes after another reset period
+            if self._state == self.HALF_OPEN and (
+                not self._probing
+                or time.monotonic() - self._probe_started >= self.reset_seconds
+            ):
+                self._probing = True
+                self._probe_started = time.monotonic()
+                self._stats["probes"] += 1
+                return True
+            self._stats["rejected"] += 1
+            return False
+
+    def record_success(self) -> None:
+        """A call succeeded: close the breaker."""
+        with self._lock:
+            self._state = self.CLOSED
+            self._failures = 0
+            self._probing = False
+
+    def record_failure(self) -> None:
+        """A call failed: open the breaker after too many in a row."""
+        with self._lock:
+            self._failures += 1
+            if self._state == self.HALF_OPEN or (
+                self._state == self.CLOSED and self._failures >= self.failure_threshold
+            ):
+                self._state = self.OPEN
+                self._opened_at = time.monotonic()
+                self._probing = False
+                self._stats["opened"] += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get breaker state and counters."""
+        with self._lock:
+            self._refresh()
+            return {
+                "state": self._state,
+                "consecutive_failures": self._failures,
+                **self._stats,
+            }
+
+
+class SSEWriter:
+    """
+    Server-Sent Events writer that coalesces streamed tokens into frames.
+
+    Tokens are buffered and sent as one ``token`` frame every ``flush_ms``
+    milliseconds or once ``flush_bytes`` are pending, whichever comes first.
+    A frame carries the concatenated text, so clients that append
+    ``data.token`` render exactly what per-token frames would have shown.
+    Idle streams get an SSE comment every ``heartbeat`` seconds so proxies
+    keep the connection open. ``flush_ms=0`` restores one frame per token.
+    """
+
+    TOKEN_FRAME = 'data: {"type": "token", "token": %s}\n\n'
+    HEARTBEAT_FRAME = ": ping\n\n"
+    _END = object()
+
+    def __init__(
+        self,
+        flush_ms: int = SSE_FLUSH_INTERVAL_MS,
+        flush_bytes: int = SSE_FLUSH_BYTES,
+        heartbeat: float = SSE_HEARTBEAT_INTERVAL,
+    ):
+        self.flush_interval = max(flush_ms, 0) / 1000
+        self.flush_bytes = max(flush_bytes, 1)
+        self.heartbeat = heartbeat
+        self._pending: List[str] = []
+        self._pending_bytes = 0
+        self._last_write = time.monotonic()
+        self._lock = threading.Lock()
+        self.stats = {"tokens": 0, "frames": 0, "bytes": 0, "heartbeats": 0}
+
+    @classmethod
+    def negotiate(cls, options: Optional[Dict[str, Any]]) -> "SSEWriter":
+        """
+        Build a writer from a client's ``stream_options``.
+
+        Clients may ask for a shorter or longer flush interval (capped at
+        ``SSE_MAX_FLUSH_INTERVAL_MS``) or a smaller byte threshold; anything
+        missing or malformed falls back to the server defaults.
+        """
+        options = options if isinstance(options, dict) else {}
+        try:
+            flush_ms = int(options.get("flush_ms", SSE_FLUSH_INTERVAL_MS))
+            flush_bytes = int(options.get("flush_bytes", SSE_FLUSH_BYTES))
+        except (TypeError, ValueError):
+            flush_ms, flush_bytes = SSE_FLUSH_INTERVAL_MS, SSE_FLUSH_BYTES
+        return cls(
+            flush_ms=min(max(flush_ms, 0), SSE_MAX_FLUSH_INTERVAL_MS),
+            flush_bytes=min(max(flush_bytes, 1), SSE_FLUSH_BYTES),
+        )
+
+    def policy(self) -> Dict[str, Any]:
+        """Effective batching policy, echoed to the client."""
+        return {
+            "flush_ms": int(self.flush_interval * 1000),
+            "flush_bytes": self.flush_bytes,
+            "heartbeat": self.heartbeat,
+        }
+
+    def _write(self, frame: str) -> str:
+        """Account for a frame about to be sent (caller holds the lock)."""
+        self._last_write = time.monotonic()
+        self.stats["frames"] += 1
+        self.stats["bytes"] += len(frame)
+        return frame
+
+    def _flush_locked(self) -> str:
+        """Frame pending tokens (caller holds the lock)."""
+        if not self._pending:
+            return ""
+        text = "".join(self._pending)
+        self._pending.clear()
+        self._pending_bytes = 0
+        return self._write(self.TOKEN_FRAME % json.dumps(text))
+
+    def event(self, payload: Dict[str, Any]) -> str:
+        """Frame a non-token event, sending any pending tokens first."""
+        frame = f"data: {json.dumps(payload)}\n\n"
+        with self._lock:
+            return self._flush_locked() + self._write(frame)
+
+    def token(self, text: str) -> str:
+        """Buffer a token; returns a frame when the flush policy says so."""
+        if not text:
+            return ""
+        with self._lock:
+            self.stats["tokens"] += 1
+            self._pending.append(text)
+            self._pending_bytes += len(text.encode("utf-8"))
+            if (
+                self._pending_bytes >= self.flush_bytes
+                or time.monotonic() - self._last_write >= self.flush_interval
+            ):
+                return self._flush_locked()
+            return ""
+
+    def flush(self) -> str:
+        """Frame all pending tokens (empty string if there are none)."""
+        with self._lock:
+            return self._flush_locked()
+
+    def stream(self, tokens: Iterable[str]) -> Iterator[str]:
+        """
+        Yield coalesced frames for a blocking token iterator.
+
+        The iterator is drained on a helper thread that batches tokens as
+        they arrive, so only whole frames cross the thread boundary. This
+        side wakes up only to send a frame, to flush a batch the model has
+        stalled on, or to send a heartbeat while the model is silent (e.g.
+        evaluating a long prompt). Errors raised by the iterator are
+        re-raised here after pending tokens are flushed. If this generator
+        is closed early (the client disconnected), the iterator is closed
+        as soon as it produces its next token.
+        """
+        frames: queue.Queue = queue.Queue()
+        stop = threading.Event()
+
+        def pump():
+            try:
+                for text in tokens:
+                    if stop.is_set():
+                        break
+                    frame = self.token(text)
+                    if frame:
+                        frames.put(frame)
+            except Exception as e:
+                frames.put(e)
+            finally:
+                # Closing the source here (its own thread) aborts the upstream
+                # request as soon as the client has gone away
+                close = getattr(tokens, "close", None)
+                if close:
+                    close()
+            frames.put(self._END)
+
+        threading.Thread(target=pump, name="sse-pump", daemon=True).start()
+        try:
+            while True:
+                with self._lock:
+                    interval = self.flush_interval if self._pending else self.heartbeat
+                    wait = self._last_write + interval - time.monotonic()
+                try:
+                    item = frames.get(timeout=max(wait, 0))
+                except queue.Empty:
+                    with self._lock:
+                        frame = self._flush_locked()
+                        if (
+                            not frame
+                            and time.monotonic() - self._last_write >= self.heartbeat
+                        ):
+                            self.stats["heartbeats"] += 1
+                            frame = self._write(self.HEARTBEAT_FRAME)
+                    if frame:
+                        yield frame
+                    continue
+
+                if item is self._END:
+                    break
+                if isinstance(item, Exception):
+                    pending = self.flush()
+                    if pending:
+                        yield pending
+                    raise item
+                yield item
+
+            pending = self.flush()
+            if pending:
+                yield pending
+        finally:
+            stop.set()
+
+
 def create_temp_file(suffix: str = "", prefix: str = "banglarag_") -> str:
     """Create a temporary file and return its path."""
     fd, path = tempfile.mkstemp(suffix=suffix, prefix=prefix)
@@ -284,6 +683,45 @@ def find_pdf_files(directory: Union[str, Path]) -> List[Path]:
     return sorted(pdf_files)
 
 
+def find_test_reports(directory: Optional[Union[str, Path]] = None) -> List[Path]:
+    """Find bundled evaluation reports (``*_test_report_*.json``)."""
+    directories = [Path(directory)] if directory else [ROOT_DIR, TEST_REPORTS_DIR]
+
+    reports = []
+    for report_dir in directories:
+        if report_dir.exists():
+            reports.extend(
+                p for p in report_dir.glob(TEST_REPORT_PATTERN) if p.is_file()
+            )
+
+    return sorted(set(reports))
+
+
+def load_test_report_entries(
+    report_paths: Optional[List[Union[str, Path]]] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Load ``detailed_results`` entries from evaluation reports.
+
+    Entries are de-duplicated by ``test_id`` since every model report replays
+    the same question set.
+    """
+    if report_paths is None:
+        report_paths = find_test_reports()
+
+    entries: Dict[str, Dict[str, Any]] = {}
+    for path in report_paths:
+        report = safe_json_load(path)
+        if not report:
+            continue
+        for entry in report.get("detailed_results", []):
+            test_id = entry.get("test_id") or entry.get("question")
+            if test_id and test_id not in entries:
+                entries[test_id] = entry
+
+    return list(entries.values())
+
+
 def sanitize_text(text: str) -> str:
     """Sanitize text by removing extra whitespace and special characters."""
     if not text:
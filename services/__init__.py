@@ -29,6 +29,58 @@ from .llm_service import (
     get_available_models,
     test_ollama_connection,
 )
+from .retrieval_service import (
+    CollectionSource,
+    FederatedRetriever,
+)
+from .question_service import (
+    IncrementalQuestionParser,
+    QuestionGenerator,
+    QuestionShard,
+    parse_questions,
+    validate_question,
+)
+from .course_index_service import (
+    ModuleIndex,
+    load_module_index,
+)
+from .job_service import (
+    JobQueue,
+    JobStatus,
+    JobContext,
+    get_job_queue,
+)
+from .relevance_service import (
+    GateDecision,
+    RelevanceGate,
+    get_relevance_gate,
+    calibrate_thresholds,
+    calibrate_by_language,
+)
+from .warmup_service import (
+    QueryLog,
+    CacheWarmer,
+    get_query_log,
+)
+from .evaluation_service import (
+    EvaluationCheckpoint,
+    EvaluationRunner,
+    build_report,
+)
+from .grading_service import (
+    AnswerGrader,
+    calibrate_grader,
+    make_llm_judge,
+)
+from .extractive_service import (
+    ExtractiveAnswerer,
+    get_extractive_answerer,
+)
+from .routing_service import (
+    RoutingPolicy,
+    fit_routes,
+    get_routing_policy,
+)
 from .voice_service import (
     VoiceInputService,
     get_voice_service,
@@ -59,6 +111,48 @@ __all__ = [
     "query_ollama",
     "get_available_models",
     "test_ollama_connection",
+    # Retrieval service
+    "CollectionSource",
+    "FederatedRetriever",
+    # Question generation
+    "IncrementalQuestionParser",
+    "QuestionGenerator",
+    "QuestionShard",
+    "parse_questions",
+    "validate_question",
+    # Course module index
+    "ModuleIndex",
+    "load_module_index",
+    # Background jobs
+    "JobQueue",
+    "JobStatus",
+    "JobContext",
+    "get_job_queue",
+    # Relevance gate
+    "GateDecision",
+    "RelevanceGate",
+    "get_relevance_gate",
+    "calibrate_thresholds",
+    "calibrate_by_language",
+    # Cache warm-up
+    "QueryLog",
+    "CacheWarmer",
+    "get_query_log",
+    # Evaluation
+    "EvaluationCheckpoint",
+    "EvaluationRunner",
+    "build_report",
+    # Answer grading
+    "AnswerGrader",
+    "calibrate_grader",
+    "make_llm_judge",
+    # Extractive fast path
+    "ExtractiveAnswerer",
+    "get_extractive_answerer",
+    # Query routing
+    "RoutingPolicy",
+    "fit_routes",
+    "get_routing_policy",
     # Voice service
     "VoiceInputService",
     "get_voice_service",
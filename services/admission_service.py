@@ -0,0 +1,307 @@
+#!/usr/bin/env python3
+"""
+Admission control for BanglaRAG system.
+Bounds how much work waits in front of the RAG pipeline, orders it by lane
+priority and sheds requests that could not finish before their deadline.
+"""
+
+from collections import deque
+from typing import Optional, List, Dict, Any
+import heapq
+import itertools
+import threading
+import time
+
+from core.logging_config import BanglaRAGLogger
+from core.exceptions import OverloadedException, ValidationException
+from core.constants import (
+    ADMISSION_SLOTS,
+    ADMISSION_LANES,
+    ADMISSION_SAMPLE_WINDOW,
+)
+
+logger = BanglaRAGLogger.get_logger("admission")
+
+
+class Ticket:
+    """
+    A request's place in the admission queue.
+
+    Created by ``AdmissionController.admit``. ``wait`` turns it into a held
+    slot; ``close`` releases the slot (recording the service time) or leaves
+    the queue if the slot was never granted. Usable as a context manager.
+    """
+
+    def __init__(
+        self,
+        controller: "AdmissionController",
+        lane: str,
+        priority: int,
+        deadline: Optional[float],
+    ):
+        self.controller = controller
+        self.lane = lane
+        self.priority = priority
+        self.deadline = deadline  # Absolute time.time(), or None
+        self.seq = next(controller._sequence)
+        self.admitted_at = time.time()
+        self.started_at: Optional[float] = None
+        self.closed = False
+
+    def __lt__(self, other: "Ticket") -> bool:
+        return (self.priority, self.seq) < (other.priority, other.seq)
+
+    @property
+    def active(self) -> bool:
+        """Whether the ticket holds a slot."""
+        return self.started_at is not None and not self.closed
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait for a slot.
+
+        Returns:
+            True once the slot is held, False if ``timeout`` expired first
+            (the ticket keeps its place, so call again to keep waiting)
+
+        Raises:
+            OverloadedException: If the deadline can no longer be met
+        """
+        return self.controller._wait(self, timeout)
+
+    def position(self) -> int:
+        """1-based queue position (0 once running)."""
+        return self.controller._position(self)
+
+    def estimated_wait(self) -> float:
+        """Seconds until this ticket is expected to get a slot."""
+        return self.controller._estimate_wait(self.priority, self.position() - 1)
+
+    def close(self) -> None:
+        """Release the slot, or leave the queue if it was never granted."""
+        self.controller._close(self)
+
+    def __enter__(self) -> "Ticket":
+        self.wait()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+
+class AdmissionController:
+    """
+    Bounded priority queue in front of a fixed number of pipeline slots.
+
+    Each lane has a priority, a queue limit and a default deadline. Queue
+    wait is estimated from recently measured service times: with ``n``
+    requests ahead and ``slots`` workers, a newcomer waits about
+    ``(n + 1) / slots`` mean service times. A request is admitted only if
+    that wait plus its own lane's service time fits before its deadline, so
+    work is never accepted that would time out anyway.
+    """
+
+    def __init__(
+        self,
+        slots: int = ADMISSION_SLOTS,
+        lanes: Optional[Dict[str, Dict[str, Any]]] = None,
+        sample_window: int = ADMISSION_SAMPLE_WINDOW,
+    ):
+        self.slots = max(slots, 1)
+        self.lanes = lanes or ADMISSION_LANES
+        self._condition = threading.Condition()
+        self._waiters: List[Ticket] = []
+        self._sequence = itertools.count()
+        self._in_use = 0
+        self._service_times = {lane: deque(maxlen=sample_window) for lane in self.lanes}
+        self._recent = deque(maxlen=sample_window)
+        self._stats = {
+            lane: {
+                "admitted": 0,
+                "completed": 0,
+                "rejected_full": 0,
+                "rejected_deadline": 0,
+                "expired": 0,
+                "abandoned": 0,
+            }
+            for lane in self.lanes
+        }
+
+    def _lane(self, lane: str) -> Dict[str, Any]:
+        """Look up a lane's configuration."""
+        if lane not in self.lanes:
+            raise ValidationException(f"Unknown admission lane: {lane}")
+        return self.lanes[lane]
+
+    def _service_time(self, lane: Optional[str] = None) -> float:
+        """Mean recent service time for a lane (or all lanes)."""
+        samples = self._service_times[lane] if lane else self._recent
+        if samples:
+            return sum(samples) / len(samples)
+        if lane:
+            return self.lanes[lane]["service_time"]
+        return sum(c["service_time"] for c in self.lanes.values()) / len(self.lanes)
+
+    def _ahead(self, priority: int) -> int:
+        """Queued requests that would be served before a newcomer."""
+        return sum(1 for ticket in self._waiters if ticket.priority <= priority)
+
+    def _estimate_wait(self, priority: int, ahead: Optional[int] = None) -> float:
+        """Expected queue wait for a request with ``ahead`` requests before it."""
+        with self._condition:
+            ahead = self._ahead(priority) if ahead is None else ahead
+            if ahead <= 0 and self._in_use < self.slots:
+                return 0.0
+            return (ahead + 1) / self.slots * self._service_time()
+
+    def admit(self, lane: str, deadline: Optional[float] = None) -> Ticket:
+        """
+        Join a lane's queue or be shed immediately.
+
+        Args:
+            lane: Lane name from ``ADMISSION_LANES``
+            deadline: Seconds the client will wait for a complete answer
+                (defaults to the lane's deadline)
+
+        Returns:
+            Ticket to ``wait`` on
+
+        Raises:
+            OverloadedException: Lane queue full, or the estimated wait plus
+                service time exceeds the deadline; ``retry_after`` is the
+                estimated wait
+        """
+        config = self._lane(lane)
+        if deadline is None:
+            deadline = config["deadline"]
+
+        with self._condition:
+            queued = sum(1 for ticket in self._waiters if ticket.lane == lane)
+            wait = self._estimate_wait(config["priority"])
+            retry_after = max(wait, 1.0)
+
+            if queued >= config["max_queue"]:
+                self._stats[lane]["rejected_full"] += 1
+                raise OverloadedException(
+                    f"The {lane} queue is full ({queued} waiting)", retry_after
+                )
+
+            service = self._service_time(lane)
+            if deadline is not None and wait + service > deadline:
+                self._stats[lane]["rejected_deadline"] += 1
+                raise OverloadedException(
+                    f"Estimated wait {wait:.0f}s plus {service:.0f}s of work "
+                    f"exceeds the {deadline:.0f}s deadline",
+                    retry_after,
+                )
+
+            ticket = Ticket(
+                self,
+                lane,
+                config["priority"],
+                None if deadline is None else time.time() + deadline,
+            )
+            heapq.heappush(self._waiters, ticket)
+            self._stats[lane]["admitted"] += 1
+            return ticket
+
+    def _wait(self, ticket: Ticket, timeout: Optional[float]) -> bool:
+        """Block until ``ticket`` is first in line and a slot is free."""
+        if ticket.active:
+            return True
+
+        give_up = None if timeout is None else time.time() + timeout
+        service = self._service_time(ticket.lane)
+        with self._condition:
+            while not (
+                self._waiters
+                and self._waiters[0] is ticket
+                and self._in_use < self.slots
+            ):
+                now = time.time()
+                # Starting now could no longer finish before the deadline
+                if ticket.deadline is not None and now + service > ticket.deadline:
+                    self._remove(ticket)
+                    ticket.closed = True  # Closing it later is not an abandonment
+                    self._stats[ticket.lane]["expired"] += 1
+                    raise OverloadedException(
+                        "Waited too long in the queue to finish before the deadline",
+                        self._estimate_wait(ticket.priority),
+                    )
+                latest_start = (
+                    None if ticket.deadline is None else ticket.deadline - service
+                )
+                limits = [t for t in (give_up, latest_start) if t is not None]
+                remaining = min(limits) - now if limits else None
+                if give_up is not None and now >= give_up:
+                    return False
+                self._condition.wait(remaining)
+
+            self._remove(ticket)
+            self._in_use += 1
+            ticket.started_at = time.time()
+            return True
+
+    def _remove(self, ticket: Ticket) -> None:
+        """Take a ticket out of the queue (caller holds the lock)."""
+        if ticket in self._waiters:
+            self._waiters.remove(ticket)
+            heapq.heapify(self._waiters)
+            self._condition.notify_all()
+
+    def _position(self, ticket: Ticket) -> int:
+        """1-based position among queued tickets."""
+        with self._condition:
+            if ticket not in self._waiters:
+                return 0
+            return 1 + sum(1 for other in self._waiters if other < ticket)
+
+    def _close(self, ticket: Ticket) -> None:
+        """Release a held slot or abandon a queued ticket."""
+        with self._condition:
+            if ticket.closed:
+                return
+            ticket.closed = True
+            if ticket.started_at is None:
+                self._remove(ticket)
+                self._stats[ticket.lane]["abandoned"] += 1
+                return
+
+            elapsed = time.time() - ticket.started_at
+            self._service_times[ticket.lane].append(elapsed)
+            self._recent.append(elapsed)
+            self._stats[ticket.lane]["completed"] += 1
+            self._in_use -= 1
+            self._condition.notify_all()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get slot usage, queue depth and per-lane estimates."""
+        with self._condition:
+            return {
+                "slots": self.slots,
+                "in_use": self._in_use,
+                "queued": len(self._waiters),
+                "lanes": {
+                    lane: {
+                        **self._stats[lane],
+                        "queued": sum(1 for t in self._waiters if t.lane == lane),
+                        "service_time": round(self._service_time(lane), 2),
+                        "estimated_wait": round(
+                            self._estimate_wait(config["priority"]), 2
+                        ),
+                    }
+                    for lane, config in self.lanes.items()
+                },
+            }
+
+
+# Global admission controller instance
+_admission_controller: Optional[AdmissionController] = None
+
+
+def get_admission_controller() -> AdmissionController:
+    """Get global admission controller instance."""
+    global _admission_controller
+    if _admission_controller is None:
+        _admission_controller = AdmissionController()
+    return _admission_controller
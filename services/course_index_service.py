@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""
+Course module index for BanglaRAG system.
+Maps every course module to its chunk IDs, grouped by subsection, so question
+generation can sample a module's content without an embedding search.
+"""
+
+from pathlib import Path
+from typing import Optional, List, Dict, Any, Union
+import random
+
+from langchain.schema import Document
+
+from core.logging_config import BanglaRAGLogger
+from core.utils import safe_json_load, safe_json_save
+from core.constants import COURSE_COLLECTION, MODULE_INDEX_FILE
+
+logger = BanglaRAGLogger.get_logger("course_index")
+
+DEFAULT_SECTION = "General"
+
+
+class ModuleIndex:
+    """
+    Module → subsection → chunk-id index over a course collection.
+
+    Built once at ingest from chunk metadata (``id``, ``module`` and
+    ``section``) and persisted next to the database.
+    """
+
+    def __init__(
+        self,
+        modules: Optional[Dict[str, Dict[str, List[str]]]] = None,
+        collection: str = COURSE_COLLECTION,
+    ):
+        self.modules = modules or {}
+        self.collection = collection
+
+    @classmethod
+    def build(
+        cls, documents: List[Document], collection: str = COURSE_COLLECTION
+    ) -> "ModuleIndex":
+        """Build the index from chunked course documents."""
+        modules: Dict[str, Dict[str, List[str]]] = {}
+        for doc in documents:
+            doc_id = doc.metadata.get("id")
+            module = doc.metadata.get("module")
+            if not doc_id or not module:
+                continue
+            section = doc.metadata.get("section") or DEFAULT_SECTION
+            modules.setdefault(module, {}).setdefault(section, []).append(doc_id)
+
+        index = cls(modules, collection)
+        logger.info(
+            f"Built module index: {len(modules)} modules, "
+            f"{index.chunk_count} chunks"
+        )
+        return index
+
+    @classmethod
+    def from_database(
+        cls, db_manager, collection: str = COURSE_COLLECTION
+    ) -> "ModuleIndex":
+        """Rebuild the index from stored chunk metadata (no embeddings needed)."""
+        return cls.build(db_manager.get_documents(), collection)
+
+    @classmethod
+    def load(
+        cls, path: Union[str, Path] = MODULE_INDEX_FILE
+    ) -> Optional["ModuleIndex"]:
+        """Load a persisted index, or None if there is none."""
+        data = safe_json_load(path) if Path(path).exists() else None
+        if not data:
+            return None
+        return cls(data.get("modules", {}), data.get("collection", COURSE_COLLECTION))
+
+    def save(self, path: Union[str, Path] = MODULE_INDEX_FILE) -> bool:
+        """Persist the index."""
+        saved = safe_json_save(
+            {"collection": self.collection, "modules": self.modules}, path
+        )
+        if saved:
+            logger.info(f"Module index saved to {path}")
+        return saved
+
+    @property
+    def chunk_count(self) -> int:
+        """Total number of indexed chunks."""
+        return sum(
+            len(ids) for sections in self.modules.values() for ids in sections.values()
+        )
+
+    def resolve(self, module: str) -> Optional[str]:
+        """
+        Match a requested module to an indexed one.
+
+        Accepts the full title ("MODULE 1: ARRAYS AND STRINGS") or its short
+        form ("MODULE 1"), case-insensitively.
+        """
+        wanted = module.strip().lower()
+        for name in self.modules:
+            lowered = name.lower()
+            if lowered == wanted or lowered.split(":", 1)[0].strip() == wanted:
+                return name
+        return None
+
+    def sample(
+        self,
+        module: str,
+        count: int,
+        rng: Optional[random.Random] = None,
+    ) -> List[str]:
+        """
+        Sample chunk IDs stratified across a module's subsections.
+
+        Subsections are visited round-robin so every part of the module is
+        represented before any subsection contributes a second chunk. With
+        ``module="all"`` the modules themselves are the outer strata.
+
+        Returns:
+            Chunk IDs, or an empty list for an unknown module
+        """
+        rng = rng or random.Random()
+
+        if module == "all":
+            names = list(self.modules)
+        else:
+            name = self.resolve(module)
+            names = [name] if name else []
+        if not names or count <= 0:
+            return []
+
+        # One round-robin stream per module, then interleave the modules
+        streams = [self._stratified(self.modules[name], rng) for name in names]
+        rng.shuffle(streams)
+        return _round_robin(streams)[:count]
+
+    @staticmethod
+    def _stratified(sections: Dict[str, List[str]], rng: random.Random) -> List[str]:
+        """Shuffle within each subsection and interleave the subsections."""
+        strata = [rng.sample(ids, len(ids)) for ids in sections.values() if ids]
+        rng.shuffle(strata)
+        return _round_robin(strata)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get per-module chunk and subsection counts."""
+        return {
+            "collection": self.collection,
+            "chunks": self.chunk_count,
+            "modules": {
+                name: {
+                    "sections": len(sections),
+                    "chunks": sum(len(ids) for ids in sections.values()),
+                }
+                for name, sections in self.modules.items()
+            },
+        }
+
+
+def _round_robin(streams: List[List[str]]) -> List[str]:
+    """Take one item from each stream in turn until all are exhausted."""
+    merged = []
+    for position in range(max((len(s) for s in streams), default=0)):
+        merged.extend(s[position] for s in streams if position < len(s))
+    return merged
+
+
+def load_module_index(
+    db_manager=None, path: Union[str, Path] = MODULE_INDEX_FILE
+) -> Optional[ModuleIndex]:
+    """
+    Load the persisted module index, rebuilding it from the database if missing.
+
+    Args:
+        db_manager: Course collection manager used to rebuild a missing index
+        path: Index file location
+
+    Returns:
+        The index, or None if it can neither be loaded nor rebuilt
+    """
+    index = ModuleIndex.load(path)
+    if index is not None:
+        logger.info(f"Loaded module index from {path}")
+        return index
+
+    if db_manager is None:
+        return None
+
+    try:
+        index = ModuleIndex.from_database(db_manager)
+    except Exception as e:
+        logger.warning(f"Could not rebuild module index: {e}")
+        return None
+
+    if index.modules:
+        index.save(path)
+        return index
+    return None
@@ -7,9 +7,12 @@ Provides clean interface for vector database operations with proper dependency i
 from abc import ABC, abstractmethod
 from typing import Optional, List, Dict, Any, Tuple
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
 import threading
 import time
 
+import numpy as np
+
 from langchain_chroma import Chroma
 from langchain.schema import Document
 import chromadb
@@ -20,10 +23,24 @@ from core.utils import (
     retry_with_backoff,
     measure_performance,
     SimpleCache,
+    get_text_hash,
     ensure_directory,
+    safe_json_load,
+    safe_json_save,
+)
+from core.constants import (
+    DATABASE_DIRECTORY,
+    DEFAULT_RETRIEVAL_COUNT,
+    VECTOR_BACKEND,
+    VECTOR_COMPRESSION,
+    COMPRESSED_DIMENSIONS,
+    RESCORE_FACTOR,
+    BANGLA_CODE,
+    INDEX_LANGUAGES,
+    LANGUAGE_PARTITIONED_INDEXES,
+    PARTITION_SCORE_FLOORS,
 )
-from core.constants import DATABASE_DIRECTORY, DEFAULT_RETRIEVAL_COUNT
-from services.embedding_service import get_embedding_factory
+from services.embedding_service import get_embedding_factory, canonicalize_query
 
 logger = BanglaRAGLogger.get_logger("database")
 
@@ -45,6 +62,37 @@ class VectorDatabase(ABC):
         """Perform similarity search."""
         pass
 
+    @abstractmethod
+    def similarity_search_with_scores(
+        self, query: str, k: int = DEFAULT_RETRIEVAL_COUNT
+    ) -> List[Tuple[Document, float]]:
+        """Perform similarity search returning (document, relevance) pairs.
+
+        Relevance scores are normalized so that higher means more similar.
+        """
+        pass
+
+    @abstractmethod
+    def embed_query(self, query: str) -> List[float]:
+        """Embed a query with the database's own embedding function."""
+        pass
+
+    @abstractmethod
+    def similarity_search_by_vector_with_scores(
+        self, embedding: List[float], k: int = DEFAULT_RETRIEVAL_COUNT
+    ) -> List[Tuple[Document, float]]:
+        """Search with a precomputed query embedding, returning relevance scores."""
+        pass
+
+    @abstractmethod
+    def get_documents(
+        self,
+        ids: Optional[List[str]] = None,
+        where: Optional[Dict[str, Any]] = None,
+    ) -> List[Document]:
+        """Fetch documents by ID and/or metadata filter, without a vector search."""
+        pass
+
     @abstractmethod
     def get_document_count(self) -> int:
         """Get total number of documents."""
@@ -68,11 +116,13 @@ class ChromaVectorDatabase(VectorDatabase):
         self,
         persist_directory: str = DATABASE_DIRECTORY,
         collection_name: str = "banglarag",
+        embedding_function=None,
     ):
         self.persist_directory = Path(persist_directory)
         self.collection_name = collection_name
         self._db: Optional[Chroma] = None
         self._client: Optional[chromadb.PersistentClient] = None
+        self._embedding_function = embedding_function
         self._initialize_database()
 
     def _initialize_database(self) -> None:
@@ -81,11 +131,13 @@ class ChromaVectorDatabase(VectorDatabase):
             # Ensure directory exists
             ensure_directory(self.persist_directory)
 
-            # Get embedding function
-            embedding_factory = get_embedding_factory()
-            embedding_function = (
-                embedding_factory.get_embedding_function_with_fallback()
-            )
+            # Get embedding function (English Ollama model unless given one)
+            if self._embedding_function is None:
+                embedding_factory = get_embedding_factory()
+                self._embedding_function = (
+                    embedding_factory.get_embedding_function_with_fallback()
+                )
+            embedding_function = self._embedding_function
 
             # Create ChromaDB client
             self._client = chromadb.PersistentClient(path=str(self.persist_directory))
@@ -142,14 +194,85 @@ class ChromaVectorDatabase(VectorDatabase):
             raise DatabaseException("Database not initialized")
 
         try:
-            results = self._db.similarity_search(query, k=k)
-            logger.debug(f"Found {len(results)} similar documents for query")
+            results = self._db.similarity_search_by_vector(self.embed_query(query), k=k)
+            logger.debug("Found %d similar documents for query", len(results))
             return results
 
         except Exception as e:
             logger.error(f"Similarity search failed: {e}")
             raise DatabaseException(f"Similarity search failed: {e}")
 
+    @retry_with_backoff(max_retries=2)
+    @measure_performance
+    def similarity_search_with_scores(
+        self, query: str, k: int = DEFAULT_RETRIEVAL_COUNT
+    ) -> List[Tuple[Document, float]]:
+        """Perform similarity search in ChromaDB with relevance scores."""
+        if not self._db:
+            raise DatabaseException("Database not initialized")
+
+        # Embed through the shared cache instead of letting Chroma call Ollama
+        results = self.similarity_search_by_vector_with_scores(
+            self.embed_query(query), k
+        )
+        logger.debug("Found %d scored documents for query", len(results))
+        return results
+
+    def embed_query(self, query: str) -> List[float]:
+        """Embed a canonicalized query through the shared embedding cache."""
+        if not self._embedding_function:
+            raise DatabaseException("Database not initialized")
+        return get_embedding_factory().embed_query(query, self._embedding_function)
+
+    @retry_with_backoff(max_retries=2)
+    @measure_performance
+    def similarity_search_by_vector_with_scores(
+        self, embedding: List[float], k: int = DEFAULT_RETRIEVAL_COUNT
+    ) -> List[Tuple[Document, float]]:
+        """Search ChromaDB with a precomputed embedding."""
+        if not self._db:
+            raise DatabaseException("Database not initialized")
+
+        try:
+            results = self._db.similarity_search_by_vector_with_relevance_scores(
+                list(embedding), k=k
+            )
+            # Chroma returns distances here, convert to relevance (higher is better)
+            relevance_fn = self._db._select_relevance_score_fn()
+            return [(doc, relevance_fn(distance)) for doc, distance in results]
+
+        except Exception as e:
+            logger.error(f"Vector similarity search failed: {e}")
+            raise DatabaseException(f"Vector similarity search failed: {e}")
+
+    def get_documents(
+        self,
+        ids: Optional[List[str]] = None,
+        where: Optional[Dict[str, Any]] = None,
+    ) -> List[Document]:
+        """Fetch documents from ChromaDB by ID and/or metadata filter."""
+        if not self._db:
+            raise DatabaseException("Database not initialized")
+
+        try:
+            data = self._db.get(ids=ids, where=where)
+            documents = {
+                doc_id: Document(page_content=content or "", metadata=metadata or {})
+                for doc_id, content, metadata in zip(
+                    data.get("ids", []),
+                    data.get("documents", []),
+                    data.get("metadatas", []),
+                )
+            }
+            # Chroma does not guarantee order, keep the caller's
+            if ids is not None:
+                return [documents[doc_id] for doc_id in ids if doc_id in documents]
+            return list(documents.values())
+
+        except Exception as e:
+            logger.error(f"Failed to get documents: {e}")
+            raise DatabaseException(f"Failed to get documents: {e}")
+
     def get_document_count(self) -> int:
         """Get total number of documents in database."""
         if not self._db:
@@ -187,6 +310,725 @@ class ChromaVectorDatabase(VectorDatabase):
             return []
 
 
+class MemmapVectorDatabase(VectorDatabase):
+    """
+    Exact vector search over a memory-mapped float32 embedding matrix.
+
+    Rows are L2-normalized on insert, so one matrix-vector product scores every
+    chunk by cosine similarity and ``argpartition`` selects the top-k. Adds
+    append rows to the matrix file; deletes mark rows dead until enough have
+    accumulated to compact the file.
+    """
+
+    VECTORS_FILE = "vectors.f32"
+    STORE_FILE = "store.json"
+    COMPACT_RATIO = 0.25  # Rewrite the matrix once this share of rows is dead
+
+    def __init__(
+        self,
+        persist_directory: str = DATABASE_DIRECTORY,
+        collection_name: str = "banglarag",
+        embedding_function=None,
+    ):
+        self.persist_directory = Path(persist_directory)
+        self.collection_name = collection_name
+        self.directory = self.persist_directory / f"{collection_name}.memmap"
+        self._embedding_function = embedding_function
+        self._lock = threading.RLock()
+
+        self.dimension: Optional[int] = None
+        self._ids: List[str] = []
+        self._texts: List[str] = []
+        self._metadatas: List[Dict[str, Any]] = []
+        self._rows: Dict[str, int] = {}
+        self._alive = np.zeros(0, dtype=bool)
+        self._matrix: Optional[np.ndarray] = None
+        self._load()
+
+    @property
+    def embedding_function(self):
+        """Embedding function, created on first use."""
+        if self._embedding_function is None:
+            self._embedding_function = (
+                get_embedding_factory().get_embedding_function_with_fallback()
+            )
+        return self._embedding_function
+
+    def _load(self) -> None:
+        """Load ids, metadata and the memory-mapped matrix from disk."""
+        store_path = self.directory / self.STORE_FILE
+        if not store_path.exists():
+            logger.info(f"Memmap store '{self.collection_name}' is empty")
+            return
+
+        try:
+            store = safe_json_load(store_path) or {}
+            self.dimension = store.get("dimension")
+            self._ids = store.get("ids", [])
+            self._texts = store.get("texts", [])
+            self._metadatas = store.get("metadatas", [])
+            self._alive = np.ones(len(self._ids), dtype=bool)
+            self._alive[store.get("deleted", [])] = False
+            self._rows = {
+                doc_id: row for row, doc_id in enumerate(self._ids) if self._alive[row]
+            }
+            self._remap()
+            logger.info(
+                f"Memmap store '{self.collection_name}' loaded: "
+                f"{len(self._rows)} vectors x {self.dimension}"
+            )
+        except Exception as e:
+            logger.error(f"Failed to load memmap store: {e}")
+            raise DatabaseException(f"Memmap store load failed: {e}")
+
+    def _remap(self) -> None:
+        """Re-open the matrix file at its current size."""
+        if not self._ids or not self.dimension:
+            self._matrix = None
+            return
+        self._matrix = np.memmap(
+            self.directory / self.VECTORS_FILE,
+            dtype=np.float32,
+            mode="r",
+            shape=(len(self._ids), self.dimension),
+        )
+
+    def _save_store(self) -> None:
+        """Persist ids, texts, metadata and dead rows."""
+        saved = safe_json_save(
+            {
+                "dimension": self.dimension,
+                "ids": self._ids,
+                "texts": self._texts,
+                "metadatas": self._metadatas,
+                "deleted": np.flatnonzero(~self._alive).tolist(),
+            },
+            self.directory / self.STORE_FILE,
+        )
+        if not saved:
+            raise DatabaseException("Failed to save memmap store")
+
+    @staticmethod
+    def _normalize(vectors: np.ndarray) -> np.ndarray:
+        """L2-normalize rows so dot products are cosine similarities."""
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors / np.maximum(norms, 1e-12)
+
+    def add_documents(
+        self, documents: List[Document], ids: Optional[List[str]] = None
+    ) -> None:
+        """Embed and add documents."""
+        if not documents:
+            logger.warning("No documents to add")
+            return
+
+        embeddings = self.embedding_function.embed_documents(
+            [doc.page_content for doc in documents]
+        )
+        self.add_embeddings(documents, embeddings, ids)
+
+    def add_embeddings(
+        self,
+        documents: List[Document],
+        embeddings: List[List[float]],
+        ids: Optional[List[str]] = None,
+    ) -> None:
+        """Add documents with precomputed embeddings (re-adding an ID replaces it)."""
+        if ids is None:
+            ids = [
+                doc.metadata.get("id", f"doc_{len(self._ids) + i}")
+                for i, doc in enumerate(documents)
+            ]
+
+        vectors = self._normalize(np.asarray(embeddings, dtype=np.float32))
+        if vectors.ndim != 2 or len(vectors) != len(documents):
+            raise DatabaseException("Expected one embedding per document")
+
+        with self._lock:
+            if self.dimension is None:
+                self.dimension = vectors.shape[1]
+            elif vectors.shape[1] != self.dimension:
+                raise DatabaseException(
+                    f"Embedding dimension {vectors.shape[1]} does not match "
+                    f"store dimension {self.dimension}"
+                )
+
+            # Replaced documents become dead rows
+            for doc_id in ids:
+                if doc_id in self._rows:
+                    self._alive[self._rows.pop(doc_id)] = False
+
+            ensure_directory(self.directory)
+            with open(self.directory / self.VECTORS_FILE, "ab") as f:
+                f.write(np.ascontiguousarray(vectors).tobytes())
+
+            start = len(self._ids)
+            for offset, (doc, doc_id) in enumerate(zip(documents, ids)):
+                self._ids.append(doc_id)
+                self._texts.append(doc.page_content)
+                self._metadatas.append(dict(doc.metadata))
+                self._rows[doc_id] = start + offset
+            self._alive = np.concatenate([self._alive, np.ones(len(ids), dtype=bool)])
+
+            self._save_store()
+            self._remap()
+
+        logger.info(f"Added {len(documents)} vectors to memmap store")
+
+    def delete_documents(self, ids: List[str]) -> None:
+        """Delete documents by IDs, compacting once enough rows are dead."""
+        with self._lock:
+            for doc_id in ids:
+                if doc_id in self._rows:
+                    self._alive[self._rows.pop(doc_id)] = False
+
+            dead = len(self._ids) - len(self._rows)
+            if dead and dead >= len(self._ids) * self.COMPACT_RATIO:
+                self._compact()
+            else:
+                self._save_store()
+
+        logger.info(f"Deleted {len(ids)} documents")
+
+    def _compact(self) -> None:
+        """Rewrite the matrix without dead rows."""
+        keep = np.flatnonzero(self._alive)
+        vectors = (
+            np.array(self._matrix[keep])
+            if self._matrix is not None
+            else np.zeros((0, self.dimension or 0), dtype=np.float32)
+        )
+
+        # Write aside and swap so readers never see a half-written file
+        tmp_path = self.directory / (self.VECTORS_FILE + ".tmp")
+        with open(tmp_path, "wb") as f:
+            f.write(np.ascontiguousarray(vectors).tobytes())
+
+        self._ids = [self._ids[row] for row in keep]
+        self._texts = [self._texts[row] for row in keep]
+        self._metadatas = [self._metadatas[row] for row in keep]
+        self._alive = np.ones(len(keep), dtype=bool)
+        self._rows = {doc_id: row for row, doc_id in enumerate(self._ids)}
+
+        tmp_path.replace(self.directory / self.VECTORS_FILE)
+        self._save_store()
+        self._remap()
+        logger.info(f"Compacted memmap store to {len(keep)} vectors")
+
+    def _top_k(self, queries: np.ndarray, k: int) -> List[List[Tuple[int, float]]]:
+        """Score normalized query rows against the matrix and pick top-k rows."""
+        with self._lock:
+            matrix, alive = self._matrix, self._alive
+
+        # A negative k would make argpartition count from the end
+        if matrix is None or not alive.any() or k <= 0:
+            return [[] for _ in queries]
+
+        # (n, d) @ (d, m): one BLAS call for the whole batch
+        scores = matrix @ queries.T
+        scores[~alive] = -np.inf
+
+        k = min(k, int(alive.sum()))
+        results = []
+        for column in scores.T:
+            top = np.argpartition(-column, k - 1)[:k]
+            top = top[np.argsort(-column[top])]
+            results.append([(int(row), float(column[row])) for row in top])
+        return results
+
+    def _document(self, row: int) -> Document:
+        """Build a Document for a matrix row."""
+        return Document(
+            page_content=self._texts[row],
+            metadata=dict(self._metadatas[row], id=self._ids[row]),
+        )
+
+    def similarity_search(
+        self, query: str, k: int = DEFAULT_RETRIEVAL_COUNT
+    ) -> List[Document]:
+        """Perform exact similarity search."""
+        return [doc for doc, _ in self.similarity_search_with_scores(query, k)]
+
+    def similarity_search_with_scores(
+        self, query: str, k: int = DEFAULT_RETRIEVAL_COUNT
+    ) -> List[Tuple[Document, float]]:
+        """Perform exact similarity search with cosine relevance scores."""
+        return self.similarity_search_by_vector_with_scores(self.embed_query(query), k)
+
+    def embed_query(self, query: str) -> List[float]:
+        """Embed a canonicalized query through the shared embedding cache."""
+        return get_embedding_factory().embed_query(query, self.embedding_function)
+
+    def similarity_search_by_vector_with_scores(
+        self, embedding: List[float], k: int = DEFAULT_RETRIEVAL_COUNT
+    ) -> List[Tuple[Document, float]]:
+        """Search with a precomputed query embedding."""
+        return self.similarity_search_by_vectors_with_scores([embedding], k)[0]
+
+    def similarity_search_by_vectors_with_scores(
+        self, embeddings: List[List[float]], k: int = DEFAULT_RETRIEVAL_COUNT
+    ) -> List[List[Tuple[Document, float]]]:
+        """Search a batch of query embeddings with one matrix product."""
+        queries = np.asarray(embeddings, dtype=np.float32)
+        if self.dimension is not None and queries.shape[1] != self.dimension:
+            raise DatabaseException(
+                f"Query dimension {queries.shape[1]} does not match "
+                f"store dimension {self.dimension}"
+            )
+
+        results = self._top_k(self._normalize(queries), k)
+        return [
+            [(self._document(row), score) for row, score in hits] for hits in results
+        ]
+
+    def get_documents(
+        self,
+        ids: Optional[List[str]] = None,
+        where: Optional[Dict[str, Any]] = None,
+    ) -> List[Document]:
+        """Fetch documents by ID and/or equality metadata filter."""
+        with self._lock:
+            if ids is not None:
+                rows = [self._rows[doc_id] for doc_id in ids if doc_id in self._rows]
+            else:
+                rows = sorted(self._rows.values())
+
+            return [
+                self._document(row)
+                for row in rows
+                if not where or _matches_filter(self._metadatas[row], where)
+            ]
+
+    def get_document_count(self) -> int:
+        """Get number of live documents."""
+        return len(self._rows)
+
+    def get_existing_ids(self) -> List[str]:
+        """Get list of live document IDs."""
+        with self._lock:
+            return list(self._rows)
+
+
+class Int8Quantizer:
+    """Scalar int8 quantization with a per-dimension scale and offset."""
+
+    BLOCK_ROWS = 256  # Rows dequantized at a time; small blocks stay in cache
+
+    def fit(self, vectors: np.ndarray) -> "Int8Quantizer":
+        """Learn each dimension's range."""
+        low, high = vectors.min(axis=0), vectors.max(axis=0)
+        self.scale = np.maximum(high - low, 1e-12).astype(np.float32) / 255.0
+        self.low = low.astype(np.float32)
+        return self
+
+    def encode(self, vectors: np.ndarray) -> np.ndarray:
+        """Quantize rows to int8 codes."""
+        codes = np.rint((vectors - self.low) / self.scale) - 128
+        return np.clip(codes, -128, 127).astype(np.int8)
+
+    def score(self, codes: np.ndarray, queries: np.ndarray) -> np.ndarray:
+        """Approximate dot products of the encoded rows with each query."""
+        # x ~= (code + 128) * scale + low, so x.y = code.(scale*y) + (128*scale + low).y
+        weighted = (queries * self.scale).T.astype(np.float32)
+        bias = queries @ (128 * self.scale + self.low)
+        scores = np.empty((len(codes), len(queries)), dtype=np.float32)
+        for start in range(0, len(codes), self.BLOCK_ROWS):
+            block = codes[start : start + self.BLOCK_ROWS].astype(np.float32)
+            scores[start : start + len(block)] = block @ weighted
+        return scores + bias
+
+
+class PCAProjector:
+    """Project embeddings onto their top principal components."""
+
+    FIT_SAMPLE = 10000  # Rows used to fit the components
+
+    def __init__(self, dimensions: int):
+        self.dimensions = dimensions
+
+    def fit(self, vectors: np.ndarray) -> "PCAProjector":
+        """Fit the mean and principal components on a sample of rows."""
+        if len(vectors) > self.FIT_SAMPLE:
+            picks = np.random.default_rng(0).choice(
+                len(vectors), self.FIT_SAMPLE, replace=False
+            )
+            vectors = vectors[np.sort(picks)]
+        self.mean = vectors.mean(axis=0).astype(np.float32)
+        _, _, components = np.linalg.svd(vectors - self.mean, full_matrices=False)
+        self.components = components[: self.dimensions].astype(np.float32)
+        return self
+
+    def encode(self, vectors: np.ndarray) -> np.ndarray:
+        """Project rows to the reduced space."""
+        return ((vectors - self.mean) @ self.components.T).astype(np.float32)
+
+    def score(self, codes: np.ndarray, queries: np.ndarray) -> np.ndarray:
+        """Approximate dot products of the projected rows with each query."""
+        return codes @ (self.components @ queries.T) + queries @ self.mean
+
+
+class TruncationProjector:
+    """Keep the leading dimensions of Matryoshka-trained embeddings."""
+
+    def __init__(self, dimensions: int):
+        self.dimensions = dimensions
+
+    def fit(self, vectors: np.ndarray) -> "TruncationProjector":
+        """Nothing to learn."""
+        return self
+
+    def encode(self, vectors: np.ndarray) -> np.ndarray:
+        """Truncate and re-normalize rows."""
+        return MemmapVectorDatabase._normalize(
+            np.ascontiguousarray(vectors[:, : self.dimensions])
+        )
+
+    def score(self, codes: np.ndarray, queries: np.ndarray) -> np.ndarray:
+        """Cosine similarity in the truncated space."""
+        return codes @ self.encode(queries).T
+
+
+def create_compressor(method: str, dimensions: int = COMPRESSED_DIMENSIONS):
+    """Create the first-stage compressor for a compression method."""
+    if method == "int8":
+        return Int8Quantizer()
+    if method == "pca":
+        return PCAProjector(dimensions)
+    if method == "truncate":
+        return TruncationProjector(dimensions)
+    raise DatabaseException(f"Unknown vector compression: {method}")
+
+
+class CompressedVectorDatabase(MemmapVectorDatabase):
+    """
+    Memmap store searched through a compressed in-RAM index.
+
+    The first stage scores int8 codes (``int8``), PCA projections (``pca``) or
+    truncated Matryoshka prefixes (``truncate``) for every chunk, keeps
+    ``RESCORE_FACTOR * k`` candidates and rescores only those rows at full
+    precision from the memory-mapped matrix. New rows are encoded with the
+    fitted compressor; it is refitted when the store compacts.
+    """
+
+    def __init__(
+        self,
+        persist_directory: str = DATABASE_DIRECTORY,
+        collection_name: str = "banglarag",
+        embedding_function=None,
+        compression: str = "int8",
+        dimensions: int = COMPRESSED_DIMENSIONS,
+        rescore_factor: int = RESCORE_FACTOR,
+    ):
+        self.compression = compression
+        self.dimensions = dimensions
+        self.rescore_factor = rescore_factor
+        self._compressor = None
+        self._codes: Optional[np.ndarray] = None
+        super().__init__(persist_directory, collection_name, embedding_function)
+
+    def _remap(self) -> None:
+        """Re-open the matrix and encode rows the index has not seen yet."""
+        super()._remap()
+        if self._matrix is None:
+            self._codes = None
+            return
+
+        if self._compressor is None or self._codes is None:
+            self._compressor = create_compressor(self.compression, self.dimensions)
+            self._compressor.fit(np.asarray(self._matrix))
+            self._codes = self._compressor.encode(self._matrix)
+        elif len(self._codes) < len(self._matrix):
+            new_codes = self._compressor.encode(self._matrix[len(self._codes) :])
+            self._codes = np.concatenate([self._codes, new_codes])
+
+    def _compact(self) -> None:
+        """Compact the store and refit the compressor on the remaining rows."""
+        self._compressor = None
+        super()._compact()
+
+    def _top_k(self, queries: np.ndarray, k: int) -> List[List[Tuple[int, float]]]:
+        """Shortlist with the compressed index, then rescore at full precision."""
+        with self._lock:
+            matrix, alive = self._matrix, self._alive
+            codes, compressor = self._codes, self._compressor
+
+        if matrix is None or not alive.any() or k <= 0:
+            return [[] for _ in queries]
+
+        approx = compressor.score(codes, queries)
+        approx[~alive] = -np.inf
+
+        live = int(alive.sum())
+        k = min(k, live)
+        shortlist = min(max(k * self.rescore_factor, k), live)
+
+        results = []
+        for query, column in zip(queries, approx.T):
+            candidates = np.sort(np.argpartition(-column, shortlist - 1)[:shortlist])
+            exact = matrix[candidates] @ query
+            top = np.argsort(-exact)[:k]
+            results.append([(int(candidates[i]), float(exact[i])) for i in top])
+        return results
+
+    def get_index_stats(self) -> Dict[str, Any]:
+        """Memory used by the compressed index versus the full-precision matrix."""
+        with self._lock:
+            codes, matrix = self._codes, self._matrix
+        full_bytes = matrix.nbytes if matrix is not None else 0
+        index_bytes = codes.nbytes if codes is not None else 0
+        return {
+            "compression": self.compression,
+            "vectors": len(self._rows),
+            "full_precision_bytes": full_bytes,
+            "index_bytes": index_bytes,
+            "ratio": round(full_bytes / index_bytes, 2) if index_bytes else None,
+        }
+
+
+class PartitionedVectorDatabase(VectorDatabase):
+    """
+    One sub-index per language, each embedded with that language's model.
+
+    Documents are split by script at ingest and never share a collection with
+    another embedding space. Queries go to the partition their script points
+    to; mixed-script queries search every routed partition in parallel. Empty
+    partitions are skipped, so an English-only index keeps answering Bangla
+    queries until it is re-ingested.
+
+    Raw cosine scores from different embedding models sit on different
+    scales, so every returned score is rescaled against its partition's
+    ``score_floors`` entry (the score of unrelated text) to
+    ``(score - floor) / (1 - floor)``, clipped at 0. Results from several
+    partitions are merged on that comparable score, which is also what
+    callers see as the relevance score.
+    """
+
+    def __init__(
+        self,
+        partitions: Dict[str, VectorDatabase],
+        default_language: str,
+        score_floors: Optional[Dict[str, float]] = None,
+    ):
+        if default_language not in partitions:
+            raise DatabaseException(f"No partition for language '{default_language}'")
+        self.partitions = partitions
+        self.default_language = default_language
+        self.score_floors = (
+            PARTITION_SCORE_FLOORS if score_floors is None else score_floors
+        )
+        self._executor = ThreadPoolExecutor(
+            max_workers=len(partitions), thread_name_prefix="partition"
+        )
+
+    @staticmethod
+    def partition_name(collection_name: str, language: str) -> str:
+        """Collection name of a language partition (default language keeps the base name)."""
+        if language == INDEX_LANGUAGES[0]:
+            return collection_name
+        return f"{collection_name}_{language}"
+
+    def _document_language(self, doc: Document) -> str:
+        """Partition a document belongs to, by its dominant script."""
+        language = doc.metadata.get("language")
+        if language in self.partitions:
+            return language
+        share = get_embedding_factory().script_share(doc.page_content)
+        if share >= 0.5 and BANGLA_CODE in self.partitions:
+            return BANGLA_CODE
+        return self.default_language
+
+    def populated_languages(self) -> List[str]:
+        """Languages whose partition holds at least one document."""
+        return [
+            language
+            for language, partition in self.partitions.items()
+            if partition.get_document_count() > 0
+        ]
+
+    def route(self, query: str) -> List[str]:
+        """Non-empty partitions a query should search, most likely first."""
+        populated = self.populated_languages()
+        routed = [
+            language
+            for language in get_embedding_factory().route_languages(query)
+            if language in populated
+        ]
+        # Nothing indexed for the detected language yet: search what we have
+        return routed or populated or [self.default_language]
+
+    def add_documents(
+        self, documents: List[Document], ids: Optional[List[str]] = None
+    ) -> None:
+        """Split documents by language and add each group to its partition."""
+        if ids is None:
+            ids = [
+                doc.metadata.get("id", f"doc_{i}") for i, doc in enumerate(documents)
+            ]
+
+        groups: Dict[str, Tuple[List[Document], List[str]]] = {}
+        for doc, doc_id in zip(documents, ids):
+            language = self._document_language(doc)
+            doc.metadata["language"] = language
+            group = groups.setdefault(language, ([], []))
+            group[0].append(doc)
+            group[1].append(doc_id)
+
+        for language, (group_docs, group_ids) in groups.items():
+            self.partitions[language].add_documents(group_docs, group_ids)
+            logger.info(f"Added {len(group_docs)} documents to '{language}' partition")
+
+    def similarity_search(
+        self, query: str, k: int = DEFAULT_RETRIEVAL_COUNT
+    ) -> List[Document]:
+        """Perform similarity search in the routed partitions."""
+        return [doc for doc, _ in self.similarity_search_with_scores(query, k)]
+
+    def similarity_search_with_scores(
+        self, query: str, k: int = DEFAULT_RETRIEVAL_COUNT
+    ) -> List[Tuple[Document, float]]:
+        """Search the routed partitions, merging them on comparable scores."""
+        languages = self.route(query)
+        return self._search_partitions(
+            {
+                language: (
+                    self.partitions[language].similarity_search_with_scores,
+                    query,
+                )
+                for language in languages
+            },
+            k,
+        )
+
+    def similarity_search_by_language_vectors(
+        self, vectors: Dict[str, List[float]], k: int = DEFAULT_RETRIEVAL_COUNT
+    ) -> List[Tuple[Document, float]]:
+        """
+        Search with query vectors that were already embedded per language.
+
+        Lets callers embed a query once per language and reuse the vectors
+        across several partitioned collections. Languages without a vector
+        or without documents are skipped.
+        """
+        populated = self.populated_languages()
+        searches = {
+            language: (
+                self.partitions[language].similarity_search_by_vector_with_scores,
+                vector,
+            )
+            for language, vector in vectors.items()
+            if language in populated
+        }
+        if not searches:
+            return []
+        return self._search_partitions(searches, k)
+
+    def comparable_score(self, language: str, score: float) -> float:
+        """Rescale a partition's raw score to the shared scale (see class doc)."""
+        floor = self.score_floors.get(language, 0.0)
+        return max((score - floor) / (1.0 - floor), 0.0)
+
+    def _search_partitions(self, searches: Dict[str, Tuple], k: int):
+        """Run per-partition searches in parallel and merge on comparable scores."""
+        if len(searches) == 1:
+            language, (search, query) = next(iter(searches.items()))
+            return [
+                (doc, self.comparable_score(language, score))
+                for doc, score in search(query, k)
+            ]
+
+        futures = {
+            language: self._executor.submit(search, query, k)
+            for language, (search, query) in searches.items()
+        }
+        merged: List[Tuple[Document, float]] = []
+        for language, future in futures.items():
+            try:
+                results = future.result()
+            except Exception as e:
+                logger.warning(f"Partition '{language}' search failed: {e}")
+                continue
+            merged.extend(
+                (doc, self.comparable_score(language, score)) for doc, score in results
+            )
+
+        merged.sort(key=lambda item: item[1], reverse=True)
+        return merged[:k]
+
+    def embed_query_for(self, query: str, language: str) -> List[float]:
+        """Embed a query with one partition's model."""
+        return self.partitions[language].embed_query(query)
+
+    def embed_query(self, query: str) -> List[float]:
+        """Embed a query in its most likely partition's space."""
+        return self.partitions[self.route(query)[0]].embed_query(query)
+
+    def similarity_search_by_vector_with_scores(
+        self, embedding: List[float], k: int = DEFAULT_RETRIEVAL_COUNT
+    ) -> List[Tuple[Document, float]]:
+        """Search the default partition (a bare vector carries no language)."""
+        results = self.partitions[
+            self.default_language
+        ].similarity_search_by_vector_with_scores(embedding, k)
+        return [
+            (doc, self.comparable_score(self.default_language, score))
+            for doc, score in results
+        ]
+
+    def get_documents(
+        self,
+        ids: Optional[List[str]] = None,
+        where: Optional[Dict[str, Any]] = None,
+    ) -> List[Document]:
+        """Fetch documents from every partition."""
+        documents = {}
+        for partition in self.partitions.values():
+            for doc in partition.get_documents(ids=ids, where=where):
+                documents[doc.metadata.get("id")] = doc
+        if ids is not None:
+            return [documents[doc_id] for doc_id in ids if doc_id in documents]
+        return list(documents.values())
+
+    def get_document_count(self) -> int:
+        """Get total number of documents across partitions."""
+        return sum(p.get_document_count() for p in self.partitions.values())
+
+    def delete_documents(self, ids: List[str]) -> None:
+        """Delete documents from whichever partition holds them."""
+        for partition in self.partitions.values():
+            existing = set(partition.get_existing_ids())
+            owned = [doc_id for doc_id in ids if doc_id in existing]
+            if owned:
+                partition.delete_documents(owned)
+
+    def get_existing_ids(self) -> List[str]:
+        """Get document IDs across partitions."""
+        return [
+            doc_id
+            for partition in self.partitions.values()
+            for doc_id in partition.get_existing_ids()
+        ]
+
+
+def _matches_filter(metadata: Dict[str, Any], where: Dict[str, Any]) -> bool:
+    """Evaluate a Chroma-style ``where`` filter ($and, $or, $eq, $in)."""
+    for key, condition in where.items():
+        if key == "$and":
+            if not all(_matches_filter(metadata, clause) for clause in condition):
+                return False
+        elif key == "$or":
+            if not any(_matches_filter(metadata, clause) for clause in condition):
+                return False
+        elif isinstance(condition, dict):
+            value = metadata.get(key)
+            if "$eq" in condition and value != condition["$eq"]:
+                return False
+            if "$in" in condition and value not in condition["$in"]:
+                return False
+        elif metadata.get(key) != condition:
+            return False
+    return True
+
+
 class DatabaseManager:
     """Manages database operations with caching and optimization."""
 
@@ -269,8 +1111,8 @@ class DatabaseManager:
         self, query: str, k: int = DEFAULT_RETRIEVAL_COUNT
     ) -> List[Document]:
         """Perform similarity search with caching."""
-        # Create cache key
-        cache_key = f"search:{hash(query)}:{k}"
+        # Equivalent phrasings ("What is BFS?", "what is bfs") share one entry
+        cache_key = f"search:{get_text_hash(canonicalize_query(query))}:{k}"
 
         # Check cache
         cached_result = self._query_cache.get(cache_key)
@@ -297,15 +1139,70 @@ class DatabaseManager:
             logger.error(f"Search with cache failed: {e}")
             raise DatabaseException(f"Search failed: {e}")
 
+    @measure_performance
+    def search_with_scores(
+        self, query: str, k: int = DEFAULT_RETRIEVAL_COUNT
+    ) -> List[Tuple[Document, float]]:
+        """Perform similarity search with relevance scores and caching."""
+        cache_key = f"scored:{get_text_hash(canonicalize_query(query))}:{k}"
+
+        cached_result = self._query_cache.get(cache_key)
+        if cached_result is not None:
+            self._stats["cache_hits"] += 1
+            logger.debug("Using cached scored search result")
+            return cached_result
+
+        try:
+            results = self.database.similarity_search_with_scores(query, k)
+
+            self._query_cache.set(cache_key, results)
+
+            self._stats["queries"] += 1
+            self._stats["cache_misses"] += 1
+            self._stats["last_query_time"] = time.time()
+
+            return results
+
+        except Exception as e:
+            logger.error(f"Scored search with cache failed: {e}")
+            raise DatabaseException(f"Search failed: {e}")
+
+    def search_by_vector_with_scores(
+        self, embedding: List[float], k: int = DEFAULT_RETRIEVAL_COUNT
+    ) -> List[Tuple[Document, float]]:
+        """Search with a precomputed query embedding."""
+        try:
+            results = self.database.similarity_search_by_vector_with_scores(
+                embedding, k
+            )
+
+            self._stats["queries"] += 1
+            self._stats["last_query_time"] = time.time()
+
+            return results
+
+        except Exception as e:
+            logger.error(f"Vector search failed: {e}")
+            raise DatabaseException(f"Search failed: {e}")
+
+    def get_documents(
+        self,
+        ids: Optional[List[str]] = None,
+        where: Optional[Dict[str, Any]] = None,
+    ) -> List[Document]:
+        """Fetch documents by ID and/or metadata filter."""
+        try:
+            return self.database.get_documents(ids=ids, where=where)
+        except Exception as e:
+            logger.error(f"Document lookup failed: {e}")
+            raise DatabaseException(f"Document lookup failed: {e}")
+
     def get_database_info(self) -> Dict[str, Any]:
         """Get database information and statistics."""
         try:
             doc_count = self.database.get_document_count()
-            cache_hit_rate = (
-                self._stats["cache_hits"] / max(self._stats["queries"], 1) * 100
-                if self._stats["queries"] > 0
-                else 0
-            )
+            lookups = self._stats["cache_hits"] + self._stats["cache_misses"]
+            cache_hit_rate = self._stats["cache_hits"] / lookups * 100 if lookups else 0
 
             return {
                 "document_count": doc_count,
@@ -316,6 +1213,7 @@ class DatabaseManager:
                 "documents_added": self._stats["documents_added"],
                 "last_query_time": self._stats["last_query_time"],
                 "cache_size": self._query_cache.size(),
+                "embedding_cache": get_embedding_factory().get_cache_stats(),
             }
 
         except Exception as e:
@@ -347,16 +1245,115 @@ class DatabaseFactory:
 
     @staticmethod
     def create_chroma_database(
-        persist_directory: str = DATABASE_DIRECTORY, collection_name: str = "banglarag"
+        persist_directory: str = DATABASE_DIRECTORY,
+        collection_name: str = "banglarag",
+        embedding_function=None,
     ) -> DatabaseManager:
         """Create ChromaDB database manager."""
         try:
-            chroma_db = ChromaVectorDatabase(persist_directory, collection_name)
+            chroma_db = ChromaVectorDatabase(
+                persist_directory, collection_name, embedding_function
+            )
             return DatabaseManager(chroma_db)
         except Exception as e:
             logger.error(f"Failed to create ChromaDB: {e}")
             raise DatabaseException(f"Database creation failed: {e}")
 
+    @staticmethod
+    def create_memmap_database(
+        persist_directory: str = DATABASE_DIRECTORY,
+        collection_name: str = "banglarag",
+        embedding_function=None,
+        compression: Optional[str] = VECTOR_COMPRESSION,
+    ) -> DatabaseManager:
+        """Create in-memory (memmap) database manager, optionally compressed."""
+        try:
+            return DatabaseManager(
+                DatabaseFactory._create_vector_database(
+                    "memmap",
+                    persist_directory,
+                    collection_name,
+                    embedding_function,
+                    compression,
+                )
+            )
+        except Exception as e:
+            logger.error(f"Failed to create memmap database: {e}")
+            raise DatabaseException(f"Database creation failed: {e}")
+
+    @staticmethod
+    def _create_vector_database(
+        backend: str,
+        persist_directory: str,
+        collection_name: str,
+        embedding_function=None,
+        compression: Optional[str] = VECTOR_COMPRESSION,
+    ) -> VectorDatabase:
+        """Create a single vector database for a backend."""
+        if backend == "memmap":
+            if compression:
+                return CompressedVectorDatabase(
+                    persist_directory,
+                    collection_name,
+                    embedding_function,
+                    compression=compression,
+                )
+            return MemmapVectorDatabase(
+                persist_directory, collection_name, embedding_function
+            )
+        if backend == "chroma":
+            return ChromaVectorDatabase(
+                persist_directory, collection_name, embedding_function
+            )
+        raise DatabaseException(f"Unknown vector backend: {backend}")
+
+    @staticmethod
+    def create_partitioned_database(
+        backend: str = VECTOR_BACKEND,
+        persist_directory: str = DATABASE_DIRECTORY,
+        collection_name: str = "banglarag",
+        languages: Optional[List[str]] = None,
+    ) -> DatabaseManager:
+        """Create one sub-index per language, each with its own embedder."""
+        languages = languages or INDEX_LANGUAGES
+        factory = get_embedding_factory()
+        try:
+            partitions = {
+                language: DatabaseFactory._create_vector_database(
+                    backend,
+                    persist_directory,
+                    PartitionedVectorDatabase.partition_name(collection_name, language),
+                    factory.get_language_embedding_function(language),
+                )
+                for language in languages
+            }
+            return DatabaseManager(PartitionedVectorDatabase(partitions, languages[0]))
+        except Exception as e:
+            logger.error(f"Failed to create partitioned database: {e}")
+            raise DatabaseException(f"Database creation failed: {e}")
+
+    @staticmethod
+    def create_database(
+        backend: str = VECTOR_BACKEND,
+        persist_directory: str = DATABASE_DIRECTORY,
+        collection_name: str = "banglarag",
+        partitioned: bool = LANGUAGE_PARTITIONED_INDEXES,
+    ) -> DatabaseManager:
+        """Create a database manager for the configured backend."""
+        if partitioned:
+            return DatabaseFactory.create_partitioned_database(
+                backend, persist_directory, collection_name
+            )
+        if backend == "memmap":
+            return DatabaseFactory.create_memmap_database(
+                persist_directory, collection_name
+            )
+        if backend == "chroma":
+            return DatabaseFactory.create_chroma_database(
+                persist_directory, collection_name
+            )
+        raise DatabaseException(f"Unknown vector backend: {backend}")
+
 
 # Global database manager instance
 _database_manager: Optional[DatabaseManager] = None
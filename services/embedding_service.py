@@ -8,6 +8,8 @@ from abc import ABC, abstractmethod
 from typing import Optional, List, Dict, Any
 import numpy as np
 import re
+import threading
+import unicodedata
 import warnings
 from functools import lru_cache
 
@@ -18,19 +20,73 @@ import torch
 
 from core.logging_config import BanglaRAGLogger
 from core.exceptions import EmbeddingException, ModelException
-from core.utils import retry_with_backoff, measure_performance, SimpleCache
+from core.utils import (
+    retry_with_backoff,
+    measure_performance,
+    SimpleCache,
+    get_text_hash,
+)
 from core.constants import (
     ENGLISH_EMBEDDING_MODEL,
     BANGLA_EMBEDDING_MODEL,
     ENGLISH_CODE,
     BANGLA_CODE,
     MIN_TEXT_LENGTH_FOR_DETECTION,
+    LANGUAGE_ROUTING_THRESHOLD,
+    PATTERNS,
+    OLLAMA_KEEP_ALIVE_SECONDS,
 )
 
 logger = BanglaRAGLogger.get_logger("embedding")
 warnings.filterwarnings("ignore")
 
 
+# Common abbreviations, expanded so "BFS" and "Breadth First Search" match
+TECHNICAL_ABBREVIATIONS = {
+    "BST": "Binary Search Tree",
+    "DP": "Dynamic Programming",
+    "DFS": "Depth First Search",
+    "BFS": "Breadth First Search",
+    "AVL": "Adelson-Velsky and Landis Tree",
+    "MST": "Minimum Spanning Tree",
+    "LCS": "Longest Common Subsequence",
+}
+
+# Technical term normalizations (each is idempotent, so re-applying is harmless)
+TECHNICAL_NORMALIZATIONS = {
+    r"\balgos?\b": "algorithm",
+    r"\bstruct\b": "structure",
+    r"\bfuncs?\b": "function",
+    r"(?<!time )(?<!space )\bcomplexity\b": "time complexity space complexity",
+}
+
+
+def expand_technical_terms(text: str) -> str:
+    """Expand abbreviations and normalize technical terms."""
+    for abbr, full in TECHNICAL_ABBREVIATIONS.items():
+        pattern = r"\b" + re.escape(abbr) + r"\b"
+        text = re.sub(pattern, full, text, flags=re.IGNORECASE)
+
+    for pattern, replacement in TECHNICAL_NORMALIZATIONS.items():
+        text = re.sub(pattern, replacement, text, flags=re.IGNORECASE)
+
+    return text
+
+
+def canonicalize_query(text: str) -> str:
+    """
+    Canonical form of a search query, used for cache keys and embedding.
+
+    NFKC-normalizes Unicode (Bangla vowel signs, full-width forms), expands
+    technical abbreviations, then folds case, whitespace and trailing
+    punctuation, so "What is BFS?" and "what is  breadth first search" share
+    one embedding and one cached search. Idempotent.
+    """
+    text = unicodedata.normalize("NFKC", text)
+    text = expand_technical_terms(text)
+    return " ".join(text.casefold().split()).rstrip("?!.। ")
+
+
 class EmbeddingModel(ABC):
     """Abstract base class for embedding models."""
 
@@ -62,7 +118,9 @@ class OllamaEmbeddingModel(EmbeddingModel):
     def _initialize_model(self) -> None:
         """Initialize the Ollama embedding model."""
         try:
-            self._model = OllamaEmbeddings(model=self.model_name)
+            self._model = OllamaEmbeddings(
+                model=self.model_name, keep_alive=OLLAMA_KEEP_ALIVE_SECONDS
+            )
             # Test the model with a sample query to ensure it works
             test_embedding = self._model.embed_query("test")
             self._dimension = len(test_embedding)
@@ -84,7 +142,8 @@ class OllamaEmbeddingModel(EmbeddingModel):
             # Preprocess for better technical term matching
             processed_text = self._preprocess_technical_query(text)
             embedding = self._model.embed_query(processed_text)
-            return np.array(embedding)
+            # float32 halves cached embedding memory; Ollama returns 32-bit anyway
+            return np.asarray(embedding, dtype=np.float32)
         except Exception as e:
             logger.error(f"Failed to generate Ollama embedding: {e}")
             raise EmbeddingException(f"Ollama embedding failed: {e}")
@@ -101,33 +160,7 @@ class OllamaEmbeddingModel(EmbeddingModel):
 
     def _preprocess_technical_query(self, text: str) -> str:
         """Preprocess English queries for better technical term matching."""
-        # Expand common abbreviations
-        abbreviations = {
-            "BST": "Binary Search Tree",
-            "DP": "Dynamic Programming",
-            "DFS": "Depth First Search",
-            "BFS": "Breadth First Search",
-            "AVL": "Adelson-Velsky and Landis Tree",
-            "MST": "Minimum Spanning Tree",
-            "LCS": "Longest Common Subsequence",
-        }
-
-        for abbr, full in abbreviations.items():
-            pattern = r"\b" + re.escape(abbr) + r"\b"
-            text = re.sub(pattern, full, text, flags=re.IGNORECASE)
-
-        # Normalize technical terms
-        normalizations = {
-            r"\balgos?\b": "algorithm",
-            r"\bstruct\b": "structure",
-            r"\bfuncs?\b": "function",
-            r"\bcomplexity\b": "time complexity space complexity",
-        }
-
-        for pattern, replacement in normalizations.items():
-            text = re.sub(pattern, replacement, text, flags=re.IGNORECASE)
-
-        return text
+        return expand_technical_terms(text)
 
 
 class BanglaBERTEmbeddingModel(EmbeddingModel):
@@ -232,6 +265,52 @@ class LanguageDetector:
             logger.warning(f"Language detection failed: {e}")
             return ENGLISH_CODE  # Default to English on error
 
+    def script_share(self, text: str) -> float:
+        """Share of words in Bangla script (0.0 all Latin, 1.0 all Bangla)."""
+        # Count words, not letters: Latin technical terms are long
+        bangla = len(re.findall(PATTERNS["bangla"], text))
+        english = len(re.findall(PATTERNS["english"], text))
+        return bangla / (bangla + english) if bangla + english else 0.0
+
+    def route_languages(self, text: str) -> List[str]:
+        """
+        Pick the index partitions a query should search.
+
+        Works on script share rather than langdetect, so short questions are
+        routed too. Clearly Bangla or English text gets one language; mixed
+        text gets both, Bangla first if it dominates.
+        """
+        share = self.script_share(text)
+        if share >= LANGUAGE_ROUTING_THRESHOLD:
+            return [BANGLA_CODE]
+        if share <= 1 - LANGUAGE_ROUTING_THRESHOLD:
+            return [ENGLISH_CODE]
+        return (
+            [BANGLA_CODE, ENGLISH_CODE] if share >= 0.5 else [ENGLISH_CODE, BANGLA_CODE]
+        )
+
+
+class LanguageEmbeddings:
+    """
+    LangChain-compatible embedding function backed by a language's model.
+
+    The model is only loaded on first use, so an empty partition never pays
+    for loading BanglaBERT.
+    """
+
+    def __init__(self, factory: "EmbeddingFactory", language: str):
+        self.factory = factory
+        self.language = language
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        """Embed document chunks."""
+        model = self.factory.get_model(self.language)
+        return [model.embed_text(text).tolist() for text in texts]
+
+    def embed_query(self, text: str) -> List[float]:
+        """Embed a query."""
+        return self.factory.get_model(self.language).embed_text(text).tolist()
+
 
 class EmbeddingFactory:
     """Factory for creating and managing embedding models."""
@@ -240,6 +319,8 @@ class EmbeddingFactory:
         self._models: Dict[str, EmbeddingModel] = {}
         self._language_detector = LanguageDetector()
         self._embedding_cache = SimpleCache(max_size=500, ttl_seconds=1800)
+        self._lock = threading.Lock()
+        self._query_stats = {"hits": 0, "misses": 0}
 
     def get_model(self, language: str) -> EmbeddingModel:
         """Get embedding model for specified language."""
@@ -292,7 +373,7 @@ class EmbeddingFactory:
 
         # Detect language
         language = self._language_detector.detect_language(text)
-        logger.debug(f"Detected language: {language} for text: {text[:50]}...")
+        logger.debug("Detected language: %s for text: %.50s...", language, text)
 
         # Get appropriate model and generate embedding
         model = self.get_model(language)
@@ -303,6 +384,62 @@ class EmbeddingFactory:
 
         return embedding
 
+    def embed_query(self, text: str, embedding_function) -> List[float]:
+        """
+        Embed a search query through the shared cache.
+
+        The query is canonicalized first and the cache is keyed on the
+        canonical text plus the embedding model, so every store using the
+        same model shares vectors for equivalent queries.
+
+        Args:
+            text: Raw query text
+            embedding_function: LangChain-style embedder owned by the store
+
+        Returns:
+            Query embedding
+        """
+        canonical = canonicalize_query(text)
+        model = getattr(embedding_function, "model", None) or getattr(
+            embedding_function, "language", type(embedding_function).__name__
+        )
+        cache_key = f"query:{model}:{get_text_hash(canonical)}"
+
+        cached_embedding = self._embedding_cache.get(cache_key)
+        if cached_embedding is not None:
+            with self._lock:
+                self._query_stats["hits"] += 1
+            return cached_embedding
+
+        embedding = list(embedding_function.embed_query(canonical))
+        self._embedding_cache.set(cache_key, embedding)
+        with self._lock:
+            self._query_stats["misses"] += 1
+        return embedding
+
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """Get query embedding cache statistics."""
+        with self._lock:
+            stats = dict(self._query_stats)
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = f"{stats['hits'] / lookups * 100:.1f}%" if lookups else None
+        stats["cache_size"] = self._embedding_cache.size()
+        return stats
+
+    def get_language_embedding_function(self, language: str):
+        """Embedding function for one language's index partition."""
+        if language == ENGLISH_CODE:
+            return self.get_embedding_function_with_fallback()
+        return LanguageEmbeddings(self, language)
+
+    def route_languages(self, text: str) -> List[str]:
+        """Index partitions a query should search."""
+        return self._language_detector.route_languages(text)
+
+    def script_share(self, text: str) -> float:
+        """Share of words in Bangla script."""
+        return self._language_detector.script_share(text)
+
     def get_embedding_function_with_fallback(self) -> OllamaEmbeddings:
         """
         Get Ollama embedding function with fallback models.
@@ -317,7 +454,9 @@ class EmbeddingFactory:
 
         for model_name in fallback_models:
             try:
-                embedding_function = OllamaEmbeddings(model=model_name)
+                embedding_function = OllamaEmbeddings(
+                    model=model_name, keep_alive=OLLAMA_KEEP_ALIVE_SECONDS
+                )
                 # Test the model
                 embedding_function.embed_query("test")
                 logger.info(f"Using Ollama model: {model_name}")
@@ -0,0 +1,281 @@
+#!/usr/bin/env python3
+"""
+Evaluation service for BanglaRAG system.
+Replays a question set through the RAG pipeline for one or more models with
+bounded concurrency, checkpoints every answer so interrupted runs resume, and
+builds reports in the bundled ``*_test_report_*.json`` schema.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Optional, List, Dict, Any, Callable, Union
+import json
+import threading
+import time
+
+from core.logging_config import BanglaRAGLogger
+from core.utils import ensure_directory
+from core.constants import EVAL_CONCURRENCY
+
+logger = BanglaRAGLogger.get_logger("evaluation")
+
+# answer(question, model) -> {"answer", "success", "sources_found",
+# "source_pages", "stage_timings"}
+AnswerFunction = Callable[[str, str], Dict[str, Any]]
+# grade(result) -> {"equivalent", "confidence", "explanation"}
+GradeFunction = Callable[[Dict[str, Any]], Dict[str, Any]]
+
+CONFIDENCE_BANDS = ["HIGH", "MEDIUM", "LOW"]
+
+
+def percentile(values: List[float], p: float) -> Optional[float]:
+    """Nearest-rank percentile of ``values`` (None if empty)."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(1, -(-len(ordered) * p // 100))
+    return ordered[int(rank) - 1]
+
+
+class EvaluationCheckpoint:
+    """
+    Append-only JSON-lines record of finished answers.
+
+    Each line is one report entry plus its ``model``; entries are keyed by
+    ``(model, test_id)`` so a resumed run skips what is already done.
+    """
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+
+    def load(self) -> Dict[tuple, Dict[str, Any]]:
+        """Finished entries by ``(model, test_id)``."""
+        done: Dict[tuple, Dict[str, Any]] = {}
+        if not self.path.exists():
+            return done
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    continue  # Torn last line from an interrupted run
+                done[(entry["model"], entry["test_id"])] = entry
+        return done
+
+    def append(self, entry: Dict[str, Any]) -> None:
+        """Persist one finished entry."""
+        with self._lock:
+            ensure_directory(self.path.parent)
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+
+
+class EvaluationRunner:
+    """
+    Runs a question set against several models.
+
+    Each model gets ``concurrency`` questions in flight; models run one after
+    another (or side by side with ``parallel_models``). Answers are graded
+    with ``grade`` when given, otherwise left ungraded.
+    """
+
+    def __init__(
+        self,
+        answer: AnswerFunction,
+        models: List[str],
+        concurrency: int = EVAL_CONCURRENCY,
+        checkpoint: Optional[EvaluationCheckpoint] = None,
+        grade: Optional[GradeFunction] = None,
+        parallel_models: bool = False,
+        on_result: Optional[Callable[[Dict[str, Any], int, int], None]] = None,
+    ):
+        self.answer = answer
+        self.models = models
+        self.concurrency = max(concurrency, 1)
+        self.checkpoint = checkpoint
+        self.grade = grade
+        self.parallel_models = parallel_models
+        self.on_result = on_result
+
+    def run(self, entries: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+        """
+        Evaluate every entry with every model.
+
+        Returns:
+            Report per model, in the bundled report schema
+        """
+        done = self.checkpoint.load() if self.checkpoint else {}
+        if done:
+            logger.info(f"Resuming with {len(done)} checkpointed answers")
+
+        if self.parallel_models and len(self.models) > 1:
+            with ThreadPoolExecutor(max_workers=len(self.models)) as executor:
+                futures = {
+                    model: executor.submit(self._run_model, model, entries, done)
+                    for model in self.models
+                }
+                return {model: future.result() for model, future in futures.items()}
+
+        return {model: self._run_model(model, entries, done) for model in self.models}
+
+    def _run_model(
+        self,
+        model: str,
+        entries: List[Dict[str, Any]],
+        done: Dict[tuple, Dict[str, Any]],
+    ) -> Dict[str, Any]:
+        """Evaluate all entries for one model and build its report."""
+        results: Dict[str, Dict[str, Any]] = {
+            entry["test_id"]: done[(model, entry["test_id"])]
+            for entry in entries
+            if (model, entry["test_id"]) in done
+        }
+        todo = [entry for entry in entries if entry["test_id"] not in results]
+        logger.info(
+            f"Evaluating {model}: {len(todo)} questions "
+            f"({len(results)} from checkpoint), {self.concurrency} in flight"
+        )
+
+        lock = threading.Lock()
+        start = time.perf_counter()
+
+        def evaluate(entry: Dict[str, Any]) -> None:
+            result = self._evaluate(model, entry)
+            if self.checkpoint:
+                self.checkpoint.append(result)
+            with lock:
+                results[entry["test_id"]] = result
+                finished = len(results)
+            if self.on_result:
+                self.on_result(result, finished, len(entries))
+
+        with ThreadPoolExecutor(
+            max_workers=self.concurrency, thread_name_prefix=f"eval-{model}"
+        ) as executor:
+            list(executor.map(evaluate, todo))
+
+        ordered = [results[entry["test_id"]] for entry in entries]
+        return build_report(
+            model, ordered, time.perf_counter() - start, self.concurrency
+        )
+
+    def _evaluate(self, model: str, entry: Dict[str, Any]) -> Dict[str, Any]:
+        """Answer and grade one question."""
+        question = entry["question"]
+        start = time.perf_counter()
+        try:
+            answered = self.answer(question, model)
+        except Exception as e:
+            logger.warning(f"{model} failed on {entry['test_id']}: {e}")
+            answered = {"answer": "", "success": False, "error": str(e)}
+        response_time = time.perf_counter() - start
+
+        result = {
+            "test_id": entry["test_id"],
+            "question": question,
+            "expected_answer": entry.get("expected_answer", ""),
+            "actual_answer": answered.get("answer", ""),
+            "success": answered.get("success", False),
+            "equivalent": None,
+            "confidence": None,
+            "explanation": None,
+            "response_time": response_time,
+            "sources_found": answered.get("sources_found", 0),
+            "model_used": model,
+            "source_pages": answered.get("source_pages", []),
+            "language": entry.get("language", "english"),
+            "stage_timings": answered.get("stage_timings", {}),
+            "model": model,
+        }
+        if answered.get("error"):
+            result["error"] = answered["error"]
+
+        if self.grade:
+            start = time.perf_counter()
+            try:
+                result.update(self.grade(result))
+            except Exception as e:
+                logger.warning(f"Grading failed for {entry['test_id']}: {e}")
+            result["stage_timings"]["grading"] = time.perf_counter() - start
+
+        return result
+
+
+def _timing_summary(values: List[float]) -> Dict[str, Any]:
+    """Mean, p50 and p95 of a list of seconds."""
+    if not values:
+        return {"mean": None, "p50": None, "p95": None}
+    return {
+        "mean": round(sum(values) / len(values), 3),
+        "p50": round(percentile(values, 50), 3),
+        "p95": round(percentile(values, 95), 3),
+    }
+
+
+def build_report(
+    model: str,
+    results: List[Dict[str, Any]],
+    wall_time: float,
+    concurrency: int,
+) -> Dict[str, Any]:
+    """
+    Build a report in the bundled schema.
+
+    ``test_summary`` keeps the original fields and adds latency percentiles,
+    per-stage timings, wall time and concurrency. Entries count as passed
+    when they succeeded and were graded equivalent.
+    """
+    entries = [{k: v for k, v in r.items() if k != "model"} for r in results]
+    passed = sum(1 for e in entries if e["success"] and e.get("equivalent"))
+    graded = sum(1 for e in entries if e.get("equivalent") is not None)
+
+    languages: Dict[str, Dict[str, Any]] = {}
+    for entry in entries:
+        stats = languages.setdefault(entry["language"], {"total": 0, "passed": 0})
+        stats["total"] += 1
+        stats["passed"] += bool(entry["success"] and entry.get("equivalent"))
+    for stats in languages.values():
+        stats["pass_rate"] = round(stats["passed"] / stats["total"] * 100, 1)
+
+    confidence = {band: 0 for band in CONFIDENCE_BANDS}
+    for entry in entries:
+        if entry.get("confidence") in confidence:
+            confidence[entry["confidence"]] += 1
+
+    response_times = [e["response_time"] for e in entries]
+    stages = sorted({stage for e in entries for stage in e["stage_timings"]})
+
+    return {
+        "test_summary": {
+            "timestamp": datetime.now().isoformat(),
+            "model": model,
+            "total_tests": len(entries),
+            "passed": passed,
+            "failed": len(entries) - passed,
+            "graded": graded,
+            "pass_rate": (round(passed / len(entries) * 100, 1) if entries else 0.0),
+            "average_response_time": (
+                round(sum(response_times) / len(response_times), 2)
+                if response_times
+                else 0.0
+            ),
+            "latency": _timing_summary(response_times),
+            "stage_timings": {
+                stage: _timing_summary(
+                    [
+                        e["stage_timings"][stage]
+                        for e in entries
+                        if stage in e["stage_timings"]
+                    ]
+                )
+                for stage in stages
+            },
+            "wall_time": round(wall_time, 1),
+            "concurrency": concurrency,
+            "language_breakdown": languages,
+            "confidence_distribution": confidence,
+        },
+        "detailed_results": entries,
+    }
@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+"""
+Extractive answering service for BanglaRAG system.
+Answers from the retrieved chunks without an LLM: sentences are ranked
+against the question with BM25 plus definitional-cue and position features,
+and the best few are returned as a cited answer in milliseconds.
+"""
+
+import math
+import re
+import threading
+import time
+from collections import Counter
+from typing import Optional, List, Dict, Any
+
+from core.logging_config import BanglaRAGLogger
+from core.constants import (
+    EXTRACTIVE_MAX_SENTENCES,
+    EXTRACTIVE_MAX_CHARS,
+    EXTRACTIVE_MIN_SENTENCE_WORDS,
+    EXTRACTIVE_BM25_K1,
+    EXTRACTIVE_BM25_B,
+    EXTRACTIVE_CUE_WEIGHT,
+    EXTRACTIVE_POSITION_WEIGHT,
+)
+from services.grading_service import content_terms
+from services.llm_service import PromptTemplate, QueryType, extract_citations
+
+logger = BanglaRAGLogger.get_logger("extractive")
+
+# Sentence ends (Latin punctuation and the Bangla dari), paragraph breaks,
+# and line ends that are not mid-sentence wraps (headings, list items)
+SENTENCE_BREAK = re.compile(
+    r"(?<=[.!?।])\s+|\n\s*\n|\n(?=\s*(?:[-•*]|\d+\.)\s)"
+    r"|(?<=[^a-z\u0980-\u09FF,\-\s])[ \t]*\n"
+)
+LOWERCASE = re.compile(r"[a-z\u0980-\u09FF]")
+
+# "X is a ...", "X refers to ...", "X কে ... বলা হয়", "X হলো ..."
+DEFINITION_CUE = re.compile(
+    r"\b(?:is|are) (?:a|an|the|defined as|called)\b|\brefers? to\b|\bmeans\b"
+    r"|\bdefined as\b|বলা হয়|বলে|হলো|হল একটি|মানে",
+    re.IGNORECASE,
+)
+
+NO_ANSWER = "I couldn't find a sentence in the textbook that answers this directly."
+
+
+class ExtractiveAnswerer:
+    """
+    Builds an answer from the sentences of the retrieved chunks.
+
+    Sentences are scored by BM25 against the question, with document
+    frequencies taken over the retrieved sentences themselves, normalized to
+    the best match. Definition questions add ``cue_weight`` for sentences
+    phrased as definitions, and every sentence gets up to
+    ``position_weight`` for appearing early in its chunk, where textbook
+    paragraphs state their point. The top sentences (without near
+    duplicates) are returned in reading order with their chunks' citations.
+    """
+
+    def __init__(
+        self,
+        max_sentences: int = EXTRACTIVE_MAX_SENTENCES,
+        max_chars: int = EXTRACTIVE_MAX_CHARS,
+        k1: float = EXTRACTIVE_BM25_K1,
+        b: float = EXTRACTIVE_BM25_B,
+        cue_weight: float = EXTRACTIVE_CUE_WEIGHT,
+        position_weight: float = EXTRACTIVE_POSITION_WEIGHT,
+    ):
+        self.max_sentences = max_sentences
+        self.max_chars = max_chars
+        self.k1 = k1
+        self.b = b
+        self.cue_weight = cue_weight
+        self.position_weight = position_weight
+        self._lock = threading.Lock()
+        self._stats = {"answers": 0, "no_match": 0, "total_ms": 0.0}
+
+    @staticmethod
+    def _sentences(documents: List[Any]) -> List[Dict[str, Any]]:
+        """Split documents into sentences with their document and position."""
+        sentences = []
+        for doc_index, doc in enumerate(documents):
+            content = doc.page_content if hasattr(doc, "page_content") else str(doc)
+            parts = [
+                " ".join(part.split()).lstrip("-•* ")  # No list bullets
+                for part in SENTENCE_BREAK.split(content)
+            ]
+            # Headings, list stubs and questions make poor answers
+            parts = [
+                p
+                for p in parts
+                if len(p.split()) >= EXTRACTIVE_MIN_SENTENCE_WORDS
+                and not p.endswith(("?", ":"))
+                and LOWERCASE.search(p)
+            ]
+            for position, text in enumerate(parts):
+                sentences.append(
+                    {
+                        "text": text,
+                        "doc": doc_index,
+                        "position": position,
+                        "terms": Counter(content_terms(text)),
+                    }
+                )
+        return sentences
+
+    def rank(self, question: str, documents: List[Any]) -> List[Dict[str, Any]]:
+        """
+        Score every sentence of ``documents`` against ``question``.
+
+        Returns:
+            Sentences sharing at least one term with the question, best
+            first, each with ``score`` and ``defining``
+        """
+        query = set(content_terms(question))
+        sentences = self._sentences(documents)
+        if not query or not sentences:
+            return []
+
+        count = len(sentences)
+        avg_length = sum(sum(s["terms"].values()) for s in sentences) / count
+        idf = {}
+        for term in query:
+            df = sum(1 for s in sentences if term in s["terms"])
+            idf[term] = math.log(1 + (count - df + 0.5) / (df + 0.5))
+
+        for sentence in sentences:
+            length = sum(sentence["terms"].values())
+            norm = self.k1 * (1 - self.b + self.b * length / max(avg_length, 1))
+            sentence["bm25"] = sum(
+                idf[term] * tf * (self.k1 + 1) / (tf + norm)
+                for term, tf in ((t, sentence["terms"].get(t, 0)) for t in query)
+                if tf
+            )
+
+        matched = [s for s in sentences if s["bm25"] > 0]
+        if not matched:
+            return []
+
+        definition = PromptTemplate.detect_query_type(question) == QueryType.DEFINITION
+        best = max(s["bm25"] for s in matched)
+        for sentence in matched:
+            sentence["defining"] = bool(DEFINITION_CUE.search(sentence["text"]))
+            sentence["score"] = (
+                sentence["bm25"] / best
+                + self.position_weight / (1 + sentence["position"])
+                + (self.cue_weight if definition and sentence["defining"] else 0.0)
+            )
+        return sorted(matched, key=lambda s: s["score"], reverse=True)
+
+    def answer(self, question: str, documents: List[Any]) -> Dict[str, Any]:
+        """
+        Answer ``question`` from ``documents`` without a model call.
+
+        Returns:
+            The ``RAGQueryProcessor.process_rag_query`` schema, with
+            ``model_used`` and ``mode`` set to ``"extractive"`` and
+            ``defining`` telling whether the top sentence reads as a
+            definition
+        """
+        start = time.perf_counter()
+        picked: List[Dict[str, Any]] = []
+        length = 0
+        for sentence in self.rank(question, documents):
+            if len(picked) >= self.max_sentences:
+                break
+            if picked and length + len(sentence["text"]) > self.max_chars:
+                continue
+            # Skip sentences that repeat a picked one (overlapping chunks)
+            words = set(sentence["terms"])
+            if any(
+                len(words & set(p["terms"])) / max(len(words | set(p["terms"])), 1)
+                > 0.8
+                for p in picked
+            ):
+                continue
+            picked.append(sentence)
+            length += len(sentence["text"])
+        elapsed_ms = (time.perf_counter() - start) * 1000
+
+        with self._lock:
+            self._stats["answers" if picked else "no_match"] += 1
+            self._stats["total_ms"] += elapsed_ms
+
+        if not picked:
+            return {
+                "response": NO_ANSWER,
+                "question": question,
+                "success": False,
+                "error": "No sentence matched the question",
+                "model_used": "extractive",
+                "mode": "extractive",
+            }
+
+        ordered = sorted(picked, key=lambda s: (s["doc"], s["position"]))
+        response = " ".join(s["text"] for s in ordered)
+        if len(response) > self.max_chars:
+            response = response[: self.max_chars - 3].rsplit(" ", 1)[0] + "..."
+        used = sorted({s["doc"] for s in picked})
+
+        return {
+            "response": response,
+            "question": question,
+            "context_length": len(response),
+            "citations": extract_citations([documents[i] for i in used]),
+            "success": True,
+            "model_used": "extractive",
+            "mode": "extractive",
+            "defining": picked[0]["defining"],
+            "elapsed_ms": round(elapsed_ms, 2),
+        }
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get answer counts and mean time per answer."""
+        with self._lock:
+            stats = dict(self._stats)
+        total = stats["answers"] + stats["no_match"]
+        return {
+            "answers": stats["answers"],
+            "no_match": stats["no_match"],
+            "mean_ms": round(stats.pop("total_ms") / total, 2) if total else 0.0,
+        }
+
+
+# Global answerer instance
+_extractive_answerer: Optional[ExtractiveAnswerer] = None
+
+
+def get_extractive_answerer() -> ExtractiveAnswerer:
+    """Get global extractive answerer instance."""
+    global _extractive_answerer
+    if _extractive_answerer is None:
+        _extractive_answerer = ExtractiveAnswerer()
+    return _extractive_answerer
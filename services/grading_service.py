@@ -0,0 +1,404 @@
+#!/usr/bin/env python3
+"""
+Answer grading service for BanglaRAG system.
+Scores generated answers against expected answers with batched sentence
+embeddings and key-term overlap, and escalates only borderline answers to an
+LLM judge.
+"""
+
+from pathlib import Path
+from typing import Optional, List, Dict, Any, Callable, Tuple, Union
+import re
+import threading
+
+import numpy as np
+
+from core.logging_config import BanglaRAGLogger
+from core.utils import safe_json_load, safe_json_save, get_text_hash
+from core.constants import (
+    GRADING_THRESHOLDS_FILE,
+    GRADING_TERM_WEIGHT,
+    GRADING_MAX_FALSE_PASS,
+    GRADING_MAX_FALSE_FAIL,
+    GRADING_BATCH_SIZE,
+    PRIORITY_BATCH,
+)
+from services.embedding_service import expand_technical_terms, get_embedding_factory
+
+logger = BanglaRAGLogger.get_logger("grading")
+
+# grade(result) -> {"equivalent", "confidence", "explanation"}, None on failure
+JudgeFunction = Callable[[Dict[str, Any]], Optional[Dict[str, Any]]]
+
+# Big-O expressions, Latin words, numbers and Bangla words; hyphenated words
+# are split so "divide-and-conquer" matches "divide and conquer"
+TERM_PATTERN = re.compile(r"o\([^)]{1,20}\)|[a-z][a-z0-9]*|\d+|[ঀ-৿]+")
+
+STOPWORDS = frozenset(
+    "the and for with that this are from which into its can has have was were "
+    "will not but all any each their there than then when where what how why "
+    "who also such use used using over only more most other some been being "
+    "does given between both they them these those it's is an as at be by if "
+    "in of on or to".split()
+    + "এবং একটি হয় করে এই যে থেকে জন্য না ও কে এর তা যা হলে হল করা".split()
+)
+
+JUDGE_PROMPT = """You are grading a student-facing answer about algorithms.
+
+Question: {question}
+
+Expected answer: {expected}
+
+Actual answer: {actual}
+
+Does the actual answer convey the same key facts as the expected answer? It may
+be longer, phrased differently or in another language. Reply in exactly this
+format:
+EQUIVALENT: yes or no
+CONFIDENCE: HIGH, MEDIUM or LOW
+EXPLANATION: one or two sentences"""
+
+
+def content_terms(text: str) -> List[str]:
+    """Content words of ``text`` in order: lowercased, abbreviations expanded, no stopwords."""
+    terms = []
+    for term in TERM_PATTERN.findall(expand_technical_terms(text).lower()):
+        if term in STOPWORDS or (term.isascii() and term.isalpha() and len(term) < 3):
+            continue
+        if term.isascii() and len(term) > 4 and term.endswith("s"):
+            term = term[:-1]  # Crude plural folding: "heaps" matches "heap"
+        terms.append(term)
+    return terms
+
+
+def key_terms(text: str) -> set:
+    """Distinct content words of ``text`` (see ``content_terms``)."""
+    return set(content_terms(text))
+
+
+def _parse_judgement(text: str) -> Optional[Dict[str, Any]]:
+    """Parse the judge's EQUIVALENT/CONFIDENCE/EXPLANATION reply."""
+    equivalent = re.search(r"EQUIVALENT:\s*(yes|no)", text, re.IGNORECASE)
+    if not equivalent:
+        return None
+    confidence = re.search(r"CONFIDENCE:\s*(HIGH|MEDIUM|LOW)", text, re.IGNORECASE)
+    explanation = re.search(r"EXPLANATION:\s*(.+)", text, re.IGNORECASE | re.DOTALL)
+    return {
+        "equivalent": equivalent.group(1).lower() == "yes",
+        "confidence": confidence.group(1).upper() if confidence else "MEDIUM",
+        "explanation": explanation.group(1).strip() if explanation else "",
+    }
+
+
+def make_llm_judge(model_name: Optional[str] = None) -> JudgeFunction:
+    """
+    LLM judge that grades one answer through the model manager.
+
+    Runs at batch priority, so live chat keeps its reserved slots.
+    """
+    from services.llm_service import get_model_manager
+
+    def judge(result: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        prompt = JUDGE_PROMPT.format(
+            question=result.get("question", ""),
+            expected=result.get("expected_answer", ""),
+            actual=result.get("actual_answer", ""),
+        )
+        response = get_model_manager().generate_response(
+            prompt, model_name=model_name, priority=PRIORITY_BATCH
+        )
+        return _parse_judgement(response) if response else None
+
+    return judge
+
+
+class AnswerGrader:
+    """
+    Embedding and key-term grader for evaluation answers.
+
+    Each answer gets a score mixing the cosine similarity of its embedding
+    with the expected answer's and the share of the expected answer's key
+    terms it contains (term overlap is left out when the two are in different
+    scripts). Scores above ``accept_above`` pass and below ``reject_below``
+    fail with HIGH confidence. Answers in between are borderline: MEDIUM, or
+    LOW near the middle of the band. Borderline answers go to ``judge`` when
+    one is given. An uncalibrated grader treats every answer as borderline,
+    so with a judge it behaves like judging everything.
+    """
+
+    def __init__(
+        self,
+        accept_above: Optional[float] = None,
+        reject_below: Optional[float] = None,
+        judge: Optional[JudgeFunction] = None,
+        embed_documents: Optional[Callable[[List[str]], List[List[float]]]] = None,
+        term_weight: float = GRADING_TERM_WEIGHT,
+        batch_size: int = GRADING_BATCH_SIZE,
+    ):
+        self.accept_above = accept_above
+        self.reject_below = reject_below
+        self.judge = judge
+        self._embed_documents = embed_documents
+        self.term_weight = term_weight
+        self.batch_size = batch_size
+        self._embeddings: Dict[str, np.ndarray] = {}  # Expected answers repeat
+        self._lock = threading.Lock()
+        self._stats = {"graded": 0, "high": 0, "borderline": 0, "escalated": 0}
+
+    @property
+    def is_calibrated(self) -> bool:
+        """Whether thresholds have been fitted."""
+        return self.accept_above is not None and self.reject_below is not None
+
+    @classmethod
+    def from_file(
+        cls, path: Union[str, Path] = GRADING_THRESHOLDS_FILE, **kwargs
+    ) -> "AnswerGrader":
+        """Load calibrated thresholds, falling back to an uncalibrated grader."""
+        data = safe_json_load(path) if Path(path).exists() else None
+        if not data:
+            logger.info("No grading calibration found, every answer is borderline")
+            return cls(**kwargs)
+
+        logger.info(f"Loaded grading thresholds from {path}")
+        kwargs.setdefault("term_weight", data.get("term_weight", GRADING_TERM_WEIGHT))
+        return cls(
+            accept_above=data.get("accept_above"),
+            reject_below=data.get("reject_below"),
+            **kwargs,
+        )
+
+    def _embed(self, texts: List[str]) -> List[np.ndarray]:
+        """Unit-length embeddings, batched and cached by text."""
+        if self._embed_documents is None:
+            factory = get_embedding_factory()
+            self._embed_documents = (
+                factory.get_embedding_function_with_fallback().embed_documents
+            )
+
+        keys = [get_text_hash(text) for text in texts]
+        with self._lock:
+            missing = list(
+                {
+                    key: text
+                    for key, text in zip(keys, texts)
+                    if key not in self._embeddings
+                }.items()
+            )
+
+        for start in range(0, len(missing), self.batch_size):
+            batch = missing[start : start + self.batch_size]
+            vectors = np.asarray(
+                self._embed_documents([text for _, text in batch]), dtype=np.float32
+            )
+            norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+            vectors = vectors / np.maximum(norms, 1e-12)
+            with self._lock:
+                for (key, _), vector in zip(batch, vectors):
+                    self._embeddings[key] = vector
+
+        with self._lock:
+            return [self._embeddings[key] for key in keys]
+
+    def score_batch(self, pairs: List[Tuple[str, str]]) -> List[Dict[str, float]]:
+        """
+        Score ``(expected, actual)`` pairs with one pass of batched embeddings.
+
+        Returns:
+            ``{"similarity", "term_overlap", "score"}`` per pair
+        """
+        if not pairs:
+            return []
+
+        vectors = self._embed([text for pair in pairs for text in pair])
+        factory = get_embedding_factory()
+
+        scores = []
+        for i, (expected, actual) in enumerate(pairs):
+            similarity = float(np.dot(vectors[2 * i], vectors[2 * i + 1]))
+            expected_terms = key_terms(expected)
+            overlap = (
+                len(expected_terms & key_terms(actual)) / len(expected_terms)
+                if expected_terms
+                else 0.0
+            )
+
+            # A Bangla reference shares no words with an English answer
+            same_script = (
+                abs(factory.script_share(expected) - factory.script_share(actual)) < 0.5
+            )
+            weight = self.term_weight if same_script and expected_terms else 0.0
+            scores.append(
+                {
+                    "similarity": round(similarity, 4),
+                    "term_overlap": round(overlap, 4),
+                    "score": round((1 - weight) * similarity + weight * overlap, 4),
+                }
+            )
+        return scores
+
+    def classify(self, score: float) -> Tuple[bool, str]:
+        """Map a score to ``(equivalent, confidence)``."""
+        if not self.is_calibrated:
+            return score >= 0.5, "LOW"
+        if score > self.accept_above:
+            return True, "HIGH"
+        if score < self.reject_below:
+            return False, "HIGH"
+
+        middle = (self.accept_above + self.reject_below) / 2
+        width = self.accept_above - self.reject_below
+        confidence = "MEDIUM" if abs(score - middle) >= width / 4 else "LOW"
+        return score >= middle, confidence
+
+    def grade(self, result: Dict[str, Any]) -> Dict[str, Any]:
+        """Grade one evaluation result (the ``EvaluationRunner`` grade hook)."""
+        return self.grade_batch([result])[0]
+
+    def grade_batch(self, results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Grade evaluation results.
+
+        Returns:
+            ``{"equivalent", "confidence", "explanation", "grade_score",
+            "graded_by"}`` per result, in order
+        """
+        answered = [
+            i
+            for i, r in enumerate(results)
+            if r.get("success") and (r.get("actual_answer") or "").strip()
+        ]
+        scores = self.score_batch(
+            [
+                (results[i].get("expected_answer", ""), results[i]["actual_answer"])
+                for i in answered
+            ]
+        )
+        scored = dict(zip(answered, scores))
+
+        grades = []
+        for i, result in enumerate(results):
+            if i not in scored:
+                grades.append(
+                    {
+                        "equivalent": False,
+                        "confidence": "HIGH",
+                        "explanation": "No answer was generated",
+                        "grade_score": 0.0,
+                        "graded_by": "grader",
+                    }
+                )
+                continue
+
+            features = scored[i]
+            equivalent, confidence = self.classify(features["score"])
+            grade = {
+                "equivalent": equivalent,
+                "confidence": confidence,
+                "explanation": (
+                    f"Score {features['score']:.2f} (embedding similarity "
+                    f"{features['similarity']:.2f}, key-term overlap "
+                    f"{features['term_overlap']:.2f})"
+                ),
+                "grade_score": features["score"],
+                "graded_by": "grader",
+            }
+
+            if confidence != "HIGH" and self.judge:
+                try:
+                    judged = self.judge(result)
+                except Exception as e:
+                    logger.warning(f"Judge failed for {result.get('test_id')}: {e}")
+                    judged = None
+                if judged:
+                    grade.update(judged, graded_by="judge")
+                with self._lock:
+                    self._stats["escalated"] += 1
+
+            with self._lock:
+                self._stats["graded"] += 1
+                self._stats["high" if confidence == "HIGH" else "borderline"] += 1
+            grades.append(grade)
+
+        return grades
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get grading statistics, including judge calls avoided."""
+        with self._lock:
+            stats = dict(self._stats)
+        stats["calibrated"] = self.is_calibrated
+        stats["escalation_rate"] = round(
+            stats["escalated"] / max(stats["graded"], 1), 4
+        )
+        return stats
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize thresholds."""
+        return {
+            "accept_above": self.accept_above,
+            "reject_below": self.reject_below,
+            "term_weight": self.term_weight,
+        }
+
+
+def calibrate_grader(
+    samples: List[Tuple[float, bool]],
+    max_false_pass: float = GRADING_MAX_FALSE_PASS,
+    max_false_fail: float = GRADING_MAX_FALSE_FAIL,
+    term_weight: float = GRADING_TERM_WEIGHT,
+) -> Dict[str, Any]:
+    """
+    Fit grading thresholds from judged answers.
+
+    Args:
+        samples: (grader score, judged equivalent) per answer
+        max_false_pass: Share of judged-wrong answers we accept to pass outright
+        max_false_fail: Share of judged-right answers we accept to fail outright
+        term_weight: Key-term weight the scores were computed with
+
+    Returns:
+        Thresholds plus how the grader would have banded ``samples``
+    """
+    positives = sorted(score for score, equivalent in samples if equivalent)
+    negatives = sorted(
+        (score for score, equivalent in samples if not equivalent), reverse=True
+    )
+    if not positives or not negatives:
+        raise ValueError("Calibration needs both equivalent and wrong answers")
+
+    # Fail outright below the score that keeps false fails within budget
+    fail_index = int(len(positives) * max_false_fail)
+    reject_below = positives[min(fail_index, len(positives) - 1)]
+
+    # Pass outright above the score that keeps false passes within budget
+    pass_index = int(len(negatives) * max_false_pass)
+    accept_above = max(negatives[min(pass_index, len(negatives) - 1)], reject_below)
+
+    grader = AnswerGrader(accept_above, reject_below, term_weight=term_weight)
+    counts = {
+        band: {"equivalent": 0, "not_equivalent": 0}
+        for band in ("pass", "fail", "borderline")
+    }
+    agree = 0
+    for score, equivalent in samples:
+        verdict, confidence = grader.classify(score)
+        band = "borderline" if confidence != "HIGH" else ("pass" if verdict else "fail")
+        counts[band]["equivalent" if equivalent else "not_equivalent"] += 1
+        agree += verdict == equivalent
+
+    borderline = sum(counts["borderline"].values())
+    return {
+        **grader.to_dict(),
+        "samples": len(samples),
+        "bands": counts,
+        "agreement": round(agree / len(samples), 4),
+        "judge_calls_saved": len(samples) - borderline,
+        "escalation_rate": round(borderline / len(samples), 4),
+    }
+
+
+def save_grading_thresholds(
+    calibration: Dict[str, Any], path: Union[str, Path] = GRADING_THRESHOLDS_FILE
+) -> bool:
+    """Persist calibrated thresholds for evaluation runs to load."""
+    return safe_json_save(calibration, path)
@@ -0,0 +1,495 @@
+#!/usr/bin/env python3
+"""
+Background job queue for BanglaRAG system.
+Persists long-running work (question generation, ingestion) in SQLite and runs
+it on a small worker pool, so it survives client disconnects and restarts.
+"""
+
+from enum import Enum
+from pathlib import Path
+from typing import Optional, List, Dict, Any, Callable, Union
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+
+from core.logging_config import BanglaRAGLogger
+from core.exceptions import JobException, JobCancelledException
+from core.utils import ensure_directory
+from core.constants import (
+    JOBS_DB_FILE,
+    JOB_WORKERS,
+    JOB_LEASE_SECONDS,
+    JOB_HEARTBEAT_SECONDS,
+    JOB_MAX_ATTEMPTS,
+    PRIORITY_BATCH,
+)
+
+logger = BanglaRAGLogger.get_logger("jobs")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    priority INTEGER NOT NULL,
+    status TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    progress TEXT NOT NULL DEFAULT '{}',
+    result TEXT,
+    error TEXT,
+    version INTEGER NOT NULL DEFAULT 0,
+    cancel_requested INTEGER NOT NULL DEFAULT 0,
+    worker_pid INTEGER,
+    lease_expires REAL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    created_at REAL NOT NULL,
+    started_at REAL,
+    finished_at REAL
+);
+CREATE INDEX IF NOT EXISTS jobs_queue ON jobs (status, priority, created_at);
+"""
+
+# Columns added after the first release, for job files created before them
+_MIGRATIONS = {
+    "lease_expires": "ALTER TABLE jobs ADD COLUMN lease_expires REAL",
+    "attempts": "ALTER TABLE jobs ADD COLUMN attempts INTEGER NOT NULL DEFAULT 0",
+}
+
+
+class JobStatus(Enum):
+    """Lifecycle of a background job."""
+
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
+
+TERMINAL_STATUSES = {JobStatus.SUCCEEDED, JobStatus.FAILED, JobStatus.CANCELLED}
+
+
+class JobContext:
+    """Handle passed to a job handler for reporting progress and cancellation."""
+
+    def __init__(
+        self, job_queue: "JobQueue", job_id: str, priority: int, payload: Dict
+    ):
+        self.job_queue = job_queue
+        self.job_id = job_id
+        self.priority = priority
+        self.payload = payload
+        self._progress: Dict[str, Any] = {}
+
+    def report_progress(self, **progress) -> None:
+        """Merge keys into the job's progress record."""
+        self._progress.update(progress)
+        self.job_queue._update(self.job_id, progress=json.dumps(self._progress))
+
+    @property
+    def cancelled(self) -> bool:
+        """Whether cancellation has been requested."""
+        return self.job_queue._cancel_requested(self.job_id)
+
+    def check_cancelled(self) -> None:
+        """Raise JobCancelledException if the job has been cancelled."""
+        if self.cancelled:
+            raise JobCancelledException(f"Job {self.job_id} cancelled")
+
+
+class JobQueue:
+    """
+    SQLite-backed priority job queue with a worker pool.
+
+    Jobs with a lower priority value are claimed first, ties in submission
+    order. Claims are atomic in SQLite, so several processes may share a file.
+    A claimed job holds a lease of ``lease_seconds`` that its process renews
+    every ``heartbeat_seconds`` while the job runs; a running job whose lease
+    has lapsed belongs to a process that died and is queued again, unless it
+    has already been claimed ``max_attempts`` times, in which case it fails.
+    """
+
+    def __init__(
+        self,
+        db_path: Union[str, Path] = JOBS_DB_FILE,
+        workers: int = JOB_WORKERS,
+        lease_seconds: float = JOB_LEASE_SECONDS,
+        heartbeat_seconds: float = JOB_HEARTBEAT_SECONDS,
+        max_attempts: int = JOB_MAX_ATTEMPTS,
+    ):
+        self.db_path = Path(db_path)
+        self.workers = workers
+        self.lease_seconds = lease_seconds
+        self.heartbeat_seconds = heartbeat_seconds
+        self.max_attempts = max(max_attempts, 1)
+        self._handlers: Dict[str, Dict[str, Any]] = {}
+        self._threads: List[threading.Thread] = []
+        self._running: set = set()  # Jobs this process is running
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        self._changed = threading.Condition()
+
+        ensure_directory(self.db_path.parent)
+        self._conn = sqlite3.connect(
+            str(self.db_path), check_same_thread=False, isolation_level=None
+        )
+        self._conn.row_factory = sqlite3.Row
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(_SCHEMA)
+            columns = {
+                row["name"] for row in self._conn.execute("PRAGMA table_info(jobs)")
+            }
+            for column, statement in _MIGRATIONS.items():
+                if column not in columns:
+                    self._conn.execute(statement)
+
+    def register(
+        self,
+        kind: str,
+        handler: Callable[[JobContext], Optional[Dict[str, Any]]],
+        priority: int = PRIORITY_BATCH,
+    ) -> None:
+        """Register a handler and its default priority for a job kind."""
+        self._handlers[kind] = {"handler": handler, "priority": priority}
+
+    def start(self) -> None:
+        """Requeue orphaned jobs and start the worker and heartbeat threads."""
+        if self._threads:
+            return
+
+        self._requeue_orphans()
+        self._stop.clear()
+        for i in range(self.workers):
+            thread = threading.Thread(
+                target=self._worker_loop, name=f"job-worker-{i}", daemon=True
+            )
+            thread.start()
+            self._threads.append(thread)
+        heartbeat = threading.Thread(
+            target=self._heartbeat_loop, name="job-heartbeat", daemon=True
+        )
+        heartbeat.start()
+        self._threads.append(heartbeat)
+        logger.info(f"Job queue started with {self.workers} workers")
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Stop the workers after their current job."""
+        self._stop.set()
+        with self._changed:
+            self._changed.notify_all()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    def submit(
+        self,
+        kind: str,
+        payload: Optional[Dict[str, Any]] = None,
+        priority: Optional[int] = None,
+    ) -> str:
+        """Queue a job and return its ID."""
+        if kind not in self._handlers:
+            raise JobException(f"Unknown job kind: {kind}")
+
+        job_id = uuid.uuid4().hex
+        if priority is None:
+            priority = self._handlers[kind]["priority"]
+
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO jobs (id, kind, priority, status, payload, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    job_id,
+                    kind,
+                    priority,
+                    JobStatus.QUEUED.value,
+                    json.dumps(payload or {}),
+                    time.time(),
+                ),
+            )
+        self._notify()
+        logger.info(f"Queued job {job_id} ({kind}, priority {priority})")
+        return job_id
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Get a job record, or None if it does not exist."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT * FROM jobs WHERE id = ?", (job_id,)
+            ).fetchone()
+        return self._to_dict(row) if row else None
+
+    def list_jobs(
+        self, status: Optional[str] = None, limit: int = 50
+    ) -> List[Dict[str, Any]]:
+        """List recent jobs, optionally filtered by status."""
+        query = "SELECT * FROM jobs"
+        params: tuple = ()
+        if status:
+            query += " WHERE status = ?"
+            params = (status,)
+        query += " ORDER BY created_at DESC LIMIT ?"
+
+        with self._lock:
+            rows = self._conn.execute(query, params + (limit,)).fetchall()
+        return [self._to_dict(row) for row in rows]
+
+    def cancel(self, job_id: str) -> bool:
+        """
+        Cancel a job.
+
+        Queued jobs are cancelled immediately; running jobs are flagged and
+        stop at their next ``check_cancelled``. Returns False for unknown or
+        finished jobs.
+        """
+        with self._lock:
+            cursor = self._conn.execute(
+                "UPDATE jobs SET status = ?, finished_at = ?, version = version + 1 "
+                "WHERE id = ? AND status = ?",
+                (
+                    JobStatus.CANCELLED.value,
+                    time.time(),
+                    job_id,
+                    JobStatus.QUEUED.value,
+                ),
+            )
+            if cursor.rowcount == 0:
+                cursor = self._conn.execute(
+                    "UPDATE jobs SET cancel_requested = 1, version = version + 1 "
+                    "WHERE id = ? AND status = ?",
+                    (job_id, JobStatus.RUNNING.value),
+                )
+
+        cancelled = cursor.rowcount > 0
+        if cancelled:
+            self._notify()
+            logger.info(f"Cancellation requested for job {job_id}")
+        return cancelled
+
+    def wait_for_change(self, job_id: str, version: int, timeout: float) -> None:
+        """Block until the job's version moves past ``version`` or timeout."""
+        deadline = time.time() + timeout
+        with self._changed:
+            while not self._stop.is_set():
+                job = self.get(job_id)
+                remaining = deadline - time.time()
+                if job is None or job["version"] != version or remaining <= 0:
+                    return
+                # Other processes sharing the file do not notify us, so cap waits
+                self._changed.wait(min(remaining, 1.0))
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get job counts by status."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT status, COUNT(*) AS count FROM jobs GROUP BY status"
+            ).fetchall()
+        counts = {status.value: 0 for status in JobStatus}
+        counts.update({row["status"]: row["count"] for row in rows})
+        return {
+            "workers": self.workers if self._threads else 0,
+            "kinds": sorted(self._handlers),
+            "jobs": counts,
+        }
+
+    def _worker_loop(self) -> None:
+        """Claim and run jobs until stopped."""
+        while not self._stop.is_set():
+            job = self._claim_next()
+            if job is None:
+                with self._changed:
+                    self._changed.wait(1.0)
+                continue
+            self._run(job)
+
+    def _claim_next(self) -> Optional[Dict[str, Any]]:
+        """Atomically move the most urgent queued job to running."""
+        kinds = list(self._handlers)
+        if not kinds:
+            return None
+        placeholders = ",".join("?" for _ in kinds)
+
+        with self._lock:
+            while True:
+                row = self._conn.execute(
+                    f"SELECT id FROM jobs WHERE status = ? AND kind IN ({placeholders}) "
+                    "ORDER BY priority, created_at LIMIT 1",
+                    (JobStatus.QUEUED.value, *kinds),
+                ).fetchone()
+                if row is None:
+                    return None
+
+                now = time.time()
+                cursor = self._conn.execute(
+                    "UPDATE jobs SET status = ?, started_at = ?, worker_pid = ?, "
+                    "lease_expires = ?, attempts = attempts + 1, "
+                    "version = version + 1 WHERE id = ? AND status = ?",
+                    (
+                        JobStatus.RUNNING.value,
+                        now,
+                        os.getpid(),
+                        now + self.lease_seconds,
+                        row["id"],
+                        JobStatus.QUEUED.value,
+                    ),
+                )
+                # Another process may have claimed it between the two statements
+                if cursor.rowcount == 1:
+                    self._running.add(row["id"])
+                    break
+
+            claimed = self._conn.execute(
+                "SELECT * FROM jobs WHERE id = ?", (row["id"],)
+            ).fetchone()
+        return self._to_dict(claimed)
+
+    def _run(self, job: Dict[str, Any]) -> None:
+        """Run one claimed job and record its outcome."""
+        context = JobContext(self, job["id"], job["priority"], job["payload"])
+        handler = self._handlers[job["kind"]]["handler"]
+        start_time = time.time()
+        self._notify()
+
+        try:
+            result = handler(context)
+            self._finish(job["id"], JobStatus.SUCCEEDED, result=result)
+            logger.info(
+                f"Job {job['id']} ({job['kind']}) finished in "
+                f"{time.time() - start_time:.1f}s"
+            )
+        except JobCancelledException:
+            self._finish(job["id"], JobStatus.CANCELLED)
+            logger.info(f"Job {job['id']} ({job['kind']}) cancelled")
+        except Exception as e:
+            self._finish(job["id"], JobStatus.FAILED, error=str(e))
+            logger.error(f"Job {job['id']} ({job['kind']}) failed: {e}")
+        finally:
+            with self._lock:
+                self._running.discard(job["id"])
+
+    def _finish(
+        self,
+        job_id: str,
+        status: JobStatus,
+        result: Optional[Dict[str, Any]] = None,
+        error: Optional[str] = None,
+    ) -> None:
+        """Move a job to a terminal status."""
+        self._update(
+            job_id,
+            status=status.value,
+            result=json.dumps(result) if result is not None else None,
+            error=error,
+            finished_at=time.time(),
+        )
+
+    def _update(self, job_id: str, **fields) -> None:
+        """Update columns of a job and bump its version."""
+        assignments = ", ".join(f"{column} = ?" for column in fields)
+        with self._lock:
+            self._conn.execute(
+                f"UPDATE jobs SET {assignments}, version = version + 1 WHERE id = ?",
+                (*fields.values(), job_id),
+            )
+        self._notify()
+
+    def _cancel_requested(self, job_id: str) -> bool:
+        """Read a job's cancellation flag."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT cancel_requested FROM jobs WHERE id = ?", (job_id,)
+            ).fetchone()
+        return bool(row and row["cancel_requested"])
+
+    def _heartbeat_loop(self) -> None:
+        """Renew this process's leases and requeue other processes' orphans."""
+        while not self._stop.wait(self.heartbeat_seconds):
+            self._renew_leases()
+            self._requeue_orphans()
+
+    def _renew_leases(self) -> None:
+        """Extend the lease of every job this process is running."""
+        with self._lock:
+            running = list(self._running)
+            if not running:
+                return
+            placeholders = ",".join("?" for _ in running)
+            # No version bump: a heartbeat is not a change streams care about
+            self._conn.execute(
+                f"UPDATE jobs SET lease_expires = ? WHERE status = ? "
+                f"AND id IN ({placeholders})",
+                (time.time() + self.lease_seconds, JobStatus.RUNNING.value, *running),
+            )
+
+    def _requeue_orphans(self) -> None:
+        """
+        Requeue running jobs whose lease has lapsed (their process died).
+
+        A job that was cancelled, or that has used up ``max_attempts`` (its
+        input likely crashes the worker), is finished instead.
+        """
+        with self._lock:
+            now = time.time()
+            rows = self._conn.execute(
+                "SELECT id, attempts, cancel_requested FROM jobs WHERE status = ? "
+                "AND (lease_expires IS NULL OR lease_expires < ?)",
+                (JobStatus.RUNNING.value, now),
+            ).fetchall()
+
+            for row in rows:
+                if row["id"] in self._running:
+                    continue  # Ours and alive; its lease is renewed next beat
+
+                if row["cancel_requested"]:
+                    status, error = JobStatus.CANCELLED, None
+                elif row["attempts"] >= self.max_attempts:
+                    status = JobStatus.FAILED
+                    error = f"Worker died in each of {row['attempts']} attempts"
+                else:
+                    self._conn.execute(
+                        "UPDATE jobs SET status = ?, started_at = NULL, "
+                        "worker_pid = NULL, lease_expires = NULL, "
+                        "version = version + 1 WHERE id = ? AND status = ?",
+                        (JobStatus.QUEUED.value, row["id"], JobStatus.RUNNING.value),
+                    )
+                    logger.info(f"Requeued interrupted job {row['id']}")
+                    continue
+
+                self._conn.execute(
+                    "UPDATE jobs SET status = ?, error = ?, finished_at = ?, "
+                    "lease_expires = NULL, version = version + 1 "
+                    "WHERE id = ? AND status = ?",
+                    (status.value, error, now, row["id"], JobStatus.RUNNING.value),
+                )
+                logger.warning(f"Interrupted job {row['id']} {status.value}")
+
+    def _notify(self) -> None:
+        """Wake workers and progress streams."""
+        with self._changed:
+            self._changed.notify_all()
+
+    @staticmethod
+    def _to_dict(row: sqlite3.Row) -> Dict[str, Any]:
+        """Convert a jobs row to a JSON-ready dict."""
+        job = dict(row)
+        job["payload"] = json.loads(job["payload"])
+        job["progress"] = json.loads(job["progress"])
+        job["result"] = json.loads(job["result"]) if job["result"] else None
+        job["cancel_requested"] = bool(job["cancel_requested"])
+        return job
+
+
+# Global job queue instance
+_job_queue: Optional[JobQueue] = None
+
+
+def get_job_queue() -> JobQueue:
+    """Get global job queue instance."""
+    global _job_queue
+    if _job_queue is None:
+        _job_queue = JobQueue()
+    return _job_queue
@@ -5,21 +5,32 @@ Provides clean interface for language model operations with proper prompt manage
 """
 
 from abc import ABC, abstractmethod
-from typing import Optional, List, Dict, Any, Tuple
+from typing import Optional, List, Dict, Any, Tuple, Iterator, Callable
 from enum import Enum
+from collections import deque
 import requests
+import itertools
 import json
+import os
+import queue
+import re
 import threading
 import time
 from functools import lru_cache
 
 from core.logging_config import BanglaRAGLogger
-from core.exceptions import ModelException, NetworkException
+from core.exceptions import (
+    ModelException,
+    NetworkException,
+    NodeUnreachableException,
+    DeadlineExceededException,
+)
 from core.utils import (
-    retry_with_backoff,
     measure_performance,
     SimpleCache,
-    timeout_handler,
+    PriorityLimiter,
+    Deadline,
+    CircuitBreaker,
 )
 from core.constants import (
     PREFERRED_LLM_MODEL,
@@ -28,7 +39,38 @@ from core.constants import (
     TEMPERATURE,
     TIMEOUT_SECONDS,
     OLLAMA_BASE_URL,
+    OLLAMA_NODES,
+    OLLAMA_NODE_REFRESH_SECONDS,
+    OLLAMA_NODE_LATENCY_SAMPLES,
+    OLLAMA_KEEP_ALIVE_SECONDS,
+    OLLAMA_PRELOAD_MODELS,
+    OLLAMA_RESIDENT_MODELS,
+    OLLAMA_RESIDENCY_REFRESH_SECONDS,
+    OLLAMA_PRELOAD_TIMEOUT,
+    OLLAMA_RESIDENCY_EVENTS,
+    ENGLISH_EMBEDDING_MODEL,
     OLLAMA_API_TIMEOUT,
+    OLLAMA_MODEL_INFO_RETRY_SECONDS,
+    OLLAMA_MAX_RETRIES,
+    OLLAMA_REQUEST_BUDGET,
+    OLLAMA_MIN_ATTEMPT_SECONDS,
+    OLLAMA_BREAKER_FAILURES,
+    OLLAMA_BREAKER_RESET_SECONDS,
+    OLLAMA_HEDGING,
+    OLLAMA_HEDGE_PERCENTILE,
+    OLLAMA_HEDGE_MAX_FRACTION,
+    OLLAMA_HEDGE_BURST,
+    OLLAMA_HEDGE_MIN_DELAY,
+    OLLAMA_HEDGE_MIN_SAMPLES,
+    OLLAMA_TTFT_SAMPLES,
+    OLLAMA_MAX_CONCURRENCY,
+    OLLAMA_INTERACTIVE_RESERVED_SLOTS,
+    OLLAMA_COMPLETION_SAMPLES,
+    PRIORITY_INTERACTIVE,
+    ROUTING_ENABLED,
+    EXTRACTIVE_ENABLED,
+    EXTRACTIVE_OVERLOAD_LOAD,
+    EXTRACTIVE_DEFINITION_LOAD,
 )
 
 logger = BanglaRAGLogger.get_logger("llm")
@@ -90,63 +132,146 @@ INSTRUCTIONS:
 ANSWER:""",
     }
 
+    # Static instructions, sent first (as the system prompt where the model's
+    # template has one) so every request starts with the same prefix and
+    # Ollama can reuse its evaluation from the previous request
+    SYSTEM_PROMPT = """You are an expert computer science educator specializing in algorithms and data structures.
+
+CRITICAL INSTRUCTIONS - MUST FOLLOW:
+1. Answer ONLY using information from the CONTEXT below
+2. Write naturally and smoothly, like ChatGPT or Grok - be conversational yet precise
+3. DO NOT reference "Document 1", "Document 2", or "according to the materials" in your answer
+4. DO NOT say "based on the context" or "the textbook says" - just explain directly
+5. If the CONTEXT lacks information, respond: "I cannot find this information in the textbook."
+6. DO NOT use general knowledge outside the CONTEXT
+7. DO NOT answer non-CS topics (cooking, sports, etc.) - respond: "This is outside the scope of algorithms and data structures."
+8. Write as if you're explaining to a student - clear, engaging, and well-structured
+9. Use examples from the CONTEXT when helpful, but integrate them smoothly
+10. The sources will be shown separately, so focus on crafting a high-quality explanation
+
+Write a natural, flowing explanation using only the CONTEXT FROM TEXTBOOK. Be clear, engaging, and avoid meta-references."""
+
+    LANGUAGE_INSTRUCTIONS = {
+        "bangla": "Please answer in Bengali (বাংলা ভাষায়).",
+        "english": "Please answer in English.",
+    }
+
+    # Bangla questions ending in "কি?"/"কী?" ask "what is ..."
+    BANGLA_DEFINITION = re.compile(r"(?:কি|কী)\s*[?？।]?\s*$")
+
     @classmethod
     def detect_query_type(cls, question: str) -> QueryType:
-        """Detect query type from question content."""
+        """Detect query type from question content (English or Bangla cues)."""
         question_lower = question.lower()
 
         if any(
             phrase in question_lower
-            for phrase in ["what is", "define", "definition of"]
+            for phrase in [
+                "what is",
+                "define",
+                "definition of",
+                "বলতে কি বোঝায়",
+                "সংজ্ঞা",
+            ]
         ):
             return QueryType.DEFINITION
         elif any(
-            phrase in question_lower for phrase in ["how does", "how to", "explain how"]
+            phrase in question_lower
+            for phrase in [
+                "how does",
+                "how to",
+                "explain how",
+                "কিভাবে",
+                "কীভাবে",
+                "কি ভাবে",
+            ]
         ):
             return QueryType.PROCESS
         elif any(
             phrase in question_lower
-            for phrase in ["time complexity", "space complexity", "complexity"]
+            for phrase in [
+                "time complexity",
+                "space complexity",
+                "complexity",
+                "কমপ্লেক্সিটি",
+                "জটিলতা",
+            ]
         ):
             return QueryType.COMPLEXITY
         elif any(
-            phrase in question_lower for phrase in ["used for", "purpose of", "why use"]
+            phrase in question_lower
+            for phrase in [
+                "used for",
+                "purpose of",
+                "why use",
+                "উদ্দেশ্য",
+                "কেন ব্যবহার",
+            ]
         ):
             return QueryType.PURPOSE
+        elif cls.BANGLA_DEFINITION.search(question):
+            return QueryType.DEFINITION
         else:
             return QueryType.GENERAL
 
+    @staticmethod
+    def chunk_key(doc: Any) -> Tuple:
+        """
+        Sort key giving retrieved chunks a fixed order.
+
+        Chunk ids (``course_chunk_12``) compare by their numbers, so chunks
+        keep their order in the book; chunks without an id follow by source,
+        page and position.
+        """
+        metadata = getattr(doc, "metadata", None) or {}
+        chunk_id = str(metadata.get("id", ""))
+        parts = tuple(
+            (0, int(part), "") if part.isdigit() else (1, 0, part)
+            for part in re.split(r"(\d+)", chunk_id)
+            if part
+        )
+        return (
+            not chunk_id,
+            parts,
+            str(metadata.get("source", metadata.get("file_name", ""))),
+            metadata.get("page_number", metadata.get("page", 0)),
+            metadata.get("chunk_index", 0),
+        )
+
     @classmethod
-    def generate_prompt(
-        cls, question: str, context: str, query_type: Optional[QueryType] = None
-    ) -> str:
-        """Generate optimized prompt based on query type."""
+    def build_prompt(
+        cls,
+        question: str,
+        context: str,
+        query_type: Optional[QueryType] = None,
+        language: Optional[str] = None,
+    ) -> Dict[str, str]:
+        """
+        Assemble the prompt with its static part first.
+
+        Returns:
+            ``system`` (the same for every request) and ``prompt``: the
+            context, then the question and the instructions for its
+            language and query type, which vary per request
+        """
         if query_type is None:
             query_type = cls.detect_query_type(question)
 
-        instruction = cls.TEMPLATES[query_type]
-
-        return f"""You are an expert computer science educator specializing in algorithms and data structures.
-
-CRITICAL INSTRUCTIONS - MUST FOLLOW:
-1. Answer ONLY using information from the CONTEXT below
-2. Write naturally and smoothly, like ChatGPT or Grok - be conversational yet precise
-3. DO NOT reference "Document 1", "Document 2", or "according to the materials" in your answer
-4. DO NOT say "based on the context" or "the textbook says" - just explain directly
-5. If the CONTEXT lacks information, respond: "I cannot find this information in the textbook."
-6. DO NOT use general knowledge outside the CONTEXT
-7. DO NOT answer non-CS topics (cooking, sports, etc.) - respond: "This is outside the scope of algorithms and data structures."
-8. Write as if you're explaining to a student - clear, engaging, and well-structured
-9. Use examples from the CONTEXT when helpful, but integrate them smoothly
-10. The sources will be shown separately, so focus on crafting a high-quality explanation
-
-CONTEXT FROM TEXTBOOK:
-{context}
-
-QUESTION: {question}
+        lines = [f"CONTEXT FROM TEXTBOOK:\n{context}", f"QUESTION: {question}"]
+        if language in cls.LANGUAGE_INSTRUCTIONS:
+            lines.append(cls.LANGUAGE_INSTRUCTIONS[language])
+        return {
+            "system": cls.SYSTEM_PROMPT,
+            "prompt": "\n\n".join(lines) + "\n" + cls.TEMPLATES[query_type],
+        }
 
-Write a natural, flowing explanation using only the information above. Be clear, engaging, and avoid meta-references.
-{instruction}"""
+    @classmethod
+    def generate_prompt(
+        cls, question: str, context: str, query_type: Optional[QueryType] = None
+    ) -> str:
+        """Generate optimized prompt based on query type, as a single string."""
+        prompt = cls.build_prompt(question, context, query_type)
+        return f"{prompt['system']}\n\n{prompt['prompt']}"
 
 
 class LLMModel(ABC):
@@ -177,6 +302,17 @@ class OllamaModel(LLMModel):
         self._session = requests.Session()
         self._session.timeout = OLLAMA_API_TIMEOUT
         self._model_info: Optional[Dict] = None
+        self._model_info_expires = 0.0  # Failed lookups are only kept briefly
+        self._supports_json_mode = True
+        self._last_prompt = ""
+        self._lock = threading.Lock()
+        self._prompt_stats = {
+            "requests": 0,
+            "prompt_chars": 0,
+            "shared_prefix_chars": 0,
+            "prompt_eval_tokens": 0,
+            "prompt_eval_seconds": 0.0,
+        }
         self._check_availability()
 
     def _check_availability(self) -> None:
@@ -195,49 +331,228 @@ class OllamaModel(LLMModel):
         except Exception as e:
             logger.error(f"Failed to check model availability: {e}")
 
-    @retry_with_backoff(max_retries=3)
-    @timeout_handler(TIMEOUT_SECONDS)
+    def supports_system(self) -> bool:
+        """Whether the model's template places a system prompt (``.System``)."""
+        template = self.get_model_info().get("template") or ""
+        return ".System" in template
+
+    def _payload(
+        self,
+        prompt: str,
+        system: Optional[str],
+        stream: bool,
+        max_tokens: int,
+        temperature: float,
+    ) -> Dict[str, Any]:
+        """
+        Request body for ``/api/generate``.
+
+        ``system`` goes in Ollama's ``system`` field when the model's template
+        uses one, otherwise ahead of the prompt; either way it comes first.
+        """
+        payload = {
+            "model": self.model_name,
+            "prompt": prompt,
+            "stream": stream,
+            "keep_alive": OLLAMA_KEEP_ALIVE_SECONDS,
+            "options": {
+                "num_predict": max_tokens,
+                "temperature": temperature,
+                "top_p": 0.9,
+                "stop": ["Human:", "Assistant:", "User:"],
+            },
+        }
+        if system and self.supports_system():
+            payload["system"] = system
+        elif system:
+            payload["prompt"] = f"{system}\n\n{prompt}"
+        return payload
+
+    def _record_prompt_eval(self, payload: Dict[str, Any], body: Dict[str, Any]):
+        """
+        Record Ollama's prompt evaluation for a finished request.
+
+        Ollama reuses the evaluated prefix of the previous prompt, so with a
+        stable prefix ``prompt_eval_count`` and ``prompt_eval_duration`` cover
+        little more than the part that changed. The share of the prompt the
+        previous one shared is kept alongside, to compare the two.
+        """
+        text = payload.get("system", "") + payload["prompt"]
+        with self._lock:
+            shared = len(os.path.commonprefix([self._last_prompt, text]))
+            self._last_prompt = text
+            self._prompt_stats["requests"] += 1
+            self._prompt_stats["prompt_chars"] += len(text)
+            self._prompt_stats["shared_prefix_chars"] += shared
+            self._prompt_stats["prompt_eval_tokens"] += body.get("prompt_eval_count", 0)
+            self._prompt_stats["prompt_eval_seconds"] += (
+                body.get("prompt_eval_duration", 0) / 1e9
+            )
+
+    def get_prompt_stats(self) -> Dict[str, Any]:
+        """Get prompt evaluation counts and time (totals)."""
+        with self._lock:
+            return dict(self._prompt_stats)
+
     @measure_performance
     def generate_response(
         self,
         prompt: str,
         max_tokens: int = MAX_TOKENS,
         temperature: float = TEMPERATURE,
+        deadline: Optional[Deadline] = None,
+        system: Optional[str] = None,
         **kwargs,
     ) -> str:
-        """Generate response using Ollama API."""
-        try:
-            payload = {
-                "model": self.model_name,
-                "prompt": prompt,
-                "stream": False,
-                "options": {
-                    "num_predict": max_tokens,
-                    "temperature": temperature,
-                    "top_p": 0.9,
-                    "stop": ["Human:", "Assistant:", "User:"],
-                },
-            }
+        """
+        Generate response using Ollama API.
+
+        Network errors and server errors are retried with backoff while
+        ``deadline`` leaves at least ``OLLAMA_MIN_ATTEMPT_SECONDS``. Each
+        attempt's HTTP timeout is capped by the time left; Ollama sends a
+        non-streamed body only once generation is done, so the read timeout
+        bounds the whole call. A timed-out attempt is not retried: the model
+        manager moves on to the next model instead, and neither is a refused
+        connection: the pool moves the request to another node.
+        """
+        deadline = deadline or Deadline()
+        payload = self._payload(prompt, system, False, max_tokens, temperature)
+
+        last_error: Optional[Exception] = None
+        for attempt in range(OLLAMA_MAX_RETRIES):
+            timeout = deadline.timeout(TIMEOUT_SECONDS)
+            if timeout < OLLAMA_MIN_ATTEMPT_SECONDS:
+                raise DeadlineExceededException(
+                    f"Only {timeout:.1f}s left for {self.model_name}"
+                ) from last_error
 
+            try:
+                response = self._session.post(
+                    f"{self.base_url}/api/generate",
+                    json=payload,
+                    timeout=(min(OLLAMA_API_TIMEOUT, timeout), timeout),
+                )
+            except requests.Timeout:
+                logger.error(
+                    f"Ollama request timed out after {timeout:.0f}s for model {self.model_name}"
+                )
+                raise NetworkException("Ollama request timed out")
+            except requests.ConnectionError as e:
+                raise NodeUnreachableException(f"Ollama request failed: {e}")
+            except requests.RequestException as e:
+                last_error = NetworkException(f"Ollama request failed: {e}")
+            else:
+                if response.status_code == 200:
+                    body = response.json()
+                    self._record_prompt_eval(payload, body)
+                    return body.get("response", "").strip()
+
+                logger.error(
+                    f"Ollama API error: {response.status_code} - {response.text}"
+                )
+                if response.status_code < 500:
+                    # Unknown model or bad request: retrying cannot help
+                    raise ModelException(f"Ollama API error: {response.status_code}")
+                last_error = NetworkException(
+                    f"Ollama API error: {response.status_code}"
+                )
+
+            if attempt < OLLAMA_MAX_RETRIES - 1:
+                sleep_time = deadline.timeout(2**attempt)
+                logger.warning(
+                    f"Attempt {attempt + 1} failed for {self.model_name}: "
+                    f"{last_error}. Retrying in {sleep_time:.1f}s..."
+                )
+                time.sleep(sleep_time)
+
+        raise last_error
+
+    def stream_response(
+        self,
+        prompt: str,
+        max_tokens: int = MAX_TOKENS,
+        temperature: float = TEMPERATURE,
+        json_mode: bool = False,
+        deadline: Optional[Deadline] = None,
+        system: Optional[str] = None,
+        **kwargs,
+    ) -> Iterator[str]:
+        """
+        Stream response tokens from the Ollama API.
+
+        With ``json_mode`` the request asks Ollama to constrain output to JSON;
+        servers that reject the ``format`` option are remembered and retried
+        without it. ``deadline`` caps the wait for the first token (and for
+        each later one), not the length of the stream. Closing the generator
+        closes the HTTP stream.
+        """
+        timeout = (deadline or Deadline()).timeout(TIMEOUT_SECONDS)
+        payload = self._payload(prompt, system, True, max_tokens, temperature)
+        if json_mode and self._supports_json_mode:
+            payload["format"] = "json"
+
+        try:
             response = self._session.post(
-                f"{self.base_url}/api/generate", json=payload, timeout=TIMEOUT_SECONDS
+                f"{self.base_url}/api/generate",
+                json=payload,
+                stream=True,
+                timeout=(min(OLLAMA_API_TIMEOUT, timeout), timeout),
             )
+        except requests.Timeout:
+            logger.error(f"Ollama stream timed out for model {self.model_name}")
+            raise NetworkException("Ollama request timed out")
+        except requests.ConnectionError as e:
+            raise NodeUnreachableException(f"Ollama stream failed: {e}")
+        except requests.RequestException as e:
+            raise NetworkException(f"Ollama stream failed: {e}")
 
-            if response.status_code == 200:
-                result = response.json()
-                return result.get("response", "").strip()
-            else:
+        try:
+            if response.status_code == 400 and "format" in payload:
+                logger.warning(
+                    f"Ollama rejected JSON mode for {self.model_name}, disabling it"
+                )
+                self._supports_json_mode = False
+                response.close()
+                yield from self.stream_response(
+                    prompt,
+                    max_tokens,
+                    temperature,
+                    json_mode=False,
+                    deadline=deadline,
+                    system=system,
+                )
+                return
+
+            if response.status_code != 200:
                 logger.error(
                     f"Ollama API error: {response.status_code} - {response.text}"
                 )
                 raise NetworkException(f"Ollama API error: {response.status_code}")
 
+            for line in response.iter_lines():
+                if not line:
+                    continue
+                try:
+                    chunk = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+
+                if chunk.get("error"):
+                    raise ModelException(f"Ollama stream error: {chunk['error']}")
+
+                token = chunk.get("response", "")
+                if token:
+                    yield token
+
+                if chunk.get("done", False):
+                    self._record_prompt_eval(payload, chunk)
+                    break
+
         except requests.Timeout:
-            logger.error(f"Ollama request timed out for model {self.model_name}")
+            logger.error(f"Ollama stream timed out for model {self.model_name}")
             raise NetworkException("Ollama request timed out")
-        except Exception as e:
-            logger.error(f"Ollama generation failed: {e}")
-            raise ModelException(f"Response generation failed: {e}")
+        finally:
+            response.close()
 
     def is_available(self) -> bool:
         """Check if model is available."""
@@ -252,8 +567,14 @@ class OllamaModel(LLMModel):
         return False
 
     def get_model_info(self) -> Dict[str, Any]:
-        """Get model information."""
-        if self._model_info is None:
+        """
+        Get model information.
+
+        A successful ``/api/show`` is cached for the model's lifetime; a failed
+        one for ``OLLAMA_MODEL_INFO_RETRY_SECONDS``, so a model pulled or a
+        server restarted later is picked up.
+        """
+        if self._model_info is None or time.time() >= self._model_info_expires:
             try:
                 response = self._session.post(
                     f"{self.base_url}/api/show",
@@ -262,18 +583,633 @@ class OllamaModel(LLMModel):
                 )
                 if response.status_code == 200:
                     self._model_info = response.json()
+                    self._model_info_expires = float("inf")
                 else:
                     self._model_info = {
                         "name": self.model_name,
                         "status": "unavailable",
                     }
+                    self._model_info_expires = (
+                        time.time() + OLLAMA_MODEL_INFO_RETRY_SECONDS
+                    )
             except Exception as e:
                 logger.error(f"Failed to get model info: {e}")
                 self._model_info = {"name": self.model_name, "error": str(e)}
+                self._model_info_expires = time.time() + OLLAMA_MODEL_INFO_RETRY_SECONDS
 
         return self._model_info
 
 
+class OllamaNode:
+    """
+    One Ollama server in the pool, with what routing needs to know about it.
+
+    ``available`` and ``loaded`` hold the models from ``/api/tags`` and
+    ``/api/ps`` at the last refresh (``available`` is None until known);
+    ``loaded`` also gains every model the node has answered with since. A
+    node that cannot be reached is unhealthy until a refresh reaches it
+    again, and a draining node takes no new requests.
+    """
+
+    def __init__(self, url: str, capacity: int = OLLAMA_MAX_CONCURRENCY):
+        self.url = url.rstrip("/")
+        self.capacity = capacity
+        self.healthy = True
+        self.draining = False
+        self.available: Optional[set] = None
+        self.loaded: set = set()
+        self.in_flight = 0
+        self._latency: deque = deque(maxlen=OLLAMA_NODE_LATENCY_SAMPLES)
+        self._models: Dict[str, OllamaModel] = {}
+        self._session = requests.Session()
+        self._lock = threading.Lock()
+        self._refreshing = threading.Lock()
+        self._stats = {"requests": 0, "errors": 0, "cold_loads": 0}
+
+    def model(self, model_name: str) -> OllamaModel:
+        """Get or create the client for ``model_name`` on this node."""
+        model = self._models.get(model_name)
+        if model is None:
+            model = self._models.setdefault(
+                model_name, OllamaModel(model_name, base_url=self.url)
+            )
+        return model
+
+    def prompt_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Prompt evaluation totals per model used on this node."""
+        return {
+            name: model.get_prompt_stats() for name, model in list(self._models.items())
+        }
+
+    def serves(self, model_name: str) -> bool:
+        """Whether the node has the model (assumed until its tags are known)."""
+        return self.available is None or model_name in self.available
+
+    def latency(self) -> float:
+        """Mean recent time to first token (0 before the first request)."""
+        with self._lock:
+            samples = list(self._latency)
+        return sum(samples) / len(samples) if samples else 0.0
+
+    def begin(self, model_name: str) -> None:
+        """Count a request routed here."""
+        with self._lock:
+            self.in_flight += 1
+            self._stats["requests"] += 1
+            if model_name not in self.loaded:
+                self._stats["cold_loads"] += 1
+
+    def end(
+        self, model_name: str, seconds: Optional[float], error: Optional[Exception]
+    ) -> None:
+        """
+        Count a finished request and its time to first token.
+
+        A connection failure triggers an immediate refresh, so an
+        unreachable node leaves rotation without waiting for the next poll.
+        """
+        with self._lock:
+            self.in_flight -= 1
+            if error is None:
+                self.loaded.add(model_name)
+                if seconds is not None:
+                    self._latency.append(seconds)
+            else:
+                self._stats["errors"] += 1
+
+        if isinstance(error, NodeUnreachableException):
+            threading.Thread(target=self.refresh, daemon=True).start()
+
+    def load(
+        self,
+        model_name: str,
+        embedding: bool = False,
+        keep_alive: int = OLLAMA_KEEP_ALIVE_SECONDS,
+        timeout: float = OLLAMA_PRELOAD_TIMEOUT,
+    ) -> float:
+        """
+        Load ``model_name`` into memory without generating anything.
+
+        An empty prompt (or embedding input) makes Ollama load the model and
+        reset its ``keep_alive``; on a loaded model it returns at once.
+
+        Returns:
+            Seconds the request took
+
+        Raises:
+            NodeUnreachableException: If the node refuses the connection
+            ModelException: If Ollama cannot load the model
+        """
+        endpoint = "/api/embed" if embedding else "/api/generate"
+        payload = {"model": model_name, "keep_alive": keep_alive}
+        payload["input" if embedding else "prompt"] = ""
+
+        started = time.monotonic()
+        try:
+            response = self._session.post(
+                f"{self.url}{endpoint}",
+                json=payload,
+                timeout=(OLLAMA_API_TIMEOUT, timeout),
+            )
+        except requests.ConnectionError as e:
+            raise NodeUnreachableException(f"Ollama node {self.url} refused: {e}")
+        except requests.RequestException as e:
+            raise ModelException(f"Loading {model_name} on {self.url} failed: {e}")
+        if response.status_code != 200:
+            raise ModelException(
+                f"Loading {model_name} on {self.url} failed: "
+                f"{response.status_code} - {response.text[:200]}"
+            )
+
+        with self._lock:
+            self.loaded.add(model_name)
+        return time.monotonic() - started
+
+    def refresh(self) -> bool:
+        """Poll the node's models; marks it healthy if it answers."""
+        if not self._refreshing.acquire(blocking=False):
+            return self.healthy  # Already being polled
+
+        try:
+            try:
+                response = self._session.get(f"{self.url}/api/tags", timeout=5)
+                response.raise_for_status()
+                available = {m["name"] for m in response.json().get("models", [])}
+                response = self._session.get(f"{self.url}/api/ps", timeout=5)
+                loaded = (
+                    {m["name"] for m in response.json().get("models", [])}
+                    if response.status_code == 200
+                    else None
+                )
+            except (requests.RequestException, ValueError, KeyError) as e:
+                if self.healthy:
+                    logger.warning(f"Ollama node {self.url} is unreachable: {e}")
+                self.healthy = False
+                return False
+
+            with self._lock:
+                if not self.healthy:
+                    logger.info(f"Ollama node {self.url} is back")
+                self.healthy = True
+                self.available = available
+                if loaded is not None:
+                    self.loaded = loaded
+            return True
+        finally:
+            self._refreshing.release()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get the node's routing state and counts."""
+        latency = self.latency()
+        with self._lock:
+            return {
+                "url": self.url,
+                "healthy": self.healthy,
+                "draining": self.draining,
+                "drained": self.draining and self.in_flight == 0,
+                "in_flight": self.in_flight,
+                "capacity": self.capacity,
+                "loaded": sorted(self.loaded),
+                "latency": round(latency, 3),
+                **self._stats,
+            }
+
+
+class OllamaPool:
+    """
+    Routes model calls across Ollama nodes.
+
+    A request goes to the least-loaded node that already has the model
+    loaded, so it does not pay for a cold load; a node without it is used
+    only when every warm node is at capacity or there is none. Load is the
+    expected wait, the requests in flight times the node's recent time to
+    first token. A background thread refreshes health and loaded models
+    every ``refresh_seconds``.
+    """
+
+    def __init__(
+        self,
+        urls: List[str],
+        capacity: int = OLLAMA_MAX_CONCURRENCY,
+        refresh_seconds: float = OLLAMA_NODE_REFRESH_SECONDS,
+    ):
+        if not urls:
+            raise ValueError("An Ollama pool needs at least one node")
+
+        self.nodes: Dict[str, OllamaNode] = {}
+        for url in urls:
+            node = OllamaNode(url, capacity)
+            self.nodes[node.url] = node
+        self.refresh_seconds = refresh_seconds
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        threading.Thread(
+            target=self._monitor, name="ollama-node-monitor", daemon=True
+        ).start()
+
+    def _monitor(self) -> None:
+        while True:
+            self.refresh()
+            if self._stop.wait(self.refresh_seconds):
+                return
+
+    def refresh(self) -> None:
+        """Poll every node now."""
+        for node in list(self.nodes.values()):
+            node.refresh()
+
+    def close(self) -> None:
+        """Stop the background refresh."""
+        self._stop.set()
+
+    def acquire(
+        self, model_name: str, exclude: Tuple[str, ...] = (), warm_only: bool = False
+    ) -> Optional[OllamaNode]:
+        """
+        Pick a node for ``model_name`` and count the request on it.
+
+        Nodes in ``exclude`` are skipped; with ``warm_only`` only nodes that
+        have the model loaded and a free slot qualify. If no healthy node
+        can serve the model, unhealthy ones are tried rather than failing
+        outright. Returns None when no node qualifies.
+        """
+        with self._lock:
+            candidates = [
+                node
+                for node in self.nodes.values()
+                if not node.draining
+                and node.url not in exclude
+                and node.serves(model_name)
+            ]
+            healthy = [node for node in candidates if node.healthy]
+            candidates = healthy or candidates
+
+            warm = [
+                node
+                for node in candidates
+                if model_name in node.loaded and node.in_flight < node.capacity
+            ]
+            if warm_only:
+                candidates = [node for node in warm if node.healthy]
+            elif warm:
+                candidates = warm
+            if not candidates:
+                return None
+
+            node = min(
+                candidates,
+                key=lambda n: ((n.in_flight + 1) * n.latency(), n.in_flight),
+            )
+            node.begin(model_name)
+            return node
+
+    def any_node(self, model_name: str) -> OllamaNode:
+        """A node to ask about ``model_name`` (healthy ones first)."""
+        nodes = sorted(
+            self.nodes.values(),
+            key=lambda n: (not n.healthy, n.draining, not n.serves(model_name)),
+        )
+        return nodes[0]
+
+    def drain(self, url: str) -> bool:
+        """Stop routing new requests to ``url``; in-flight ones finish."""
+        node = self.nodes.get(url.rstrip("/"))
+        if node is None:
+            return False
+        node.draining = True
+        logger.info(f"Draining Ollama node {node.url} ({node.in_flight} in flight)")
+        return True
+
+    def restore(self, url: str) -> bool:
+        """Put a drained node back into rotation."""
+        node = self.nodes.get(url.rstrip("/"))
+        if node is None:
+            return False
+        node.draining = False
+        node.refresh()
+        logger.info(f"Ollama node {node.url} restored")
+        return True
+
+    def get_stats(self) -> List[Dict[str, Any]]:
+        """Get routing state per node."""
+        return [node.get_stats() for node in self.nodes.values()]
+
+
+class ModelResidency:
+    """
+    Keeps chosen models loaded on every Ollama node.
+
+    Resident models are loaded at startup and, every ``refresh_seconds``,
+    each node's loaded models (``/api/ps``) are checked: a resident model a
+    node has evicted is loaded again, and one still loaded gets its
+    ``keep_alive`` extended, so no request pays for the load. Each load that
+    had to bring weights into memory is recorded as a cold-load event.
+    Requests routed to a node without their model loaded are counted per
+    node (``cold_loads`` in the node stats).
+    """
+
+    def __init__(
+        self,
+        pool: OllamaPool,
+        keep_alive: int = OLLAMA_KEEP_ALIVE_SECONDS,
+        refresh_seconds: float = OLLAMA_RESIDENCY_REFRESH_SECONDS,
+    ):
+        self.pool = pool
+        self.keep_alive = keep_alive
+        self.refresh_seconds = refresh_seconds
+        self._resident: Dict[str, bool] = {}  # Model -> is an embedding model
+        self._events: deque = deque(maxlen=OLLAMA_RESIDENCY_EVENTS)
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._stats = {
+            "preloads": 0,
+            "reloads": 0,
+            "extended": 0,
+            "failures": 0,
+            "cold_load_seconds": 0.0,
+        }
+
+    def start(self) -> None:
+        """Start the periodic residency check (once)."""
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(
+                target=self._monitor, name="ollama-residency", daemon=True
+            )
+        self._thread.start()
+
+    def close(self) -> None:
+        """Stop the periodic residency check."""
+        self._stop.set()
+
+    def _monitor(self) -> None:
+        while not self._stop.wait(self.refresh_seconds):
+            self.refresh()
+
+    def pin(self, model_name: str, embedding: bool = False) -> None:
+        """Keep ``model_name`` loaded from the next check on."""
+        with self._lock:
+            self._resident[model_name] = embedding
+
+    def unpin(self, model_name: str) -> None:
+        """Let Ollama evict ``model_name`` again when it is idle."""
+        with self._lock:
+            self._resident.pop(model_name, None)
+
+    def resident(self) -> List[str]:
+        """Models kept loaded."""
+        with self._lock:
+            return sorted(self._resident)
+
+    def _nodes(self, model_name: str) -> List[OllamaNode]:
+        """Nodes that should hold ``model_name``."""
+        return [
+            node
+            for node in self.pool.nodes.values()
+            if node.healthy and not node.draining and node.serves(model_name)
+        ]
+
+    def preload(
+        self, model_name: str, embedding: bool = False, reason: str = "preload"
+    ) -> bool:
+        """
+        Load ``model_name`` on every node that serves it, in parallel.
+
+        Returns:
+            True if at least one node has it loaded
+        """
+        nodes = self._nodes(model_name)
+        if not nodes:
+            logger.warning(f"No Ollama node to preload {model_name} on")
+            return False
+
+        results: Dict[str, bool] = {}
+
+        def load(node: OllamaNode) -> None:
+            results[node.url] = self._load(node, model_name, embedding, reason)
+
+        threads = [
+            threading.Thread(target=load, args=(node,), daemon=True) for node in nodes
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return any(results.values())
+
+    def _load(
+        self, node: OllamaNode, model_name: str, embedding: bool, reason: str
+    ) -> bool:
+        """Load on one node, recording it as a cold load if it was not loaded."""
+        cold = model_name not in node.loaded
+        try:
+            seconds = node.load(
+                model_name, embedding=embedding, keep_alive=self.keep_alive
+            )
+        except Exception as e:
+            logger.warning(f"Preloading {model_name} on {node.url} failed: {e}")
+            with self._lock:
+                self._stats["failures"] += 1
+            return False
+
+        with self._lock:
+            if not cold:
+                self._stats["extended"] += 1
+                return True
+            self._stats["reloads" if reason == "evicted" else "preloads"] += 1
+            self._stats["cold_load_seconds"] += seconds
+            self._events.append(
+                {
+                    "model": model_name,
+                    "node": node.url,
+                    "reason": reason,
+                    "seconds": round(seconds, 2),
+                    "at": time.time(),
+                }
+            )
+        logger.info(f"Loaded {model_name} on {node.url} in {seconds:.1f}s ({reason})")
+        return True
+
+    def refresh(self) -> None:
+        """Reload evicted resident models and extend the others' keep-alive."""
+        self.pool.refresh()
+        with self._lock:
+            resident = dict(self._resident)
+        for model_name, embedding in resident.items():
+            for node in self._nodes(model_name):
+                reason = "keep_alive" if model_name in node.loaded else "evicted"
+                self._load(node, model_name, embedding, reason)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get resident models, load counts and recent cold loads."""
+        with self._lock:
+            stats = dict(self._stats)
+            events = list(self._events)
+            resident = sorted(self._resident)
+        nodes = self.pool.get_stats()
+        return {
+            "resident": resident,
+            "keep_alive": self.keep_alive,
+            **stats,
+            "cold_load_seconds": round(stats["cold_load_seconds"], 2),
+            "request_cold_loads": sum(node["cold_loads"] for node in nodes),
+            "loaded": {node["url"]: node["loaded"] for node in nodes},
+            "recent_cold_loads": events,
+        }
+
+
+class HedgePolicy:
+    """
+    Decides when to send a backup request, and how many.
+
+    A model's hedge delay is the ``percentile`` of its recent times to first
+    token (never below ``min_delay``); until ``min_samples`` are known the
+    model is not hedged. Every request earns ``max_fraction`` of a hedge
+    credit (up to ``burst``) and every hedge spends one, so hedges never add
+    more than that fraction of extra load.
+    """
+
+    def __init__(
+        self,
+        percentile: float = OLLAMA_HEDGE_PERCENTILE,
+        max_fraction: float = OLLAMA_HEDGE_MAX_FRACTION,
+        burst: float = OLLAMA_HEDGE_BURST,
+        min_delay: float = OLLAMA_HEDGE_MIN_DELAY,
+        min_samples: int = OLLAMA_HEDGE_MIN_SAMPLES,
+        samples: int = OLLAMA_TTFT_SAMPLES,
+    ):
+        self.percentile = percentile
+        self.max_fraction = max_fraction
+        self.burst = max(burst, 1.0)
+        self.min_delay = min_delay
+        self.min_samples = min_samples
+        self.samples = samples
+        self._ttft: Dict[str, deque] = {}
+        self._credits = 0.0
+        self._lock = threading.Lock()
+        self._stats = {
+            "requests": 0,
+            "hedges": 0,
+            "hedge_wins": 0,
+            "skipped_no_credit": 0,
+            "skipped_no_slot": 0,
+            "losers_cancelled": 0,
+        }
+
+    def record_ttft(self, model_name: str, seconds: float) -> None:
+        """Remember a model's time to first token."""
+        with self._lock:
+            self._ttft.setdefault(model_name, deque(maxlen=self.samples)).append(
+                seconds
+            )
+
+    def delay(self, model_name: str) -> Optional[float]:
+        """Seconds to wait for a first token before hedging (None: don't)."""
+        with self._lock:
+            samples = sorted(self._ttft.get(model_name, ()))
+        if len(samples) < self.min_samples:
+            return None
+        index = min(int(len(samples) * self.percentile / 100), len(samples) - 1)
+        return max(samples[index], self.min_delay)
+
+    def note_request(self) -> None:
+        """Count a request and earn its share of a hedge credit."""
+        with self._lock:
+            self._stats["requests"] += 1
+            self._credits = min(self._credits + self.max_fraction, self.burst)
+
+    def can_hedge(self) -> bool:
+        """Whether a hedge credit is available."""
+        with self._lock:
+            if self._credits < 1.0:
+                self._stats["skipped_no_credit"] += 1
+                return False
+            return True
+
+    def spend(self) -> None:
+        """Spend a credit on a hedge that is being sent."""
+        with self._lock:
+            self._credits = max(self._credits - 1.0, 0.0)
+            self._stats["hedges"] += 1
+
+    def record(self, event: str) -> None:
+        """Count a hedging event (``hedge_wins``, ``skipped_no_slot``, ...)."""
+        with self._lock:
+            self._stats[event] += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get hedge counts and the current per-model delays."""
+        with self._lock:
+            stats = dict(self._stats)
+            models = list(self._ttft)
+        stats["hedge_rate"] = round(stats["hedges"] / max(stats["requests"], 1), 4)
+        delays = {model: self.delay(model) for model in models}
+        stats["delays"] = {
+            model: round(delay, 2) for model, delay in delays.items() if delay
+        }
+        return stats
+
+
+class StreamAttempt:
+    """
+    One model stream consumed on a worker thread, so attempts can be raced.
+
+    Tokens, completion and errors are put on the shared ``events`` queue as
+    ``(attempt, kind, payload)``. ``cancel`` makes the worker close its
+    stream (aborting the Ollama request) at the next token; a stalled
+    request is bounded by the stream's read timeout.
+    """
+
+    def __init__(
+        self,
+        model_name: str,
+        stream: Iterator[str],
+        events: "queue.Queue",
+        on_first_token: Optional[Callable[[float], None]] = None,
+        on_finish: Optional[Callable[[Optional[Exception]], None]] = None,
+        node: Optional[OllamaNode] = None,
+    ):
+        self.model_name = model_name
+        self.node = node
+        self.failed = False
+        self._stream = stream
+        self._events = events
+        self._on_first_token = on_first_token
+        self._on_finish = on_finish
+        self._cancelled = threading.Event()
+        self._started_at = time.monotonic()
+        threading.Thread(
+            target=self._run, name=f"llm-attempt-{model_name}", daemon=True
+        ).start()
+
+    def _run(self) -> None:
+        first = True
+        error: Optional[Exception] = None
+        try:
+            for token in self._stream:
+                if first:
+                    first = False
+                    if self._on_first_token:
+                        self._on_first_token(time.monotonic() - self._started_at)
+                if self._cancelled.is_set():
+                    return
+                self._events.put((self, "token", token))
+            self._events.put((self, "done", None))
+        except Exception as e:
+            error = e
+            self._events.put((self, "error", e))
+        finally:
+            self._stream.close()
+            if self._on_finish:
+                self._on_finish(error)
+
+    def cancel(self) -> None:
+        """Stop at the next token and close the stream."""
+        self._cancelled.set()
+
+
 class ModelManager:
     """Manages multiple LLM models with fallback and caching."""
 
@@ -281,25 +1217,74 @@ class ModelManager:
         self,
         preferred_model: str = PREFERRED_LLM_MODEL,
         fallback_models: List[str] = None,
+        max_concurrency: int = OLLAMA_MAX_CONCURRENCY,
+        base_url: Optional[str] = None,
+        hedging: bool = OLLAMA_HEDGING,
+        nodes: Optional[List[str]] = None,
+        preload: bool = OLLAMA_PRELOAD_MODELS,
     ):
         self.preferred_model = preferred_model
         self.fallback_models = fallback_models or FALLBACK_LLM_MODELS
-        self._models: Dict[str, OllamaModel] = {}
+        self.max_concurrency = max_concurrency
+        # Ollama servers to balance across; ``base_url`` is a one-node pool
+        urls = nodes or ([base_url] if base_url else OLLAMA_NODES)
+        self.base_url = urls[0]
+        self._pool = OllamaPool(urls, capacity=max_concurrency)
+        # Models kept loaded on every node, so requests skip the cold load
+        self.preload = preload
+        self._residency = ModelResidency(self._pool)
+        # Per-model breakers: a failing model is skipped instead of costing
+        # every request its full timeout
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self.hedging = hedging
+        self._hedge = HedgePolicy()
         self._response_cache = SimpleCache(
             max_size=200, ttl_seconds=1800
         )  # 30 min cache
         self._active_model: Optional[str] = None
         self._lock = threading.Lock()
-        self._stats = {"requests": 0, "cache_hits": 0, "model_switches": 0, "errors": 0}
+        # Bounds in-flight Ollama requests, serving chat ahead of batch work;
+        # the lock only guards shared state
+        self._concurrency = PriorityLimiter(
+            max_concurrency * len(urls), reserved=OLLAMA_INTERACTIVE_RESERVED_SLOTS
+        )
+        self._stats = {
+            "requests": 0,
+            "cache_hits": 0,
+            "model_switches": 0,
+            "errors": 0,
+            "deadline_exceeded": 0,
+        }
+        # Streams closed before the model finished, and what that saved
+        self._cancellation = {
+            "streams_completed": 0,
+            "streams_cancelled": 0,
+            "tokens_generated": 0,
+            "tokens_saved_max": 0,
+            "tokens_saved_estimate": 0,
+        }
+        self._completion_lengths: Dict[int, deque] = {}
         self._warm_up_models()
 
     def _warm_up_models(self) -> None:
-        """Warm up models in background."""
+        """Warm up models in background, loading the resident ones into Ollama."""
 
         def warm_up():
             try:
                 # Initialize preferred model
                 self._get_or_create_model(self.preferred_model)
+                if self.preload:
+                    self._residency.pin(ENGLISH_EMBEDDING_MODEL, embedding=True)
+                    for model_name in [self.preferred_model] + OLLAMA_RESIDENT_MODELS:
+                        self._residency.pin(model_name)
+                    self._residency.pool.refresh()
+                    for model_name in self._residency.resident():
+                        self._residency.preload(
+                            model_name,
+                            embedding=model_name == ENGLISH_EMBEDDING_MODEL,
+                            reason="startup",
+                        )
+                    self._residency.start()
                 logger.info("Model warm-up completed")
             except Exception as e:
                 logger.warning(f"Model warm-up failed: {e}")
@@ -307,10 +1292,264 @@ class ModelManager:
         threading.Thread(target=warm_up, daemon=True).start()
 
     def _get_or_create_model(self, model_name: str) -> OllamaModel:
-        """Get or create model instance."""
-        if model_name not in self._models:
-            self._models[model_name] = OllamaModel(model_name)
-        return self._models[model_name]
+        """Get or create model instance (on a healthy node, for metadata)."""
+        return self._pool.any_node(model_name).model(model_name)
+
+    def _breaker(self, model_name: str) -> CircuitBreaker:
+        """Get or create the circuit breaker for a model."""
+        with self._lock:
+            if model_name not in self._breakers:
+                self._breakers[model_name] = CircuitBreaker(
+                    OLLAMA_BREAKER_FAILURES, OLLAMA_BREAKER_RESET_SECONDS
+                )
+            return self._breakers[model_name]
+
+    def _out_of_time(self, deadline: Deadline, model_name: str) -> bool:
+        """Whether too little budget is left to try ``model_name``."""
+        if deadline.timeout(TIMEOUT_SECONDS) >= OLLAMA_MIN_ATTEMPT_SECONDS:
+            return False
+        logger.warning(f"Deadline reached before trying {model_name}")
+        with self._lock:
+            self._stats["deadline_exceeded"] += 1
+        return True
+
+    def _next_usable(self, chain: Iterator[str], deadline: Deadline) -> Optional[str]:
+        """
+        Take the next model from ``chain`` whose circuit allows a call.
+
+        Returns None once the chain is used up or the deadline is too close.
+        """
+        for model_name in chain:
+            if self._out_of_time(deadline, model_name):
+                return None
+            if self._breaker(model_name).allow():
+                return model_name
+            logger.debug("Skipping %s, circuit open", model_name)
+        return None
+
+    def _start_attempt(
+        self,
+        model_name: str,
+        prompt: str,
+        deadline: Deadline,
+        events: "queue.Queue",
+        kwargs: Dict[str, Any],
+        release: Optional[Callable[[], None]] = None,
+        node: Optional[OllamaNode] = None,
+        avoid: Tuple[str, ...] = (),
+    ) -> StreamAttempt:
+        """
+        Start streaming from ``model_name`` on a worker thread.
+
+        The request goes to ``node`` if one was already picked, otherwise
+        to the node the pool routes it to (other than those in ``avoid``).
+        The model's breaker, the node's
+        load and the first-token times are updated from the worker, so they
+        stay accurate even for attempts that lose a race. ``release`` runs
+        when the attempt ends (a hedge's extra slot).
+        """
+        breaker = self._breaker(model_name)
+        node = node or self._pool.acquire(model_name, exclude=avoid)
+        first_token: List[float] = []
+
+        def on_first_token(seconds: float) -> None:
+            first_token.append(seconds)
+            breaker.record_success()
+            self._hedge.record_ttft(model_name, seconds)
+
+        def on_finish(error: Optional[Exception]) -> None:
+            if error is not None:
+                breaker.record_failure()
+            elif not first_token:
+                breaker.record_success()  # Empty but clean answer
+            if node:
+                node.end(model_name, first_token[0] if first_token else None, error)
+            if release:
+                release()
+
+        try:
+            if node is None:
+                raise ModelException(f"No Ollama node can serve {model_name}")
+            stream = node.model(model_name).stream_response(
+                prompt, deadline=deadline, **kwargs
+            )
+        except Exception as e:
+            on_finish(e)
+            raise
+        return StreamAttempt(
+            model_name, stream, events, on_first_token, on_finish, node=node
+        )
+
+    def _start_hedge(
+        self,
+        primary: StreamAttempt,
+        avoid: set,
+        chain: Iterator[str],
+        prompt: str,
+        priority: int,
+        deadline: Deadline,
+        events: "queue.Queue",
+        kwargs: Dict[str, Any],
+    ) -> Optional[StreamAttempt]:
+        """
+        Send a backup request, if allowed.
+
+        The backup is the same model on another node that has it loaded,
+        or else the next usable fallback model.
+        """
+        if not self._hedge.can_hedge():
+            return None
+        # A hedge needs a spare slot; under saturation it would only add load
+        if not self._concurrency.acquire(priority, timeout=0):
+            self._hedge.record("skipped_no_slot")
+            return None
+
+        exclude = tuple(avoid | {primary.node.url}) if primary.node else ()
+        node = self._pool.acquire(primary.model_name, exclude=exclude, warm_only=True)
+        backup = primary.model_name if node else self._next_usable(chain, deadline)
+        if backup is None:
+            self._concurrency.release()
+            return None
+
+        self._hedge.spend()
+        logger.info(
+            f"Hedging slow first token with {backup}"
+            + (f" on {node.url}" if node else "")
+        )
+        try:
+            return self._start_attempt(
+                backup,
+                prompt,
+                deadline,
+                events,
+                kwargs,
+                release=self._concurrency.release,
+                node=node,
+                avoid=tuple(avoid),
+            )
+        except Exception as e:
+            logger.warning(f"Hedge to {backup} failed to start: {e}")
+            return None
+
+    def _race(
+        self,
+        primary: str,
+        chain: Iterator[str],
+        prompt: str,
+        priority: int,
+        deadline: Deadline,
+        kwargs: Dict[str, Any],
+        avoid: set,
+    ) -> Iterator[Tuple[str, str]]:
+        """
+        Stream ``primary``, hedged with the next usable model in ``chain``.
+
+        If no token arrived within the primary's hedge delay, a backup request
+        is started (see ``_start_hedge``). The first attempt to produce a token
+        wins and the other is cancelled; once a model is streaming, its finish
+        time is mostly fixed, so racing on to completion would only double the
+        load. Nodes in ``avoid`` are not used, and nodes that cannot be
+        connected to are added to it.
+
+        Yields:
+            ``(model, token)`` from the winning attempt
+
+        Raises:
+            The last error if every attempt fails before its first token, or
+            DeadlineExceededException if none starts before the deadline
+        """
+        events: queue.Queue = queue.Queue()
+        attempts = [
+            self._start_attempt(
+                primary, prompt, deadline, events, kwargs, avoid=tuple(avoid)
+            )
+        ]
+        hedge_delay = self._hedge.delay(primary) if self.hedging else None
+        hedge_at = None if hedge_delay is None else time.monotonic() + hedge_delay
+        winner: Optional[StreamAttempt] = None
+
+        try:
+            while True:
+                # The deadline bounds the first token, not the whole answer
+                wait = None if winner else deadline.remaining()
+                if hedge_at is not None:
+                    until_hedge = max(hedge_at - time.monotonic(), 0.0)
+                    wait = until_hedge if wait is None else min(wait, until_hedge)
+
+                try:
+                    attempt, kind, payload = events.get(timeout=wait)
+                except queue.Empty:
+                    if hedge_at is not None and time.monotonic() >= hedge_at:
+                        hedge_at = None
+                        backup = self._start_hedge(
+                            attempts[0],
+                            avoid,
+                            chain,
+                            prompt,
+                            priority,
+                            deadline,
+                            events,
+                            kwargs,
+                        )
+                        if backup:
+                            attempts.append(backup)
+                        continue
+                    raise DeadlineExceededException(
+                        f"No first token from {primary} before the deadline"
+                    )
+
+                if winner is None:
+                    if kind == "error":
+                        attempt.failed = True
+                        if attempt.node and isinstance(
+                            payload, NodeUnreachableException
+                        ):
+                            avoid.add(attempt.node.url)
+                        logger.warning(
+                            f"Model {attempt.model_name} failed to stream: {payload}"
+                        )
+                        with self._lock:
+                            self._stats["errors"] += 1
+                        if all(a.failed for a in attempts):
+                            raise payload
+                        continue
+
+                    winner = attempt
+                    hedge_at = None
+                    for other in attempts:
+                        if other is not winner and not other.failed:
+                            other.cancel()
+                            self._hedge.record("losers_cancelled")
+                    if winner is not attempts[0]:
+                        self._hedge.record("hedge_wins")
+
+                if attempt is not winner:
+                    continue
+                if kind == "token":
+                    yield attempt.model_name, payload
+                elif kind == "done":
+                    return
+                else:
+                    with self._lock:
+                        self._stats["errors"] += 1
+                    raise payload
+        finally:
+            for attempt in attempts:
+                attempt.cancel()
+
+    def _fail_over(
+        self, model_name: str, error: Exception, avoid: set, retried: set
+    ) -> bool:
+        """
+        Whether to retry ``model_name`` on another node after ``error``.
+
+        Only connection failures (the node, not the model, failed) are
+        retried, once per model and only while a node not in ``avoid`` is left.
+        """
+        if not isinstance(error, NodeUnreachableException) or model_name in retried:
+            return False
+        retried.add(model_name)
+        return any(url not in avoid for url in self._pool.nodes)
 
     def _find_available_model(self) -> Optional[str]:
         """Find first available model from preferred and fallback list."""
@@ -327,58 +1566,284 @@ class ModelManager:
 
         return None
 
+    @staticmethod
+    def _cache_key(prompt: str, model_name: str, kwargs: Dict[str, Any]) -> str:
+        """Response cache key: model, system and user prompt, and budget."""
+        prompt_hash = hash((model_name, kwargs.get("system"), prompt))
+        return f"response:{prompt_hash}:{kwargs.get('max_tokens', MAX_TOKENS)}"
+
+    def has_cached_response(
+        self, prompt: str, model_name: Optional[str] = None, **kwargs
+    ) -> bool:
+        """Whether ``generate_response`` would answer ``prompt`` from cache."""
+        if not kwargs.pop("use_cache", True):
+            return False
+        cache_model = model_name or self.get_active_model()
+        cache_key = self._cache_key(prompt, cache_model, kwargs)
+        return bool(self._response_cache.get(cache_key))
+
     @measure_performance
     def generate_response(
         self,
         prompt: str,
         use_cache: bool = True,
         model_name: Optional[str] = None,
+        priority: int = PRIORITY_INTERACTIVE,
+        fallback: bool = True,
+        deadline: Optional[Deadline] = None,
+        on_model: Optional[Callable[[str], None]] = None,
         **kwargs,
     ) -> Optional[str]:
-        """Generate response with fallback and caching."""
-        # Check cache first
+        """
+        Generate response with fallback and caching.
+
+        One ``deadline`` (``OLLAMA_REQUEST_BUDGET`` from now by default)
+        covers waiting for a slot, retries and every fallback model; models
+        whose circuit breaker is open are skipped. With ``fallback=False``
+        only the requested model is tried, e.g. when evaluating a specific
+        model. With hedging on, the answer is collected from
+        ``stream_response`` so that slow first tokens can be hedged.
+        ``on_model`` is called with the model that gave the answer.
+        """
+        # Check cache first (answers are cached per model asked for)
+        cache_model = model_name or self.get_active_model()
         if use_cache:
-            cache_key = (
-                f"response:{hash(prompt)}:{kwargs.get('max_tokens', MAX_TOKENS)}"
-            )
+            cache_key = self._cache_key(prompt, cache_model, kwargs)
             cached_response = self._response_cache.get(cache_key)
             if cached_response:
                 self._stats["cache_hits"] += 1
                 logger.debug("Using cached response")
+                if on_model:
+                    on_model(cache_model)
                 return cached_response
 
+        deadline = deadline or Deadline.after(OLLAMA_REQUEST_BUDGET)
+
+        if self.hedging:
+            # Streamed underneath so a late first token can be hedged
+            answered: List[str] = []
+            try:
+                response = "".join(
+                    self.stream_response(
+                        prompt,
+                        model_name=model_name,
+                        priority=priority,
+                        fallback=fallback,
+                        deadline=deadline,
+                        on_model=answered.append,
+                        **kwargs,
+                    )
+                ).strip()
+            except Exception as e:
+                if isinstance(e, DeadlineExceededException):
+                    with self._lock:
+                        self._stats["deadline_exceeded"] += 1
+                logger.error(f"All models failed to generate response: {e}")
+                return None
+
+            answered_by = answered[0] if answered else cache_model
+            if use_cache:
+                cache_key = self._cache_key(prompt, answered_by, kwargs)
+                self._response_cache.set(cache_key, response)
+            if on_model:
+                on_model(answered_by)
+            return response
+
         with self._lock:
             self._stats["requests"] += 1
 
             # Determine which model to use
             target_model = model_name or self._active_model or self.preferred_model
 
-            # Try to generate response
-            for attempt_model in [target_model] + self.fallback_models:
-                try:
-                    model = self._get_or_create_model(attempt_model)
-                    response = model.generate_response(prompt, **kwargs)
-
-                    # Update active model if it changed
-                    if self._active_model != attempt_model:
-                        self._active_model = attempt_model
-                        self._stats["model_switches"] += 1
-                        logger.info(f"Switched to model: {attempt_model}")
+        try:
+            with self._concurrency.slot(priority, timeout=deadline.remaining()):
+                # Try to generate response
+                chain = iter(
+                    [target_model] + (self.fallback_models if fallback else [])
+                )
+                avoid: set = set()  # Nodes that failed this request
+                retried: set = set()
+                while True:
+                    attempt_model = self._next_usable(chain, deadline)
+                    if attempt_model is None:
+                        break
+                    breaker = self._breaker(attempt_model)
+
+                    try:
+                        node = self._pool.acquire(attempt_model, exclude=tuple(avoid))
+                        if node is None:
+                            raise ModelException(
+                                f"No Ollama node can serve {attempt_model}"
+                            )
+                        started = time.monotonic()
+                        error = None
+                        try:
+                            response = node.model(attempt_model).generate_response(
+                                prompt, deadline=deadline, **kwargs
+                            )
+                        except Exception as e:
+                            error = e
+                            if isinstance(e, NodeUnreachableException):
+                                avoid.add(node.url)
+                            raise
+                        finally:
+                            node.end(attempt_model, time.monotonic() - started, error)
+                        breaker.record_success()
+
+                        with self._lock:
+                            # Update active model if it changed; models asked
+                            # for by name (e.g. routed) don't become the default
+                            if (
+                                model_name is None
+                                and self._active_model != attempt_model
+                            ):
+                                self._active_model = attempt_model
+                                self._stats["model_switches"] += 1
+                                logger.info(f"Switched to model: {attempt_model}")
+
+                        # Cache the response under the model that gave it
+                        if use_cache:
+                            cache_key = self._cache_key(prompt, attempt_model, kwargs)
+                            self._response_cache.set(cache_key, response)
+
+                        if on_model:
+                            on_model(attempt_model)
+                        return response
+
+                    except Exception as e:
+                        breaker.record_failure()
+                        logger.warning(f"Model {attempt_model} failed: {e}")
+                        with self._lock:
+                            self._stats["errors"] += 1
+                        if self._fail_over(attempt_model, e, avoid, retried):
+                            chain = itertools.chain([attempt_model], chain)
+                        continue
+
+        except DeadlineExceededException as e:
+            logger.warning(f"Gave up waiting for a model slot: {e}")
+            with self._lock:
+                self._stats["deadline_exceeded"] += 1
+
+        logger.error("All models failed to generate response")
+        return None
 
-                    # Cache the response
-                    if use_cache:
-                        cache_key = f"response:{hash(prompt)}:{kwargs.get('max_tokens', MAX_TOKENS)}"
-                        self._response_cache.set(cache_key, response)
+    def stream_response(
+        self,
+        prompt: str,
+        model_name: Optional[str] = None,
+        priority: int = PRIORITY_INTERACTIVE,
+        fallback: bool = True,
+        deadline: Optional[Deadline] = None,
+        on_model: Optional[Callable[[str], None]] = None,
+        **kwargs,
+    ) -> Iterator[str]:
+        """
+        Stream response tokens with fallback.
+
+        Falls back to the next model only while nothing has been streamed yet.
+        ``deadline`` bounds the time to the first token across slot wait and
+        fallbacks, and models whose circuit breaker is open are skipped. With
+        hedging on, a first token later than the model's usual one triggers a
+        backup request to the next model and the faster of the two is kept
+        (see ``HedgePolicy``).
+        The concurrency slot is held until the stream is exhausted or closed.
+        Closing the generator early closes the HTTP stream, which makes Ollama
+        stop generating, frees the slot and is counted as a cancellation.
+        ``on_model`` is called with the model whose tokens are streamed, once
+        the first one arrives.
+        """
+        with self._lock:
+            self._stats["requests"] += 1
+            target_model = model_name or self._active_model or self.preferred_model
 
-                    return response
+        deadline = deadline or Deadline.after(OLLAMA_REQUEST_BUDGET)
+        max_tokens = kwargs.get("max_tokens", MAX_TOKENS)
+        generated = 0
+        chain = iter([target_model] + (self.fallback_models if fallback else []))
+        avoid: set = set()  # Nodes that failed this request
+        retried: set = set()
+        try:
+            with self._concurrency.slot(priority, timeout=deadline.remaining()):
+                self._hedge.note_request()
+                while True:
+                    attempt_model = self._next_usable(chain, deadline)
+                    if attempt_model is None:
+                        break
+
+                    started = False
+                    winner = attempt_model
+                    try:
+                        race = self._race(
+                            attempt_model,
+                            chain,
+                            prompt,
+                            priority,
+                            deadline,
+                            kwargs,
+                            avoid,
+                        )
+                        try:
+                            for winner, token in race:
+                                if not started and on_model:
+                                    on_model(winner)
+                                started = True
+                                generated += 1
+                                yield token
+                        finally:
+                            race.close()
+
+                        with self._lock:
+                            if model_name is None and self._active_model != winner:
+                                self._active_model = winner
+                                self._stats["model_switches"] += 1
+                                logger.info(f"Switched to model: {winner}")
+                        self._record_completion(max_tokens, generated)
+                        return
+
+                    except Exception as e:
+                        if started:
+                            raise
+                        logger.warning(f"Model {attempt_model} failed to stream: {e}")
+                        if self._fail_over(attempt_model, e, avoid, retried):
+                            chain = itertools.chain([attempt_model], chain)
+                        continue
+        except GeneratorExit:
+            self._record_cancellation(max_tokens, generated)
+            raise
+
+        logger.error("All models failed to stream response")
+        raise ModelException("All models failed to stream response")
+
+    def _record_completion(self, max_tokens: int, generated: int) -> None:
+        """Remember how long a stream ran when nobody stopped it."""
+        with self._lock:
+            self._cancellation["streams_completed"] += 1
+            self._cancellation["tokens_generated"] += generated
+            lengths = self._completion_lengths.setdefault(
+                max_tokens, deque(maxlen=OLLAMA_COMPLETION_SAMPLES)
+            )
+            lengths.append(generated)
 
-                except Exception as e:
-                    logger.warning(f"Model {attempt_model} failed: {e}")
-                    self._stats["errors"] += 1
-                    continue
+    def _record_cancellation(self, max_tokens: int, generated: int) -> None:
+        """
+        Count the tokens a stream closed after ``generated`` tokens did not run.
 
-            logger.error("All models failed to generate response")
-            return None
+        The upper bound assumes the model would have used its whole
+        ``max_tokens`` budget; the estimate uses the mean length of recent
+        streams with the same budget that ran to completion.
+        """
+        with self._lock:
+            lengths = self._completion_lengths.get(max_tokens)
+            expected = sum(lengths) / len(lengths) if lengths else max_tokens
+            self._cancellation["streams_cancelled"] += 1
+            self._cancellation["tokens_generated"] += generated
+            self._cancellation["tokens_saved_max"] += max(max_tokens - generated, 0)
+            self._cancellation["tokens_saved_estimate"] += max(
+                round(expected) - generated, 0
+            )
+        logger.info(
+            "Stream cancelled after %d of up to %d tokens", generated, max_tokens
+        )
 
     def get_available_models(self) -> List[str]:
         """Get list of available models."""
@@ -411,9 +1876,133 @@ class ModelManager:
             "cache_hit_rate": f"{cache_hit_rate:.1f}%",
             "model_switches": self._stats["model_switches"],
             "errors": self._stats["errors"],
+            "deadline_exceeded": self._stats["deadline_exceeded"],
             "cache_size": self._response_cache.size(),
+            "concurrency": self._concurrency.get_stats(),
+            "cancellation": self.get_cancellation_stats(),
+            "circuit_breakers": self.get_breaker_stats(),
+            "hedging": self.get_hedge_stats(),
+            "nodes": self.get_node_stats(),
+            "residency": self.get_residency_stats(),
+            "prompt_cache": self.get_prompt_cache_stats(),
         }
 
+    def set_active_model(self, model_name: str) -> Dict[str, Any]:
+        """
+        Make ``model_name`` the model requests use by default.
+
+        The model is loaded on the nodes first, so the switch does not hand
+        the next user a cold load, and is then kept resident in place of the
+        previous active model (the preferred model always stays resident).
+
+        Returns:
+            ``success``, ``warmed`` (the model answered the load) and
+            ``load_seconds``
+        """
+        if model_name not in self.get_available_models():
+            return {"success": False, "warmed": False, "load_seconds": 0.0}
+
+        started = time.monotonic()
+        warmed = self._residency.preload(model_name, reason="switch")
+        load_seconds = round(time.monotonic() - started, 2)
+
+        with self._lock:
+            previous = self._active_model
+            self._active_model = model_name
+            if previous != model_name:
+                self._stats["model_switches"] += 1
+        if self.preload:
+            self._residency.pin(model_name)
+            kept = [model_name, self.preferred_model] + OLLAMA_RESIDENT_MODELS
+            if previous and previous not in kept:
+                self._residency.unpin(previous)
+        logger.info(f"Active model set to {model_name} (loaded in {load_seconds}s)")
+        return {"success": True, "warmed": warmed, "load_seconds": load_seconds}
+
+    def get_prompt_cache_stats(self) -> Dict[str, Any]:
+        """
+        Get prompt evaluation per model, from Ollama's response timings.
+
+        ``shared_prefix`` is the share of each prompt that matched the
+        previous one sent to the same model and node, so the most Ollama's
+        prompt cache could skip; ``prompt_eval_tokens`` and
+        ``prompt_eval_ms`` are what it actually evaluated. With the cache
+        hit, they stay small while prompts grow.
+        """
+        totals: Dict[str, Dict[str, float]] = {}
+        for node in list(self._pool.nodes.values()):
+            for model_name, stats in node.prompt_stats().items():
+                total = totals.setdefault(model_name, dict.fromkeys(stats, 0))
+                for key, value in stats.items():
+                    total[key] += value
+
+        models = {}
+        for model_name, total in sorted(totals.items()):
+            count = max(total["requests"], 1)
+            models[model_name] = {
+                "requests": total["requests"],
+                "prompt_chars": round(total["prompt_chars"] / count),
+                "shared_prefix": round(
+                    total["shared_prefix_chars"] / max(total["prompt_chars"], 1), 3
+                ),
+                "prompt_eval_tokens": round(total["prompt_eval_tokens"] / count, 1),
+                "prompt_eval_ms": round(total["prompt_eval_seconds"] * 1000 / count, 1),
+            }
+        return models
+
+    def get_active_model(self) -> str:
+        """Model requests use unless one is asked for by name."""
+        return self._active_model or self.preferred_model
+
+    def get_residency_stats(self) -> Dict[str, Any]:
+        """Get resident models, preloads and cold-load events."""
+        return self._residency.get_stats()
+
+    def get_load(self) -> float:
+        """Share of model slots in use, queued requests included (1.0 = full)."""
+        stats = self._concurrency.get_stats()
+        return (stats["in_use"] + stats["waiting"]) / max(stats["slots"], 1)
+
+    def can_generate(
+        self, model_name: Optional[str] = None, fallback: bool = True
+    ) -> bool:
+        """Whether any model a request would try has a breaker that isn't open."""
+        chain = [model_name or self._active_model or self.preferred_model]
+        if fallback:
+            chain += self.fallback_models
+        return any(self._breaker(name).state != CircuitBreaker.OPEN for name in chain)
+
+    def has_model(self, model_name: str) -> bool:
+        """Whether any Ollama node has ``model_name`` installed."""
+        return any(node.serves(model_name) for node in self._pool.nodes.values())
+
+    def get_breaker_stats(self) -> Dict[str, Any]:
+        """Get circuit breaker state per model that has been called."""
+        with self._lock:
+            breakers = dict(self._breakers)
+        return {name: breaker.get_stats() for name, breaker in breakers.items()}
+
+    def get_node_stats(self) -> List[Dict[str, Any]]:
+        """Get health, load and loaded models per Ollama node."""
+        return self._pool.get_stats()
+
+    def drain_node(self, url: str) -> bool:
+        """Take a node out of rotation for maintenance (False if unknown)."""
+        return self._pool.drain(url)
+
+    def restore_node(self, url: str) -> bool:
+        """Put a drained node back into rotation (False if unknown)."""
+        return self._pool.restore(url)
+
+    def get_hedge_stats(self) -> Dict[str, Any]:
+        """Get hedged request counts and the current hedge delay per model."""
+        return {"enabled": self.hedging, **self._hedge.get_stats()}
+
+    def get_cancellation_stats(self) -> Dict[str, Any]:
+        """Get counts of streams closed early and the tokens that saved."""
+        with self._lock:
+            return dict(self._cancellation)
+
     def clear_cache(self) -> None:
         """Clear response cache."""
         self._response_cache.clear()
@@ -423,9 +2012,20 @@ class ModelManager:
 class RAGQueryProcessor:
     """Processes RAG queries with context and prompt optimization."""
 
-    def __init__(self, model_manager: ModelManager):
+    def __init__(
+        self,
+        model_manager: ModelManager,
+        router: Optional[Any] = None,
+        fast_path: Optional[Any] = None,
+    ):
         self.model_manager = model_manager
         self.prompt_template = PromptTemplate()
+        # Optional RoutingPolicy picking model and max_tokens per question
+        self.router = router
+        # Optional ExtractiveAnswerer for when the LLM cannot answer in time
+        self.fast_path = fast_path
+        self._fast_path_reasons: Dict[str, int] = {}
+        self._lock = threading.Lock()
 
     @measure_performance
     def process_rag_query(
@@ -435,29 +2035,84 @@ class RAGQueryProcessor:
         max_context_length: int = 2000,
         **kwargs,
     ) -> Dict[str, Any]:
-        """Process RAG query with context and generate response."""
+        """
+        Process RAG query with context and generate response.
+
+        With a router, the model and ``max_tokens`` come from the question's
+        route unless given; a ``model_name`` passed in is kept and only the
+        budget is routed. With a fast path, interactive questions missing the
+        response cache are answered extractively instead when
+        ``fast_path_reason`` gives a reason, or when generation fails.
+        """
         try:
             # Prepare context from documents
             context = self._prepare_context(context_documents, max_context_length)
 
-            # Generate optimized prompt
-            prompt = self.prompt_template.generate_prompt(question, context)
+            route = None
+            query_type = None
+            if self.router is not None:
+                route = self.route(question, kwargs.get("model_name"))
+                query_type = QueryType(route["query_type"])
+                if route["model"]:
+                    kwargs["model_name"] = route["model"]
+                kwargs.setdefault("max_tokens", route["max_tokens"])
+
+            # Generate optimized prompt, static instructions first
+            prompt = self.prompt_template.build_prompt(question, context, query_type)
+
+            # A cached LLM answer is both faster and better than an extractive one
+            cached = self.model_manager.has_cached_response(
+                prompt["prompt"], system=prompt["system"], **kwargs
+            )
+            reason = (
+                None
+                if cached
+                else self.fast_path_reason(question, query_type, **kwargs)
+            )
+            if reason:
+                result = self.answer_extractively(question, context_documents, reason)
+                if result is not None:
+                    return result
 
             # Generate response
-            response = self.model_manager.generate_response(prompt, **kwargs)
+            started = time.monotonic()
+            answered: List[str] = []  # The model that answered, after fallbacks
+            response = self.model_manager.generate_response(
+                prompt["prompt"],
+                system=prompt["system"],
+                on_model=answered.append,
+                **kwargs,
+            )
+            model_used = answered[-1] if answered else None
+            if route is not None:
+                self.router.record(
+                    {**route, "model": model_used or route["model"]},
+                    time.monotonic() - started,
+                    bool(response),
+                )
+
+            if not response and self._fast_path_allowed(kwargs):
+                result = self.answer_extractively(
+                    question, context_documents, "llm_failed"
+                )
+                if result is not None:
+                    return result
 
             if response:
                 # Extract citations from context documents
                 citations = self._extract_citations(context_documents)
 
-                return {
+                result = {
                     "response": response,
                     "question": question,
                     "context_length": len(context),
                     "citations": citations,
                     "success": True,
-                    "model_used": self.model_manager._active_model,
+                    "model_used": model_used or self.model_manager.get_active_model(),
                 }
+                if route is not None:
+                    result["route"] = route
+                return result
             else:
                 return {
                     "response": "I apologize, but I couldn't generate a response at the moment.",
@@ -475,8 +2130,113 @@ class RAGQueryProcessor:
                 "error": str(e),
             }
 
+    def _fast_path_allowed(self, kwargs: Dict[str, Any]) -> bool:
+        """Fast path is only for people waiting (not batch or warm-up work)."""
+        return (
+            self.fast_path is not None
+            and kwargs.get("priority", PRIORITY_INTERACTIVE) == PRIORITY_INTERACTIVE
+        )
+
+    def fast_path_reason(
+        self, question: str, query_type: Optional[QueryType] = None, **kwargs
+    ) -> Optional[str]:
+        """
+        Why ``question`` should skip the LLM, or None to generate.
+
+        ``"breaker_open"`` when every model it could use has an open circuit
+        breaker, ``"overload"`` when model load reaches
+        ``EXTRACTIVE_OVERLOAD_LOAD`` and ``"definition"`` for definition
+        questions from ``EXTRACTIVE_DEFINITION_LOAD`` (answered extractively
+        only if a retrieved sentence reads as a definition).
+        """
+        if not self._fast_path_allowed(kwargs):
+            return None
+        if not self.model_manager.can_generate(
+            kwargs.get("model_name"), kwargs.get("fallback", True)
+        ):
+            return "breaker_open"
+
+        load = self.model_manager.get_load()
+        if load >= EXTRACTIVE_OVERLOAD_LOAD:
+            return "overload"
+        query_type = query_type or PromptTemplate.detect_query_type(question)
+        if query_type == QueryType.DEFINITION and load >= EXTRACTIVE_DEFINITION_LOAD:
+            return "definition"
+        return None
+
+    def answer_extractively(
+        self, question: str, documents: List[Any], reason: str
+    ) -> Optional[Dict[str, Any]]:
+        """Extractive answer for ``reason``, or None to use the LLM path."""
+        result = self.fast_path.answer(question, documents)
+        if not result["success"] or (reason == "definition" and not result["defining"]):
+            return None
+
+        with self._lock:
+            self._fast_path_reasons[reason] = self._fast_path_reasons.get(reason, 0) + 1
+        logger.info(f"Answered extractively ({reason})")
+        result["fast_path_reason"] = reason
+        return result
+
+    def get_fast_path_stats(self) -> Dict[str, Any]:
+        """Get extractive answers served per reason."""
+        if self.fast_path is None:
+            return {"enabled": False}
+        with self._lock:
+            reasons = dict(self._fast_path_reasons)
+        return {"enabled": True, "reasons": reasons, **self.fast_path.get_stats()}
+
+    def route(
+        self,
+        question: str,
+        model_name: Optional[str] = None,
+        language: Optional[str] = None,
+        idle: bool = False,
+    ) -> Dict[str, Any]:
+        """
+        Route ``question`` at the current load (see ``RoutingPolicy.route``).
+
+        The active model is preferred, so a model picked with
+        ``/api/set-model`` is only routed away from when the stats justify it.
+        With ``idle``, load is ignored and the route is the one an interactive
+        request gets on an unloaded server.
+        """
+        return self.router.route(
+            question,
+            language=language,
+            load=None if idle else self.model_manager.get_load(),
+            available=self.model_manager.has_model,
+            model_name=model_name,
+            preferred=self.model_manager.get_active_model(),
+        )
+
+    def build_prompt(
+        self,
+        question: str,
+        documents: List[Any],
+        query_type: Optional[QueryType] = None,
+        language: Optional[str] = None,
+        max_context_length: int = 2000,
+    ) -> Dict[str, str]:
+        """
+        System and user prompt for ``question`` over ``documents``.
+
+        Pass both to the model manager (``prompt``, ``system=``) so the
+        static instructions lead every request.
+        """
+        context = self._prepare_context(documents, max_context_length)
+        return self.prompt_template.build_prompt(
+            question, context, query_type, language
+        )
+
     def _prepare_context(self, documents: List[Any], max_length: int) -> str:
-        """Prepare context string from documents."""
+        """
+        Prepare context string from documents.
+
+        Documents are taken in retrieval order until ``max_length``, then
+        put in chunk order (``PromptTemplate.chunk_key``), so the same chunks
+        always give the same context whatever their scores.
+        """
         context_parts = []
         current_length = 0
 
@@ -504,31 +2264,35 @@ class RAGQueryProcessor:
                 remaining_space = max_length - current_length
                 if remaining_space > 100:  # Only add if there's reasonable space
                     formatted_content = formatted_content[: remaining_space - 3] + "..."
-                    context_parts.append(formatted_content)
+                    context_parts.append((doc, formatted_content))
                 break
 
-            context_parts.append(formatted_content)
+            context_parts.append((doc, formatted_content))
             current_length += len(formatted_content)
 
-        return "\n\n".join(context_parts)
+        context_parts.sort(key=lambda part: PromptTemplate.chunk_key(part[0]))
+        return "\n\n".join(content for _, content in context_parts)
 
     def _extract_citations(self, documents: List[Any]) -> List[Dict[str, Any]]:
         """Extract citation information from documents."""
-        citations = []
+        return extract_citations(documents)
 
-        for doc in documents:
-            if hasattr(doc, "metadata"):
-                metadata = doc.metadata
-                citation = {
-                    "file_name": metadata.get("file_name", "Unknown Document"),
-                    "page_number": metadata.get(
-                        "page_number", metadata.get("page", 0) + 1
-                    ),
-                    "source": metadata.get("source", "Unknown Source"),
-                }
-                citations.append(citation)
 
-        return citations
+def extract_citations(documents: List[Any]) -> List[Dict[str, Any]]:
+    """File, page and source of each document that has metadata."""
+    citations = []
+
+    for doc in documents:
+        if hasattr(doc, "metadata"):
+            metadata = doc.metadata
+            citation = {
+                "file_name": metadata.get("file_name", "Unknown Document"),
+                "page_number": metadata.get("page_number", metadata.get("page", 0) + 1),
+                "source": metadata.get("source", "Unknown Source"),
+            }
+            citations.append(citation)
+
+    return citations
 
 
 # Global instances
@@ -548,7 +2312,19 @@ def get_rag_processor() -> RAGQueryProcessor:
     """Get global RAG processor instance."""
     global _rag_processor
     if _rag_processor is None:
-        _rag_processor = RAGQueryProcessor(get_model_manager())
+        router = None
+        if ROUTING_ENABLED:
+            from services.routing_service import get_routing_policy
+
+            router = get_routing_policy()
+        fast_path = None
+        if EXTRACTIVE_ENABLED:
+            from services.extractive_service import get_extractive_answerer
+
+            fast_path = get_extractive_answerer()
+        _rag_processor = RAGQueryProcessor(
+            get_model_manager(), router=router, fast_path=fast_path
+        )
     return _rag_processor
 
 
@@ -0,0 +1,491 @@
+#!/usr/bin/env python3
+"""
+Automatic question generation (AQG) service for BanglaRAG system.
+Splits a teacher's request into small shards that are generated, validated and retried independently.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, List, Dict, Any, Iterator, Callable
+import json
+import queue
+import re
+import threading
+
+from core.logging_config import BanglaRAGLogger
+from core.constants import (
+    AQG_SHARD_SIZE,
+    AQG_SHARD_RETRIES,
+    AQG_TOKENS_PER_QUESTION,
+    AQG_CONTEXT_CHARS_PER_SHARD,
+    PRIORITY_INTERACTIVE,
+)
+
+logger = BanglaRAGLogger.get_logger("aqg")
+
+QUESTION_TYPES = {
+    "multiple-choice": "multiple choice questions with 4 options (A, B, C, D)",
+    "true-false": "true/false questions",
+    "short-answer": "short answer questions requiring 1-2 sentence responses",
+    "explain": "explanation questions asking to describe or explain concepts",
+}
+
+DIFFICULTY_GUIDANCE = {
+    "easy": "Basic recall and understanding level questions",
+    "medium": "Application and analysis level questions",
+    "hard": "Advanced synthesis and evaluation level questions",
+}
+
+MIXED_DIFFICULTIES = ["easy", "medium", "hard"]
+
+
+class QuestionShard:
+    """A small, independently generated slice of a question set."""
+
+    def __init__(
+        self,
+        index: int,
+        question_type: str,
+        difficulty: str,
+        count: int,
+        chunks: List[Any],
+        module: str,
+    ):
+        self.index = index
+        self.question_type = question_type
+        self.difficulty = difficulty
+        self.count = count
+        self.chunks = chunks
+        self.module = module
+
+    @property
+    def module_label(self) -> str:
+        """Module name used in generated questions."""
+        return self.module if self.module != "all" else "General"
+
+    def build_context(self) -> str:
+        """Concatenate this shard's chunks up to the per-shard context budget."""
+        context = "\n\n".join(
+            f"SECTION: {chunk.metadata.get('module', 'Unknown')}\n{chunk.page_content}"
+            for chunk in self.chunks
+        )
+        return context[:AQG_CONTEXT_CHARS_PER_SHARD]
+
+    def build_prompt(self, count: Optional[int] = None, json_mode: bool = False) -> str:
+        """
+        Build the generation prompt for this shard.
+
+        Ollama's JSON mode only produces objects, so ``json_mode`` asks for the
+        question array wrapped in a ``{"questions": [...]}`` object.
+        """
+        count = count or self.count
+        options_line = (
+            '\n      "options": ["Option A", "Option B", "Option C", "Option D"],'
+            if self.question_type == "multiple-choice"
+            else ""
+        )
+        question_format = f"""{{
+      "question": "...",
+      "type": "{self.question_type}",{options_line}
+      "answer": "...",
+      "difficulty": "{self.difficulty}",
+      "module": "{self.module_label}"
+    }}"""
+        if json_mode:
+            start, end = "{", "}"
+            response_format = f'{{\n  "questions": [\n    {question_format}\n  ]\n}}'
+        else:
+            start, end = "[", "]"
+            response_format = f"[\n    {question_format}\n]"
+
+        return f"""You are an expert educator creating assessment questions for a Data Structures course.
+
+COURSE CONTENT:
+{self.build_context()}
+
+TASK: Generate {count} {QUESTION_TYPES[self.question_type]}.
+
+REQUIREMENTS:
+- Difficulty Level: {DIFFICULTY_GUIDANCE[self.difficulty]}
+- Questions must be clear, unambiguous, and directly related to the course content above
+- For multiple choice: provide exactly 4 options and make "answer" one of them
+- For true/false: "answer" must be "True" or "False"
+- Questions should test conceptual understanding, not just memorization
+
+CRITICAL: You MUST respond with ONLY valid JSON - no markdown, no explanation, no code blocks.
+Start your response with {start} and end with {end}
+
+FORMAT (JSON only):
+{response_format}
+
+Generate exactly {count} questions. JSON ONLY - no other text:"""
+
+
+def parse_questions(response: str) -> List[Dict[str, Any]]:
+    """Parse question objects from an LLM response with several fallbacks."""
+    response_clean = response.strip()
+    response_clean = re.sub(r"^```json\s*", "", response_clean, flags=re.IGNORECASE)
+    response_clean = re.sub(r"^```\s*", "", response_clean)
+    response_clean = re.sub(r"\s*```$", "", response_clean)
+
+    # Strategy 1: Extract JSON array
+    json_match = re.search(r"\[\s*\{[\s\S]*\}\s*\]", response_clean)
+    if json_match:
+        try:
+            questions = json.loads(json_match.group())
+            if isinstance(questions, list):
+                return questions
+        except json.JSONDecodeError as e:
+            logger.debug(f"Array extraction failed: {e}")
+
+    # Strategy 2: Parse entire cleaned response
+    try:
+        questions = json.loads(response_clean)
+        if isinstance(questions, dict) and isinstance(questions.get("questions"), list):
+            return questions["questions"]
+        if isinstance(questions, list):
+            return questions
+        if isinstance(questions, dict):
+            return [questions]
+    except json.JSONDecodeError as e:
+        logger.debug(f"Direct parse failed: {e}")
+
+    # Strategy 3: Extract individual question objects
+    questions = []
+    for match in re.finditer(r'\{[^{}]*"question"[^{}]*"answer"[^{}]*\}', response):
+        try:
+            questions.append(json.loads(match.group()))
+        except json.JSONDecodeError:
+            continue
+    return questions
+
+
+class IncrementalQuestionParser:
+    """
+    Incremental JSON parser that emits question objects as they complete.
+
+    Tracks brace depth outside of strings, so each ``{...}`` holding a
+    ``"question"`` key is decoded the moment its closing brace arrives, whether
+    it sits in a bare array or a ``{"questions": [...]}`` wrapper. Markdown
+    fences and any other text outside the JSON are skipped.
+    """
+
+    def __init__(self):
+        self._buffer = ""
+        self._position = 0
+        self._starts: List[int] = []
+        self._in_string = False
+        self._escaped = False
+
+    def feed(self, text: str) -> List[Dict[str, Any]]:
+        """Consume a chunk of tokens and return any questions it completed."""
+        self._buffer += text
+        completed = []
+
+        while self._position < len(self._buffer):
+            char = self._buffer[self._position]
+
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == "\\":
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+            elif char == '"' and self._starts:
+                self._in_string = True
+            elif char == "{":
+                self._starts.append(self._position)
+            elif char == "}" and self._starts:
+                start = self._starts.pop()
+                try:
+                    obj = json.loads(self._buffer[start : self._position + 1])
+                except json.JSONDecodeError:
+                    obj = None
+                if isinstance(obj, dict) and "question" in obj:
+                    completed.append(obj)
+
+            self._position += 1
+
+        # Outside any object nothing behind us is needed again
+        if not self._starts:
+            self._buffer = ""
+            self._position = 0
+
+        return completed
+
+
+def validate_question(question: Any, shard: QuestionShard) -> Optional[Dict[str, Any]]:
+    """
+    Check a generated question against the AQG schema.
+
+    Returns the normalized question, or None if it cannot be used.
+    """
+    if not isinstance(question, dict):
+        return None
+
+    text = str(question.get("question", "")).strip()
+    answer = question.get("answer")
+    if not text or answer is None or str(answer).strip() == "":
+        return None
+
+    normalized = {
+        "question": text,
+        "type": shard.question_type,
+        "answer": str(answer).strip(),
+        "difficulty": shard.difficulty,
+        "module": question.get("module") or shard.module_label,
+    }
+
+    if shard.question_type == "multiple-choice":
+        options = question.get("options")
+        if not isinstance(options, list) or len(options) != 4:
+            return None
+        options = [str(option).strip() for option in options]
+
+        # Map letter answers ("B" / "B)") onto the option text
+        letter = re.fullmatch(r"([A-Da-d])[\).:]?", normalized["answer"])
+        if letter:
+            normalized["answer"] = options["abcd".index(letter.group(1).lower())]
+
+        lowered = [option.lower() for option in options]
+        if normalized["answer"].lower() not in lowered:
+            return None
+        normalized["answer"] = options[lowered.index(normalized["answer"].lower())]
+        normalized["options"] = options
+
+    elif shard.question_type == "true-false":
+        value = normalized["answer"].lower()
+        if value not in ("true", "false"):
+            return None
+        normalized["answer"] = value.capitalize()
+
+    if "explanation" in question:
+        normalized["explanation"] = str(question["explanation"])
+
+    return normalized
+
+
+class QuestionGenerator:
+    """Generates question sets as concurrent, independently retried shards."""
+
+    def __init__(
+        self,
+        model_manager,
+        shard_size: int = AQG_SHARD_SIZE,
+        max_retries: int = AQG_SHARD_RETRIES,
+        max_workers: Optional[int] = None,
+        priority: int = PRIORITY_INTERACTIVE,
+    ):
+        self.model_manager = model_manager
+        self.shard_size = shard_size
+        self.max_retries = max_retries
+        self.priority = priority
+        # Never queue more shards on Ollama than it has slots for
+        self.max_workers = max_workers or getattr(model_manager, "max_concurrency", 1)
+
+    def plan_shards(
+        self,
+        chunks: List[Any],
+        module: str,
+        difficulty: str,
+        num_questions: int,
+        question_types: List[str],
+    ) -> List[QuestionShard]:
+        """Split a request into shards by question type, difficulty and chunk."""
+        if not chunks or num_questions <= 0:
+            return []
+
+        types = [t for t in question_types if t in QUESTION_TYPES] or [
+            "multiple-choice"
+        ]
+        difficulties = (
+            MIXED_DIFFICULTIES
+            if difficulty not in DIFFICULTY_GUIDANCE
+            else [difficulty]
+        )
+
+        # Assign every question slot a (type, difficulty), then group into shards
+        groups: Dict[tuple, int] = {}
+        for slot in range(num_questions):
+            key = (types[slot % len(types)], difficulties[slot % len(difficulties)])
+            groups[key] = groups.get(key, 0) + 1
+
+        shard_specs = []
+        for (question_type, shard_difficulty), count in groups.items():
+            while count > 0:
+                size = min(self.shard_size, count)
+                shard_specs.append((question_type, shard_difficulty, size))
+                count -= size
+
+        # Give each shard its own slice of the course chunks
+        shards = []
+        for index, (question_type, shard_difficulty, size) in enumerate(shard_specs):
+            shard_chunks = chunks[index :: len(shard_specs)] or [
+                chunks[index % len(chunks)]
+            ]
+            shards.append(
+                QuestionShard(
+                    index, question_type, shard_difficulty, size, shard_chunks, module
+                )
+            )
+
+        logger.info(
+            f"Planned {len(shards)} shards for {num_questions} questions "
+            f"({len(types)} types, {len(difficulties)} difficulties)"
+        )
+        return shards
+
+    def generate_shard(
+        self,
+        shard: QuestionShard,
+        on_question: Optional[Callable[[Dict[str, Any]], None]] = None,
+        cancelled: Optional[threading.Event] = None,
+    ) -> Dict[str, Any]:
+        """
+        Generate one shard, retrying until it validates or runs out of attempts.
+
+        Tokens are streamed from the model and ``on_question`` is called with
+        each validated question as soon as its JSON object is complete. Once
+        ``cancelled`` is set the model stream is closed at the next token and
+        no further attempts are made.
+        """
+        questions: List[Dict[str, Any]] = []
+        attempts = 0
+        last_error = None
+
+        while len(questions) < shard.count and attempts <= self.max_retries:
+            if cancelled is not None and cancelled.is_set():
+                last_error = "Cancelled"
+                break
+            attempts += 1
+            missing = shard.count - len(questions)
+            parser = IncrementalQuestionParser()
+            response = ""
+            valid: List[Dict[str, Any]] = []
+
+            def accept(candidate: Any) -> None:
+                question = validate_question(candidate, shard)
+                if question is not None and len(valid) < missing:
+                    valid.append(question)
+                    if on_question:
+                        on_question(question)
+
+            stream = self.model_manager.stream_response(
+                shard.build_prompt(missing, json_mode=True),
+                max_tokens=AQG_TOKENS_PER_QUESTION * missing + 50,
+                json_mode=True,
+                priority=self.priority,
+            )
+            try:
+                for token in stream:
+                    if cancelled is not None and cancelled.is_set():
+                        break
+                    response += token
+                    for candidate in parser.feed(token):
+                        accept(candidate)
+                    if len(valid) >= missing:
+                        break
+            except Exception as e:
+                last_error = str(e)
+                logger.warning(f"Shard {shard.index} attempt {attempts} failed: {e}")
+            finally:
+                # Stop the model as soon as the shard is full or cancelled
+                stream.close()
+
+            if cancelled is not None and cancelled.is_set():
+                questions.extend(valid)
+                last_error = "Cancelled"
+                break
+
+            # Objects the incremental parser could not frame, e.g. truncated output
+            if not valid and response:
+                for candidate in parse_questions(response):
+                    accept(candidate)
+
+            if not response and last_error is None:
+                last_error = "No response from LLM"
+            elif not valid and response:
+                last_error = "No valid questions in response"
+                logger.warning(
+                    f"Shard {shard.index} attempt {attempts} failed validation: "
+                    f"{response[:200]}"
+                )
+            questions.extend(valid)
+
+        return {
+            "shard": shard.index,
+            "questions": questions,
+            "attempts": attempts,
+            "error": None if questions else last_error,
+        }
+
+    def generate(
+        self,
+        chunks: List[Any],
+        module: str,
+        difficulty: str,
+        num_questions: int,
+        question_types: List[str],
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Generate a question set, yielding events as soon as they happen.
+
+        Yields:
+            ``{"type": "question", "question", "shard"}`` for every validated
+            question as its JSON completes, and ``{"type": "shard_done",
+            "shard", "count", "attempts", "error", "total_shards"}`` when a
+            shard finishes, in arrival order
+
+        Closing the generator cancels shards that have not started and stops
+        the model streams of those that have.
+        """
+        shards = self.plan_shards(
+            chunks, module, difficulty, num_questions, question_types
+        )
+        if not shards:
+            return
+
+        events: "queue.Queue[Dict[str, Any]]" = queue.Queue()
+        cancelled = threading.Event()
+
+        def run_shard(shard: QuestionShard) -> None:
+            try:
+                result = self.generate_shard(
+                    shard,
+                    on_question=lambda q: events.put(
+                        {"type": "question", "question": q, "shard": shard.index}
+                    ),
+                    cancelled=cancelled,
+                )
+            except Exception as e:
+                logger.error(f"Shard generation failed: {e}")
+                result = {"shard": shard.index, "questions": [], "attempts": 0}
+                result["error"] = str(e)
+            events.put(
+                {
+                    "type": "shard_done",
+                    "shard": result["shard"],
+                    "count": len(result["questions"]),
+                    "attempts": result["attempts"],
+                    "error": result["error"],
+                    "total_shards": len(shards),
+                }
+            )
+
+        executor = ThreadPoolExecutor(
+            max_workers=min(self.max_workers, len(shards)), thread_name_prefix="aqg"
+        )
+        try:
+            for shard in shards:
+                executor.submit(run_shard, shard)
+
+            remaining = len(shards)
+            while remaining:
+                event = events.get()
+                if event["type"] == "shard_done":
+                    remaining -= 1
+                yield event
+        finally:
+            # Consumer went away: stop running shards, drop the rest
+            cancelled.set()
+            executor.shutdown(wait=False, cancel_futures=True)
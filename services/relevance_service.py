@@ -0,0 +1,330 @@
+#!/usr/bin/env python3
+"""
+Relevance gate for BanglaRAG system.
+Decides from retrieval scores whether a query should reach the LLM at all.
+Thresholds are fitted on the scores the federated retriever returns, per query
+language where the evaluation set has enough questions in that language.
+"""
+
+from enum import Enum
+from pathlib import Path
+from typing import Optional, List, Dict, Any, Sequence, Tuple, Union
+import math
+import threading
+
+from core.logging_config import BanglaRAGLogger
+from core.utils import safe_json_load, safe_json_save
+from core.constants import (
+    RELEVANCE_THRESHOLDS_FILE,
+    RELEVANCE_MAX_FALSE_REFUSAL,
+    RELEVANCE_MAX_FALSE_ACCEPT,
+    RELEVANCE_MIN_LANGUAGE_SAMPLES,
+)
+
+logger = BanglaRAGLogger.get_logger("relevance")
+
+
+class GateDecision(Enum):
+    """Outcome of the relevance gate."""
+
+    ANSWER = "answer"
+    CLARIFY = "clarify"
+    REFUSE = "refuse"
+
+
+class RelevanceGate:
+    """
+    Score-threshold gate in front of the LLM.
+
+    Queries whose best chunk scores below ``refuse_below`` are refused, those at
+    or above ``answer_above`` are answered. In between, a clear winner (top
+    score ahead of the runner-up by at least ``min_gap``) is answered and an
+    ambiguous retrieval asks the user to clarify. An uncalibrated gate answers
+    every query that retrieved something, matching the old behaviour.
+
+    ``languages`` holds thresholds fitted for one query language (see
+    ``gate_language``); other languages use the shared ones.
+    """
+
+    def __init__(
+        self,
+        refuse_below: Optional[float] = None,
+        answer_above: Optional[float] = None,
+        min_gap: Optional[float] = None,
+        languages: Optional[Dict[str, Dict[str, Any]]] = None,
+    ):
+        self.refuse_below = refuse_below
+        self.answer_above = answer_above
+        self.min_gap = min_gap
+        self.languages = {
+            language: RelevanceGate(
+                thresholds.get("refuse_below"),
+                thresholds.get("answer_above"),
+                thresholds.get("min_gap"),
+            )
+            for language, thresholds in (languages or {}).items()
+        }
+        self._lock = threading.Lock()
+        self._stats = {"answered": 0, "clarified": 0, "refused": 0}
+
+    @property
+    def is_calibrated(self) -> bool:
+        """Whether thresholds have been fitted."""
+        return self.refuse_below is not None and self.answer_above is not None
+
+    @classmethod
+    def from_file(
+        cls, path: Union[str, Path] = RELEVANCE_THRESHOLDS_FILE
+    ) -> "RelevanceGate":
+        """Load calibrated thresholds, falling back to an always-answer gate."""
+        data = safe_json_load(path) if Path(path).exists() else None
+        if not data:
+            logger.info("No relevance calibration found, gate will pass all queries")
+            return cls()
+
+        logger.info(f"Loaded relevance thresholds from {path}")
+        return cls(
+            refuse_below=data.get("refuse_below"),
+            answer_above=data.get("answer_above"),
+            min_gap=data.get("min_gap"),
+            languages=data.get("languages"),
+        )
+
+    def classify(
+        self, scores: Sequence[float], language: Optional[str] = None
+    ) -> GateDecision:
+        """Classify a retrieval by its (descending) relevance scores."""
+        if not scores:
+            return GateDecision.REFUSE
+
+        if language in self.languages and self.languages[language].is_calibrated:
+            return self.languages[language].classify(scores)
+
+        if not self.is_calibrated:
+            return GateDecision.ANSWER
+
+        top = scores[0]
+        gap = top - scores[1] if len(scores) > 1 else top
+
+        if top < self.refuse_below:
+            return GateDecision.REFUSE
+        if top >= self.answer_above:
+            return GateDecision.ANSWER
+        if self.min_gap is not None and gap >= self.min_gap:
+            return GateDecision.ANSWER
+        return GateDecision.CLARIFY
+
+    def evaluate(
+        self, scores: Sequence[float], language: Optional[str] = None
+    ) -> GateDecision:
+        """Classify a live query and record the decision in the gate stats."""
+        decision = self.classify(scores, language)
+
+        with self._lock:
+            if decision == GateDecision.ANSWER:
+                self._stats["answered"] += 1
+            elif decision == GateDecision.CLARIFY:
+                self._stats["clarified"] += 1
+            else:
+                self._stats["refused"] += 1
+
+        return decision
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get gate statistics, including LLM calls avoided."""
+        with self._lock:
+            stats = dict(self._stats)
+
+        total = sum(stats.values())
+        saved = stats["clarified"] + stats["refused"]
+        stats.update(
+            {
+                "calibrated": self.is_calibrated,
+                "calibrated_languages": sorted(self.languages),
+                "llm_calls_saved": saved,
+                "llm_calls_saved_rate": f"{saved / max(total, 1) * 100:.1f}%",
+            }
+        )
+        return stats
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize thresholds."""
+        data = {
+            "refuse_below": self.refuse_below,
+            "answer_above": self.answer_above,
+            "min_gap": self.min_gap,
+        }
+        if self.languages:
+            data["languages"] = {
+                language: gate.to_dict() for language, gate in self.languages.items()
+            }
+        return data
+
+
+def gate_language(query: str) -> str:
+    """
+    Language whose thresholds apply to ``query``.
+
+    The first partition the retriever routes the query to, since that
+    language's embedding model produced most of its scores.
+    """
+    from services.embedding_service import get_embedding_factory
+
+    return get_embedding_factory().route_languages(query)[0]
+
+
+def retrieval_scores(documents: Sequence[Any]) -> List[float]:
+    """Relevance scores of retrieved documents, best first, as the gate expects."""
+    return sorted(
+        (
+            doc.metadata["relevance_score"]
+            for doc in documents
+            if "relevance_score" in doc.metadata
+        ),
+        reverse=True,
+    )
+
+
+def _score_features(scores: Sequence[float]) -> Tuple[float, float]:
+    """Return (top score, gap to runner-up) for a score list."""
+    if not scores:
+        return 0.0, 0.0
+    top = scores[0]
+    gap = top - scores[1] if len(scores) > 1 else top
+    return top, gap
+
+
+def calibrate_thresholds(
+    samples: List[Tuple[Sequence[float], bool]],
+    max_false_refusal: float = RELEVANCE_MAX_FALSE_REFUSAL,
+    max_false_accept: float = RELEVANCE_MAX_FALSE_ACCEPT,
+) -> Dict[str, Any]:
+    """
+    Fit gate thresholds from labelled retrievals.
+
+    Args:
+        samples: (descending relevance scores, is_on_topic) per question
+        max_false_refusal: Share of on-topic questions we accept to refuse
+        max_false_accept: Share of off-topic questions we accept to answer
+
+    Returns:
+        Thresholds plus the confusion counts they produce on ``samples``
+    """
+    positives = sorted(_score_features(s)[0] for s, on_topic in samples if on_topic)
+    negatives = sorted(
+        (_score_features(s)[0] for s, on_topic in samples if not on_topic),
+        reverse=True,
+    )
+    if not positives or not negatives:
+        raise ValueError("Calibration needs both on-topic and off-topic questions")
+
+    # Refuse below the score that keeps false refusals within budget
+    refuse_index = int(len(positives) * max_false_refusal)
+    refuse_below = positives[min(refuse_index, len(positives) - 1)]
+
+    # Answer outright above the score that keeps false accepts within budget;
+    # classify answers at the threshold, so it sits just past that negative
+    accept_index = int(len(negatives) * max_false_accept)
+    answer_above = max(
+        math.nextafter(negatives[min(accept_index, len(negatives) - 1)], math.inf),
+        refuse_below,
+    )
+
+    # In the ambiguous band, pick the gap that best separates the two classes,
+    # among those whose extra false accepts still fit the budget
+    accept_budget = int(len(negatives) * max_false_accept)
+    spare_accepts = accept_budget - sum(1 for top in negatives if top >= answer_above)
+    band = [
+        (_score_features(s)[1], on_topic)
+        for s, on_topic in samples
+        if refuse_below <= _score_features(s)[0] < answer_above
+    ]
+    min_gap = None
+    best_margin = 0
+    for candidate, _ in band:
+        answered = [on_topic for gap, on_topic in band if gap >= candidate]
+        if answered.count(False) > spare_accepts:
+            continue
+        margin = answered.count(True) - answered.count(False)
+        if margin > best_margin:
+            best_margin, min_gap = margin, candidate
+
+    gate = RelevanceGate(refuse_below, answer_above, min_gap)
+    counts = {
+        decision.value: {"on_topic": 0, "off_topic": 0} for decision in GateDecision
+    }
+    for scores, on_topic in samples:
+        label = "on_topic" if on_topic else "off_topic"
+        counts[gate.classify(scores).value][label] += 1
+
+    gated = sum(
+        counts[d.value][label]
+        for d in (GateDecision.CLARIFY, GateDecision.REFUSE)
+        for label in ("on_topic", "off_topic")
+    )
+
+    return {
+        **gate.to_dict(),
+        "samples": len(samples),
+        "decisions": counts,
+        "llm_calls_saved": gated,
+        "llm_calls_saved_rate": round(gated / len(samples), 4),
+    }
+
+
+def calibrate_by_language(
+    samples: List[Tuple[Sequence[float], bool, str]],
+    max_false_refusal: float = RELEVANCE_MAX_FALSE_REFUSAL,
+    max_false_accept: float = RELEVANCE_MAX_FALSE_ACCEPT,
+    min_samples: int = RELEVANCE_MIN_LANGUAGE_SAMPLES,
+) -> Dict[str, Any]:
+    """
+    Fit shared thresholds plus thresholds for each query language.
+
+    Args:
+        samples: (descending relevance scores, is_on_topic, gate language)
+        min_samples: Questions, with both labels present, a language needs
+            before it gets thresholds of its own
+
+    Returns:
+        The shared calibration, with per-language ones under ``languages``
+    """
+    calibration = calibrate_thresholds(
+        [(scores, on_topic) for scores, on_topic, _ in samples],
+        max_false_refusal,
+        max_false_accept,
+    )
+
+    by_language: Dict[str, List[Tuple[Sequence[float], bool]]] = {}
+    for scores, on_topic, language in samples:
+        by_language.setdefault(language, []).append((scores, on_topic))
+
+    calibration["languages"] = {}
+    for language, language_samples in sorted(by_language.items()):
+        labels = {on_topic for _, on_topic in language_samples}
+        if len(language_samples) < min_samples or len(labels) < 2:
+            continue
+        calibration["languages"][language] = calibrate_thresholds(
+            language_samples, max_false_refusal, max_false_accept
+        )
+
+    return calibration
+
+
+def save_thresholds(
+    calibration: Dict[str, Any], path: Union[str, Path] = RELEVANCE_THRESHOLDS_FILE
+) -> bool:
+    """Persist calibrated thresholds for the API to load at startup."""
+    return safe_json_save(calibration, path)
+
+
+# Global gate instance
+_relevance_gate: Optional[RelevanceGate] = None
+
+
+def get_relevance_gate() -> RelevanceGate:
+    """Get global relevance gate instance."""
+    global _relevance_gate
+    if _relevance_gate is None:
+        _relevance_gate = RelevanceGate.from_file()
+    return _relevance_gate
@@ -0,0 +1,310 @@
+#!/usr/bin/env python3
+"""
+Federated retrieval service for BanglaRAG system.
+Fans a single query embedding out to several collections in parallel and fuses the results.
+Language-partitioned collections get one embedding per routed language instead.
+"""
+
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from collections import deque
+from typing import Optional, List, Dict, Any, Tuple
+import threading
+import time
+
+from langchain.schema import Document
+
+from core.logging_config import BanglaRAGLogger
+from core.exceptions import DatabaseException
+from core.utils import SimpleCache, get_text_hash
+from core.constants import (
+    DATABASE_DIRECTORY,
+    DEFAULT_RETRIEVAL_COUNT,
+    SEARCH_COLLECTIONS,
+    SEARCH_FUSION_METHOD,
+    RRF_K,
+    VECTOR_BACKEND,
+    ENGLISH_CODE,
+)
+from services.embedding_service import canonicalize_query, get_embedding_factory
+from services.database_service import (
+    DatabaseManager,
+    DatabaseFactory,
+    PartitionedVectorDatabase,
+)
+
+logger = BanglaRAGLogger.get_logger("retrieval")
+
+
+class CollectionSource:
+    """A searchable collection with its fusion weight and time budget."""
+
+    def __init__(
+        self,
+        name: str,
+        manager: DatabaseManager,
+        label: Optional[str] = None,
+        weight: float = 1.0,
+        timeout: float = 5.0,
+    ):
+        self.name = name
+        self.manager = manager
+        self.label = label or name
+        self.weight = weight
+        self.timeout = timeout
+        self.latencies = deque(maxlen=100)
+        self.stats = {"searches": 0, "timeouts": 0, "errors": 0}
+
+
+class FederatedRetriever:
+    """
+    Searches any number of collections concurrently with one shared query
+    embedding, so total latency tracks the slowest collection, not the sum.
+    """
+
+    def __init__(
+        self,
+        sources: List[CollectionSource],
+        fusion: str = SEARCH_FUSION_METHOD,
+        max_workers: Optional[int] = None,
+    ):
+        if not sources:
+            raise DatabaseException("Federated retriever needs at least one collection")
+
+        self.sources = sources
+        self.fusion = fusion
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers or len(sources) * 2,
+            thread_name_prefix="retrieval",
+        )
+        self._cache = SimpleCache(max_size=100, ttl_seconds=600)  # 10 min cache
+        self._lock = threading.Lock()
+        self._latencies = deque(maxlen=100)
+        self._stats = {"queries": 0, "cache_hits": 0, "partial_results": 0}
+
+    @classmethod
+    def from_config(
+        cls,
+        persist_directory: str = DATABASE_DIRECTORY,
+        collections: Optional[Dict[str, Dict[str, Any]]] = None,
+        fusion: str = SEARCH_FUSION_METHOD,
+    ) -> "FederatedRetriever":
+        """Create a retriever over configured collections, skipping broken ones."""
+        collections = collections or SEARCH_COLLECTIONS
+        sources = []
+
+        for name, config in collections.items():
+            try:
+                manager = DatabaseFactory.create_database(
+                    backend=config.get("backend", VECTOR_BACKEND),
+                    persist_directory=persist_directory,
+                    collection_name=name,
+                )
+                sources.append(
+                    CollectionSource(
+                        name,
+                        manager,
+                        label=config.get("label"),
+                        weight=config.get("weight", 1.0),
+                        timeout=config.get("timeout", 5.0),
+                    )
+                )
+                logger.info(f"Federated retriever: added collection '{name}'")
+            except Exception as e:
+                logger.warning(f"Skipping collection '{name}': {e}")
+
+        return cls(sources, fusion=fusion)
+
+    @property
+    def primary(self) -> DatabaseManager:
+        """Database manager of the first configured collection."""
+        return self.sources[0].manager
+
+    def get_source(self, name: str) -> Optional[CollectionSource]:
+        """Look up a configured collection by name."""
+        for source in self.sources:
+            if source.name == name:
+                return source
+        return None
+
+    def embed_query(self, query: str) -> List[float]:
+        """Embed the query once for all collections."""
+        return self.primary.database.embed_query(query)
+
+    def embed_query_by_language(self, query: str) -> Dict[str, List[float]]:
+        """
+        Embed the query once per language any collection will search.
+
+        Plain collections share the English (default) embedding; partitioned
+        ones add an embedding for each partition their routing picks.
+        """
+        vectors: Dict[str, List[float]] = {}
+        for source in self.sources:
+            database = source.manager.database
+            if isinstance(database, PartitionedVectorDatabase):
+                for language in database.route(query):
+                    if language not in vectors:
+                        vectors[language] = database.embed_query_for(query, language)
+            elif ENGLISH_CODE not in vectors:
+                vectors[ENGLISH_CODE] = database.embed_query(query)
+        return vectors
+
+    def search(
+        self, query: str, k: int = DEFAULT_RETRIEVAL_COUNT
+    ) -> List[Tuple[Document, float]]:
+        """
+        Search all collections and return the fused top-k.
+
+        Each document is tagged with ``search_source`` (collection label),
+        ``collection``, its raw ``relevance_score`` and the ``fused_score``.
+        """
+        cache_key = f"federated:{get_text_hash(canonicalize_query(query))}:{k}"
+        cached_result = self._cache.get(cache_key)
+        if cached_result is not None:
+            with self._lock:
+                self._stats["cache_hits"] += 1
+            return cached_result
+
+        start_time = time.time()
+        vectors = self.embed_query_by_language(query)
+        per_source = self._fan_out(query, vectors, k)
+        fused = self._fuse(per_source, k)
+
+        elapsed = time.time() - start_time
+        with self._lock:
+            self._stats["queries"] += 1
+            self._latencies.append(elapsed)
+            if len(per_source) < len(self.sources):
+                self._stats["partial_results"] += 1
+
+        logger.debug(
+            "Federated search over %d/%d collections took %.3fs",
+            len(per_source),
+            len(self.sources),
+            elapsed,
+        )
+
+        # Only cache complete answers so a slow collection gets another chance
+        if len(per_source) == len(self.sources):
+            self._cache.set(cache_key, fused)
+        return fused
+
+    def _fan_out(
+        self, query: str, vectors: Dict[str, List[float]], k: int
+    ) -> Dict[str, List[Tuple[Document, float]]]:
+        """Query every collection concurrently, honouring per-collection timeouts."""
+        start_time = time.time()
+        futures = {
+            source.name: self._executor.submit(
+                self._timed_search, source, query, vectors, k
+            )
+            for source in self.sources
+        }
+
+        results = {}
+        for source in self.sources:
+            remaining = source.timeout - (time.time() - start_time)
+            try:
+                results[source.name] = futures[source.name].result(
+                    timeout=max(remaining, 0)
+                )
+            except FutureTimeoutError:
+                source.stats["timeouts"] += 1
+                logger.warning(
+                    f"Collection '{source.name}' timed out after {source.timeout}s"
+                )
+            except Exception as e:
+                source.stats["errors"] += 1
+                logger.error(f"Collection '{source.name}' search failed: {e}")
+
+        return results
+
+    def _timed_search(
+        self,
+        source: CollectionSource,
+        query: str,
+        vectors: Dict[str, List[float]],
+        k: int,
+    ) -> List[Tuple[Document, float]]:
+        """Run one collection search and record its latency."""
+        start_time = time.time()
+        database = source.manager.database
+        if isinstance(database, PartitionedVectorDatabase):
+            results = database.similarity_search_by_language_vectors(
+                {language: vectors[language] for language in database.route(query)},
+                k,
+            )
+        else:
+            results = source.manager.search_by_vector_with_scores(
+                vectors[ENGLISH_CODE], k
+            )
+        source.latencies.append(time.time() - start_time)
+        source.stats["searches"] += 1
+        return results
+
+    def _fuse(
+        self, per_source: Dict[str, List[Tuple[Document, float]]], k: int
+    ) -> List[Tuple[Document, float]]:
+        """
+        Weight and merge per-collection results.
+
+        With weighted fusion a result scores its collection's weight times its
+        raw relevance. Collections share one embedding model (partitioned ones
+        report scores on the same cosine scale), so raw scores compare across
+        collections; normalizing each collection to its own best hit would
+        lift a weak lone result to the top.
+        """
+        sources = {source.name: source for source in self.sources}
+        fused: Dict[str, Tuple[Document, float]] = {}
+
+        for name, results in per_source.items():
+            source = sources[name]
+            for rank, (doc, score) in enumerate(results, 1):
+                if self.fusion == "rrf":
+                    fused_score = source.weight / (RRF_K + rank)
+                else:
+                    fused_score = source.weight * score
+
+                doc.metadata["search_source"] = source.label
+                doc.metadata["collection"] = source.name
+                doc.metadata["relevance_score"] = float(score)
+                doc.metadata["fused_score"] = fused_score
+
+                key = f"{name}:{doc.metadata.get('id') or get_text_hash(doc.page_content)}"
+                if key not in fused or fused[key][1] < fused_score:
+                    fused[key] = (doc, fused_score)
+
+        ranked = sorted(fused.values(), key=lambda item: item[1], reverse=True)
+        return ranked[:k]
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get fan-out latency and per-collection statistics."""
+        with self._lock:
+            latencies = list(self._latencies)
+            stats = dict(self._stats)
+
+        stats["avg_latency"] = (
+            f"{sum(latencies) / len(latencies):.3f}s" if latencies else None
+        )
+        lookups = stats["queries"] + stats["cache_hits"]
+        stats["cache_hit_rate"] = (
+            f"{stats['cache_hits'] / lookups * 100:.1f}%" if lookups else None
+        )
+        stats["embedding_cache"] = get_embedding_factory().get_cache_stats()
+        stats["collections"] = {
+            source.name: {
+                **source.stats,
+                "label": source.label,
+                "weight": source.weight,
+                "avg_latency": (
+                    f"{sum(source.latencies) / len(source.latencies):.3f}s"
+                    if source.latencies
+                    else None
+                ),
+            }
+            for source in self.sources
+        }
+        return stats
+
+    def clear_cache(self) -> None:
+        """Clear fused result cache."""
+        self._cache.clear()
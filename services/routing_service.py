@@ -0,0 +1,302 @@
+#!/usr/bin/env python3
+"""
+Query routing service for BanglaRAG system.
+Picks the model and generation budget (num_predict) for a question from its
+query type, language and the current model load, informed by evaluation stats.
+"""
+
+import re
+import threading
+from collections import deque
+from pathlib import Path
+from typing import Optional, List, Dict, Any, Callable, Union
+
+from core.logging_config import BanglaRAGLogger
+from core.utils import safe_json_load, safe_json_save
+from core.constants import (
+    PATTERNS,
+    ROUTING_RULES,
+    ROUTING_STATS_FILE,
+    ROUTING_BANGLA_TOKEN_FACTOR,
+    ROUTING_HIGH_LOAD,
+    ROUTING_LOAD_TOKEN_FACTOR,
+    ROUTING_QUALITY_TOLERANCE,
+    ROUTING_LOAD_QUALITY_TOLERANCE,
+    ROUTING_MIN_SAMPLES,
+    ROUTING_TOKEN_HEADROOM,
+    ROUTING_MIN_TOKENS,
+    ROUTING_MAX_TOKENS,
+)
+from services.evaluation_service import percentile
+from services.llm_service import PromptTemplate, QueryType
+
+logger = BanglaRAGLogger.get_logger("routing")
+
+BANGLA_WORD = re.compile(PATTERNS["bangla"])
+LATIN_WORD = re.compile(PATTERNS["english"])
+
+
+def question_language(question: str) -> str:
+    """``"bangla"`` if the question has any Bangla word, else ``"english"``."""
+    return "bangla" if BANGLA_WORD.search(question) else "english"
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Rough LLM token count of ``text``.
+
+    Latin words average about 1.3 tokens; Bangla words are split much
+    finer by Llama-family tokenizers, about 3 tokens each.
+    """
+    bangla = len(BANGLA_WORD.findall(text))
+    other = len(LATIN_WORD.findall(text)) + len(re.findall(r"\d+", text))
+    return round(bangla * 3 + other * 1.3)
+
+
+def route_key(query_type: str, language: str) -> str:
+    """Stats key for a route, e.g. ``"definition:bangla"``."""
+    return f"{query_type}:{language}"
+
+
+class RoutingPolicy:
+    """
+    Maps a question to a model and a ``max_tokens`` budget.
+
+    Each query type has a rule (``ROUTING_RULES``): candidate models in order
+    of preference and a default budget. A ``preferred`` model (the one chosen
+    with ``/api/set-model``) is kept unless the stats justify moving: with
+    enough evaluated answers for the route (query type and language), from
+    the preferred model too, a faster candidate whose pass rate is within
+    ``quality_tolerance`` of the best evaluated model is chosen. The budget
+    covers the p90 length of the chosen model's passing answers. Under high
+    load the tolerance widens to ``load_quality_tolerance`` and budgets
+    shrink, so cheaper routes absorb the burst. Without a preferred model
+    the fastest good candidate, else the first available one, is used, with
+    the rule's budget.
+    """
+
+    def __init__(
+        self,
+        stats: Optional[Dict[str, Any]] = None,
+        rules: Optional[Dict[str, Dict[str, Any]]] = None,
+        quality_tolerance: float = ROUTING_QUALITY_TOLERANCE,
+        load_quality_tolerance: float = ROUTING_LOAD_QUALITY_TOLERANCE,
+        high_load: float = ROUTING_HIGH_LOAD,
+        min_samples: int = ROUTING_MIN_SAMPLES,
+    ):
+        self.stats = stats or {}
+        self.rules = rules or ROUTING_RULES
+        self.quality_tolerance = quality_tolerance
+        self.load_quality_tolerance = load_quality_tolerance
+        self.high_load = high_load
+        self.min_samples = min_samples
+        self._lock = threading.Lock()
+        self._live: Dict[str, Dict[str, Any]] = {}
+
+    @classmethod
+    def from_file(cls, path: Union[str, Path] = ROUTING_STATS_FILE) -> "RoutingPolicy":
+        """Load fitted route stats, falling back to the rules alone."""
+        data = safe_json_load(path) if Path(path).exists() else None
+        if not data:
+            logger.info("No routing stats found, routing by rules only")
+            return cls()
+
+        logger.info(f"Loaded routing stats for {len(data.get('routes', {}))} routes")
+        return cls(stats=data.get("routes", {}))
+
+    def _route_stats(self, query_type: str, language: str) -> Dict[str, Dict]:
+        """Per-model stats for the route, or for the query type in any language."""
+        for key in (route_key(query_type, language), route_key(query_type, "all")):
+            models = {
+                model: stats
+                for model, stats in self.stats.get(key, {}).items()
+                if stats.get("samples", 0) >= self.min_samples
+            }
+            if models:
+                return models
+        return {}
+
+    def route(
+        self,
+        question: str,
+        language: Optional[str] = None,
+        load: Optional[float] = None,
+        available: Optional[Callable[[str], bool]] = None,
+        model_name: Optional[str] = None,
+        preferred: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        Choose a model and budget for ``question``.
+
+        Args:
+            question: The user's question
+            language: ``"english"`` or ``"bangla"`` (detected if None)
+            load: Model slot usage, queued requests included (1.0 = full)
+            available: Whether a model is installed; unavailable ones are skipped
+            model_name: Keep this model and only pick the budget (evaluations)
+            preferred: Model to keep unless the stats show a faster one
+                that answers as well (the active model)
+
+        Returns:
+            Route with ``query_type``, ``language``, ``model``, ``max_tokens``
+            and ``reason`` (``"stats"``, ``"preferred"``, ``"rule"`` or
+            ``"fixed"``)
+        """
+        query_type = PromptTemplate.detect_query_type(question).value
+        language = language or question_language(question)
+        rule = self.rules.get(query_type) or self.rules[QueryType.GENERAL.value]
+        high_load = load is not None and load >= self.high_load
+
+        if preferred and available is not None and not available(preferred):
+            preferred = None
+        candidates = [
+            model for model in rule["models"] if available is None or available(model)
+        ]
+        if preferred and preferred not in candidates:
+            candidates.insert(0, preferred)
+        stats = self._route_stats(query_type, language)
+
+        if model_name:
+            model, reason = model_name, "fixed"
+        else:
+            tolerance = (
+                self.load_quality_tolerance if high_load else self.quality_tolerance
+            )
+            best = max((s["pass_rate"] for s in stats.values()), default=0.0)
+            good = [
+                m
+                for m in candidates
+                if m in stats and stats[m]["pass_rate"] >= best - tolerance
+            ]
+            fastest = min(good, key=lambda m: stats[m]["latency_p50"]) if good else None
+            if preferred and (fastest is None or preferred not in stats):
+                # Nothing shows the preferred model is worse or slower here
+                model, reason = preferred, "preferred"
+            elif fastest is not None:
+                model = fastest
+                reason = "preferred" if fastest == preferred else "stats"
+            else:
+                model = candidates[0] if candidates else None
+                reason = "rule"
+
+        if model in stats and stats[model].get("answer_tokens_p90"):
+            max_tokens = stats[model]["answer_tokens_p90"] * ROUTING_TOKEN_HEADROOM
+        else:
+            max_tokens = rule["max_tokens"]
+            if language == "bangla":
+                max_tokens *= ROUTING_BANGLA_TOKEN_FACTOR
+        if high_load:
+            max_tokens *= ROUTING_LOAD_TOKEN_FACTOR
+        max_tokens = int(min(max(max_tokens, ROUTING_MIN_TOKENS), ROUTING_MAX_TOKENS))
+
+        return {
+            "query_type": query_type,
+            "language": language,
+            "model": model,
+            "max_tokens": max_tokens,
+            "high_load": high_load,
+            "reason": reason,
+        }
+
+    def record(self, route: Dict[str, Any], seconds: float, success: bool) -> None:
+        """Record a live answer's latency and outcome for its route."""
+        key = route_key(route["query_type"], route["language"])
+        with self._lock:
+            live = self._live.setdefault(
+                key,
+                {
+                    "requests": 0,
+                    "failures": 0,
+                    "models": {},
+                    "latency": deque(maxlen=200),
+                },
+            )
+            live["requests"] += 1
+            live["failures"] += not success
+            model = route.get("model") or "default"
+            live["models"][model] = live["models"].get(model, 0) + 1
+            if success:
+                live["latency"].append(seconds)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get live per-route counts, models used and latency."""
+        with self._lock:
+            live = {
+                key: {**value, "latency": list(value["latency"])}
+                for key, value in self._live.items()
+            }
+
+        routes = {}
+        for key, value in live.items():
+            latency = value.pop("latency")
+            routes[key] = {
+                **value,
+                "latency_p50": round(percentile(latency, 50) or 0, 2),
+                "latency_p95": round(percentile(latency, 95) or 0, 2),
+            }
+        return {"fitted_routes": len(self.stats), "routes": routes}
+
+
+def fit_routes(
+    samples: List[Dict[str, Any]], min_samples: int = ROUTING_MIN_SAMPLES
+) -> Dict[str, Any]:
+    """
+    Summarize evaluated answers per route and model.
+
+    Args:
+        samples: One dict per answer with ``model``, ``question``,
+            ``language``, ``passed``, ``latency`` and ``answer``
+        min_samples: Answers a route needs before the policy trusts it
+
+    Returns:
+        ``{"routes": {route: {model: stats}}}`` for ``RoutingPolicy``, with
+        stats for each query type in every language under ``<type>:all``
+    """
+    grouped: Dict[str, Dict[str, List[Dict[str, Any]]]] = {}
+    for sample in samples:
+        query_type = PromptTemplate.detect_query_type(sample["question"]).value
+        for key in (
+            route_key(query_type, sample["language"]),
+            route_key(query_type, "all"),
+        ):
+            grouped.setdefault(key, {}).setdefault(sample["model"], []).append(sample)
+
+    routes: Dict[str, Dict[str, Any]] = {}
+    for key, models in sorted(grouped.items()):
+        routes[key] = {}
+        for model, answers in sorted(models.items()):
+            passed = [a for a in answers if a["passed"]]
+            lengths = [estimate_tokens(a["answer"]) for a in passed]
+            routes[key][model] = {
+                "samples": len(answers),
+                "pass_rate": round(len(passed) / len(answers), 4),
+                "latency_p50": round(
+                    percentile([a["latency"] for a in answers], 50), 2
+                ),
+                "latency_p90": round(
+                    percentile([a["latency"] for a in answers], 90), 2
+                ),
+                "answer_tokens_p90": percentile(lengths, 90) if lengths else None,
+                "trusted": len(answers) >= min_samples,
+            }
+
+    return {"routes": routes, "samples": len(samples), "min_samples": min_samples}
+
+
+def save_routing_stats(
+    stats: Dict[str, Any], path: Union[str, Path] = ROUTING_STATS_FILE
+) -> bool:
+    """Persist fitted route stats for the API to load at startup."""
+    return safe_json_save(stats, path)
+
+
+# Global policy instance
+_routing_policy: Optional[RoutingPolicy] = None
+
+
+def get_routing_policy() -> RoutingPolicy:
+    """Get global routing policy instance."""
+    global _routing_policy
+    if _routing_policy is None:
+        _routing_policy = RoutingPolicy.from_file()
+    return _routing_policy
@@ -0,0 +1,314 @@
+#!/usr/bin/env python3
+"""
+Cache warm-up service for BanglaRAG system.
+Records answered questions and, after a restart, replays the most frequent
+ones (plus the bundled evaluation questions) through retrieval and generation
+in the background, so the search, embedding and response caches are filled
+before students arrive.
+"""
+
+from collections import Counter, defaultdict, deque
+from pathlib import Path
+from typing import Optional, List, Dict, Any, Callable, Union
+import threading
+import time
+
+from core.logging_config import BanglaRAGLogger
+from core.utils import ensure_directory, load_test_report_entries
+from core.constants import (
+    QUERY_LOG_FILE,
+    WARMUP_TOP_N,
+    WARMUP_MAX_QUESTIONS,
+    WARMUP_TIME_BUDGET,
+    WARMUP_QUERY_LOG_LINES,
+    WARMUP_BACKOFF_SECONDS,
+    PRIORITY_MAINTENANCE,
+)
+from services.embedding_service import canonicalize_query
+from services.relevance_service import (
+    GateDecision,
+    gate_language,
+    get_relevance_gate,
+    retrieval_scores,
+)
+
+logger = BanglaRAGLogger.get_logger("warmup")
+
+
+class QueryLog:
+    """Append-only log of answered questions, one per line."""
+
+    def __init__(self, path: Union[str, Path] = QUERY_LOG_FILE):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+
+    def record(self, query: str) -> None:
+        """Append a question (newlines collapsed)."""
+        line = " ".join(query.split())
+        if not line:
+            return
+        try:
+            with self._lock:
+                ensure_directory(self.path.parent)
+                with open(self.path, "a", encoding="utf-8") as f:
+                    f.write(line + "\n")
+        except OSError as e:
+            logger.warning(f"Failed to record query: {e}")
+
+    def top_questions(
+        self, n: int = WARMUP_TOP_N, max_lines: int = WARMUP_QUERY_LOG_LINES
+    ) -> List[Dict[str, Any]]:
+        """
+        Most frequent recent questions.
+
+        Questions are grouped by their canonical form (the cache key), and
+        each group is represented by its most common spelling.
+
+        Returns:
+            ``{"question", "count"}`` dicts, most frequent first
+        """
+        if not self.path.exists():
+            return []
+
+        with self._lock:
+            with open(self.path, "r", encoding="utf-8") as f:
+                lines = deque((line.strip() for line in f), maxlen=max_lines)
+
+        counts: Counter = Counter()
+        spellings: Dict[str, Counter] = defaultdict(Counter)
+        for line in lines:
+            if not line:
+                continue
+            key = canonicalize_query(line)
+            counts[key] += 1
+            spellings[key][line] += 1
+
+        return [
+            {"question": spellings[key].most_common(1)[0][0], "count": count}
+            for key, count in counts.most_common(n)
+        ]
+
+
+class CacheWarmer:
+    """
+    Replays likely questions through the RAG pipeline in the background.
+
+    Each question is searched (filling the federated, search and embedding
+    caches) and, if the relevance gate would let it through, answered with
+    the same prompt ``/api/chat`` builds (filling the response cache). Model
+    calls run at maintenance priority, so they never take the slots reserved
+    for live chat, and warm-up pauses entirely while live requests are
+    queued. It stops once every question is warm or the time budget is spent.
+    """
+
+    def __init__(
+        self,
+        retriever,
+        rag_processor,
+        query_log: Optional[QueryLog] = None,
+        top_n: int = WARMUP_TOP_N,
+        max_questions: int = WARMUP_MAX_QUESTIONS,
+        time_budget: float = WARMUP_TIME_BUDGET,
+        k: int = 3,
+        is_relevant: Optional[Callable[[str], bool]] = None,
+        is_busy: Optional[Callable[[], bool]] = None,
+    ):
+        self.retriever = retriever
+        self.rag_processor = rag_processor
+        self.query_log = query_log or get_query_log()
+        self.top_n = top_n
+        self.max_questions = max_questions
+        self.time_budget = time_budget
+        self.k = k  # Must match the endpoint's k for the caches to hit
+        self.is_relevant = is_relevant
+        self.is_busy = is_busy
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        self._stats = self._initial_stats()
+
+    @staticmethod
+    def _initial_stats() -> Dict[str, Any]:
+        """Counters for a fresh warm-up run."""
+        return {
+            "status": "idle",
+            "planned": 0,
+            "from_log": 0,
+            "from_reports": 0,
+            "answered": 0,
+            "retrieval_only": 0,
+            "skipped": 0,
+            "failed": 0,
+            "paused_seconds": 0.0,
+            "started_at": None,
+            "finished_at": None,
+        }
+
+    def plan(self) -> List[Dict[str, Any]]:
+        """
+        Questions to warm, most valuable first.
+
+        The query log's most frequent questions come first, then evaluation
+        questions from the bundled test reports; duplicates (by canonical
+        form) are dropped. The plan is capped at ``max_questions`` so warm
+        answers do not evict each other from the response cache.
+        """
+        planned: List[Dict[str, Any]] = []
+        seen = set()
+
+        def add(question: str, source: str) -> None:
+            key = canonicalize_query(question or "")
+            if key and key not in seen:
+                seen.add(key)
+                planned.append({"question": question, "source": source})
+
+        for entry in self.query_log.top_questions(self.top_n):
+            add(entry["question"], "log")
+        for entry in load_test_report_entries():
+            add(entry.get("question", ""), "reports")
+
+        return planned[: self.max_questions]
+
+    def start(self) -> bool:
+        """Start warming in a background thread (False if already running)."""
+        with self._lock:
+            if self._thread and self._thread.is_alive():
+                return False
+            self._stop.clear()
+            self._stats = self._initial_stats()
+            self._stats["status"] = "planning"
+            self._stats["started_at"] = time.time()
+            self._thread = threading.Thread(
+                target=self._run, name="cache-warmup", daemon=True
+            )
+            self._thread.start()
+            return True
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Ask the warm-up to stop after the current question."""
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout)
+
+    def _run(self) -> None:
+        """Warm planned questions until done, stopped or out of time."""
+        start = time.monotonic()
+        try:
+            questions = self.plan()
+            with self._lock:
+                self._stats.update(
+                    status="running",
+                    planned=len(questions),
+                    from_log=sum(1 for q in questions if q["source"] == "log"),
+                    from_reports=sum(1 for q in questions if q["source"] == "reports"),
+                )
+            logger.info(f"Cache warm-up started with {len(questions)} questions")
+
+            status = "completed"
+            for entry in questions:
+                if not self._wait_until_idle(start):
+                    status = "stopped" if self._stop.is_set() else "budget_exhausted"
+                    break
+                outcome = self.warm(entry["question"])
+                with self._lock:
+                    self._stats[outcome] += 1
+
+        except Exception as e:
+            logger.error(f"Cache warm-up failed: {e}")
+            status = "failed"
+
+        with self._lock:
+            self._stats["status"] = status
+            self._stats["finished_at"] = time.time()
+        logger.info(
+            f"Cache warm-up {status} after {time.monotonic() - start:.1f}s: "
+            f"{self._stats['answered']} answered, "
+            f"{self._stats['retrieval_only']} retrieval only"
+        )
+
+    def _wait_until_idle(self, start: float) -> bool:
+        """Back off while live requests are queued; False once out of time."""
+        while True:
+            if self._stop.is_set() or time.monotonic() - start >= self.time_budget:
+                return False
+            if not (self.is_busy and self.is_busy()):
+                return True
+            self._stop.wait(WARMUP_BACKOFF_SECONDS)
+            with self._lock:
+                self._stats["paused_seconds"] += WARMUP_BACKOFF_SECONDS
+
+    def warm(self, question: str) -> str:
+        """
+        Run one question through retrieval and, if it would be answered,
+        generation.
+
+        Returns:
+            The stats counter it falls under: ``answered``, ``retrieval_only``
+            (the relevance gate would not answer it), ``skipped`` or ``failed``
+        """
+        if self.is_relevant and not self.is_relevant(question):
+            return "skipped"
+
+        try:
+            documents = [doc for doc, _ in self.retriever.search(question, k=self.k)]
+            if not documents:
+                return "retrieval_only"
+
+            # classify, not evaluate: warm-up must not skew the live gate stats
+            scores = retrieval_scores(documents)
+            if (
+                scores
+                and get_relevance_gate().classify(scores, gate_language(question))
+                != GateDecision.ANSWER
+            ):
+                return "retrieval_only"
+
+            # Warm with the unloaded interactive route: under load routing
+            # shrinks max_tokens, and that budget is part of the cache key
+            route_kwargs = {}
+            if self.rag_processor.router is not None:
+                route = self.rag_processor.route(question, idle=True)
+                route_kwargs["max_tokens"] = route["max_tokens"]
+                if route["model"]:
+                    route_kwargs["model_name"] = route["model"]
+
+            result = self.rag_processor.process_rag_query(
+                question, documents, priority=PRIORITY_MAINTENANCE, **route_kwargs
+            )
+            return "answered" if result.get("success") else "failed"
+
+        except Exception as e:
+            logger.warning(f"Warm-up failed for '{question[:60]}': {e}")
+            return "failed"
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get warm-up progress."""
+        with self._lock:
+            stats = dict(self._stats)
+        done = (
+            stats["answered"]
+            + stats["retrieval_only"]
+            + stats["skipped"]
+            + stats["failed"]
+        )
+        stats["done"] = done
+        stats["progress"] = (
+            round(done / stats["planned"] * 100, 1) if stats["planned"] else 0.0
+        )
+        if stats["started_at"]:
+            end = stats["finished_at"] or time.time()
+            stats["elapsed"] = round(end - stats["started_at"], 1)
+        stats["time_budget"] = self.time_budget
+        return stats
+
+
+# Global query log instance
+_query_log: Optional[QueryLog] = None
+
+
+def get_query_log() -> QueryLog:
+    """Get global query log instance."""
+    global _query_log
+    if _query_log is None:
+        _query_log = QueryLog()
+    return _query_log
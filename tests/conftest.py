@@ -0,0 +1,9 @@
+"""
+Pytest configuration for BanglaRAG unit tests.
+Puts the project root on the import path, as the tools/ scripts do.
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
@@ -0,0 +1,160 @@
+"""
+Tests for lanes, deadline shedding and slot hand-off in admission control.
+"""
+
+import threading
+import time
+
+import pytest
+
+from core.exceptions import OverloadedException, ValidationException
+from services.admission_service import AdmissionController
+
+LANES = {
+    "chat": {"priority": 0, "max_queue": 2, "deadline": 5.0, "service_time": 0.2},
+    "batch": {"priority": 10, "max_queue": 4, "deadline": None, "service_time": 0.2},
+}
+
+
+@pytest.fixture
+def controller():
+    return AdmissionController(slots=1, lanes=LANES)
+
+
+def hold_slot(controller, lane="batch"):
+    ticket = controller.admit(lane)
+    assert ticket.wait(timeout=0)
+    return ticket
+
+
+def lane_stats(controller, lane):
+    return controller.get_stats()["lanes"][lane]
+
+
+def test_unknown_lane_is_rejected(controller):
+    with pytest.raises(ValidationException):
+        controller.admit("bulk")
+
+
+def test_free_slot_is_granted_at_once(controller):
+    ticket = controller.admit("chat")
+
+    assert ticket.estimated_wait() == 0.0
+    assert ticket.wait(timeout=0)
+    assert ticket.position() == 0
+    assert controller.get_stats()["in_use"] == 1
+
+
+def test_full_lane_queue_sheds_only_that_lane(controller):
+    hold_slot(controller)
+    controller.admit("chat")
+    controller.admit("chat")
+
+    with pytest.raises(OverloadedException) as shed:
+        controller.admit("chat")
+    assert shed.value.retry_after >= 1.0
+    assert lane_stats(controller, "chat")["rejected_full"] == 1
+
+    controller.admit("batch")  # Other lanes keep their own limit
+
+
+def test_requests_that_cannot_meet_their_deadline_are_shed(controller):
+    hold_slot(controller)
+    # One request ahead (the held slot): ~0.2s wait plus 0.2s of work
+    with pytest.raises(OverloadedException):
+        controller.admit("chat", deadline=0.3)
+    assert lane_stats(controller, "chat")["rejected_deadline"] == 1
+
+    ticket = controller.admit("chat", deadline=1.0)
+    assert ticket.estimated_wait() == pytest.approx(0.2)
+
+
+def test_interactive_lane_is_served_before_queued_batch_work(controller):
+    held = hold_slot(controller)
+    batch = controller.admit("batch")
+    chat = controller.admit("chat")
+
+    assert (chat.position(), batch.position()) == (1, 2)
+    held.close()
+
+    assert not batch.wait(timeout=0.05)  # Keeps its place behind chat
+    assert chat.wait(timeout=0)
+    chat.close()
+    assert batch.wait(timeout=0)
+
+
+def test_same_lane_is_first_come_first_served(controller):
+    held = hold_slot(controller)
+    tickets = [controller.admit("batch") for _ in range(3)]
+    order = []
+
+    def worker(ticket):
+        with ticket:
+            order.append(ticket)
+            time.sleep(0.01)
+
+    threads = [threading.Thread(target=worker, args=(t,)) for t in reversed(tickets)]
+    for thread in threads:
+        thread.start()
+    held.close()
+    for thread in threads:
+        thread.join(timeout=2.0)
+
+    assert order == tickets
+
+
+def test_ticket_expires_when_it_can_no_longer_finish(controller):
+    hold_slot(controller)
+    ticket = controller.admit("chat", deadline=0.5)
+
+    start = time.time()
+    with pytest.raises(OverloadedException):
+        ticket.wait()
+
+    # Gives up once less than its service time is left
+    assert time.time() - start == pytest.approx(0.3, abs=0.15)
+    ticket.close()
+    stats = lane_stats(controller, "chat")
+    assert (stats["expired"], stats["abandoned"], stats["queued"]) == (1, 0, 0)
+
+
+def test_slot_is_released_when_the_request_fails(controller):
+    with pytest.raises(RuntimeError):
+        with controller.admit("chat"):
+            raise RuntimeError("pipeline failed")
+
+    assert controller.get_stats()["in_use"] == 0
+    assert lane_stats(controller, "chat")["completed"] == 1
+    assert controller.admit("chat").wait(timeout=0)
+
+
+def test_closing_twice_releases_the_slot_once(controller):
+    ticket = hold_slot(controller, "chat")
+    ticket.close()
+    other = hold_slot(controller)
+    ticket.close()
+
+    assert other.active
+    assert controller.get_stats()["in_use"] == 1
+    assert lane_stats(controller, "chat")["completed"] == 1
+
+
+def test_abandoned_ticket_leaves_the_queue(controller):
+    held = hold_slot(controller)
+    waiting = controller.admit("chat")
+    waiting.close()
+
+    assert lane_stats(controller, "chat")["abandoned"] == 1
+    assert controller.get_stats()["queued"] == 0
+    held.close()
+    assert controller.get_stats()["in_use"] == 0
+
+
+def test_wait_estimates_follow_measured_service_times(controller):
+    ticket = hold_slot(controller, "chat")
+    time.sleep(0.05)
+    ticket.close()
+
+    assert lane_stats(controller, "chat")["service_time"] == pytest.approx(
+        0.05, abs=0.03
+    )
@@ -0,0 +1,140 @@
+"""
+Tests for pairing performance log lines into calls and their percentiles.
+"""
+
+import gzip
+import json
+import sys
+
+import pytest
+
+from tools.analyze_performance_log import (
+    Histogram,
+    PerformanceLogAnalyzer,
+    main,
+    read_events,
+    rotated_files,
+)
+
+LOG_NAME = "banglarag_performance.log"
+
+
+def line(clock, event, op, duration=None, error=None):
+    text = f"2025-10-08 10:{clock // 60:02d}:{clock % 60:02d} - PERF - {event}: {op}"
+    if duration is not None:
+        text += f" - Duration: {duration:.2f}s"
+    if error:
+        text += f" - Error: {error}"
+    return text + "\n"
+
+
+def search_lines(first, count):
+    """``count`` searches taking 0.1s, 0.2s, ... (numbered from ``first``)."""
+    lines = []
+    for i in range(first, first + count):
+        lines.append(line(i * 10, "Started", "search"))
+        lines.append(line(i * 10 + 1, "Completed", "search", (i + 1) / 10))
+    return lines
+
+
+@pytest.fixture
+def log_dir(tmp_path):
+    """A rotated log: 10 searches, a retried and a timed-out generation, strays."""
+    with gzip.open(tmp_path / f"{LOG_NAME}.2.gz", "wt", encoding="utf-8") as f:
+        f.writelines(search_lines(0, 4))
+    (tmp_path / f"{LOG_NAME}.1").write_text(
+        "".join(search_lines(4, 6)) + "not a performance line\n", encoding="utf-8"
+    )
+    (tmp_path / LOG_NAME).write_text(
+        "".join(
+            [
+                # One generation whose first attempt timed out
+                line(200, "Started", "generate_response"),
+                line(200, "Started", "generate_response"),
+                line(202, "Failed", "generate_response", 2.0, "Request timed out"),
+                line(202, "Started", "generate_response"),
+                line(203, "Completed", "generate_response", 1.0),
+                line(203, "Completed", "generate_response", 3.0),
+                # One that failed outright
+                line(210, "Started", "generate_response"),
+                line(215, "Failed", "generate_response", 5.0, "Request timed out"),
+                # An end whose start was rotated away, and a start never ended
+                line(220, "Completed", "embed_text", 0.2),
+                line(230, "Started", "embed_text"),
+            ]
+        ),
+        encoding="utf-8",
+    )
+    return tmp_path
+
+
+def analyze(paths):
+    analyzer = PerformanceLogAnalyzer()
+    for event in read_events(paths, analyzer.stats):
+        analyzer.feed(event)
+    analyzer.finish()
+    return analyzer, analyzer.report()
+
+
+def test_rotations_are_read_oldest_first(log_dir):
+    assert [p.name for p in rotated_files(log_dir / LOG_NAME)] == [
+        f"{LOG_NAME}.2.gz",
+        f"{LOG_NAME}.1",
+        LOG_NAME,
+    ]
+
+
+def test_events_are_counted_and_paired_into_calls(log_dir):
+    analyzer, report = analyze(rotated_files(log_dir / LOG_NAME))
+
+    assert report["events"] == 20 + 10
+    assert analyzer.stats["unparsed_lines"] == 1
+    operations = report["operations"]
+    assert operations["search"]["calls"] == 10
+    assert operations["embed_text"]["calls"] == 1
+    assert operations["embed_text"]["orphan_ends"] == 1
+    assert operations["embed_text"]["unfinished"] == 1
+
+
+def test_retries_fold_into_the_outer_call(log_dir):
+    _, report = analyze([log_dir / LOG_NAME])
+
+    generation = report["operations"]["generate_response"]
+    assert generation["calls"] == 2
+    assert generation["attempts"] == 3
+    assert generation["failed_attempts"] == 2
+    assert generation["retry_amplification"] == 1.5
+    assert generation["failure_rate"] == generation["timeout_rate"] == 0.5
+    assert (generation["p50"], generation["max"]) == (3.0, 5.0)
+
+
+def test_percentiles_are_nearest_rank(log_dir):
+    _, report = analyze(rotated_files(log_dir / LOG_NAME))
+
+    search = report["operations"]["search"]
+    assert (search["p50"], search["p90"], search["p99"], search["max"]) == (
+        0.5,
+        0.9,
+        1.0,
+        1.0,
+    )
+    assert search["mean"] == 0.55
+
+
+def test_empty_histogram_has_no_percentiles():
+    assert Histogram().percentile(50) is None
+
+
+def test_report_prints_percentiles_and_saves_json(log_dir, monkeypatch, capsys):
+    output = log_dir / "report.json"
+    logs = [str(p) for p in rotated_files(log_dir / LOG_NAME)]
+    monkeypatch.setattr(sys, "argv", ["analyze", *logs, "--output", str(output)])
+
+    main()
+
+    printed = capsys.readouterr().out
+    assert "30 events from 3 file(s), 1 unparsed lines" in printed
+    row = next(l for l in printed.splitlines() if l.strip().startswith("search "))
+    assert row.split()[1:6] == ["10", "0.50", "0.90", "1.00", "1.00"]
+    saved = json.loads(output.read_text(encoding="utf-8"))
+    assert saved["operations"]["search"]["p90"] == 0.9
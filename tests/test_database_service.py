@@ -0,0 +1,254 @@
+"""
+Tests for the memmap, compressed and language-partitioned vector backends.
+"""
+
+import numpy as np
+import pytest
+from langchain.schema import Document
+
+from services.database_service import (
+    CompressedVectorDatabase,
+    MemmapVectorDatabase,
+    PartitionedVectorDatabase,
+)
+
+
+@pytest.fixture
+def database(tmp_path):
+    # Embeddings are passed in directly, so no embedding model is needed
+    db = MemmapVectorDatabase(str(tmp_path), "test", embedding_function=object())
+    documents = [
+        Document(page_content=f"chunk {i}", metadata={"id": str(i)}) for i in range(4)
+    ]
+    db.add_embeddings(documents, np.eye(4).tolist())
+    return db
+
+
+def search(db, embedding, k):
+    return [
+        doc.metadata["id"]
+        for doc, _ in db.similarity_search_by_vector_with_scores(embedding, k)
+    ]
+
+
+@pytest.mark.parametrize("k", [0, -1])
+def test_no_results_for_non_positive_k(database, k):
+    assert search(database, [1, 0, 0, 0], k) == []
+    assert database.similarity_search_by_vectors_with_scores(
+        [[1, 0, 0, 0], [0, 1, 0, 0]], k
+    ) == [[], []]
+
+
+def test_results_ordered_by_cosine_similarity(database):
+    hits = database.similarity_search_by_vector_with_scores([0.1, 0, 2, 1], 3)
+
+    assert [doc.metadata["id"] for doc, _ in hits] == ["2", "3", "0"]
+    assert hits[0][1] == pytest.approx(2 / np.sqrt(5.01))
+
+
+def test_k_larger_than_store_returns_every_live_row(database):
+    database.delete_documents(["1"])
+
+    assert sorted(search(database, [1, 1, 1, 1], 10)) == ["0", "2", "3"]
+
+
+def test_empty_store_returns_nothing(tmp_path):
+    db = MemmapVectorDatabase(str(tmp_path), "empty", embedding_function=object())
+
+    assert search(db, [1, 0, 0, 0], 3) == []
+
+
+COMPRESSIONS = ["int8", "pca", "truncate"]
+
+
+def embeddings(rows, dimensions=64, leading=16, seed=0):
+    """Random vectors whose energy sits in the ``leading`` dimensions."""
+    scales = np.where(np.arange(dimensions) < leading, 1.0, 0.05)
+    return np.random.default_rng(seed).standard_normal((rows, dimensions)) * scales
+
+
+def documents(count):
+    return [
+        Document(page_content=f"chunk {i}", metadata={"id": str(i)})
+        for i in range(count)
+    ]
+
+
+@pytest.fixture
+def corpus(tmp_path):
+    """Exact memmap store and the vectors it holds."""
+    vectors = embeddings(400)
+    exact = MemmapVectorDatabase(str(tmp_path), "exact", embedding_function=object())
+    exact.add_embeddings(documents(len(vectors)), vectors.tolist())
+    return exact, vectors
+
+
+def compressed_store(tmp_path, vectors, compression):
+    db = CompressedVectorDatabase(
+        str(tmp_path),
+        f"compressed_{compression}",
+        embedding_function=object(),
+        compression=compression,
+        dimensions=16,
+    )
+    db.add_embeddings(documents(len(vectors)), vectors.tolist())
+    return db
+
+
+@pytest.mark.parametrize("compression", COMPRESSIONS)
+def test_compressed_search_recalls_the_exact_top_k(tmp_path, corpus, compression):
+    exact, vectors = corpus
+    db = compressed_store(tmp_path, vectors, compression)
+    queries = (vectors[:20] + embeddings(20, seed=1) * 0.3).tolist()
+
+    found = db.similarity_search_by_vectors_with_scores(queries, 10)
+    expected = exact.similarity_search_by_vectors_with_scores(queries, 10)
+
+    recall = np.mean(
+        [
+            len(
+                {d.metadata["id"] for d, _ in hits}
+                & {d.metadata["id"] for d, _ in truth}
+            )
+            / 10
+            for hits, truth in zip(found, expected)
+        ]
+    )
+    assert recall >= 0.9
+    assert [hits[0][0].metadata["id"] for hits in found] == [
+        truth[0][0].metadata["id"] for truth in expected
+    ]
+    assert db.get_index_stats()["ratio"] > 1
+
+
+@pytest.mark.parametrize("compression", COMPRESSIONS)
+def test_compressed_results_carry_exact_scores_in_order(tmp_path, corpus, compression):
+    exact, vectors = corpus
+    db = compressed_store(tmp_path, vectors, compression)
+
+    hits = db.similarity_search_by_vector_with_scores(vectors[7].tolist(), 5)
+
+    scores = [score for _, score in hits]
+    assert scores == sorted(scores, reverse=True)
+    assert hits[0][0].metadata["id"] == "7"
+    assert scores[0] == pytest.approx(1.0, abs=1e-5)
+    exact_scores = dict(
+        (doc.metadata["id"], score)
+        for doc, score in exact.similarity_search_by_vector_with_scores(
+            vectors[7].tolist(), 50
+        )
+    )
+    for doc, score in hits:
+        assert score == pytest.approx(exact_scores[doc.metadata["id"]], abs=1e-5)
+
+
+@pytest.mark.parametrize("compression", COMPRESSIONS)
+@pytest.mark.parametrize("k", [0, -1])
+def test_compressed_search_returns_nothing_for_non_positive_k(tmp_path, compression, k):
+    db = compressed_store(tmp_path, embeddings(20), compression)
+
+    assert db.similarity_search_by_vectors_with_scores(
+        embeddings(2, seed=1).tolist(), k
+    ) == [[], []]
+
+
+@pytest.mark.parametrize("compression", COMPRESSIONS)
+def test_compressed_search_skips_deleted_rows(tmp_path, compression):
+    vectors = embeddings(20)
+    db = compressed_store(tmp_path, vectors, compression)
+    db.delete_documents(["3", "4"])
+
+    ids = [
+        doc.metadata["id"]
+        for doc, _ in db.similarity_search_by_vector_with_scores(
+            vectors[3].tolist(), 30
+        )
+    ]
+
+    assert len(ids) == 18
+    assert "3" not in ids and "4" not in ids
+
+
+class KeywordEmbeddings:
+    """Embeds text as keyword hits, so similarities are known in advance."""
+
+    def __init__(self, model, keywords):
+        self.model = model
+        self.keywords = keywords
+
+    def embed_query(self, text):
+        return [1.0 if word in text.casefold() else 0.01 for word in self.keywords]
+
+    def embed_documents(self, texts):
+        return [self.embed_query(text) for text in texts]
+
+
+@pytest.fixture
+def partitioned(tmp_path, request):
+    keywords = ["heap", "sort", "গ্রাফ"]
+    partitions = {
+        language: MemmapVectorDatabase(
+            str(tmp_path),
+            f"book_{language}",
+            embedding_function=KeywordEmbeddings(
+                f"{request.node.name}-{language}", keywords
+            ),
+        )
+        for language in ("en", "bn")
+    }
+    return PartitionedVectorDatabase(
+        partitions, "en", score_floors={"en": 0.0, "bn": 0.5}
+    )
+
+
+def add(db, texts):
+    db.add_documents(
+        [Document(page_content=text, metadata={"id": text}) for text in texts]
+    )
+
+
+def test_documents_are_split_into_partitions_by_script(partitioned):
+    add(partitioned, ["a heap is a tree", "গ্রাফ একটি কাঠামো"])
+
+    assert partitioned.partitions["en"].get_existing_ids() == ["a heap is a tree"]
+    assert partitioned.partitions["bn"].get_existing_ids() == ["গ্রাফ একটি কাঠামো"]
+    assert partitioned.get_document_count() == 2
+
+
+def test_queries_route_to_populated_partitions(partitioned):
+    assert partitioned.route("গ্রাফ কী?") == ["en"]  # Only English is indexed
+    add(partitioned, ["heap sort", "গ্রাফ একটি কাঠামো"])
+
+    assert partitioned.route("What is a heap?") == ["en"]
+    assert partitioned.route("গ্রাফ কী?") == ["bn"]
+    assert sorted(partitioned.route("heap sort গ্রাফ কী")) == ["bn", "en"]
+
+
+def test_scores_are_rescaled_to_one_scale(partitioned):
+    assert partitioned.comparable_score("en", 0.8) == pytest.approx(0.8)
+    assert partitioned.comparable_score("bn", 0.75) == pytest.approx(0.5)
+    assert partitioned.comparable_score("bn", 0.4) == 0.0
+    assert partitioned.comparable_score("fr", 0.3) == pytest.approx(0.3)
+
+
+def test_partitions_merge_on_comparable_scores(partitioned):
+    add(partitioned, ["heap sort", "sort", "গ্রাফ একটি কাঠামো"])
+    # "sort" and the Bangla chunk share a raw cosine (~0.59), but the Bangla
+    # one sits just above its partition's floor, so it ranks last
+    results = partitioned.similarity_search_by_language_vectors(
+        {"en": [1.0, 1.0, 1.0], "bn": [1.0, 1.0, 1.0]}, k=3
+    )
+
+    ids = [doc.metadata["id"] for doc, _ in results]
+    assert ids == ["heap sort", "sort", "গ্রাফ একটি কাঠামো"]
+    scores = [score for _, score in results]
+    assert scores == sorted(scores, reverse=True)
+    assert all(0.0 <= score <= 1.0 for score in scores)
+
+
+def test_single_partition_search_reports_comparable_scores(partitioned):
+    add(partitioned, ["গ্রাফ একটি কাঠামো"])
+
+    [(doc, score)] = partitioned.similarity_search_with_scores("গ্রাফ", k=1)
+    raw = partitioned.partitions["bn"].similarity_search_with_scores("গ্রাফ", k=1)
+    assert score == pytest.approx(partitioned.comparable_score("bn", raw[0][1]))
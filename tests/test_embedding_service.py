@@ -0,0 +1,91 @@
+"""
+Tests for query canonicalization and the shared query embedding cache.
+"""
+
+import pytest
+
+from services.embedding_service import EmbeddingFactory, canonicalize_query
+
+
+class CountingEmbeddings:
+    """Embeds text as its length, counting the texts it was asked for."""
+
+    def __init__(self, model):
+        self.model = model
+        self.texts = []
+
+    def embed_query(self, text):
+        self.texts.append(text)
+        return [float(len(text)), float(len(self.texts))]
+
+
+@pytest.fixture
+def factory():
+    return EmbeddingFactory()
+
+
+@pytest.mark.parametrize(
+    "variants",
+    [
+        ["What is BFS?", "what is  breadth first search", "WHAT IS BFS"],
+        ["Explain heap sort.", "explain\theap sort!", "  Explain Heap Sort  "],
+        # Composed and decomposed Bangla letters (য় and ো)
+        ["বাইনারি সার্চ কী?", "বাইনারি সার্চ কী।", "বাইনারি সার্চ কী"],
+        ["\u09b8\u09ae\u09df", "\u09b8\u09ae\u09af\u09bc"],
+        ["\u09a4\u09cb", "\u09a4\u09c7\u09be"],
+    ],
+)
+def test_equivalent_queries_share_a_canonical_form(variants):
+    canonical = {canonicalize_query(v) for v in variants}
+
+    assert len(canonical) == 1
+    assert canonicalize_query(canonical.pop()) == canonicalize_query(variants[0])
+
+
+@pytest.mark.parametrize(
+    "first, second",
+    [
+        ("What is BFS?", "What is DFS?"),
+        ("heap sort", "heap"),
+        ("quick sort", "sort quick"),
+        ("\u09b8\u09ae\u09df", "\u09b8\u09ae\u09af"),
+        ("O(n log n)", "O(n)"),
+    ],
+)
+def test_different_queries_keep_different_forms(first, second):
+    assert canonicalize_query(first) != canonicalize_query(second)
+
+
+def test_equivalent_queries_are_embedded_once(factory):
+    embedder = CountingEmbeddings("en-model")
+
+    first = factory.embed_query("What is BFS?", embedder)
+    second = factory.embed_query("what is breadth first search", embedder)
+
+    assert first == second
+    assert embedder.texts == ["what is breadth first search"]
+    stats = factory.get_cache_stats()
+    assert (stats["hits"], stats["misses"]) == (1, 1)
+
+
+def test_different_queries_do_not_collide(factory):
+    embedder = CountingEmbeddings("en-model")
+
+    factory.embed_query("What is BFS?", embedder)
+    factory.embed_query("What is DFS?", embedder)
+
+    assert len(embedder.texts) == 2
+    assert factory.get_cache_stats()["hits"] == 0
+
+
+def test_cache_is_kept_per_embedding_model(factory):
+    english = CountingEmbeddings("en-model")
+    bangla = CountingEmbeddings("bn-model")
+
+    factory.embed_query("heap sort", english)
+    factory.embed_query("heap sort", bangla)
+    factory.embed_query("Heap sort?", english)
+
+    assert len(english.texts) == 1
+    assert len(bangla.texts) == 1
+    assert factory.get_cache_stats()["hits"] == 1
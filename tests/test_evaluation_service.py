@@ -0,0 +1,27 @@
+"""
+Tests for the evaluation runner's statistics helpers.
+"""
+
+import pytest
+
+from services.evaluation_service import percentile
+
+
+def test_empty_input_has_no_percentile():
+    assert percentile([], 50) is None
+
+
+@pytest.mark.parametrize(
+    "p, expected", [(0, 1), (10, 1), (50, 5), (51, 6), (90, 9), (95, 10), (100, 10)]
+)
+def test_nearest_rank(p, expected):
+    assert percentile(list(range(1, 11)), p) == expected
+
+
+def test_returns_a_sample_and_leaves_input_untouched():
+    values = [0.8, 0.1, 2.5, 0.4]
+
+    assert percentile(values, 50) == 0.4
+    assert percentile(values, 75) == 0.8
+    assert percentile([3.0], 95) == 3.0
+    assert values == [0.8, 0.1, 2.5, 0.4]
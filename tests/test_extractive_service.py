@@ -0,0 +1,150 @@
+"""
+Tests for extractive answering and when RAG queries take the fast path.
+"""
+
+import pytest
+from langchain.schema import Document
+
+from services.extractive_service import NO_ANSWER, ExtractiveAnswerer
+from services.grading_service import content_terms
+from services.llm_service import RAGQueryProcessor
+
+CHUNKS = [
+    Document(
+        page_content=(
+            "Sorting orders the items.\n\n"
+            "Merge sort is a divide-and-conquer algorithm that splits the array "
+            "in half. It merges the two sorted halves in linear time."
+        ),
+        metadata={"file_name": "sorting.pdf", "page_number": 3, "source": "book"},
+    ),
+    Document(
+        page_content=(
+            "A heap is a complete binary tree that keeps the heap property. "
+            "Heaps are used to build priority queues in logarithmic time."
+        ),
+        metadata={"file_name": "heaps.pdf", "page_number": 7, "source": "book"},
+    ),
+]
+
+
+@pytest.fixture
+def answerer():
+    return ExtractiveAnswerer()
+
+
+def test_hyphenated_words_match_their_parts():
+    assert content_terms("divide-and-conquer") == content_terms("divide and conquer")
+    assert content_terms("A min-heap") == ["min", "heap"]
+    assert content_terms("O(n log n) time") == ["o(n log n)", "time"]
+
+
+def test_hyphenated_question_finds_spaced_sentence(answerer):
+    documents = [
+        Document(
+            page_content="Quick sort uses divide and conquer around a pivot element."
+        )
+    ]
+
+    result = answerer.answer("Explain divide-and-conquer", documents)
+
+    assert result["success"]
+    assert "divide and conquer" in result["response"]
+
+
+def test_definition_questions_prefer_defining_sentences(answerer):
+    ranked = answerer.rank("What is a heap?", CHUNKS)
+
+    assert ranked[0]["text"].startswith("A heap is a complete binary tree")
+    assert ranked[0]["defining"]
+    scores = [s["score"] for s in ranked]
+    assert scores == sorted(scores, reverse=True)
+
+
+def test_answer_cites_only_the_chunks_it_used(answerer):
+    result = answerer.answer("What is a heap?", CHUNKS)
+
+    assert result["success"]
+    assert result["mode"] == result["model_used"] == "extractive"
+    assert result["defining"]
+    assert [c["file_name"] for c in result["citations"]] == ["heaps.pdf"]
+
+
+def test_short_fragments_are_not_answers(answerer):
+    # "Sorting orders the items." is under EXTRACTIVE_MIN_SENTENCE_WORDS
+    texts = [s["text"] for s in answerer.rank("What is sorting?", CHUNKS)]
+
+    assert "Sorting orders the items." not in texts
+
+
+def test_answer_respects_sentence_and_length_limits():
+    answerer = ExtractiveAnswerer(max_sentences=1)
+    result = answerer.answer("merge sort halves", CHUNKS)
+    assert result["response"].count(".") == 1
+
+    answerer = ExtractiveAnswerer(max_chars=40)
+    result = answerer.answer("merge sort halves", CHUNKS)
+    assert len(result["response"]) <= 40
+    assert result["response"].endswith("...")
+
+
+def test_overlapping_chunks_do_not_repeat_sentences(answerer):
+    result = answerer.answer("What is a heap?", CHUNKS + [CHUNKS[1]])
+
+    assert result["response"].count("A heap is a complete binary tree") == 1
+
+
+def test_no_matching_sentence_is_a_failed_answer(answerer):
+    result = answerer.answer("What is the shortest path?", CHUNKS)
+
+    assert not result["success"]
+    assert result["response"] == NO_ANSWER
+    assert answerer.get_stats()["no_match"] == 1
+
+
+class FakeModelManager:
+    """Overloaded model manager whose response cache is a dict of prompts."""
+
+    def __init__(self):
+        self.cache = {}
+        self.checked = []
+        self.generated = []
+
+    def has_cached_response(self, prompt, model_name=None, **kwargs):
+        self.checked.append(prompt)
+        return kwargs.get("use_cache", True) and prompt in self.cache
+
+    def generate_response(self, prompt, on_model=None, use_cache=True, **kwargs):
+        self.generated.append(prompt)
+        if use_cache and prompt in self.cache:
+            on_model("big")
+            return self.cache[prompt]
+        return None
+
+    def can_generate(self, model_name=None, fallback=True):
+        return True
+
+    def get_load(self):
+        return 1.0
+
+    def get_active_model(self):
+        return "big"
+
+
+def test_cached_answers_are_served_before_the_fast_path(answerer):
+    manager = FakeModelManager()
+    processor = RAGQueryProcessor(manager, fast_path=answerer)
+
+    result = processor.process_rag_query("What is a heap?", CHUNKS)
+    assert result["fast_path_reason"] == "overload"
+    assert not manager.generated
+
+    manager.cache[manager.checked[-1]] = "A heap is a tree-based structure."
+    result = processor.process_rag_query("What is a heap?", CHUNKS)
+    assert result["response"] == "A heap is a tree-based structure."
+    assert result["model_used"] == "big"
+    assert "fast_path_reason" not in result
+
+    # Without the cache the fast path answers again
+    result = processor.process_rag_query("What is a heap?", CHUNKS, use_cache=False)
+    assert result["fast_path_reason"] == "overload"
@@ -0,0 +1,195 @@
+"""
+Tests for grading thresholds, batch grading and judge escalation.
+"""
+
+import zlib
+
+import pytest
+
+from services.grading_service import (
+    AnswerGrader,
+    calibrate_grader,
+    content_terms,
+    save_grading_thresholds,
+)
+
+EXPECTED = "Merge sort splits the array and merges sorted halves in O(n log n) time."
+
+
+class TermEmbeddings:
+    """Hashed bag-of-key-terms embeddings, recording each batch embedded."""
+
+    def __init__(self, dimensions=256):
+        self.dimensions = dimensions
+        self.batches = []
+
+    def __call__(self, texts):
+        self.batches.append(list(texts))
+        vectors = []
+        for text in texts:
+            vector = [0.0] * self.dimensions
+            vector[-1] = 0.1  # Never all zeros
+            for term in content_terms(text):
+                vector[zlib.crc32(term.encode("utf-8")) % (self.dimensions - 1)] += 1.0
+            vectors.append(vector)
+        return vectors
+
+
+def result(actual, expected=EXPECTED, success=True, test_id="t1"):
+    return {
+        "test_id": test_id,
+        "question": "How does merge sort work?",
+        "expected_answer": expected,
+        "actual_answer": actual,
+        "success": success,
+    }
+
+
+@pytest.fixture
+def embedder():
+    return TermEmbeddings()
+
+
+@pytest.fixture
+def grader(embedder):
+    return AnswerGrader(accept_above=0.8, reject_below=0.4, embed_documents=embedder)
+
+
+@pytest.mark.parametrize(
+    "score, expected",
+    [
+        (0.9, (True, "HIGH")),
+        (0.3, (False, "HIGH")),
+        (0.75, (True, "MEDIUM")),
+        (0.62, (True, "LOW")),
+        (0.58, (False, "LOW")),
+        (0.45, (False, "MEDIUM")),
+    ],
+)
+def test_scores_map_to_verdict_and_confidence(grader, score, expected):
+    assert grader.classify(score) == expected
+
+
+def test_uncalibrated_grader_is_never_confident():
+    grader = AnswerGrader()
+
+    assert not grader.is_calibrated
+    assert grader.classify(0.99) == (True, "LOW")
+    assert grader.classify(0.1) == (False, "LOW")
+
+
+def test_matching_answer_passes_and_unrelated_one_fails(grader):
+    passed, failed = grader.grade_batch(
+        [result(EXPECTED), result("A heap keeps its smallest key at the root.")]
+    )
+
+    assert (passed["equivalent"], passed["confidence"]) == (True, "HIGH")
+    assert (failed["equivalent"], failed["confidence"]) == (False, "HIGH")
+    assert passed["grade_score"] > failed["grade_score"]
+    assert passed["graded_by"] == failed["graded_by"] == "grader"
+
+
+def test_missing_answers_fail_without_embedding(grader, embedder):
+    grades = grader.grade_batch([result("", success=True), result("x", success=False)])
+
+    assert all(g["equivalent"] is False and g["confidence"] == "HIGH" for g in grades)
+    assert all(g["grade_score"] == 0.0 for g in grades)
+    assert embedder.batches == []
+
+
+def test_batches_embed_each_distinct_text_once(embedder):
+    grader = AnswerGrader(0.8, 0.4, embed_documents=embedder, batch_size=2)
+    answers = ["Merge sort splits the array.", "It merges halves.", EXPECTED]
+
+    grades = grader.grade_batch([result(a) for a in answers])
+
+    assert len(grades) == 3
+    embedded = [text for batch in embedder.batches for text in batch]
+    assert sorted(embedded) == sorted(set(answers))  # EXPECTED repeats
+    assert all(len(batch) <= 2 for batch in embedder.batches)
+
+    grader.grade_batch([result(answers[0])])  # Already embedded
+    assert len(embedder.batches) == 2
+
+
+def test_key_terms_are_left_out_across_scripts(grader):
+    [same_script] = grader.score_batch([(EXPECTED, "Merge sort is fast.")])
+    [cross_script] = grader.score_batch([(EXPECTED, "মার্জ সর্ট দ্রুত কাজ করে।")])
+
+    assert same_script["score"] != same_script["similarity"]
+    assert cross_script["score"] == cross_script["similarity"]
+
+
+def test_only_borderline_answers_go_to_the_judge(embedder):
+    judged = []
+
+    def judge(r):
+        judged.append(r["test_id"])
+        return {"equivalent": True, "confidence": "HIGH", "explanation": "Same facts"}
+
+    grader = AnswerGrader(0.99, 0.1, judge=judge, embed_documents=embedder)
+    grades = grader.grade_batch(
+        [
+            result(EXPECTED, test_id="exact"),
+            result("Merge sort merges sorted halves.", test_id="partial"),
+        ]
+    )
+
+    assert judged == ["partial"]
+    assert grades[0]["graded_by"] == "grader"
+    assert grades[1]["graded_by"] == "judge" and grades[1]["equivalent"]
+    stats = grader.get_stats()
+    assert (stats["graded"], stats["high"], stats["escalated"]) == (2, 1, 1)
+    assert stats["escalation_rate"] == 0.5
+
+
+def test_failing_judge_keeps_the_grader_verdict(embedder):
+    def judge(r):
+        raise TimeoutError("judge timed out")
+
+    grader = AnswerGrader(0.99, 0.1, judge=judge, embed_documents=embedder)
+    [grade] = grader.grade_batch([result("Merge sort merges sorted halves.")])
+
+    assert grade["graded_by"] == "grader"
+    assert grade["confidence"] in ("MEDIUM", "LOW")
+
+
+def test_calibration_keeps_outright_verdicts_within_budget():
+    samples = [(0.5 + i / 100, True) for i in range(50)] + [
+        (0.2 + i / 100, False) for i in range(50)
+    ]
+
+    calibration = calibrate_grader(samples, max_false_pass=0.1, max_false_fail=0.1)
+
+    grader = AnswerGrader(calibration["accept_above"], calibration["reject_below"])
+    false_pass = sum(
+        1 for s, ok in samples if not ok and grader.classify(s) == (True, "HIGH")
+    )
+    false_fail = sum(
+        1 for s, ok in samples if ok and grader.classify(s) == (False, "HIGH")
+    )
+    assert false_pass <= 5 and false_fail <= 5
+    assert calibration["judge_calls_saved"] + round(
+        calibration["escalation_rate"] * len(samples)
+    ) == len(samples)
+
+
+def test_calibration_needs_both_kinds_of_answer():
+    with pytest.raises(ValueError):
+        calibrate_grader([(0.9, True), (0.8, True)])
+
+
+def test_saved_thresholds_are_loaded(tmp_path):
+    path = tmp_path / "grading.json"
+    calibration = calibrate_grader([(0.9, True), (0.7, True), (0.3, False)])
+    assert save_grading_thresholds(calibration, path)
+
+    grader = AnswerGrader.from_file(path)
+
+    assert grader.is_calibrated
+    assert grader.to_dict() == {
+        "accept_above": calibration["accept_above"],
+        "reject_below": calibration["reject_below"],
+        "term_weight": calibration["term_weight"],
+    }
+    assert not AnswerGrader.from_file(tmp_path / "missing.json").is_calibrated
@@ -0,0 +1,161 @@
+"""
+Tests for the SQLite job queue: claiming, cancellation, leases and restarts.
+"""
+
+import threading
+import time
+
+import pytest
+
+from core.constants import PRIORITY_BATCH, PRIORITY_MAINTENANCE
+from services.job_service import JobQueue, JobStatus
+
+
+def make_queue(path, **kwargs):
+    queue = JobQueue(path, workers=1, **kwargs)
+    queue.register("echo", lambda context: dict(context.payload))
+    return queue
+
+
+def wait_for_status(queue, job_id, status, timeout=5.0):
+    deadline = time.time() + timeout
+    while queue.get(job_id)["status"] != status.value:
+        assert time.time() < deadline, queue.get(job_id)
+        time.sleep(0.02)
+    return queue.get(job_id)
+
+
+def crash_while_running(path, lease_seconds=0.05):
+    """Claim the next job in a queue that then dies without finishing it."""
+    crashed = make_queue(path, lease_seconds=lease_seconds)
+    job = crashed._claim_next()
+    time.sleep(lease_seconds * 2)
+    return job
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    return tmp_path / "jobs.sqlite3"
+
+
+def test_claims_follow_priority_then_submission_order(db_path):
+    queue = make_queue(db_path)
+    late_batch = queue.submit("echo", {"n": 1}, priority=PRIORITY_MAINTENANCE)
+    first = queue.submit("echo", {"n": 2}, priority=PRIORITY_BATCH)
+    time.sleep(0.01)
+    second = queue.submit("echo", {"n": 3}, priority=PRIORITY_BATCH)
+
+    claimed = [queue._claim_next()["id"] for _ in range(3)]
+    assert claimed == [first, second, late_batch]
+    assert queue._claim_next() is None
+
+    job = queue.get(first)
+    assert job["status"] == JobStatus.RUNNING.value
+    assert job["attempts"] == 1
+    assert job["lease_expires"] > time.time()
+
+
+def test_job_runs_to_completion(db_path):
+    queue = make_queue(db_path)
+    queue.start()
+    try:
+        job_id = queue.submit("echo", {"answer": 42})
+        job = wait_for_status(queue, job_id, JobStatus.SUCCEEDED)
+    finally:
+        queue.stop()
+
+    assert job["result"] == {"answer": 42}
+
+
+def test_cancel_queued_and_running_jobs(db_path):
+    queue = make_queue(db_path)
+    started = threading.Event()
+
+    def wait_for_cancel(context):
+        started.set()
+        while True:
+            context.check_cancelled()
+            time.sleep(0.01)
+
+    queue.register("loop", wait_for_cancel)
+    queued = queue.submit("echo", priority=PRIORITY_MAINTENANCE)
+    assert queue.cancel(queued)
+    assert queue.get(queued)["status"] == JobStatus.CANCELLED.value
+
+    queue.start()
+    try:
+        running = queue.submit("loop")
+        assert started.wait(5.0)
+        assert queue.cancel(running)
+        wait_for_status(queue, running, JobStatus.CANCELLED)
+    finally:
+        queue.stop()
+
+    assert not queue.cancel(running)
+    assert not queue.cancel("missing")
+
+
+def test_expired_lease_is_requeued_and_live_lease_is_not(db_path):
+    queue = make_queue(db_path, lease_seconds=30)
+    job_id = queue.submit("echo")
+
+    crash_while_running(db_path)
+    live = queue.submit("echo")
+    queue._claim_next()  # Our own job: alive and leased
+
+    queue._requeue_orphans()
+    requeued = queue.get(job_id)
+    assert requeued["status"] == JobStatus.QUEUED.value
+    assert requeued["lease_expires"] is None and requeued["attempts"] == 1
+    assert queue.get(live)["status"] == JobStatus.RUNNING.value
+
+
+def test_heartbeat_keeps_long_jobs_leased(db_path):
+    queue = make_queue(db_path, lease_seconds=0.3, heartbeat_seconds=0.05)
+    queue.register("slow", lambda context: time.sleep(1.0) or {"done": True})
+    queue.start()
+    try:
+        job_id = queue.submit("slow")
+        job = wait_for_status(queue, job_id, JobStatus.SUCCEEDED)
+    finally:
+        queue.stop()
+
+    assert job["attempts"] == 1
+
+
+def test_restart_recovers_jobs_of_a_dead_process(db_path):
+    job_id = make_queue(db_path).submit("echo", {"resume": True})
+    crash_while_running(db_path)
+
+    restarted = make_queue(db_path)
+    restarted.start()
+    try:
+        job = wait_for_status(restarted, job_id, JobStatus.SUCCEEDED)
+    finally:
+        restarted.stop()
+
+    assert job["result"] == {"resume": True}
+    assert job["attempts"] == 2
+
+
+def test_job_that_keeps_killing_its_worker_fails(db_path):
+    queue = make_queue(db_path, max_attempts=2)
+    job_id = queue.submit("echo")
+
+    for _ in range(2):
+        crash_while_running(db_path)
+        queue._requeue_orphans()
+
+    job = queue.get(job_id)
+    assert job["status"] == JobStatus.FAILED.value
+    assert "2 attempts" in job["error"]
+
+
+def test_cancelled_orphan_is_not_requeued(db_path):
+    queue = make_queue(db_path)
+    job_id = queue.submit("echo")
+    crash_while_running(db_path)
+    queue.cancel(job_id)
+
+    queue._requeue_orphans()
+    assert queue.get(job_id)["status"] == JobStatus.CANCELLED.value
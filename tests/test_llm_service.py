@@ -0,0 +1,221 @@
+"""
+Tests for Ollama deadlines, circuit breakers, load balancing, failover and
+hedging against stub servers.
+"""
+
+import socket
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from core.constants import (
+    OLLAMA_BREAKER_FAILURES,
+    OLLAMA_HEDGE_BURST,
+    OLLAMA_HEDGE_MAX_FRACTION,
+    OLLAMA_HEDGE_MIN_SAMPLES,
+)
+from core.exceptions import NodeUnreachableException
+from core.utils import CircuitBreaker, Deadline
+from services.evaluation_service import percentile
+from services.llm_service import ModelManager, OllamaModel
+from tools.stub_ollama import StubOllama
+
+MODELS = ["primary:stub", "fallback-a:stub"]
+
+
+@pytest.fixture
+def stubs():
+    """Starts stub Ollama servers (all advertising ``MODELS``), stopped after the test."""
+    started = []
+
+    def start(*configs):
+        for config in configs:
+            config = {"token_delay": 0.005, "tokens": 10, **config}
+            stub = StubOllama(models=MODELS, **config)
+            stub.start()
+            started.append(stub)
+        return started[-len(configs) :]
+
+    yield start
+    for stub in started:
+        stub.stop()
+
+
+def make_manager(stubs, **kwargs):
+    """Manager over the stubs (no preloading), first node refresh finished."""
+    options = {"hedging": False, "preload": False, **kwargs}
+    manager = ModelManager(
+        MODELS[0], MODELS[1:], nodes=[stub.url for stub in stubs], **options
+    )
+    time.sleep(0.3)  # Let warm-up and the first node refresh finish
+    return manager
+
+
+def send(manager, requests, workers):
+    """Send ``requests`` with ``workers`` in flight; latencies (None on failure)."""
+
+    def timed(i):
+        start = time.perf_counter()
+        response = manager.generate_response(f"question {i}", use_cache=False)
+        return None if response is None else time.perf_counter() - start
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(timed, range(requests)))
+
+
+def node_stats(manager, url):
+    return next(n for n in manager.get_node_stats() if n["url"] == url)
+
+
+def closed_port_url():
+    """URL of a local port nothing listens on."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    return f"http://127.0.0.1:{port}"
+
+
+def worker_threads():
+    """Threads other than the stub servers' request handlers."""
+    return sum(
+        1
+        for thread in threading.enumerate()
+        if "process_request" not in thread.name and thread.name != "stub-ollama"
+    )
+
+
+@pytest.fixture
+def short_attempts(monkeypatch):
+    """One attempt per model, started with as little as 0.5s left."""
+    monkeypatch.setattr("services.llm_service.OLLAMA_MIN_ATTEMPT_SECONDS", 0.5)
+    monkeypatch.setattr("services.llm_service.OLLAMA_MAX_RETRIES", 1)
+
+
+def test_hanging_models_give_up_within_the_deadline(stubs, short_attempts):
+    [stub] = stubs({"hanging": MODELS})
+    manager = make_manager([stub])
+    threads_before = worker_threads()
+
+    start = time.perf_counter()
+    response = manager.generate_response(
+        "hello", use_cache=False, deadline=Deadline.after(2.0)
+    )
+    elapsed = time.perf_counter() - start
+    stub.stop()
+
+    assert response is None
+    assert elapsed <= 2.5
+    assert manager.get_manager_stats()["deadline_exceeded"] == 1
+    # Attempt threads wind down once the stub is gone
+    settle = time.monotonic() + 2.0
+    while worker_threads() > threads_before and time.monotonic() < settle:
+        time.sleep(0.05)
+    assert worker_threads() <= threads_before
+
+
+def test_failing_model_is_skipped_once_its_breaker_opens(stubs, short_attempts):
+    [stub] = stubs({"failing": [MODELS[0]], "delay": 0.05})
+    manager = make_manager([stub])
+
+    for _ in range(OLLAMA_BREAKER_FAILURES):
+        assert manager.generate_response("hello", use_cache=False, model_name=MODELS[0])
+    breaker = manager.get_breaker_stats()[MODELS[0]]
+    assert breaker["state"] == CircuitBreaker.OPEN
+
+    primary_calls = stub.calls[MODELS[0]]
+    assert manager.generate_response("hello", use_cache=False, model_name=MODELS[0])
+    assert stub.calls[MODELS[0]] == primary_calls == OLLAMA_BREAKER_FAILURES
+
+
+def test_refused_connection_is_not_retried():
+    model = OllamaModel(MODELS[0], base_url=closed_port_url())
+
+    start = time.perf_counter()
+    with pytest.raises(NodeUnreachableException):
+        model.generate_response("question")
+
+    # Retrying would sleep 1s, then 2s, before giving up
+    assert time.perf_counter() - start < 0.5
+
+
+def test_faster_nodes_take_more_of_the_load(stubs):
+    fast, medium, slow = stubs({"delay": 0.05}, {"delay": 0.2}, {"delay": 0.6})
+    manager = make_manager([fast, medium, slow])
+
+    latencies = send(manager, requests=60, workers=6)
+
+    assert None not in latencies
+    served = [sum(stub.calls.values()) for stub in (fast, medium, slow)]
+    assert served[0] > served[1] > served[2]
+
+
+def test_requests_stay_on_the_node_with_the_model_loaded(stubs):
+    warm, cold = stubs({"delay": 0.05}, {"delay": 0.05, "loaded": [], "cold_load": 2.0})
+    manager = make_manager([warm, cold])
+
+    latencies = send(manager, requests=10, workers=1)
+
+    assert None not in latencies
+    assert sum(cold.calls.values()) == 0
+    assert max(latencies) < 1.0
+
+
+def test_drained_node_finishes_its_requests_then_gets_no_more(stubs):
+    drained_stub, other = stubs({"delay": 0.1}, {"delay": 0.1})
+    manager = make_manager([drained_stub, other])
+    url = drained_stub.url
+
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        load = pool.submit(send, manager, 60, 6)
+        time.sleep(0.5)
+        manager.drain_node(url)
+        routed_at_drain = node_stats(manager, url)["requests"]
+        latencies = load.result()
+
+    drained = node_stats(manager, url)
+    assert None not in latencies
+    assert drained["drained"]
+    assert drained["requests"] == routed_at_drain
+
+    manager.restore_node(url)
+    send(manager, 15, 6)
+    assert node_stats(manager, url)["requests"] > drained["requests"]
+
+
+def test_node_that_goes_down_is_routed_around(stubs):
+    preferred, backup = stubs({"delay": 0.05}, {"delay": 0.3})
+    manager = make_manager([preferred, backup])
+    send(manager, 4, workers=2)
+
+    preferred.stop()
+    latencies = send(manager, 10, workers=1)
+
+    assert None not in latencies
+    assert not node_stats(manager, preferred.url)["healthy"]
+    # Failing over costs no retry sleeps (1s, then 2s) on the dead node
+    assert latencies[0] < 1.0
+
+
+def test_hedging_lowers_tail_latency_within_its_budget(stubs):
+    requests = 60
+    stall = {"delay": 0.05, "stall_rate": 0.05, "stall": 1.5}
+
+    def run(hedging):
+        pair = stubs({**stall, "seed": 7}, {**stall, "seed": 8})
+        manager = make_manager(pair, hedging=hedging)
+        # First-token samples, so hedging can start; hedges go to the other node
+        for _ in range(OLLAMA_HEDGE_MIN_SAMPLES + 5):
+            manager.generate_response("warm up", use_cache=False)
+        latencies = send(manager, requests, workers=2)
+        assert None not in latencies
+        return percentile(latencies, 99), manager.get_hedge_stats()
+
+    p99_off, _ = run(False)
+    p99_on, hedge_stats = run(True)
+
+    assert p99_on < p99_off
+    assert hedge_stats["hedges"] <= requests * OLLAMA_HEDGE_MAX_FRACTION + (
+        OLLAMA_HEDGE_BURST
+    )
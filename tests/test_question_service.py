@@ -0,0 +1,70 @@
+"""
+Tests for streaming AQG output through the incremental question parser.
+"""
+
+import json
+
+from services.question_service import IncrementalQuestionParser
+
+QUESTIONS = [
+    {"question": "What is the worst case of quicksort?", "answer": "O(n^2)"},
+    {"question": "Is merge sort stable?", "answer": "True"},
+]
+
+
+def feed_all(parser, chunks):
+    completed = []
+    for chunk in chunks:
+        completed.extend(parser.feed(chunk))
+    return completed
+
+
+def test_bare_array_streamed_char_by_char():
+    parser = IncrementalQuestionParser()
+    assert feed_all(parser, json.dumps(QUESTIONS)) == QUESTIONS
+
+
+def test_question_is_emitted_when_its_closing_brace_arrives():
+    parser = IncrementalQuestionParser()
+    text = json.dumps(QUESTIONS)
+    split = text.index("}") + 1
+
+    assert parser.feed(text[: split - 1]) == []
+    assert parser.feed(text[split - 1 : split]) == [QUESTIONS[0]]
+    assert parser.feed(text[split:]) == [QUESTIONS[1]]
+
+
+def test_wrapper_object_and_markdown_fence():
+    parser = IncrementalQuestionParser()
+    text = (
+        "Here are your questions:\n```json\n"
+        + json.dumps({"questions": QUESTIONS}, indent=2)
+        + "\n```\nGood luck!"
+    )
+
+    # The wrapper itself has no "question" key and is not emitted
+    assert feed_all(parser, [text[i : i + 7] for i in range(0, len(text), 7)]) == (
+        QUESTIONS
+    )
+
+
+def test_braces_and_escaped_quotes_inside_strings():
+    parser = IncrementalQuestionParser()
+    question = {"question": 'What does "}" close in {a: 1}?', "answer": "\\{"}
+
+    assert feed_all(parser, json.dumps([question])) == [question]
+
+
+def test_malformed_object_is_skipped():
+    parser = IncrementalQuestionParser()
+    text = '[{"question": "broken", "answer": }, ' + json.dumps(QUESTIONS[1]) + "]"
+
+    assert feed_all(parser, text) == [QUESTIONS[1]]
+
+
+def test_buffer_is_released_between_objects():
+    parser = IncrementalQuestionParser()
+    parser.feed(json.dumps(QUESTIONS[0]) + ", ")
+
+    assert parser._buffer == ""
+    assert parser.feed(json.dumps(QUESTIONS[1])) == [QUESTIONS[1]]
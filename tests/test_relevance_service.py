@@ -0,0 +1,142 @@
+"""
+Tests for the relevance gate and its threshold calibration.
+"""
+
+import pytest
+from langchain.schema import Document
+
+from services.relevance_service import (
+    GateDecision,
+    RelevanceGate,
+    calibrate_by_language,
+    calibrate_thresholds,
+    retrieval_scores,
+)
+
+# (descending relevance scores, is_on_topic)
+ON_TOPIC = [([0.9, 0.8], True), ([0.5, 0.2], True), ([0.6, 0.35], True)]
+OFF_TOPIC = [([0.1, 0.05], False), ([0.55, 0.5], False), ([0.7, 0.68], False)]
+
+
+def confusion(calibration, decision, label):
+    return calibration["decisions"][decision.value][label]
+
+
+def test_uncalibrated_gate_answers_any_retrieval():
+    gate = RelevanceGate()
+    assert gate.classify([0.01]) == GateDecision.ANSWER
+    assert gate.classify([]) == GateDecision.REFUSE
+
+
+def test_zero_budgets_refuse_and_answer_nothing_wrongly():
+    calibration = calibrate_thresholds(
+        ON_TOPIC + OFF_TOPIC, max_false_refusal=0.0, max_false_accept=0.0
+    )
+
+    assert calibration["refuse_below"] == 0.5
+    assert calibration["answer_above"] > 0.7
+    assert confusion(calibration, GateDecision.REFUSE, "on_topic") == 0
+    assert confusion(calibration, GateDecision.ANSWER, "off_topic") == 0
+
+
+def test_min_gap_separates_the_ambiguous_band():
+    calibration = calibrate_thresholds(
+        ON_TOPIC + OFF_TOPIC, max_false_refusal=0.0, max_false_accept=0.0
+    )
+
+    # On-topic gaps in the band are 0.3 and 0.25, off-topic ones 0.05 and 0.02
+    assert calibration["min_gap"] == pytest.approx(0.25)
+    assert confusion(calibration, GateDecision.ANSWER, "on_topic") == 3
+    assert confusion(calibration, GateDecision.CLARIFY, "off_topic") == 2
+    assert confusion(calibration, GateDecision.REFUSE, "off_topic") == 1
+    assert calibration["llm_calls_saved"] == 3
+
+
+@pytest.mark.parametrize("budget", [0.0, 0.1, 0.25, 0.5])
+def test_false_rates_stay_within_budget(budget):
+    samples = [([0.3 + i * 0.05, 0.1], True) for i in range(10)]
+    samples += [([0.1 + i * 0.05, 0.09], False) for i in range(10)]
+
+    calibration = calibrate_thresholds(
+        samples, max_false_refusal=budget, max_false_accept=budget
+    )
+
+    assert calibration["answer_above"] >= calibration["refuse_below"]
+    assert confusion(calibration, GateDecision.REFUSE, "on_topic") <= 10 * budget
+    assert confusion(calibration, GateDecision.ANSWER, "off_topic") <= 10 * budget
+
+
+def test_calibration_needs_both_classes():
+    with pytest.raises(ValueError):
+        calibrate_thresholds(ON_TOPIC)
+    with pytest.raises(ValueError):
+        calibrate_thresholds(OFF_TOPIC)
+
+
+def test_language_thresholds_override_shared_ones():
+    gate = RelevanceGate(
+        refuse_below=0.5,
+        answer_above=0.8,
+        min_gap=None,
+        languages={"bn": {"refuse_below": 0.2, "answer_above": 0.3}},
+    )
+
+    assert gate.classify([0.35]) == GateDecision.REFUSE
+    assert gate.classify([0.35], "en") == GateDecision.REFUSE
+    assert gate.classify([0.35], "bn") == GateDecision.ANSWER
+    assert gate.to_dict()["languages"]["bn"]["answer_above"] == 0.3
+
+
+def test_calibrate_by_language_needs_enough_samples_of_both_kinds():
+    english = [(scores, on_topic, "en") for scores, on_topic in ON_TOPIC + OFF_TOPIC]
+    bangla = [([0.3, 0.1], True, "bn"), ([0.2, 0.19], False, "bn")] * 2
+    mixed = [([0.9, 0.1], True, "bn+en")] * 4
+
+    calibration = calibrate_by_language(
+        english + bangla + mixed,
+        max_false_refusal=0.0,
+        max_false_accept=0.0,
+        min_samples=4,
+    )
+
+    assert sorted(calibration["languages"]) == ["bn", "en"]
+    assert calibration["languages"]["bn"]["refuse_below"] == 0.3
+    assert calibration["samples"] == len(english + bangla + mixed)
+
+    gate = RelevanceGate(
+        **{
+            key: calibration[key]
+            for key in ("refuse_below", "answer_above", "min_gap", "languages")
+        }
+    )
+    assert gate.classify([0.3, 0.1], "bn") == GateDecision.ANSWER
+
+
+def test_retrieval_scores_are_sorted_best_first():
+    documents = [
+        Document(page_content="a", metadata={"relevance_score": 0.2}),
+        Document(page_content="b", metadata={}),
+        Document(page_content="c", metadata={"relevance_score": 0.7}),
+    ]
+
+    assert retrieval_scores(documents) == [0.7, 0.2]
+
+
+def test_min_gap_keeps_band_false_accepts_within_budget():
+    # Answering the two on-topic band questions (gap 0.3) would also answer
+    # the off-topic one with gap 0.45, which a zero budget does not allow
+    samples = [
+        ([0.6, 0.3], True),
+        ([0.62, 0.32], True),
+        ([0.65, 0.2], False),
+        ([0.9, 0.1], True),
+        ([0.7, 0.69], False),
+    ]
+
+    calibration = calibrate_thresholds(
+        samples, max_false_refusal=0.0, max_false_accept=0.0
+    )
+
+    assert calibration["min_gap"] is None
+    assert confusion(calibration, GateDecision.ANSWER, "off_topic") == 0
+    assert confusion(calibration, GateDecision.CLARIFY, "on_topic") == 2
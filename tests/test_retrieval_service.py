@@ -0,0 +1,112 @@
+"""
+Tests for fusing per-collection search results.
+"""
+
+import pytest
+from langchain.schema import Document
+
+from core.constants import RRF_K
+from services.retrieval_service import CollectionSource, FederatedRetriever
+
+
+def make_retriever(fusion="weighted", weights=None):
+    weights = weights or {"book": 1.0, "course": 1.0}
+    sources = [
+        CollectionSource(name, manager=None, weight=weight)
+        for name, weight in weights.items()
+    ]
+    return FederatedRetriever(sources, fusion=fusion, max_workers=1)
+
+
+def results(name, scores):
+    return [
+        (Document(page_content=f"{name} {i}", metadata={"id": f"{name}-{i}"}), score)
+        for i, score in enumerate(scores)
+    ]
+
+
+def fused_scores(ranked):
+    return {doc.metadata["id"]: score for doc, score in ranked}
+
+
+def test_weighted_fusion_ranks_by_raw_score_across_collections():
+    retriever = make_retriever()
+    ranked = retriever._fuse(
+        {
+            "book": results("book", [0.9, 0.8, 0.7]),
+            "course": results("course", [0.75, 0.2]),
+        },
+        k=5,
+    )
+
+    assert [doc.metadata["id"] for doc, _ in ranked] == [
+        "book-0",
+        "book-1",
+        "course-0",
+        "book-2",
+        "course-1",
+    ]
+    assert fused_scores(ranked)["course-0"] == pytest.approx(0.75)
+    assert ranked[0][0].metadata["relevance_score"] == 0.9
+
+
+def test_weighted_fusion_applies_collection_weight():
+    retriever = make_retriever(weights={"book": 1.0, "course": 0.5})
+    ranked = retriever._fuse(
+        {
+            "book": results("book", [0.4, 0.2]),
+            "course": results("course", [0.9, 0.1]),
+        },
+        k=4,
+    )
+
+    assert [doc.metadata["id"] for doc, _ in ranked] == [
+        "course-0",
+        "book-0",
+        "book-1",
+        "course-1",
+    ]
+    assert fused_scores(ranked)["course-0"] == pytest.approx(0.45)
+    # The gate still sees the unweighted score
+    assert ranked[0][0].metadata["relevance_score"] == 0.9
+
+
+def test_weak_lone_result_does_not_outrank_strong_hits():
+    retriever = make_retriever()
+    ranked = retriever._fuse(
+        {"book": results("book", [0.85, 0.8]), "course": results("course", [0.1])},
+        k=3,
+    )
+
+    assert ranked[-1][0].metadata["id"] == "course-0"
+    assert fused_scores(ranked)["course-0"] == pytest.approx(0.1)
+
+
+def test_rrf_fusion_uses_rank_only():
+    retriever = make_retriever(fusion="rrf", weights={"book": 1.0, "course": 2.0})
+    ranked = retriever._fuse(
+        {
+            "book": results("book", [0.99, 0.98]),
+            "course": results("course", [0.01, 0.005]),
+        },
+        k=4,
+    )
+
+    scores = fused_scores(ranked)
+    assert scores["book-0"] == pytest.approx(1.0 / (RRF_K + 1))
+    assert scores["course-1"] == pytest.approx(2.0 / (RRF_K + 2))
+    assert ranked[0][0].metadata["id"] == "course-0"
+
+
+def test_duplicates_keep_best_score_and_k_truncates():
+    retriever = make_retriever()
+    book = results("book", [0.9, 0.5, 0.1])
+    duplicate = (Document(page_content="again", metadata={"id": "book-0"}), 0.1)
+    ranked = retriever._fuse({"book": book + [duplicate], "course": []}, k=2)
+
+    assert len(ranked) == 2
+    assert ranked[0][0].metadata["id"] == "book-0"
+    assert ranked[0][1] == pytest.approx(0.9)
+    assert [score for _, score in ranked] == sorted(
+        (score for _, score in ranked), reverse=True
+    )
@@ -0,0 +1,170 @@
+"""
+Tests for query routing and fitting route stats from evaluations.
+"""
+
+import pytest
+
+from core.constants import (
+    ROUTING_MAX_TOKENS,
+    ROUTING_MIN_TOKENS,
+    ROUTING_TOKEN_HEADROOM,
+)
+from services.routing_service import RoutingPolicy, estimate_tokens, fit_routes
+
+RULES = {
+    "definition": {"models": ["big", "small"], "max_tokens": 200},
+    "general": {"models": ["big"], "max_tokens": 400},
+}
+DEFINITION = "What is a binary search tree?"
+
+
+def model_stats(pass_rate, latency, tokens=80, samples=20):
+    return {
+        "samples": samples,
+        "pass_rate": pass_rate,
+        "latency_p50": latency,
+        "answer_tokens_p90": tokens,
+    }
+
+
+def policy(small_pass_rate=0.87, samples=20, key="definition:english"):
+    stats = {
+        key: {
+            "big": model_stats(0.9, 4.0, tokens=120, samples=samples),
+            "small": model_stats(small_pass_rate, 1.0, samples=samples),
+        }
+    }
+    return RoutingPolicy(
+        stats=stats,
+        rules=RULES,
+        quality_tolerance=0.05,
+        load_quality_tolerance=0.15,
+        high_load=0.75,
+        min_samples=10,
+    )
+
+
+def test_rules_alone_pick_first_available_candidate():
+    router = RoutingPolicy(rules=RULES)
+
+    route = router.route(DEFINITION)
+    assert (route["model"], route["reason"], route["max_tokens"]) == (
+        "big",
+        "rule",
+        200,
+    )
+    assert router.route(DEFINITION, available=lambda m: m == "small")["model"] == (
+        "small"
+    )
+    assert router.route(DEFINITION, language="bangla")["max_tokens"] == 400
+
+
+def test_stats_pick_faster_model_within_tolerance():
+    route = policy().route(DEFINITION)
+
+    assert (route["model"], route["reason"]) == ("small", "stats")
+    assert route["max_tokens"] == int(80 * ROUTING_TOKEN_HEADROOM)
+
+
+def test_model_outside_tolerance_is_not_chosen():
+    assert policy(small_pass_rate=0.8).route(DEFINITION)["model"] == "big"
+
+
+def test_high_load_widens_tolerance_and_shrinks_budget():
+    router = policy(small_pass_rate=0.8)
+    route = router.route(DEFINITION, load=0.9)
+
+    assert route["high_load"] and route["model"] == "small"
+    assert route["max_tokens"] < int(80 * ROUTING_TOKEN_HEADROOM)
+    assert router.route(DEFINITION, load=0.5)["model"] == "big"
+
+
+def test_routes_need_enough_samples_and_fall_back_to_any_language():
+    assert policy(samples=5).route(DEFINITION)["reason"] == "rule"
+    assert policy(key="definition:all").route(DEFINITION)["model"] == "small"
+
+
+def test_preferred_model_is_kept_unless_stats_justify_a_switch():
+    router = policy()
+
+    unevaluated = router.route(DEFINITION, preferred="tiny")
+    assert (unevaluated["model"], unevaluated["reason"]) == ("tiny", "preferred")
+
+    slower = router.route(DEFINITION, preferred="big")
+    assert (slower["model"], slower["reason"]) == ("small", "stats")
+
+    fastest = router.route(DEFINITION, preferred="small")
+    assert (fastest["model"], fastest["reason"]) == ("small", "preferred")
+
+    missing = router.route(
+        DEFINITION, preferred="tiny", available=lambda m: m != "tiny"
+    )
+    assert missing["model"] == "small"
+
+
+def test_fixed_model_only_routes_the_budget():
+    route = policy().route(DEFINITION, model_name="big")
+
+    assert (route["model"], route["reason"]) == ("big", "fixed")
+    assert route["max_tokens"] == int(120 * ROUTING_TOKEN_HEADROOM)
+
+
+@pytest.mark.parametrize("tokens, expected", [(1, ROUTING_MIN_TOKENS), (10**6, None)])
+def test_budget_is_clamped(tokens, expected):
+    router = RoutingPolicy(
+        stats={"definition:english": {"big": model_stats(0.9, 1.0, tokens=tokens)}},
+        rules=RULES,
+    )
+
+    assert router.route(DEFINITION)["max_tokens"] == (expected or ROUTING_MAX_TOKENS)
+
+
+def answer(model, passed, latency, text="a b c d", language="english"):
+    return {
+        "model": model,
+        "question": DEFINITION,
+        "language": language,
+        "passed": passed,
+        "latency": latency,
+        "answer": text,
+    }
+
+
+def test_fit_routes_summarizes_each_route_and_language():
+    samples = [answer("big", True, 3.0, text="word " * 40) for _ in range(10)]
+    samples += [answer("small", i < 8, 1.0) for i in range(10)]
+    samples += [answer("small", True, 2.0, language="bangla")]
+
+    fitted = fit_routes(samples, min_samples=10)
+    english = fitted["routes"]["definition:english"]
+
+    assert fitted["samples"] == 21
+    assert english["small"]["pass_rate"] == 0.8
+    assert english["small"]["latency_p50"] == 1.0
+    assert english["small"]["answer_tokens_p90"] == estimate_tokens("a b c d")
+    assert english["small"]["trusted"]
+    assert fitted["routes"]["definition:all"]["small"]["samples"] == 11
+    assert not fitted["routes"]["definition:bangla"]["small"]["trusted"]
+
+
+def test_fit_routes_ignores_failed_answers_for_the_budget():
+    samples = [answer("big", False, 1.0, text="word " * 100)]
+    samples += [answer("big", True, 1.0, text="word")]
+
+    stats = fit_routes(samples)["routes"]["definition:english"]["big"]
+    assert stats["answer_tokens_p90"] == estimate_tokens("word")
+
+    failed_only = fit_routes([answer("big", False, 1.0)])
+    assert (
+        failed_only["routes"]["definition:english"]["big"]["answer_tokens_p90"] is None
+    )
+
+
+def test_fitted_stats_drive_the_policy():
+    samples = [answer("big", True, 3.0) for _ in range(10)]
+    samples += [answer("small", True, 1.0) for _ in range(10)]
+
+    router = RoutingPolicy(
+        stats=fit_routes(samples, min_samples=10)["routes"], rules=RULES, min_samples=10
+    )
+    assert router.route(DEFINITION)["model"] == "small"
@@ -0,0 +1,306 @@
+"""
+Tests for the slot limiter, circuit breaker and SSE writer in core.utils.
+"""
+
+import json
+import threading
+import time
+
+import pytest
+
+from core.constants import (
+    PRIORITY_BATCH,
+    PRIORITY_INTERACTIVE,
+    SSE_FLUSH_BYTES,
+    SSE_MAX_FLUSH_INTERVAL_MS,
+)
+from core.exceptions import DeadlineExceededException
+from core.utils import CircuitBreaker, PriorityLimiter, SSEWriter
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def wait_for_waiters(limiter, count, timeout=2.0):
+    deadline = time.time() + timeout
+    while limiter.get_stats()["waiting"] < count:
+        assert time.time() < deadline, "waiters never queued"
+        time.sleep(0.01)
+
+
+def test_batch_work_cannot_take_reserved_slots():
+    limiter = PriorityLimiter(slots=3, reserved=1)
+
+    assert limiter.acquire(PRIORITY_BATCH, timeout=0.1)
+    assert limiter.acquire(PRIORITY_BATCH, timeout=0.1)
+    assert not limiter.acquire(PRIORITY_BATCH, timeout=0.05)
+    assert limiter.acquire(PRIORITY_INTERACTIVE, timeout=0.1)
+    assert limiter.get_stats() == {
+        "slots": 3,
+        "reserved": 1,
+        "in_use": 3,
+        "waiting": 0,
+    }
+
+
+@pytest.mark.parametrize(
+    "slots, reserved, expected", [(1, 1, 0), (2, 5, 1), (4, 0, 0), (4, 2, 2)]
+)
+def test_reservation_always_leaves_batch_a_slot(slots, reserved, expected):
+    assert PriorityLimiter(slots, reserved).reserved == expected
+
+
+def test_freed_slot_goes_to_most_urgent_waiter():
+    limiter = PriorityLimiter(slots=1)
+    limiter.acquire(PRIORITY_INTERACTIVE)
+    served = []
+
+    def waiter(priority, name):
+        limiter.acquire(priority, timeout=2.0)
+        served.append(name)
+        limiter.release()
+
+    threads = [threading.Thread(target=waiter, args=(PRIORITY_BATCH, "batch"))]
+    threads[0].start()
+    wait_for_waiters(limiter, 1)
+    threads.append(
+        threading.Thread(target=waiter, args=(PRIORITY_INTERACTIVE, "interactive"))
+    )
+    threads[1].start()
+    wait_for_waiters(limiter, 2)
+
+    limiter.release()
+    for thread in threads:
+        thread.join(2.0)
+
+    assert served == ["interactive", "batch"]
+
+
+def test_slot_times_out_and_leaves_the_queue():
+    limiter = PriorityLimiter(slots=1)
+
+    with limiter.slot():
+        with pytest.raises(DeadlineExceededException):
+            with limiter.slot(PRIORITY_BATCH, timeout=0.05):
+                pass
+        assert limiter.get_stats()["waiting"] == 0
+
+    assert limiter.get_stats()["in_use"] == 0
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(time, "monotonic", fake)
+    return fake
+
+
+def test_breaker_opens_after_consecutive_failures(clock):
+    breaker = CircuitBreaker(failure_threshold=3, reset_seconds=30)
+
+    breaker.record_failure()
+    breaker.record_failure()
+    breaker.record_success()  # Not consecutive any more
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.CLOSED and breaker.allow()
+
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    assert not breaker.allow()
+    assert breaker.get_stats()["opened"] == 1
+    assert breaker.get_stats()["rejected"] == 1
+
+
+def test_half_open_breaker_lets_one_probe_through(clock):
+    breaker = CircuitBreaker(failure_threshold=1, reset_seconds=30)
+    breaker.record_failure()
+
+    clock.now += 29
+    assert not breaker.allow()
+    clock.now += 1
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert breaker.allow()
+    assert not breaker.allow()
+
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.allow() and breaker.allow()
+    assert breaker.get_stats()["probes"] == 1
+
+
+def test_failed_probe_reopens_for_another_period(clock):
+    breaker = CircuitBreaker(failure_threshold=2, reset_seconds=30)
+    breaker.record_failure()
+    breaker.record_failure()
+    clock.now += 30
+    assert breaker.allow()
+
+    # A single failure while half-open reopens, below the threshold
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    clock.now += 29
+    assert not breaker.allow()
+    clock.now += 1
+    assert breaker.allow()
+    assert breaker.get_stats()["opened"] == 2
+
+
+def test_lost_probe_stops_blocking_after_a_reset_period(clock):
+    breaker = CircuitBreaker(failure_threshold=1, reset_seconds=30)
+    breaker.record_failure()
+    clock.now += 30
+    assert breaker.allow()  # This probe never reports back
+
+    clock.now += 29
+    assert not breaker.allow()
+    clock.now += 1
+    assert breaker.allow()
+    assert breaker.get_stats()["probes"] == 2
+
+
+def events(frames):
+    """Decoded ``data:`` payloads of SSE frames, in order."""
+    return [
+        json.loads(block[len("data: ") :])
+        for frame in frames
+        for block in frame.split("\n\n")
+        if block.startswith("data: ")
+    ]
+
+
+def streamed_text(frames):
+    return "".join(e["token"] for e in events(frames) if e["type"] == "token")
+
+
+def test_tokens_are_coalesced_until_the_byte_threshold(clock):
+    writer = SSEWriter(flush_ms=1000, flush_bytes=10)
+
+    assert writer.token("abc") == ""
+    assert writer.token("def") == ""
+    frame = writer.token("ghij")
+
+    assert events([frame]) == [{"type": "token", "token": "abcdefghij"}]
+    # Bytes, not characters: each Bangla letter is three
+    assert writer.token("কখগ") == ""
+    assert streamed_text([writer.token("ঘ")]) == "কখগঘ"
+    assert writer.stats["tokens"] == 5 and writer.stats["frames"] == 2
+
+
+def test_tokens_are_sent_once_the_flush_interval_passes(clock):
+    writer = SSEWriter(flush_ms=50, flush_bytes=1000)
+
+    assert writer.token("a") == ""
+    clock.now += 0.04
+    assert writer.token("b") == ""
+    clock.now += 0.02
+    assert streamed_text([writer.token("c")]) == "abc"
+
+
+def test_zero_interval_sends_every_token(clock):
+    writer = SSEWriter(flush_ms=0)
+
+    frames = [writer.token(t) for t in ("a", "b", "c")]
+
+    assert [e["token"] for e in events(frames)] == ["a", "b", "c"]
+
+
+def test_events_send_pending_tokens_first(clock):
+    writer = SSEWriter(flush_ms=1000)
+    writer.token("partial answer")
+
+    frame = writer.event({"type": "done"})
+
+    assert events([frame]) == [
+        {"type": "token", "token": "partial answer"},
+        {"type": "done"},
+    ]
+    assert writer.flush() == ""
+
+
+def test_negotiated_policy_is_capped():
+    writer = SSEWriter.negotiate({"flush_ms": 10_000, "flush_bytes": 10**6})
+    assert writer.policy()["flush_ms"] == SSE_MAX_FLUSH_INTERVAL_MS
+    assert writer.policy()["flush_bytes"] == SSE_FLUSH_BYTES
+
+    assert SSEWriter.negotiate({"flush_ms": "fast"}).policy() == SSEWriter().policy()
+
+
+def test_stream_batches_tokens_without_losing_any():
+    tokens = [f"tok{i} " for i in range(200)]
+    writer = SSEWriter(flush_ms=50, flush_bytes=64)
+
+    frames = list(writer.stream(iter(tokens)))
+
+    assert streamed_text(frames) == "".join(tokens)
+    assert len(frames) < len(tokens)
+    assert writer.stats["tokens"] == len(tokens)
+
+
+def test_stream_sends_the_tail_when_the_source_ends():
+    writer = SSEWriter(flush_ms=SSE_MAX_FLUSH_INTERVAL_MS, flush_bytes=10**6)
+
+    frames = list(writer.stream(iter(["no ", "flush ", "yet"])))
+
+    assert streamed_text(frames) == "no flush yet"
+
+
+def test_stream_flushes_a_batch_the_model_stalls_on():
+    def tokens():
+        yield "before "
+        time.sleep(0.3)
+        yield "after"
+
+    writer = SSEWriter(flush_ms=50, flush_bytes=10**6)
+    frames = list(writer.stream(tokens()))
+
+    assert [e["token"] for e in events(frames)] == ["before ", "after"]
+
+
+def test_stream_sends_heartbeats_while_the_model_is_silent():
+    def tokens():
+        time.sleep(0.3)
+        yield "late"
+
+    writer = SSEWriter(heartbeat=0.1)
+    frames = list(writer.stream(tokens()))
+
+    assert SSEWriter.HEARTBEAT_FRAME in frames
+    assert streamed_text(frames) == "late"
+
+
+def test_stream_flushes_pending_tokens_before_an_error():
+    def tokens():
+        yield "partial"
+        raise ConnectionError("model went away")
+
+    writer = SSEWriter(flush_ms=SSE_MAX_FLUSH_INTERVAL_MS, flush_bytes=10**6)
+    frames = []
+    with pytest.raises(ConnectionError):
+        for frame in writer.stream(tokens()):
+            frames.append(frame)
+
+    assert streamed_text(frames) == "partial"
+
+
+def test_closing_the_stream_closes_the_source():
+    closed = threading.Event()
+
+    def tokens():
+        try:
+            while True:
+                yield "tok "
+                time.sleep(0.01)
+        finally:
+            closed.set()
+
+    stream = SSEWriter(flush_ms=0).stream(tokens())
+    next(stream)
+    stream.close()
+
+    assert closed.wait(timeout=1.0)
@@ -0,0 +1,411 @@
+#!/usr/bin/env python3
+"""
+Latency percentiles, throughput and failure rates from the performance log.
+Streams ``banglarag_performance.log`` and its rotations line by line, pairs
+"Started"/"Completed"/"Failed" lines into calls and folds same-named nested
+calls (stacked ``measure_performance`` decorators, retry attempts) into the
+outermost call, so each logical operation is counted once.
+"""
+
+import sys
+import re
+import gzip
+import json
+from collections import Counter, defaultdict
+from datetime import datetime
+from pathlib import Path
+from typing import Optional, List, Dict, Any, Iterator
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.constants import LOGS_DIR, PERFORMANCE_LOG_FILE, LOG_DATE_FORMAT
+
+LINE_RE = re.compile(
+    r"^(?P<ts>\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}) - PERF - "
+    r"(?P<event>Started|Completed|Failed): (?P<op>[^\s]+)"
+    r"(?: - Duration: (?P<duration>[\d.]+)s)?(?: - Error: (?P<error>.*))?$"
+)
+TIMEOUT_RE = re.compile(r"timed out|timeout", re.IGNORECASE)
+
+# Timestamps have one-second resolution; durations are rounded to 10 ms
+MATCH_TOLERANCE = 2.0
+DURATION_RESOLUTION = 0.01
+
+
+def rotated_files(base: Path) -> List[Path]:
+    """A log and its rotations (``.1``, ``.2``, ... and ``.gz``), oldest first."""
+    rotations = []
+    for path in base.parent.glob(base.name + ".*"):
+        suffix = path.name[len(base.name) + 1 :].split(".")[0]
+        if suffix.isdigit():
+            rotations.append((int(suffix), path))
+    ordered = [path for _, path in sorted(rotations, reverse=True)]
+    return ordered + ([base] if base.exists() else [])
+
+
+def read_events(paths: List[Path], stats: Dict[str, int]) -> Iterator[Dict[str, Any]]:
+    """Parse PERF lines from each file in turn, one line in memory at a time."""
+    for path in paths:
+        opener = gzip.open if path.suffix == ".gz" else open
+        with opener(path, "rt", encoding="utf-8", errors="replace") as f:
+            for line in f:
+                match = LINE_RE.match(line.rstrip("\n"))
+                if not match:
+                    stats["unparsed_lines"] += 1
+                    continue
+                event = match.groupdict()
+                event["ts"] = datetime.strptime(
+                    event["ts"], LOG_DATE_FORMAT
+                ).timestamp()
+                if event["duration"] is not None:
+                    event["duration"] = float(event["duration"])
+                yield event
+
+
+class Histogram:
+    """Exact percentiles over values quantized to the log's 10 ms resolution."""
+
+    def __init__(self):
+        self.counts: Counter = Counter()
+        self.total = 0
+
+    def add(self, value: float) -> None:
+        self.counts[round(value / DURATION_RESOLUTION)] += 1
+        self.total += 1
+
+    def percentile(self, p: float) -> Optional[float]:
+        """Nearest-rank percentile, or None if empty."""
+        if not self.total:
+            return None
+        rank = max(1, -(-self.total * p // 100))  # ceil
+        seen = 0
+        for bucket in sorted(self.counts):
+            seen += self.counts[bucket]
+            if seen >= rank:
+                return round(bucket * DURATION_RESOLUTION, 2)
+        return None
+
+
+class OperationStats:
+    """Aggregates for one operation name."""
+
+    def __init__(self):
+        self.latency = Histogram()
+        self.calls = 0
+        self.failed = 0
+        self.timeouts = 0
+        self.attempts = 0
+        self.failed_attempts = 0
+        self.unfinished = 0
+        self.orphan_ends = 0
+        self.total_seconds = 0.0
+        self.first_ts: Optional[float] = None
+        self.last_ts: Optional[float] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        calls = max(self.calls, 1)
+        return {
+            "calls": self.calls,
+            "p50": self.latency.percentile(50),
+            "p90": self.latency.percentile(90),
+            "p99": self.latency.percentile(99),
+            "max": self.latency.percentile(100),
+            "mean": round(self.total_seconds / calls, 3),
+            "failure_rate": round(self.failed / calls, 4),
+            "timeout_rate": round(self.timeouts / calls, 4),
+            "attempts": self.attempts,
+            "failed_attempts": self.failed_attempts,
+            "retry_amplification": round(self.attempts / calls, 2),
+            "unfinished": self.unfinished,
+            "orphan_ends": self.orphan_ends,
+        }
+
+
+class PerformanceLogAnalyzer:
+    """
+    Pairs performance log events into calls and aggregates them.
+
+    An end line is matched to the open start of the same operation whose
+    timestamp is closest to ``end - duration`` (latest start on ties). A
+    finished call stays pending while an older start of the same operation is
+    still open, since that start may turn out to enclose it; when an
+    enclosing call finishes it absorbs the calls inside it as attempts. Starts
+    open longer than ``max_open_age`` are given up on as unfinished, so
+    memory is bounded by the calls in flight, not the length of the log.
+    """
+
+    def __init__(self, window: int = 3600, max_open_age: float = 600.0):
+        self.window = window
+        self.max_open_age = max_open_age
+        self.operations: Dict[str, OperationStats] = defaultdict(OperationStats)
+        self.windows: Dict[int, Dict[str, Dict[str, float]]] = defaultdict(dict)
+        self._open: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+        self._pending: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+        self.stats = Counter()
+
+    def feed(self, event: Dict[str, Any]) -> None:
+        """Process one parsed log line."""
+        self.stats["events"] += 1
+        op, ts = event["op"], event["ts"]
+        self._evict(ts)
+
+        if event["event"] == "Started":
+            self._open[op].append({"ts": ts})
+            return
+
+        duration = event["duration"] or 0.0
+        call = {
+            "start": ts - duration,
+            "end": ts,
+            "duration": duration,
+            "failed": event["event"] == "Failed",
+            "timeout": bool(event["error"] and TIMEOUT_RE.search(event["error"])),
+            "attempts": 0,
+            "failed_attempts": 0,
+        }
+
+        start = self._match_start(op, call["start"])
+        if start is None:
+            # Its start was rotated away or never logged
+            self.operations[op].orphan_ends += 1
+        else:
+            call["start"] = start["ts"]
+
+        # Same-named calls inside this one were nested decorators or retries
+        inner = [
+            c
+            for c in self._pending[op]
+            if c["start"] >= call["start"] and c["end"] <= call["end"]
+        ]
+        for c in inner:
+            self._pending[op].remove(c)
+            call["attempts"] += 1
+            call["failed_attempts"] += 1 if c["failed"] else 0
+
+        self._pending[op].append(call)
+        self._release(op)
+
+    def _match_start(self, op: str, expected: float) -> Optional[Dict[str, Any]]:
+        """Pop the open start closest to ``expected`` (latest on ties)."""
+        best, best_distance = None, MATCH_TOLERANCE
+        for index, start in enumerate(self._open[op]):
+            distance = abs(start["ts"] - expected)
+            if distance <= best_distance:
+                best, best_distance = index, distance
+        return None if best is None else self._open[op].pop(best)
+
+    def _release(self, op: str) -> None:
+        """Record pending calls that no open start could still enclose."""
+        oldest_open = min((s["ts"] for s in self._open[op]), default=None)
+        keep = []
+        for call in self._pending[op]:
+            if oldest_open is not None and oldest_open <= call["start"]:
+                keep.append(call)
+            else:
+                self._record(op, call)
+        self._pending[op] = keep
+
+    def _evict(self, now: float) -> None:
+        """Give up on starts that have been open too long."""
+        for op, starts in self._open.items():
+            stale = [s for s in starts if now - s["ts"] > self.max_open_age]
+            if stale:
+                for start in stale:
+                    starts.remove(start)
+                self.operations[op].unfinished += len(stale)
+                self._release(op)
+
+    def _record(self, op: str, call: Dict[str, Any]) -> None:
+        """Add one logical call to the operation and window aggregates."""
+        stats = self.operations[op]
+        stats.calls += 1
+        stats.latency.add(call["duration"])
+        stats.total_seconds += call["duration"]
+        stats.failed += call["failed"]
+        stats.timeouts += call["timeout"]
+        # A call that wraps nothing was a single attempt
+        stats.attempts += max(call["attempts"], 1)
+        stats.failed_attempts += call["failed_attempts"] or int(call["failed"])
+        stats.first_ts = min(stats.first_ts or call["end"], call["end"])
+        stats.last_ts = max(stats.last_ts or call["end"], call["end"])
+
+        bucket = int(call["end"] // self.window * self.window)
+        window = self.windows[bucket].setdefault(
+            op, {"calls": 0, "failed": 0, "seconds": 0.0, "max": 0.0}
+        )
+        window["calls"] += 1
+        window["failed"] += call["failed"]
+        window["seconds"] += call["duration"]
+        window["max"] = max(window["max"], call["duration"])
+
+    def finish(self) -> None:
+        """Flush calls still pending at the end of the log."""
+        for op in list(self._open):
+            self.operations[op].unfinished += len(self._open[op])
+            self._open[op] = []
+            self._release(op)
+
+    def report(self) -> Dict[str, Any]:
+        """Per-operation and per-window results."""
+        operations = {
+            op: stats.to_dict()
+            for op, stats in sorted(
+                self.operations.items(), key=lambda item: -item[1].total_seconds
+            )
+        }
+        windows = [
+            {
+                "start": datetime.fromtimestamp(bucket).strftime(LOG_DATE_FORMAT),
+                "calls_per_minute": round(
+                    sum(w["calls"] for w in ops.values()) / (self.window / 60), 2
+                ),
+                "operations": {
+                    op: {
+                        "calls": w["calls"],
+                        "failed": w["failed"],
+                        "mean": round(w["seconds"] / w["calls"], 3),
+                        "max": round(w["max"], 2),
+                    }
+                    for op, w in sorted(ops.items())
+                },
+            }
+            for bucket, ops in sorted(self.windows.items())
+        ]
+        return {
+            "window_seconds": self.window,
+            "events": self.stats["events"],
+            "operations": operations,
+            "windows": windows,
+        }
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], threshold: float):
+    """Per-operation p90/p99 changes against a previous JSON report."""
+    rows = []
+    for op, stats in current["operations"].items():
+        before = baseline.get("operations", {}).get(op)
+        if not before:
+            continue
+        for metric in ("p90", "p99"):
+            old, new = before.get(metric), stats.get(metric)
+            if old and new is not None:
+                change = (new - old) / old
+                rows.append(
+                    {
+                        "operation": op,
+                        "metric": metric,
+                        "baseline": old,
+                        "current": new,
+                        "change": round(change, 3),
+                        "regression": change > threshold,
+                    }
+                )
+    return rows
+
+
+def _fmt(value: Optional[float]) -> str:
+    return "-" if value is None else f"{value:.2f}"
+
+
+def main():
+    """Main function to analyze the performance log."""
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Latency percentiles and failure rates from the performance log"
+    )
+    parser.add_argument(
+        "logs",
+        nargs="*",
+        help=f"Log files (default: {PERFORMANCE_LOG_FILE} and its rotations)",
+    )
+    parser.add_argument(
+        "--window", type=int, default=3600, help="Throughput window in seconds"
+    )
+    parser.add_argument(
+        "--max-open-age",
+        type=float,
+        default=600.0,
+        help="Seconds before an unmatched start is counted as unfinished",
+    )
+    parser.add_argument("--op", help="Only report operations containing this text")
+    parser.add_argument("--windows", type=int, default=12, help="Windows to print")
+    parser.add_argument("--baseline", help="Previous JSON report to compare against")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.2,
+        help="Relative p90/p99 increase flagged as a regression",
+    )
+    parser.add_argument("--output", help="Write results as JSON")
+
+    args = parser.parse_args()
+
+    paths = (
+        [Path(p) for p in args.logs]
+        if args.logs
+        else rotated_files(LOGS_DIR / PERFORMANCE_LOG_FILE)
+    )
+    if not paths:
+        print("❌ No performance logs found")
+        sys.exit(1)
+
+    analyzer = PerformanceLogAnalyzer(args.window, args.max_open_age)
+    for event in read_events(paths, analyzer.stats):
+        if args.op and args.op not in event["op"]:
+            continue
+        analyzer.feed(event)
+    analyzer.finish()
+    results = analyzer.report()
+    results["unparsed_lines"] = analyzer.stats["unparsed_lines"]
+
+    print(
+        f"📄 {results['events']} events from {len(paths)} file(s), "
+        f"{results['unparsed_lines']} unparsed lines\n"
+    )
+    print(
+        f"   {'operation':<24} {'calls':>6} {'p50':>7} {'p90':>7} {'p99':>7} "
+        f"{'max':>7} {'fail%':>6} {'tmo%':>6} {'retry×':>6} {'unfin':>5}"
+    )
+    for op, s in results["operations"].items():
+        print(
+            f"   {op[:24]:<24} {s['calls']:>6} {_fmt(s['p50']):>7} "
+            f"{_fmt(s['p90']):>7} {_fmt(s['p99']):>7} {_fmt(s['max']):>7} "
+            f"{s['failure_rate'] * 100:>6.1f} {s['timeout_rate'] * 100:>6.1f} "
+            f"{s['retry_amplification']:>6.2f} {s['unfinished']:>5}"
+        )
+
+    busiest = sorted(results["windows"], key=lambda w: -w["calls_per_minute"])[
+        : args.windows
+    ]
+    if busiest:
+        print(f"\n   Busiest {len(busiest)} windows of {args.window}s:")
+        for w in sorted(busiest, key=lambda w: w["start"]):
+            slowest = max(w["operations"].items(), key=lambda item: item[1]["max"])
+            failed = sum(o["failed"] for o in w["operations"].values())
+            print(
+                f"   {w['start']}  {w['calls_per_minute']:>7.2f} calls/min  "
+                f"{failed:>3} failed  slowest {slowest[0]} {slowest[1]['max']:.2f}s"
+            )
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            results["comparison"] = compare(results, json.load(f), args.threshold)
+        print(f"\n   Against {args.baseline}:")
+        for row in results["comparison"]:
+            flag = "⚠️ " if row["regression"] else "  "
+            print(
+                f"   {flag}{row['operation'][:24]:<24} {row['metric']} "
+                f"{row['baseline']:.2f}s → {row['current']:.2f}s "
+                f"({row['change'] * 100:+.0f}%)"
+            )
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"\n✅ Results saved to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+Request latency under concurrent load with logging off, synchronous and queued.
+Runs the chat endpoint's pre-generation path (keyword check, federated search,
+relevance gate, performance tracking) from many threads against an in-memory
+retriever, so only the cost of logging differs between modes. Log files go to
+a temporary directory and console output is discarded. Needs no Ollama.
+"""
+
+import sys
+import os
+import json
+import logging
+import statistics
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from langchain.schema import Document
+
+from core.logging_config import BanglaRAGLogger, PerformanceTracker
+import web.chatbot_api as api
+
+QUERIES = [
+    "What is the time complexity of merge sort?",
+    "Explain how BFS works on a graph",
+    "What is a binary search tree?",
+    "How does dynamic programming solve the fibonacci recurrence?",
+]
+
+
+class InMemoryRetriever:
+    """Stands in for FederatedRetriever: fixed results after a short I/O wait."""
+
+    def __init__(self, io_ms: float):
+        self.io_seconds = io_ms / 1000
+
+    def search(self, query: str, k: int = 3):
+        time.sleep(self.io_seconds)
+        return [
+            (
+                Document(
+                    page_content=f"Chunk {i} about {query}\nwith more text",
+                    metadata={
+                        "search_source": "pdf",
+                        "relevance_score": 0.8 - i * 0.05,
+                        "page_number": i + 1,
+                    },
+                ),
+                0.8 - i * 0.05,
+            )
+            for i in range(k)
+        ]
+
+
+def handle_request(query: str) -> None:
+    """The logging-heavy part of /api/chat before the model is called."""
+    with PerformanceTracker("chat_request"):
+        api.log_info("Processing query: %s", "api", query)
+        if not api.is_query_relevant_to_algorithms(query):
+            return
+        with PerformanceTracker("search_dual_databases"):
+            documents = api.search_dual_databases(query, k=3)
+        api.check_context_relevance(query, documents)
+
+
+def configure(mode: str, level: str, log_dir: str) -> None:
+    """Switch logging to ``off``, ``sync`` or ``queued``."""
+    logging.disable(logging.NOTSET)
+    BanglaRAGLogger.setup_logging(
+        log_level=level, queued=(mode == "queued"), log_dir=log_dir, force=True
+    )
+    if mode == "off":
+        logging.disable(logging.CRITICAL)
+
+
+def measure(mode: str, threads: int, requests: int, level: str, log_dir: str) -> dict:
+    """Run ``threads`` clients issuing ``requests`` each; collect latencies."""
+    configure(mode, level, log_dir)
+    latencies: list = []
+    lock = threading.Lock()
+
+    def client(offset: int):
+        local = []
+        for i in range(requests):
+            start = time.perf_counter()
+            handle_request(QUERIES[(offset + i) % len(QUERIES)])
+            local.append(time.perf_counter() - start)
+        with lock:
+            latencies.extend(local)
+
+    workers = [threading.Thread(target=client, args=(n,)) for n in range(threads)]
+    wall_start = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    wall = time.perf_counter() - wall_start
+
+    stats = BanglaRAGLogger.get_stats()
+    BanglaRAGLogger.shutdown()  # Drain the queue outside the measured window
+
+    latencies.sort()
+    return {
+        "mode": mode,
+        "threads": threads,
+        "requests": len(latencies),
+        "p50_ms": round(statistics.median(latencies) * 1000, 3),
+        "p99_ms": round(latencies[int(len(latencies) * 0.99) - 1] * 1000, 3),
+        "max_ms": round(latencies[-1] * 1000, 3),
+        "throughput_rps": round(len(latencies) / wall, 1),
+        "dropped": stats["dropped"],
+        "debug_sampled_out": stats["debug_sampled_out"],
+    }
+
+
+def main():
+    """Main function to benchmark logging modes."""
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Request latency with logging off, synchronous and queued"
+    )
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 8, 32])
+    parser.add_argument("--requests", type=int, default=200, help="Per thread")
+    parser.add_argument(
+        "--io-ms", type=float, default=2.0, help="Simulated search latency"
+    )
+    parser.add_argument(
+        "--level", default="INFO", help="Root log level (DEBUG exercises sampling)"
+    )
+    parser.add_argument("--output", help="Write results as JSON")
+
+    args = parser.parse_args()
+
+    api.retriever = InMemoryRetriever(args.io_ms)
+    out = sys.stdout
+    rows = []
+    with tempfile.TemporaryDirectory() as log_dir, open(os.devnull, "w") as devnull:
+        print(
+            f"⏱️  {args.requests} requests per thread, {args.io_ms:g} ms search, "
+            f"level {args.level}\n",
+            file=out,
+        )
+        print(
+            f"   {'threads':>7} {'mode':<7} {'p50_ms':>8} {'p99_ms':>8} "
+            f"{'max_ms':>8} {'req/s':>8} {'dropped':>8}",
+            file=out,
+        )
+        # The console handler writes to whatever sys.stdout is at setup time
+        sys.stdout = devnull
+        try:
+            for threads in args.threads:
+                for mode in ("off", "sync", "queued"):
+                    row = measure(mode, threads, args.requests, args.level, log_dir)
+                    rows.append(row)
+                    print(
+                        f"   {threads:>7} {mode:<7} {row['p50_ms']:>8.3f} "
+                        f"{row['p99_ms']:>8.3f} {row['max_ms']:>8.3f} "
+                        f"{row['throughput_rps']:>8.1f} {row['dropped']:>8}",
+                        file=out,
+                    )
+        finally:
+            sys.stdout = out
+            logging.disable(logging.NOTSET)
+            BanglaRAGLogger.setup_logging(force=True)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(rows, f, indent=2)
+        print(f"\n✅ Results saved to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Search-cache hit rate with raw versus canonical query keys.
+Replays questions from a query log or test reports through an LRU cache the
+size of DatabaseManager's and reports how many searches (and embeddings)
+canonicalization saves. Needs no Ollama server.
+"""
+
+import sys
+import json
+import random
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.utils import SimpleCache
+from services.embedding_service import canonicalize_query, TECHNICAL_ABBREVIATIONS
+
+CACHE_SIZE = 100  # DatabaseManager._query_cache
+REPORT_GLOB = "*_test_report_*.json"
+
+
+def load_queries(paths: list) -> list:
+    """Read queries from plain-text logs (one per line) or test report JSON."""
+    queries = []
+    for path in paths:
+        path = Path(path)
+        if path.suffix == ".json":
+            with open(path, "r", encoding="utf-8") as f:
+                report = json.load(f)
+            queries.extend(r["question"] for r in report.get("detailed_results", []))
+        else:
+            with open(path, "r", encoding="utf-8") as f:
+                queries.extend(line.strip() for line in f if line.strip())
+    return queries
+
+
+def surface_variants(query: str) -> list:
+    """Ways students retype the same question: case, spacing, '?', acronyms."""
+    variants = [query, query.lower(), "  ".join(query.split()), query.rstrip("?")]
+    for abbr, full in TECHNICAL_ABBREVIATIONS.items():
+        if full.lower() in query.lower():
+            start = query.lower().index(full.lower())
+            variants.append(query[:start] + abbr + query[start + len(full) :])
+    return variants
+
+
+def replay(queries: list, key_fn, cache_size: int) -> dict:
+    """Run queries through an LRU cache keyed by ``key_fn``."""
+    cache = SimpleCache(max_size=cache_size, ttl_seconds=10**9)
+    hits = 0
+    for query in queries:
+        key = key_fn(query)
+        if cache.get(key) is not None:
+            hits += 1
+        else:
+            cache.set(key, True)
+    return {
+        "lookups": len(queries),
+        "hits": hits,
+        "misses": len(queries) - hits,
+        "hit_rate": round(hits / len(queries) * 100, 1) if queries else 0.0,
+    }
+
+
+def main():
+    """Main function to compare cache keys."""
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Search-cache hit rate with raw vs canonical query keys"
+    )
+    parser.add_argument(
+        "inputs",
+        nargs="*",
+        help=f"Query logs or test reports (default: {REPORT_GLOB} in the repo root)",
+    )
+    parser.add_argument(
+        "--variants",
+        action="store_true",
+        help="Expand each question into retyped variants (case, spacing, acronyms)",
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=1, help="Replay the traffic N times, shuffled"
+    )
+    parser.add_argument("--cache-size", type=int, default=CACHE_SIZE)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Write results as JSON")
+
+    args = parser.parse_args()
+
+    inputs = args.inputs or sorted(Path(__file__).parent.parent.glob(REPORT_GLOB))
+    queries = load_queries(inputs)
+    if not queries:
+        print("❌ No queries found")
+        sys.exit(1)
+
+    if args.variants:
+        queries = [v for q in queries for v in surface_variants(q)]
+    traffic = queries * args.repeat
+    random.Random(args.seed).shuffle(traffic)
+
+    results = {
+        "queries": len(traffic),
+        "distinct_raw": len(set(traffic)),
+        "distinct_canonical": len({canonicalize_query(q) for q in traffic}),
+        "raw": replay(traffic, lambda q: q, args.cache_size),
+        "canonical": replay(traffic, canonicalize_query, args.cache_size),
+    }
+
+    print(f"📄 {results['queries']} lookups from {len(inputs)} input(s)")
+    print(
+        f"   distinct keys: raw {results['distinct_raw']}, "
+        f"canonical {results['distinct_canonical']}"
+    )
+    for name in ("raw", "canonical"):
+        row = results[name]
+        print(
+            f"   {name:<10} hit rate {row['hit_rate']:>5.1f}%  "
+            f"({row['misses']} embeddings + searches)"
+        )
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"\n✅ Results saved to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Server CPU per chat stream: one SSE frame per token versus coalesced frames.
+Replays synthetic token streams at a model-like rate through the same frame
+building and socket writes the Flask endpoint does, with many streams at
+once, and reports CPU time spent on SSE (pacing cost subtracted), frames and
+bytes per stream. Needs no Ollama.
+"""
+
+import sys
+import json
+import socket
+import threading
+import time
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.constants import SSE_FLUSH_INTERVAL_MS, SSE_FLUSH_BYTES
+from core.utils import SSEWriter
+
+WORDS = (
+    "An array stores elements of the same type in contiguous memory so any "
+    "index is reached in constant time while insertion in the middle shifts "
+    "every later element and costs linear time"
+).split()
+
+
+def token_source(count: int, rate: float):
+    """Yield ``count`` word-piece tokens at roughly ``rate`` tokens/second."""
+    interval = 1.0 / rate
+    next_at = time.perf_counter()
+    for i in range(count):
+        next_at += interval
+        delay = next_at - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+        yield (" " if i else "") + WORDS[i % len(WORDS)]
+
+
+def legacy_frames(tokens):
+    """The previous endpoint: one json.dumps'd frame per token."""
+    for token in tokens:
+        yield f"data: {json.dumps({'type': 'token', 'token': token})}\n\n"
+
+
+def run_stream(mode: str, tokens: int, rate: float, flush_ms: int, results: list):
+    """Send one stream into a socket pair, like the WSGI server would."""
+    server, client = socket.socketpair()
+    drained = threading.Thread(target=_drain, args=(client,), daemon=True)
+    drained.start()
+
+    source = token_source(tokens, rate)
+    if mode == "source":
+        frames = (token for token in source if False)  # pacing cost only
+        writer = None
+    elif mode == "per-token":
+        frames = legacy_frames(source)
+        writer = None
+    else:
+        writer = SSEWriter(flush_ms=flush_ms, flush_bytes=SSE_FLUSH_BYTES)
+        frames = writer.stream(source)
+
+    sent = count = 0
+    for frame in frames:
+        server.sendall(frame.encode("utf-8"))
+        sent += len(frame)
+        count += 1
+    server.close()
+    drained.join()
+    results.append({"frames": count, "bytes": sent})
+
+
+def _drain(sock):
+    """Read and discard everything (the browser side)."""
+    while sock.recv(65536):
+        pass
+    sock.close()
+
+
+def measure(mode: str, streams: int, tokens: int, rate: float, flush_ms: int) -> dict:
+    """Run concurrent streams and measure process CPU time."""
+    results: list = []
+    threads = [
+        threading.Thread(
+            target=run_stream, args=(mode, tokens, rate, flush_ms, results)
+        )
+        for _ in range(streams)
+    ]
+    cpu_start, wall_start = time.process_time(), time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    cpu = time.process_time() - cpu_start
+    wall = time.perf_counter() - wall_start
+
+    return {
+        "mode": mode,
+        "streams": streams,
+        "wall_s": round(wall, 2),
+        "cpu_ms_per_stream": round(cpu / streams * 1000, 2),
+        "frames_per_stream": round(sum(r["frames"] for r in results) / streams, 1),
+        "bytes_per_stream": round(sum(r["bytes"] for r in results) / streams),
+    }
+
+
+def main():
+    """Main function to benchmark SSE framing."""
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Server CPU per stream for per-token vs coalesced SSE frames"
+    )
+    parser.add_argument("--streams", type=int, nargs="+", default=[1, 16, 64])
+    parser.add_argument("--tokens", type=int, default=400, help="Tokens per answer")
+    parser.add_argument("--rate", type=float, default=80.0, help="Tokens per second")
+    parser.add_argument("--flush-ms", type=int, default=SSE_FLUSH_INTERVAL_MS)
+    parser.add_argument("--output", help="Write results as JSON")
+
+    args = parser.parse_args()
+
+    print(
+        f"⏱️  {args.tokens} tokens at {args.rate:g} tok/s per stream, "
+        f"coalescing every {args.flush_ms} ms / {SSE_FLUSH_BYTES} bytes\n"
+    )
+    print(
+        f"   {'streams':>7} {'mode':<10} {'sse_cpu_ms':>14} "
+        f"{'frames':>8} {'bytes':>8} {'wall_s':>7}"
+    )
+    rows = []
+    for streams in args.streams:
+        # Token pacing costs the same in both modes; subtract it
+        source = measure("source", streams, args.tokens, args.rate, args.flush_ms)
+        for mode in ("per-token", "coalesced"):
+            row = measure(mode, streams, args.tokens, args.rate, args.flush_ms)
+            row["sse_cpu_ms_per_stream"] = round(
+                row["cpu_ms_per_stream"] - source["cpu_ms_per_stream"], 2
+            )
+            rows.append(row)
+            print(
+                f"   {streams:>7} {mode:<10} {row['sse_cpu_ms_per_stream']:>14.2f} "
+                f"{row['frames_per_stream']:>8.1f} {row['bytes_per_stream']:>8} "
+                f"{row['wall_s']:>7.2f}"
+            )
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(rows, f, indent=2)
+        print(f"\n✅ Results saved to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
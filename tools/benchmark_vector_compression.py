@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Memory versus recall@k report for compressed memmap vector indexes.
+Compares the exact float32 scan with int8, PCA and truncated first stages,
+each with and without full-precision rescoring.
+"""
+
+import sys
+import json
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.constants import DB_DIR, COMPRESSED_DIMENSIONS, RESCORE_FACTOR
+from services.database_service import MemmapVectorDatabase, CompressedVectorDatabase
+from tools.benchmark_vector_search import (
+    load_chroma_vectors,
+    synthetic_vectors,
+    grow_corpus,
+    exact_top_k,
+    percentiles,
+    recall,
+    documents_for,
+)
+
+METHODS = ["int8", "pca", "truncate"]
+
+
+def measure(store, queries: np.ndarray, k: int) -> dict:
+    """Query latency and result rows for a store."""
+    latencies, results = [], []
+    for query in queries:
+        start = time.perf_counter()
+        hits = store.similarity_search_by_vector_with_scores(query, k)
+        latencies.append(time.perf_counter() - start)
+        results.append([int(doc.metadata["id"]) for doc, _ in hits])
+    return {**percentiles(latencies), "results": results}
+
+
+def run_report(
+    corpus: np.ndarray,
+    queries: np.ndarray,
+    k: int,
+    methods: list,
+    dimensions: int,
+    rescore_factor: int,
+) -> list:
+    """Build every index variant over the same corpus and score it."""
+    truth = exact_top_k(corpus, queries, k)
+    full_bytes = corpus.shape[0] * corpus.shape[1] * 4
+    rows = []
+
+    with tempfile.TemporaryDirectory() as workdir:
+        exact = MemmapVectorDatabase(workdir, "bench")
+        exact.add_embeddings(documents_for(len(corpus)), corpus)
+        result = measure(exact, queries, k)
+        rows.append(
+            {
+                "index": "float32",
+                "index_bytes": full_bytes,
+                **result,
+                "recall": recall(result.pop("results"), truth, k),
+            }
+        )
+
+        for method in methods:
+            # rescore_factor=1 shows the first stage on its own
+            for factor in (1, rescore_factor):
+                store = CompressedVectorDatabase(
+                    workdir,
+                    "bench",
+                    compression=method,
+                    dimensions=dimensions,
+                    rescore_factor=factor,
+                )
+                result = measure(store, queries, k)
+                stats = store.get_index_stats()
+                rows.append(
+                    {
+                        "index": method if factor == 1 else f"{method}+rescore",
+                        "index_bytes": stats["index_bytes"],
+                        **result,
+                        "recall": recall(result.pop("results"), truth, k),
+                    }
+                )
+
+    for row in rows:
+        row["memory_ratio"] = round(full_bytes / row["index_bytes"], 2)
+    return rows
+
+
+def print_report(rows: list, size: int, k: int) -> None:
+    """Print the memory versus recall table."""
+    print(f"\n📊 {size} vectors")
+    print(
+        f"   {'index':<16} {'index_MB':>9} {'vs_f32':>7} "
+        f"{'recall@' + str(k):>9} {'p50_ms':>8} {'p95_ms':>8}"
+    )
+    for row in rows:
+        print(
+            f"   {row['index']:<16} {row['index_bytes'] / 2**20:>9.2f} "
+            f"{row['memory_ratio']:>6.1f}x {row['recall']:>9.3f} "
+            f"{row['p50_ms']:>8.2f} {row['p95_ms']:>8.2f}"
+        )
+
+
+def main():
+    """Main function to report memory versus recall."""
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Memory versus recall@k for compressed vector indexes"
+    )
+    parser.add_argument(
+        "--collection",
+        default=None,
+        help="Seed vectors from this Chroma collection (default: synthetic)",
+    )
+    parser.add_argument("--dim", type=int, default=768, help="Synthetic vector size")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[5000, 20000])
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=5)
+    parser.add_argument("--methods", nargs="+", default=METHODS, choices=METHODS)
+    parser.add_argument("--dimensions", type=int, default=COMPRESSED_DIMENSIONS)
+    parser.add_argument("--rescore-factor", type=int, default=RESCORE_FACTOR)
+    parser.add_argument("--output", help="Write results as JSON")
+
+    args = parser.parse_args()
+
+    if args.collection:
+        base = load_chroma_vectors(str(DB_DIR), args.collection)
+        print(f"📄 Loaded {len(base)} vectors from '{args.collection}'")
+    else:
+        base = synthetic_vectors(max(args.sizes), args.dim)
+        print(f"🎲 Generated {len(base)} synthetic {args.dim}-d vectors")
+
+    report = {}
+    rng = np.random.default_rng(1)
+    for size in args.sizes:
+        corpus = grow_corpus(base, size)
+        picks = corpus[rng.integers(0, size, size=args.queries)]
+        queries = picks + 0.3 * np.abs(corpus).mean() * rng.normal(size=picks.shape)
+
+        rows = run_report(
+            corpus,
+            queries.astype(np.float32),
+            args.k,
+            args.methods,
+            args.dimensions,
+            args.rescore_factor,
+        )
+        print_report(rows, size, args.k)
+        report[size] = rows
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"\n✅ Results saved to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+"""
+Benchmark exact memmap vector search against ChromaDB (HNSW).
+Builds both stores at several corpus sizes from the same vectors and reports
+build time, per-query latency percentiles and recall@k against brute force.
+"""
+
+import sys
+import json
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import chromadb
+from langchain_chroma import Chroma
+from langchain.schema import Document
+
+from core.constants import DB_DIR
+from services.database_service import MemmapVectorDatabase
+
+CHROMA_MAX_BATCH = 5000
+
+
+def load_chroma_vectors(persist_directory: str, collection_name: str) -> np.ndarray:
+    """Read stored embeddings from an existing Chroma collection."""
+    client = chromadb.PersistentClient(path=persist_directory)
+    data = client.get_collection(collection_name).get(include=["embeddings"])
+    return np.asarray(data["embeddings"], dtype=np.float32)
+
+
+def synthetic_vectors(count: int, dim: int, seed: int = 0) -> np.ndarray:
+    """Clustered random vectors that roughly mimic topic-structured chunks."""
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(size=(max(count // 50, 1), dim))
+    assignment = rng.integers(0, len(centers), size=count)
+    return (centers[assignment] + 0.5 * rng.normal(size=(count, dim))).astype(
+        np.float32
+    )
+
+
+def grow_corpus(base: np.ndarray, size: int, seed: int = 0) -> np.ndarray:
+    """Resample and jitter base vectors up to ``size`` rows."""
+    if len(base) >= size:
+        return base[:size]
+    rng = np.random.default_rng(seed)
+    picks = base[rng.integers(0, len(base), size=size)]
+    scale = 0.05 * np.abs(base).mean()
+    return (picks + scale * rng.normal(size=picks.shape)).astype(np.float32)
+
+
+def exact_top_k(corpus: np.ndarray, queries: np.ndarray, k: int) -> list:
+    """Ground-truth top-k row sets by cosine similarity in float64."""
+    corpus = corpus.astype(np.float64)
+    corpus /= np.linalg.norm(corpus, axis=1, keepdims=True)
+    queries = queries.astype(np.float64)
+    queries /= np.linalg.norm(queries, axis=1, keepdims=True)
+    scores = corpus @ queries.T
+    return [set(np.argsort(-column)[:k].tolist()) for column in scores.T]
+
+
+def percentiles(latencies: list) -> dict:
+    """p50/p95 latency in milliseconds."""
+    values = np.asarray(latencies) * 1000
+    return {
+        "p50_ms": round(float(np.percentile(values, 50)), 3),
+        "p95_ms": round(float(np.percentile(values, 95)), 3),
+    }
+
+
+def recall(results: list, truth: list, k: int) -> float:
+    """Mean recall@k of row-id result lists."""
+    hits = [len(set(rows) & expected) / k for rows, expected in zip(results, truth)]
+    return round(float(np.mean(hits)), 4)
+
+
+def documents_for(size: int) -> list:
+    """Placeholder documents whose ``id`` encodes the corpus row."""
+    return [
+        Document(page_content=f"chunk {row}", metadata={"id": str(row)})
+        for row in range(size)
+    ]
+
+
+def bench_memmap(
+    workdir: str, corpus: np.ndarray, queries: np.ndarray, k: int, batch: int
+) -> dict:
+    """Build and query the memmap store."""
+    start = time.time()
+    store = MemmapVectorDatabase(workdir, "bench")
+    store.add_embeddings(documents_for(len(corpus)), corpus)
+    build_time = time.time() - start
+
+    latencies, results = [], []
+    for query in queries:
+        start = time.perf_counter()
+        hits = store.similarity_search_by_vector_with_scores(query, k)
+        latencies.append(time.perf_counter() - start)
+        results.append([int(doc.metadata["id"]) for doc, _ in hits])
+
+    start = time.perf_counter()
+    for i in range(0, len(queries), batch):
+        store.similarity_search_by_vectors_with_scores(queries[i : i + batch], k)
+    batch_time = time.perf_counter() - start
+
+    return {
+        "build_s": round(build_time, 3),
+        **percentiles(latencies),
+        "batched_qps": round(len(queries) / batch_time, 1),
+        "results": results,
+    }
+
+
+def bench_chroma(workdir: str, corpus: np.ndarray, queries: np.ndarray, k: int) -> dict:
+    """Build and query Chroma through the same langchain path the app uses."""
+    start = time.time()
+    client = chromadb.PersistentClient(path=workdir)
+    collection = client.create_collection("bench")
+    for i in range(0, len(corpus), CHROMA_MAX_BATCH):
+        rows = range(i, min(i + CHROMA_MAX_BATCH, len(corpus)))
+        collection.add(
+            ids=[str(row) for row in rows],
+            embeddings=corpus[i : rows.stop].tolist(),
+            documents=[f"chunk {row}" for row in rows],
+            metadatas=[{"id": str(row)} for row in rows],
+        )
+    build_time = time.time() - start
+
+    db = Chroma(client=client, collection_name="bench")
+    latencies, results = [], []
+    for query in queries:
+        start = time.perf_counter()
+        hits = db.similarity_search_by_vector_with_relevance_scores(query.tolist(), k)
+        latencies.append(time.perf_counter() - start)
+        results.append([int(doc.metadata["id"]) for doc, _ in hits])
+
+    return {
+        "build_s": round(build_time, 3),
+        **percentiles(latencies),
+        "results": results,
+    }
+
+
+def run_benchmark(
+    base: np.ndarray, sizes: list, num_queries: int, k: int, batch: int
+) -> list:
+    """Run both backends at every corpus size."""
+    rows = []
+    rng = np.random.default_rng(1)
+
+    for size in sizes:
+        corpus = grow_corpus(base, size)
+        # Queries near real chunks, like questions about the material
+        picks = corpus[rng.integers(0, size, size=num_queries)]
+        queries = picks + 0.3 * np.abs(corpus).mean() * rng.normal(size=picks.shape)
+        queries = queries.astype(np.float32)
+        truth = exact_top_k(corpus, queries, k)
+
+        for backend in ("chroma", "memmap"):
+            with tempfile.TemporaryDirectory() as workdir:
+                if backend == "memmap":
+                    result = bench_memmap(workdir, corpus, queries, k, batch)
+                else:
+                    result = bench_chroma(workdir, corpus, queries, k)
+
+            result["recall"] = recall(result.pop("results"), truth, k)
+            rows.append({"size": size, "backend": backend, **result})
+            print(
+                f"   {size:>7} {backend:<8} build {result['build_s']:>7.2f}s  "
+                f"p50 {result['p50_ms']:>7.2f}ms  p95 {result['p95_ms']:>7.2f}ms  "
+                f"recall@{k} {result['recall']:.3f}"
+            )
+
+    return rows
+
+
+def print_table(rows: list, k: int) -> None:
+    """Print the benchmark summary."""
+    print(
+        f"\n   {'size':>7} {'backend':<8} {'build_s':>8} {'p50_ms':>8} "
+        f"{'p95_ms':>8} {'recall@' + str(k):>9} {'batch_qps':>10}"
+    )
+    for row in rows:
+        print(
+            f"   {row['size']:>7} {row['backend']:<8} {row['build_s']:>8.2f} "
+            f"{row['p50_ms']:>8.2f} {row['p95_ms']:>8.2f} {row['recall']:>9.3f} "
+            f"{row.get('batched_qps', '-'):>10}"
+        )
+
+
+def main():
+    """Main function to benchmark vector search backends."""
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Benchmark memmap exact search against ChromaDB"
+    )
+    parser.add_argument(
+        "--collection",
+        default=None,
+        help="Seed vectors from this Chroma collection (default: synthetic)",
+    )
+    parser.add_argument("--dim", type=int, default=768, help="Synthetic vector size")
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[1000, 5000, 20000, 50000]
+    )
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=5)
+    parser.add_argument("--batch", type=int, default=32, help="Batched query size")
+    parser.add_argument("--output", help="Write results as JSON")
+
+    args = parser.parse_args()
+
+    if args.collection:
+        base = load_chroma_vectors(str(DB_DIR), args.collection)
+        print(f"📄 Loaded {len(base)} vectors from '{args.collection}'")
+    else:
+        base = synthetic_vectors(max(args.sizes), args.dim)
+        print(f"🎲 Generated {len(base)} synthetic {args.dim}-d vectors")
+
+    print("\n⏱️  Running benchmark...")
+    rows = run_benchmark(base, args.sizes, args.queries, args.k, args.batch)
+    print_table(rows, args.k)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(rows, f, indent=2)
+        print(f"\n✅ Results saved to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
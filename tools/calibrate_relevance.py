@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Fit relevance gate thresholds from the bundled 200-question test reports.
+Replays every question through the same federated retriever the chatbot API
+uses, labels ``negative_*`` tests as off-topic and writes the thresholds
+(shared, and per query language where there are enough questions) the API
+loads at startup.
+"""
+
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.logging_config import log_info, log_error
+from core.utils import load_test_report_entries, find_test_reports
+from core.constants import (
+    DB_DIR,
+    RELEVANCE_THRESHOLDS_FILE,
+    RELEVANCE_MAX_FALSE_REFUSAL,
+    RELEVANCE_MAX_FALSE_ACCEPT,
+)
+from services.retrieval_service import FederatedRetriever
+from services.relevance_service import (
+    calibrate_by_language,
+    gate_language,
+    retrieval_scores,
+    save_thresholds,
+)
+
+
+def collect_samples(retriever, entries: list, k: int = 3) -> list:
+    """
+    Retrieve scores for each report question as the API's gate sees them,
+    with its topic label and gate language.
+    """
+    samples = []
+    for i, entry in enumerate(entries, 1):
+        question = entry.get("question", "")
+        if not question:
+            continue
+        try:
+            results = retriever.search(question, k=k)
+        except Exception as e:
+            log_error(f"Retrieval failed for {entry.get('test_id')}: {e}", "calibrate")
+            continue
+
+        scores = retrieval_scores([doc for doc, _ in results])
+        on_topic = not entry.get("test_id", "").startswith("negative")
+        samples.append((scores, on_topic, gate_language(question)))
+
+        if i % 25 == 0:
+            print(f"   Retrieved {i}/{len(entries)} questions")
+
+    return samples
+
+
+def print_report(calibration: dict, title: str = "Calibrated thresholds") -> None:
+    """Print thresholds and how the gate would have routed the eval set."""
+    min_gap = calibration["min_gap"]
+    print(f"\n📊 {title}:")
+    print(f"   Refuse below:  {calibration['refuse_below']:.4f}")
+    print(f"   Answer above:  {calibration['answer_above']:.4f}")
+    print(
+        f"   Minimum gap:   {min_gap:.4f}"
+        if min_gap is not None
+        else "   Minimum gap:   (never)"
+    )
+
+    print("\n🧮 Decisions on the evaluation set:")
+    print(f"   {'decision':<10}{'on-topic':>10}{'off-topic':>11}")
+    for decision, counts in calibration["decisions"].items():
+        print(f"   {decision:<10}{counts['on_topic']:>10}{counts['off_topic']:>11}")
+
+    print(
+        f"\n💡 LLM calls saved: {calibration['llm_calls_saved']}/{calibration['samples']}"
+        f" ({calibration['llm_calls_saved_rate'] * 100:.1f}%)"
+    )
+
+
+def main():
+    """Main function to calibrate the relevance gate."""
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Calibrate relevance gate thresholds from test reports"
+    )
+    parser.add_argument(
+        "reports", nargs="*", help="Test report JSON files (default: bundled reports)"
+    )
+    parser.add_argument(
+        "--k", type=int, default=3, help="Documents retrieved per query"
+    )
+    parser.add_argument(
+        "--max-false-refusal", type=float, default=RELEVANCE_MAX_FALSE_REFUSAL
+    )
+    parser.add_argument(
+        "--max-false-accept", type=float, default=RELEVANCE_MAX_FALSE_ACCEPT
+    )
+    parser.add_argument(
+        "--output", default=str(RELEVANCE_THRESHOLDS_FILE), help="Thresholds file"
+    )
+    parser.add_argument(
+        "--dry-run", action="store_true", help="Print thresholds without saving"
+    )
+
+    args = parser.parse_args()
+
+    report_paths = args.reports or find_test_reports()
+    entries = load_test_report_entries(report_paths)
+    if not entries:
+        print("❌ Error: No test report entries found")
+        sys.exit(1)
+
+    print(f"📄 Loaded {len(entries)} questions from {len(report_paths)} reports")
+
+    retriever = FederatedRetriever.from_config(persist_directory=str(DB_DIR))
+    samples = collect_samples(retriever, entries, k=args.k)
+
+    try:
+        calibration = calibrate_by_language(
+            samples,
+            max_false_refusal=args.max_false_refusal,
+            max_false_accept=args.max_false_accept,
+        )
+    except ValueError as e:
+        print(f"❌ Error: {e}")
+        sys.exit(1)
+
+    print_report(calibration)
+    for language, language_calibration in calibration["languages"].items():
+        print_report(language_calibration, f"Thresholds for '{language}' queries")
+
+    if not args.dry_run:
+        if save_thresholds(calibration, args.output):
+            log_info(f"Relevance thresholds saved to {args.output}", "calibrate")
+            print(f"\n✅ Thresholds saved to {args.output}")
+        else:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
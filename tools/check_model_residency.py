@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Check model preloading and keep-alive against stub Ollama servers.
+Drills, each against a fresh ``ModelManager`` over stubs that charge a cold
+load the first time a model is used:
+
+1. Startup preload: the preferred model is loaded with a ``keep_alive``
+   before the first request, so that request is not slowed by the load.
+2. Eviction: a node unloads the model (its keep-alive ran out); the next
+   residency check loads it again before a request needs it.
+3. Model switch: ``set_active_model`` loads the new model before it takes
+   traffic, so the first request after the switch is warm.
+
+Exits non-zero if any check fails. Needs no real Ollama.
+"""
+
+import sys
+import json
+import time
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from services.llm_service import ModelManager
+from tools.stub_ollama import StubOllama
+
+MODELS = ["primary:stub", "fallback-a:stub"]
+COLD_LOAD = 1.0
+REFRESH_SECONDS = 0.5
+
+
+def start_stubs(count: int) -> list:
+    """Start ``count`` stubs with nothing loaded."""
+    stubs = [
+        StubOllama(
+            models=MODELS,
+            delay=0.05,
+            token_delay=0.005,
+            tokens=10,
+            loaded=[],
+            cold_load=COLD_LOAD,
+        )
+        for _ in range(count)
+    ]
+    for stub in stubs:
+        stub.start()
+    return stubs
+
+
+def make_manager(stubs: list) -> ModelManager:
+    """Manager over the stubs, startup preload finished."""
+    manager = ModelManager(
+        MODELS[0], MODELS[1:], nodes=[stub.url for stub in stubs], hedging=False
+    )
+    manager._residency.refresh_seconds = REFRESH_SECONDS
+    deadline = time.monotonic() + COLD_LOAD * 5
+    while manager.get_residency_stats()["preloads"] < len(stubs):
+        if time.monotonic() > deadline:
+            break
+        time.sleep(0.05)
+    return manager
+
+
+def timed(manager: ModelManager, prompt: str) -> float:
+    """Seconds for one uncached request (inf on failure)."""
+    start = time.perf_counter()
+    response = manager.generate_response(prompt, use_cache=False)
+    return float("inf") if response is None else time.perf_counter() - start
+
+
+def check_startup() -> dict:
+    """The first request after startup finds the model loaded."""
+    stubs = start_stubs(2)
+    try:
+        manager = make_manager(stubs)
+        latency = timed(manager, "first question")
+        stats = manager.get_residency_stats()
+    finally:
+        for stub in stubs:
+            stub.stop()
+
+    keep_alive = [stub.keep_alive.get(MODELS[0]) for stub in stubs]
+    return {
+        "check": "startup preload keeps the first request warm",
+        "passed": latency < COLD_LOAD / 2
+        and all(stub.loads.get(MODELS[0]) for stub in stubs)
+        and None not in keep_alive,
+        "first_request_seconds": round(latency, 3),
+        "preloads": stats["preloads"],
+        "keep_alive": keep_alive,
+    }
+
+
+def check_evicted() -> dict:
+    """An evicted model is loaded again by the next residency check."""
+    stubs = start_stubs(1)
+    try:
+        manager = make_manager(stubs)
+        stubs[0].evict(MODELS[0])
+        time.sleep(REFRESH_SECONDS * 2 + COLD_LOAD)
+        latency = timed(manager, "after eviction")
+        stats = manager.get_residency_stats()
+    finally:
+        stubs[0].stop()
+
+    return {
+        "check": "an evicted model is reloaded before it is needed",
+        "passed": stats["reloads"] >= 1 and latency < COLD_LOAD / 2,
+        "reloads": stats["reloads"],
+        "request_seconds": round(latency, 3),
+        "recent_cold_loads": [
+            (e["model"], e["reason"], e["seconds"]) for e in stats["recent_cold_loads"]
+        ],
+    }
+
+
+def check_switch() -> dict:
+    """Switching models pre-warms the new one before it takes traffic."""
+    stubs = start_stubs(1)
+    try:
+        manager = make_manager(stubs)
+        result = manager.set_active_model(MODELS[1])
+        latency = timed(manager, "after switch")
+        resident = manager.get_residency_stats()["resident"]
+        calls = dict(stubs[0].calls)
+    finally:
+        stubs[0].stop()
+
+    return {
+        "check": "set-model loads the model before switching to it",
+        "passed": result["success"]
+        and result["warmed"]
+        and result["load_seconds"] >= COLD_LOAD * 0.9
+        and latency < COLD_LOAD / 2
+        and calls.get(MODELS[1]) == 1
+        and MODELS[1] in resident,
+        "load_seconds": result["load_seconds"],
+        "first_request_seconds": round(latency, 3),
+        "resident": resident,
+    }
+
+
+def main():
+    """Main function to run the model residency drills."""
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Check Ollama model preloading and keep-alive against stubs"
+    )
+    parser.add_argument("--output", help="Write results as JSON")
+
+    args = parser.parse_args()
+
+    print("⏱️  Running model residency drills against stub servers...\n")
+    results = [check_startup(), check_evicted(), check_switch()]
+
+    for result in results:
+        mark = "✅" if result["passed"] else "❌"
+        details = {k: v for k, v in result.items() if k not in ("check", "passed")}
+        print(f"{mark} {result['check']}")
+        for key, value in details.items():
+            print(f"   {key}: {value}")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"\n✅ Results saved to {args.output}")
+
+    if not all(result["passed"] for result in results):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
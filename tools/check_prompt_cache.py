@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+Check that RAG prompts keep a stable prefix for Ollama's prompt cache.
+Drills against a stub Ollama that charges prompt evaluation only for the
+part of a prompt not shared with the previous one, as Ollama does:
+
+1. The same retrieved chunks in a different retrieval order give the same
+   prompt.
+2. The static instructions go in the ``system`` field for models whose
+   template has one, and ahead of the prompt for those without.
+3. Follow-up questions over mostly the same chunks, retrieved in varying
+   order: with the chunk-ordered layout, less of each prompt is evaluated
+   than with the context in retrieval order.
+
+Exits non-zero if any check fails. Needs no real Ollama.
+"""
+
+import sys
+import json
+import random
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from langchain.schema import Document
+
+from services.llm_service import ModelManager, PromptTemplate, RAGQueryProcessor
+from tools.stub_ollama import StubOllama
+
+MODELS = ["primary:stub", "plain:stub"]
+TOPICS = ["heap", "stack", "queue", "hash table", "binary tree", "graph"]
+
+
+def make_documents() -> list:
+    """Textbook-like chunks, about 300 characters each."""
+    return [
+        Document(
+            page_content=(
+                f"A {topic} is a data structure covered in chapter {i + 1}. "
+                + f"Operations on a {topic} are analysed for time and space. " * 4
+            ),
+            metadata={"id": f"course_chunk_{i + 1}", "page_number": i + 10},
+        )
+        for i, topic in enumerate(TOPICS)
+    ]
+
+
+def make_processor(stub: StubOllama) -> RAGQueryProcessor:
+    """Processor over the stub, without routing or fast path."""
+    manager = ModelManager(
+        MODELS[0], MODELS[1:], base_url=stub.url, hedging=False, preload=False
+    )
+    return RAGQueryProcessor(manager)
+
+
+def check_order(processor: RAGQueryProcessor, documents: list) -> dict:
+    """Retrieval order does not change the prompt."""
+    question = "What is a heap?"
+    forward = processor.build_prompt(question, documents[:4])
+    backward = processor.build_prompt(question, documents[:4][::-1])
+    return {
+        "check": "retrieval order does not change the prompt",
+        "passed": forward == backward,
+        "prompt_chars": len(forward["system"]) + len(forward["prompt"]),
+    }
+
+
+def check_system(stub: StubOllama, processor: RAGQueryProcessor, documents) -> dict:
+    """Instructions go in the system field, or first in the prompt."""
+    prompt = processor.build_prompt("What is a stack?", documents[:3])
+    manager = processor.model_manager
+    for model_name in MODELS:
+        manager.generate_response(
+            prompt["prompt"],
+            system=prompt["system"],
+            model_name=model_name,
+            fallback=False,
+            use_cache=False,
+        )
+    # The stub keeps system field and prompt joined as they were sent
+    with_system = stub.prompts.get(MODELS[0], "")
+    inline = stub.prompts.get(MODELS[1], "")
+    return {
+        "check": "static instructions lead every prompt",
+        "passed": with_system == prompt["system"] + prompt["prompt"]
+        and inline == f"{prompt['system']}\n\n{prompt['prompt']}",
+        "system_field": MODELS[0],
+        "inline_system": MODELS[1],
+    }
+
+
+def run_questions(processor: RAGQueryProcessor, documents: list, ordered: bool):
+    """Ask questions over the same chunks retrieved in shuffled order."""
+    shuffle = random.Random(7)
+    for i in range(12):
+        # Follow-up questions: mostly the same chunks, ranked differently
+        retrieved = documents[:5] if i % 3 == 2 else documents[:4]
+        retrieved = shuffle.sample(retrieved, len(retrieved))
+        question = f"What is the time complexity of a {TOPICS[i % 4]}?"
+        if ordered:
+            prompt = processor.build_prompt(question, retrieved)
+        else:
+            context = "\n\n".join(doc.page_content for doc in retrieved)
+            prompt = PromptTemplate.build_prompt(question, context)
+        processor.model_manager.generate_response(
+            prompt["prompt"],
+            system=prompt["system"],
+            model_name=MODELS[0],
+            fallback=False,
+            use_cache=False,
+        )
+
+
+def check_reuse(documents: list) -> dict:
+    """Chunk order leaves less of each prompt to evaluate than rank order."""
+    results = {}
+    for ordered in (False, True):
+        stub = StubOllama(
+            models=MODELS, delay=0.01, token_delay=0.001, tokens=5, prompt_delay=0.05
+        )
+        stub.start()
+        try:
+            processor = make_processor(stub)
+            run_questions(processor, documents, ordered)
+            stats = processor.model_manager.get_prompt_cache_stats()[MODELS[0]]
+            results["chunk_order" if ordered else "retrieval_order"] = stats
+        finally:
+            stub.stop()
+
+    return {
+        "check": "chunk order lets Ollama reuse more of each prompt",
+        "passed": results["chunk_order"]["prompt_eval_ms"]
+        < results["retrieval_order"]["prompt_eval_ms"],
+        **results,
+    }
+
+
+def main():
+    """Main function to run the prompt prefix drills."""
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Check prompt prefix stability against a stub Ollama"
+    )
+    parser.add_argument("--output", help="Write results as JSON")
+
+    args = parser.parse_args()
+
+    print("⏱️  Running prompt cache drills against a stub server...\n")
+    documents = make_documents()
+    stub = StubOllama(
+        models=MODELS, delay=0.01, token_delay=0.001, tokens=5, no_system=MODELS[1:]
+    )
+    stub.start()
+    try:
+        processor = make_processor(stub)
+        results = [
+            check_order(processor, documents),
+            check_system(stub, processor, documents),
+        ]
+    finally:
+        stub.stop()
+    results.append(check_reuse(documents))
+
+    for result in results:
+        mark = "✅" if result["passed"] else "❌"
+        details = {k: v for k, v in result.items() if k not in ("check", "passed")}
+        print(f"{mark} {result['check']}")
+        for key, value in details.items():
+            print(f"   {key}: {value}")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"\n✅ Results saved to {args.output}")
+
+    if not all(result["passed"] for result in results):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
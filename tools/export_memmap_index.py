@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Copy a Chroma collection into the memmap vector store.
+Reuses the stored embeddings, so no text is re-embedded. Set
+``VECTOR_BACKEND = "memmap"`` (or ``"backend"`` per collection) to use it.
+"""
+
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import chromadb
+from langchain.schema import Document
+
+from core.logging_config import log_info
+from core.constants import DB_DIR, SEARCH_COLLECTIONS
+from services.database_service import MemmapVectorDatabase
+
+EXPORT_BATCH_SIZE = 1000
+
+
+def export_collection(persist_directory: str, collection_name: str) -> int:
+    """Export one collection and return the number of vectors written."""
+    client = chromadb.PersistentClient(path=persist_directory)
+    collection = client.get_collection(collection_name)
+    total = collection.count()
+
+    store = MemmapVectorDatabase(persist_directory, collection_name)
+    if store.get_document_count():
+        store.delete_documents(store.get_existing_ids())
+
+    for offset in range(0, total, EXPORT_BATCH_SIZE):
+        data = collection.get(
+            include=["embeddings", "documents", "metadatas"],
+            limit=EXPORT_BATCH_SIZE,
+            offset=offset,
+        )
+        documents = [
+            Document(page_content=text or "", metadata=metadata or {})
+            for text, metadata in zip(data["documents"], data["metadatas"])
+        ]
+        store.add_embeddings(documents, data["embeddings"], data["ids"])
+        print(f"   {collection_name}: {min(offset + EXPORT_BATCH_SIZE, total)}/{total}")
+
+    return total
+
+
+def main():
+    """Main function to export Chroma collections."""
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Export Chroma collections to the memmap vector store"
+    )
+    parser.add_argument(
+        "collections",
+        nargs="*",
+        help="Collections to export (default: all search collections)",
+    )
+    parser.add_argument("--db", default=str(DB_DIR), help="Database directory")
+
+    args = parser.parse_args()
+
+    for name in args.collections or list(SEARCH_COLLECTIONS):
+        try:
+            count = export_collection(args.db, name)
+        except Exception as e:
+            print(f"❌ Failed to export '{name}': {e}")
+            sys.exit(1)
+        log_info(f"Exported {count} vectors from '{name}' to memmap", "export")
+        print(f"✅ Exported {count} vectors from '{name}'")
+
+
+if __name__ == "__main__":
+    main()
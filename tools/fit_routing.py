@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Fit query routing stats from evaluation reports.
+Groups every answered question by route (query type and language) and model,
+and records pass rate, latency and answer length per group. The chatbot API
+loads the result at startup to pick the fastest model that keeps quality for
+each route and a ``max_tokens`` budget that fits its answers.
+"""
+
+import re
+import sys
+import json
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.logging_config import log_info
+from core.utils import find_test_reports, safe_json_load
+from core.constants import ROUTING_STATS_FILE, ROUTING_MIN_SAMPLES
+from services.routing_service import fit_routes, save_routing_stats
+
+
+def report_model(path: Path, report: dict) -> str:
+    """
+    Model a report evaluated.
+
+    Reports from ``tools/run_evaluation.py`` name it in their summary; older
+    ones only in the file name, e.g. ``llama3.1_latest(99%)_banglarag_...``.
+    (Their per-answer ``model_used`` shows whichever model was active, not
+    necessarily the one evaluated.)
+    """
+    model = report.get("test_summary", {}).get("model")
+    if model:
+        return model
+
+    slug = path.name.split("banglarag_test_report")[0]
+    slug = re.sub(r"\(\d+%\)", "", slug).strip("_")
+    model = re.sub(r"_(latest|\d+(\.\d+)?b)$", r":\1", slug)
+    # Ollama names an untagged model ``:latest``
+    return model if ":" in model else f"{model}:latest"
+
+
+def load_samples(report_paths: list) -> list:
+    """One routing sample per answered question across the reports."""
+    samples = []
+    for path in report_paths:
+        report = safe_json_load(path)
+        if not report:
+            continue
+        model = report_model(Path(path), report)
+        for entry in report.get("detailed_results", []):
+            if entry.get("test_id", "").startswith("negative"):
+                continue  # Refusals say nothing about answer quality or length
+            if entry.get("equivalent") is None:
+                continue  # Ungraded (run_evaluation.py without --grade)
+            samples.append(
+                {
+                    "model": model,
+                    "question": entry.get("question", ""),
+                    "language": entry.get("language", "english"),
+                    "passed": bool(entry.get("success") and entry.get("equivalent")),
+                    "latency": float(entry.get("response_time") or 0),
+                    "answer": entry.get("actual_answer") or "",
+                }
+            )
+    return samples
+
+
+def print_routes(stats: dict) -> None:
+    """One line per route and model."""
+    print(
+        f"\n   {'route':<22} {'model':<16} {'n':>4} {'pass%':>6} "
+        f"{'p50_s':>6} {'p90_s':>6} {'tok_p90':>7}"
+    )
+    for route, models in stats["routes"].items():
+        for model, s in models.items():
+            tokens = s["answer_tokens_p90"]
+            mark = "" if s["trusted"] else "  (too few)"
+            print(
+                f"   {route:<22} {model[:16]:<16} {s['samples']:>4} "
+                f"{s['pass_rate'] * 100:>6.1f} {s['latency_p50']:>6.2f} "
+                f"{s['latency_p90']:>6.2f} {tokens if tokens else '-':>7}{mark}"
+            )
+
+
+def main():
+    """Main function to fit routing stats from test reports."""
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Fit per-route model and budget stats from test reports"
+    )
+    parser.add_argument(
+        "reports", nargs="*", help="Test report JSON files (default: bundled reports)"
+    )
+    parser.add_argument(
+        "--min-samples",
+        type=int,
+        default=ROUTING_MIN_SAMPLES,
+        help="Answers a route needs before its stats are used",
+    )
+    parser.add_argument(
+        "--stats", default=str(ROUTING_STATS_FILE), help="Routing stats file"
+    )
+    parser.add_argument(
+        "--dry-run", action="store_true", help="Print routes without saving"
+    )
+    parser.add_argument("--output", help="Also write the fitted stats as JSON")
+
+    args = parser.parse_args()
+
+    report_paths = args.reports or find_test_reports()
+    samples = load_samples(report_paths)
+    if not samples:
+        print("❌ Error: No test report entries found")
+        sys.exit(1)
+
+    models = sorted({s["model"] for s in samples})
+    print(
+        f"📄 Loaded {len(samples)} answers from {len(report_paths)} reports "
+        f"({', '.join(models)})"
+    )
+
+    stats = fit_routes(samples, min_samples=args.min_samples)
+    print_routes(stats)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(stats, f, indent=2, ensure_ascii=False)
+        print(f"\n✅ Stats written to {args.output}")
+
+    if not args.dry_run:
+        if save_routing_stats(stats, args.stats):
+            log_info(f"Routing stats saved to {args.stats}", "routing")
+            print(f"\n✅ Routing stats saved to {args.stats}")
+        else:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
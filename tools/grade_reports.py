@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+Grade test report answers with the embedding grader.
+Scores every ``actual_answer`` against its ``expected_answer`` in batched
+embedding calls and compares the verdicts with the LLM judge labels already in
+the reports. With ``--calibrate`` it fits the grader's HIGH-confidence
+thresholds from those labels and writes them for evaluation runs to load.
+"""
+
+import sys
+import json
+import time
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.logging_config import log_info
+from core.utils import find_test_reports, safe_json_load
+from core.constants import (
+    GRADING_THRESHOLDS_FILE,
+    GRADING_TERM_WEIGHT,
+    GRADING_MAX_FALSE_PASS,
+    GRADING_MAX_FALSE_FAIL,
+)
+from services.grading_service import (
+    AnswerGrader,
+    calibrate_grader,
+    make_llm_judge,
+    save_grading_thresholds,
+)
+
+JUDGE_FAILURE = "Failed to get evaluation from judge model"
+
+
+def load_judged_entries(report_paths: list) -> list:
+    """All answers from the reports, tagged with their report's model."""
+    entries = []
+    for path in report_paths:
+        report = safe_json_load(path)
+        if not report:
+            continue
+        for entry in report.get("detailed_results", []):
+            entries.append({**entry, "report": Path(path).name})
+    return entries
+
+
+def is_trusted_label(entry: dict) -> bool:
+    """Judge labels usable for calibration: graded, answered, judge succeeded."""
+    return (
+        entry.get("equivalent") is not None
+        and entry.get("success")
+        and entry.get("explanation") != JUDGE_FAILURE
+    )
+
+
+def print_calibration(calibration: dict) -> None:
+    """Print thresholds and how the grader bands the judged answers."""
+    print("\n📊 Calibrated thresholds:")
+    print(f"   Pass above:    {calibration['accept_above']:.4f}")
+    print(f"   Fail below:    {calibration['reject_below']:.4f}")
+
+    print("\n🧮 Bands on the judged answers:")
+    print(f"   {'band':<11}{'equivalent':>11}{'wrong':>7}")
+    for band, counts in calibration["bands"].items():
+        print(f"   {band:<11}{counts['equivalent']:>11}{counts['not_equivalent']:>7}")
+
+    print(
+        f"\n💡 Judge calls saved: {calibration['judge_calls_saved']}/"
+        f"{calibration['samples']} (agreement with judge "
+        f"{calibration['agreement'] * 100:.1f}%)"
+    )
+
+
+def main():
+    """Main function to grade or calibrate from test reports."""
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Grade test report answers and calibrate the grader"
+    )
+    parser.add_argument(
+        "reports", nargs="*", help="Test report JSON files (default: bundled reports)"
+    )
+    parser.add_argument(
+        "--calibrate", action="store_true", help="Fit thresholds from judge labels"
+    )
+    parser.add_argument("--term-weight", type=float, default=GRADING_TERM_WEIGHT)
+    parser.add_argument("--max-false-pass", type=float, default=GRADING_MAX_FALSE_PASS)
+    parser.add_argument("--max-false-fail", type=float, default=GRADING_MAX_FALSE_FAIL)
+    parser.add_argument(
+        "--thresholds", default=str(GRADING_THRESHOLDS_FILE), help="Thresholds file"
+    )
+    parser.add_argument(
+        "--dry-run", action="store_true", help="Print thresholds without saving"
+    )
+    parser.add_argument(
+        "--judge-model", help="Escalate borderline answers to this LLM judge"
+    )
+    parser.add_argument("--output", help="Write per-answer grades as JSON")
+
+    args = parser.parse_args()
+
+    report_paths = args.reports or find_test_reports()
+    entries = load_judged_entries(report_paths)
+    if not entries:
+        print("❌ Error: No test report entries found")
+        sys.exit(1)
+
+    print(f"📄 Loaded {len(entries)} answers from {len(report_paths)} reports")
+
+    if args.calibrate:
+        grader = AnswerGrader(term_weight=args.term_weight)
+        trusted = [entry for entry in entries if is_trusted_label(entry)]
+
+        start = time.perf_counter()
+        scores = grader.score_batch(
+            [(e.get("expected_answer", ""), e["actual_answer"]) for e in trusted]
+        )
+        print(
+            f"⏱️  Scored {len(trusted)} answers in {time.perf_counter() - start:.1f}s"
+        )
+
+        try:
+            calibration = calibrate_grader(
+                [(s["score"], e["equivalent"]) for s, e in zip(scores, trusted)],
+                max_false_pass=args.max_false_pass,
+                max_false_fail=args.max_false_fail,
+                term_weight=args.term_weight,
+            )
+        except ValueError as e:
+            print(f"❌ Error: {e}")
+            sys.exit(1)
+
+        print_calibration(calibration)
+
+        if not args.dry_run:
+            if save_grading_thresholds(calibration, args.thresholds):
+                log_info(f"Grading thresholds saved to {args.thresholds}", "grading")
+                print(f"\n✅ Thresholds saved to {args.thresholds}")
+            else:
+                sys.exit(1)
+        return
+
+    judge = make_llm_judge(args.judge_model) if args.judge_model else None
+    grader = AnswerGrader.from_file(args.thresholds, judge=judge)
+
+    start = time.perf_counter()
+    grades = grader.grade_batch(entries)
+    elapsed = time.perf_counter() - start
+
+    labelled = [
+        (grade, entry)
+        for grade, entry in zip(grades, entries)
+        if entry.get("equivalent") is not None
+    ]
+    agree = sum(1 for g, e in labelled if g["equivalent"] == e["equivalent"])
+    stats = grader.get_stats()
+
+    print(f"⏱️  Graded {len(entries)} answers in {elapsed:.1f}s")
+    print(f"   HIGH confidence: {stats['high']}, borderline: {stats['borderline']}")
+    print(f"   Sent to the judge: {stats['escalated']}")
+    if labelled:
+        print(
+            f"   Agreement with report labels: {agree}/{len(labelled)} "
+            f"({agree / len(labelled) * 100:.1f}%)"
+        )
+
+    if args.output:
+        rows = [
+            {"report": e["report"], "test_id": e.get("test_id"), **g}
+            for g, e in zip(grades, entries)
+        ]
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(rows, f, indent=2, ensure_ascii=False)
+        print(f"\n✅ Grades saved to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
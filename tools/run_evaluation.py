@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+"""
+Run the evaluation question set against one or more Ollama models.
+Replays the questions of the bundled test reports through the chat API's
+retrieval (``search_dual_databases``) and ``RAGQueryProcessor`` with several
+questions in flight per model, checkpointing every answer so an interrupted
+run resumes where it stopped. Writes one report per model in the bundled
+schema, extended with per-stage timings and p50/p95 latency.
+"""
+
+import sys
+import json
+import time
+from datetime import datetime
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.logging_config import log_info
+from core.utils import load_test_report_entries
+from core.constants import (
+    DB_DIR,
+    TEMP_DIR,
+    TEST_REPORTS_DIR,
+    EVAL_CONCURRENCY,
+    PREFERRED_LLM_MODEL,
+    PRIORITY_BATCH,
+)
+from services.llm_service import get_rag_processor
+from services.relevance_service import GateDecision
+from services.retrieval_service import FederatedRetriever
+from services.evaluation_service import EvaluationRunner, EvaluationCheckpoint
+from services.grading_service import AnswerGrader, make_llm_judge
+import web.chatbot_api as api
+
+CHECKPOINT_FILE = TEMP_DIR / "evaluation_checkpoint.jsonl"
+
+
+def make_answer(rag_processor, k: int, gate: bool):
+    """Answer function for the runner: the /api/chat path, timed per stage."""
+
+    def answer(question: str, model: str) -> dict:
+        timings = {}
+        start = time.perf_counter()
+        if gate and not api.is_query_relevant_to_algorithms(question):
+            timings["gate"] = time.perf_counter() - start
+            return {"answer": "", "success": False, "stage_timings": timings}
+
+        documents = api.search_dual_databases(question, k=k)
+        timings["retrieval"] = time.perf_counter() - start
+        if not documents:
+            return {"answer": "", "success": False, "stage_timings": timings}
+
+        if gate:
+            decision = api.check_context_relevance(question, documents)
+            if decision != GateDecision.ANSWER:
+                answer_text = (
+                    api.CLARIFY_MESSAGE
+                    if decision == GateDecision.CLARIFY
+                    else api.OFF_TOPIC_MESSAGE
+                )
+                return {
+                    "answer": answer_text,
+                    "success": True,
+                    "sources_found": 0,
+                    "stage_timings": timings,
+                }
+
+        start = time.perf_counter()
+        result = rag_processor.process_rag_query(
+            question,
+            documents,
+            model_name=model,
+            use_cache=False,
+            fallback=False,
+            priority=PRIORITY_BATCH,
+        )
+        timings["generation"] = time.perf_counter() - start
+
+        return {
+            "answer": result.get("response", ""),
+            "success": result.get("success", False),
+            "error": result.get("error"),
+            "sources_found": len(documents),
+            "source_pages": [
+                doc.metadata.get("page_number", doc.metadata.get("page", 0) + 1)
+                for doc in documents
+            ],
+            "stage_timings": timings,
+        }
+
+    return answer
+
+
+def report_path(output_dir: Path, model: str, stamp: str) -> Path:
+    """File name in the bundled ``<model>_banglarag_test_report_<time>.json`` form."""
+    slug = model.replace(":", "_").replace("/", "_")
+    return output_dir / f"{slug}_banglarag_test_report_{stamp}.json"
+
+
+def print_comparison(reports: dict) -> None:
+    """One line per model: pass rate, latency and stage percentiles."""
+    print(
+        f"\n   {'model':<22} {'pass%':>6} {'graded':>6} {'p50_s':>7} {'p95_s':>7} "
+        f"{'retr_p50':>8} {'gen_p50':>8} {'wall_s':>7}"
+    )
+    for model, report in reports.items():
+        s = report["test_summary"]
+        stages = s["stage_timings"]
+
+        def stage_p50(name):
+            value = stages.get(name, {}).get("p50")
+            return "-" if value is None else f"{value:.2f}"
+
+        print(
+            f"   {model[:22]:<22} {s['pass_rate']:>6.1f} {s['graded']:>6} "
+            f"{s['latency']['p50'] or 0:>7.2f} {s['latency']['p95'] or 0:>7.2f} "
+            f"{stage_p50('retrieval'):>8} {stage_p50('generation'):>8} "
+            f"{s['wall_time']:>7.1f}"
+        )
+
+
+def main():
+    """Main function to run the evaluation."""
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Evaluate one or more models on the test report question set"
+    )
+    parser.add_argument(
+        "--models", nargs="+", default=[PREFERRED_LLM_MODEL], help="Ollama models"
+    )
+    parser.add_argument(
+        "--questions",
+        nargs="*",
+        help="Reports to take questions from (default: the bundled reports)",
+    )
+    parser.add_argument("--only", help="Only test ids starting with this prefix")
+    parser.add_argument("--limit", type=int, help="Evaluate the first N questions")
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=EVAL_CONCURRENCY,
+        help="Questions in flight per model",
+    )
+    parser.add_argument(
+        "--parallel-models",
+        action="store_true",
+        help="Run all models at once instead of one after another",
+    )
+    parser.add_argument("--k", type=int, default=3, help="Documents per question")
+    parser.add_argument(
+        "--gate",
+        action="store_true",
+        help="Apply the chat endpoint's keyword check and relevance gate",
+    )
+    parser.add_argument(
+        "--grade",
+        action="store_true",
+        help="Grade answers with the calibrated embedding grader",
+    )
+    parser.add_argument(
+        "--judge-model", help="Escalate borderline grades to this LLM judge"
+    )
+    parser.add_argument("--checkpoint", default=str(CHECKPOINT_FILE))
+    parser.add_argument(
+        "--fresh", action="store_true", help="Ignore an existing checkpoint"
+    )
+    parser.add_argument("--output-dir", default=str(TEST_REPORTS_DIR))
+
+    args = parser.parse_args()
+
+    entries = load_test_report_entries(args.questions or None)
+    if args.only:
+        entries = [e for e in entries if e["test_id"].startswith(args.only)]
+    if args.limit:
+        entries = entries[: args.limit]
+    if not entries:
+        print("❌ No questions found")
+        sys.exit(1)
+
+    checkpoint = EvaluationCheckpoint(args.checkpoint)
+    if args.fresh and checkpoint.path.exists():
+        checkpoint.path.unlink()
+
+    # Only what the chat path needs; no job queue or cache warm-up
+    api.retriever = FederatedRetriever.from_config(persist_directory=str(DB_DIR))
+
+    def progress(result: dict, finished: int, total: int) -> None:
+        if finished % 10 == 0 or finished == total:
+            print(
+                f"   {result['model_used']}: {finished}/{total} "
+                f"(last {result['response_time']:.1f}s)"
+            )
+
+    grader = None
+    if args.grade:
+        judge = make_llm_judge(args.judge_model) if args.judge_model else None
+        grader = AnswerGrader.from_file(judge=judge)
+
+    runner = EvaluationRunner(
+        make_answer(get_rag_processor(), args.k, args.gate),
+        args.models,
+        concurrency=args.concurrency,
+        checkpoint=checkpoint,
+        grade=grader.grade if grader else None,
+        parallel_models=args.parallel_models,
+        on_result=progress,
+    )
+
+    print(
+        f"🧪 {len(entries)} questions × {len(args.models)} model(s), "
+        f"{args.concurrency} in flight per model"
+    )
+    reports = runner.run(entries)
+
+    output_dir = Path(args.output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    stamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    for model, report in reports.items():
+        path = report_path(output_dir, model, stamp)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        log_info(f"Evaluation report for {model} saved to {path}", "evaluation")
+        print(f"✅ {model}: {path}")
+
+    print_comparison(reports)
+    if grader:
+        stats = grader.get_stats()
+        print(
+            f"\n⚖️  Graded {stats['graded']} answers, {stats['borderline']} borderline, "
+            f"{stats['escalated']} sent to the judge"
+        )
+
+    # Every answer is in a report now; a later run starts from scratch
+    checkpoint.path.unlink(missing_ok=True)
+
+
+if __name__ == "__main__":
+    main()
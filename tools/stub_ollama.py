@@ -0,0 +1,324 @@
+#!/usr/bin/env python3
+"""
+Minimal stand-in for an Ollama server, for latency and failure drills.
+Serves ``/api/tags``, ``/api/ps``, ``/api/show``, ``/api/embed`` and
+``/api/generate`` (streamed or not) with a configurable delay before the first
+token, a per-token delay, random stalls, cold loads, and models that fail
+with HTTP 500 or hang until the client gives up. A request without a prompt
+only loads the model, as in Ollama. Prompt evaluation is charged per
+character not shared with the model's previous prompt, like Ollama's prompt
+cache, and reported in the response timings.
+Usable from the command line or imported by the tests and check tools.
+"""
+
+import sys
+import os
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Optional, List, Dict, Any
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.constants import PREFERRED_LLM_MODEL, FALLBACK_LLM_MODELS
+
+
+class StubOllama:
+    """
+    Fake Ollama server on a background thread.
+
+    ``delays`` overrides the time to first token per model; models in
+    ``failing`` answer 500 and those in ``hanging`` never answer. A
+    ``stall_rate`` share of requests waits ``stall`` extra seconds before the
+    first token, like a busy GPU. Models not in ``loaded`` (default: all
+    of them) pay ``cold_load`` seconds on their first request; ``evict``
+    unloads one, as Ollama does when its keep-alive runs out. Generation
+    requests are counted per model in ``calls``, load-only and embedding
+    requests in ``loads``, and the last ``keep_alive`` asked for per model is
+    kept in ``keep_alive``. ``prompt_delay`` is the time to evaluate 1000
+    prompt characters; only those after the prefix shared with the model's
+    previous prompt (``prompts``) are evaluated. Models in ``no_system`` have
+    a template without a system prompt.
+    """
+
+    def __init__(
+        self,
+        port: int = 0,
+        models: Optional[List[str]] = None,
+        delay: float = 0.2,
+        token_delay: float = 0.01,
+        tokens: int = 20,
+        delays: Optional[Dict[str, float]] = None,
+        failing: Optional[List[str]] = None,
+        hanging: Optional[List[str]] = None,
+        stall_rate: float = 0.0,
+        stall: float = 0.0,
+        seed: Optional[int] = None,
+        loaded: Optional[List[str]] = None,
+        cold_load: float = 0.0,
+        prompt_delay: float = 0.0,
+        no_system: Optional[List[str]] = None,
+    ):
+        self.port = port
+        self.models = models or [PREFERRED_LLM_MODEL] + FALLBACK_LLM_MODELS
+        self.delay = delay
+        self.token_delay = token_delay
+        self.tokens = tokens
+        self.delays = dict(delays or {})
+        self.failing = set(failing or [])
+        self.hanging = set(hanging or [])
+        self.stall_rate = stall_rate
+        self.stall = stall
+        self._random = random.Random(seed)
+        self.loaded = set(self.models if loaded is None else loaded)
+        self.cold_load = cold_load
+        self.calls: Dict[str, int] = {}
+        self.loads: Dict[str, int] = {}
+        self.keep_alive: Dict[str, Any] = {}
+        self.prompt_delay = prompt_delay
+        self.no_system = set(no_system or [])
+        self.prompts: Dict[str, str] = {}
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._server: Optional[ThreadingHTTPServer] = None
+
+    @property
+    def url(self) -> str:
+        """Base URL to point ``OllamaModel`` at."""
+        return f"http://127.0.0.1:{self._server.server_address[1]}"
+
+    def start(self) -> str:
+        """Start serving; returns the base URL."""
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, format, *args):
+                pass  # Keep drills quiet
+
+            def _send_json(self, status: int, body: Dict[str, Any]) -> None:
+                data = json.dumps(body).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_GET(self):
+                if self.path == "/api/tags":
+                    self._send_json(
+                        200, {"models": [{"name": name} for name in stub.models]}
+                    )
+                elif self.path == "/api/ps":
+                    with stub._lock:
+                        loaded = sorted(stub.loaded)
+                    self._send_json(200, {"models": [{"name": n} for n in loaded]})
+                else:
+                    self._send_json(404, {"error": "not found"})
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length", 0))
+                payload = json.loads(self.rfile.read(length) or b"{}")
+                if self.path == "/api/show":
+                    name = payload.get("name")
+                    template = "{{ .Prompt }}"
+                    if name not in stub.no_system:
+                        template = "{{ if .System }}{{ .System }}{{ end }}" + template
+                    self._send_json(200, {"name": name, "template": template})
+                elif self.path == "/api/generate" and payload.get("prompt"):
+                    stub._generate(self, payload)
+                elif self.path in ("/api/generate", "/api/embed"):
+                    stub._load(self, payload)
+                else:
+                    self._send_json(404, {"error": "not found"})
+
+        self._stopped.clear()
+        self._server = ThreadingHTTPServer(("127.0.0.1", self.port), Handler)
+        self._server.daemon_threads = True
+        threading.Thread(
+            target=self._server.serve_forever, name="stub-ollama", daemon=True
+        ).start()
+        return self.url
+
+    def stop(self) -> None:
+        """Stop serving and release hanging requests."""
+        self._stopped.set()
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+
+    def evict(self, model: str) -> None:
+        """Unload ``model``; its next request pays ``cold_load`` again."""
+        with self._lock:
+            self.loaded.discard(model)
+
+    def _load(self, handler: BaseHTTPRequestHandler, payload: Dict[str, Any]):
+        """Load a model without generating (empty prompt, or an embedding)."""
+        model = payload.get("model", "")
+        if model not in self.models:
+            handler._send_json(404, {"error": f"model '{model}' not found"})
+            return
+
+        with self._lock:
+            self.loads[model] = self.loads.get(model, 0) + 1
+            if "keep_alive" in payload:
+                self.keep_alive[model] = payload["keep_alive"]
+            cold = model not in self.loaded
+
+        if self._stopped.wait(self.cold_load if cold else 0):
+            return
+        with self._lock:
+            self.loaded.add(model)
+        if handler.path == "/api/embed":
+            handler._send_json(200, {"model": model, "embeddings": []})
+        else:
+            handler._send_json(
+                200,
+                {"model": model, "response": "", "done": True, "done_reason": "load"},
+            )
+
+    def _generate(self, handler: BaseHTTPRequestHandler, payload: Dict[str, Any]):
+        """Answer one ``/api/generate`` request according to the model's role."""
+        model = payload.get("model", "")
+        with self._lock:
+            self.calls[model] = self.calls.get(model, 0) + 1
+            if "keep_alive" in payload:
+                self.keep_alive[model] = payload["keep_alive"]
+            stalled = self._random.random() < self.stall_rate
+            cold = model in self.models and model not in self.loaded
+            self.loaded.add(model)
+            # Only the part after the previous prompt's prefix is evaluated
+            prompt = payload.get("system", "") + payload.get("prompt", "")
+            previous = self.prompts.get(model, "")
+            evaluated = len(prompt) - len(os.path.commonprefix([previous, prompt]))
+            self.prompts[model] = prompt
+
+        if model not in self.models:
+            handler._send_json(404, {"error": f"model '{model}' not found"})
+            return
+        if model in self.failing:
+            handler._send_json(500, {"error": "stub failure"})
+            return
+        if model in self.hanging:
+            self._stopped.wait()  # Until the drill ends; the client times out
+            return
+
+        limit = payload.get("options", {}).get("num_predict") or self.tokens
+        count = min(self.tokens, limit)
+        delay = self.delays.get(model, self.delay) + (self.stall if stalled else 0)
+        delay += self.cold_load if cold else 0
+        prompt_eval = self.prompt_delay * evaluated / 1000
+        timings = {
+            "prompt_eval_count": max(evaluated // 4, 1),
+            "prompt_eval_duration": int(prompt_eval * 1e9),
+            "eval_count": count,
+        }
+        if self._stopped.wait(delay + prompt_eval):
+            return
+
+        try:
+            if not payload.get("stream", True):
+                time.sleep(self.token_delay * count)
+                handler._send_json(
+                    200,
+                    {
+                        "model": model,
+                        "response": " ".join(f"tok{i}" for i in range(count)),
+                        "done": True,
+                        **timings,
+                    },
+                )
+                return
+
+            handler.send_response(200)
+            handler.send_header("Content-Type", "application/x-ndjson")
+            handler.end_headers()
+            for i in range(count):
+                chunk = {"model": model, "response": f"tok{i} ", "done": False}
+                handler.wfile.write((json.dumps(chunk) + "\n").encode("utf-8"))
+                handler.wfile.flush()
+                time.sleep(self.token_delay)
+            done = {"model": model, "response": "", "done": True, **timings}
+            handler.wfile.write((json.dumps(done) + "\n").encode("utf-8"))
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # Client closed the stream early
+        handler.close_connection = True
+
+
+def main():
+    """Main function to run a stub Ollama server."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Run a fake Ollama server")
+    parser.add_argument("--port", type=int, default=11435)
+    parser.add_argument("--models", nargs="+", help="Models to advertise")
+    parser.add_argument(
+        "--delay", type=float, default=0.2, help="Seconds before the first token"
+    )
+    parser.add_argument("--token-delay", type=float, default=0.01)
+    parser.add_argument("--tokens", type=int, default=20)
+    parser.add_argument(
+        "--slow",
+        nargs="*",
+        default=[],
+        metavar="MODEL=SECONDS",
+        help="Per-model delay before the first token",
+    )
+    parser.add_argument("--fail", nargs="*", default=[], help="Models that return 500")
+    parser.add_argument(
+        "--hang", nargs="*", default=[], help="Models that never answer"
+    )
+    parser.add_argument(
+        "--stall-rate", type=float, default=0.0, help="Share of requests that stall"
+    )
+    parser.add_argument(
+        "--stall", type=float, default=3.0, help="Extra seconds a stalled request waits"
+    )
+    parser.add_argument(
+        "--loaded", nargs="*", help="Models already loaded (default: all)"
+    )
+    parser.add_argument(
+        "--cold-load", type=float, default=0.0, help="Seconds to load a cold model"
+    )
+    parser.add_argument(
+        "--prompt-delay",
+        type=float,
+        default=0.0,
+        help="Seconds to evaluate 1000 uncached prompt characters",
+    )
+
+    args = parser.parse_args()
+
+    delays = {}
+    for item in args.slow:
+        name, _, seconds = item.rpartition("=")
+        delays[name] = float(seconds)
+
+    stub = StubOllama(
+        port=args.port,
+        models=args.models,
+        delay=args.delay,
+        token_delay=args.token_delay,
+        tokens=args.tokens,
+        delays=delays,
+        failing=args.fail,
+        hanging=args.hang,
+        stall_rate=args.stall_rate,
+        stall=args.stall,
+        loaded=args.loaded,
+        cold_load=args.cold_load,
+        prompt_delay=args.prompt_delay,
+    )
+    print(f"🧪 Stub Ollama serving {len(stub.models)} models at {stub.start()}")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        stub.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -12,6 +12,7 @@ class BanglaRAGChatbot {
       botName: config.botName || "Course Assistant",
       botAvatar: config.botAvatar || "🤖",
       userAvatar: config.userAvatar || "👤",
+      streamFlushMs: config.streamFlushMs ?? 50, // 0 = one frame per token
       welcomeMessage:
         config.welcomeMessage ||
         "Hi! I'm your course assistant. Ask me anything about the course materials!",
@@ -388,6 +389,11 @@ class BanglaRAGChatbot {
         query,
         k: 3,
         language: this.currentLanguage, // Send selected language
+        // Server batches tokens into one frame per interval; each "token"
+        // frame may carry several tokens and is appended exactly as before
+        stream_options: {
+          flush_ms: this.config.streamFlushMs,
+        },
       }),
     });
 
@@ -20,14 +20,46 @@ from flask import (
 )
 from flask_cors import CORS
 import json
+import math
 import time
-from typing import Generator, Dict, Any
+from typing import Generator, Dict, Any, List, Optional, Callable
 import os
 
-from core.logging_config import BanglaRAGLogger, log_info, log_error
+from core.logging_config import (
+    BanglaRAGLogger,
+    log_info,
+    log_error,
+    log_debug,
+    debug_enabled,
+)
+from core.utils import SSEWriter, Deadline
 from services.database_service import get_database_manager
-from services.llm_service import get_model_manager, get_rag_processor
+from services.llm_service import QueryType, get_model_manager, get_rag_processor
 from services.embedding_service import get_embedding_factory
+from services.relevance_service import (
+    GateDecision,
+    gate_language,
+    get_relevance_gate,
+    retrieval_scores,
+)
+from services.retrieval_service import FederatedRetriever
+from services.question_service import QuestionGenerator
+from services.course_index_service import load_module_index
+from services.job_service import JobStatus, TERMINAL_STATUSES, get_job_queue
+from services.admission_service import Ticket, get_admission_controller
+from services.warmup_service import CacheWarmer, get_query_log
+from core.exceptions import JobException, OverloadedException
+from core.constants import (
+    COURSE_COLLECTION,
+    DB_DIR,
+    AQG_CHUNKS_PER_QUESTION,
+    PRIORITY_BATCH,
+    PRIORITY_MAINTENANCE,
+    ADMISSION_LANES,
+    JOB_POLL_INTERVAL,
+    ADMISSION_STATUS_INTERVAL,
+    WARMUP_ENABLED,
+)
 
 app = Flask(__name__)
 CORS(app)  # Enable CORS for cross-origin requests
@@ -35,19 +67,28 @@ CORS(app)  # Enable CORS for cross-origin requests
 logger = BanglaRAGLogger()
 
 # Initialize services
-db_manager = None
-db_manager_pdf = None  # Second database for PDF book
+db_manager = None  # Primary collection (algorithm book)
+retriever = None  # Fan-out search over all configured collections
 model_manager = None
 rag_processor = None
+question_generator = None
+module_index = None  # Module -> chunk ids of the course collection
+job_queue = None  # Background AQG and ingestion jobs
+admission = None  # Sheds chat/AQG requests that cannot finish before their deadline
+query_log = None  # Answered questions, replayed by the cache warmer
+cache_warmer = None  # Fills the caches with likely questions after a restart
+
+OFF_TOPIC_MESSAGE = "I found some content in the textbook, but it doesn't appear to be directly relevant to your question. The 'Introduction to Algorithms' textbook focuses on algorithms, data structures, and computational complexity. Please rephrase your question to focus on these topics."
+CLARIFY_MESSAGE = "Your question matches several different parts of the textbook. Could you be more specific, for example by naming the algorithm or data structure you mean?"
 
 
 def initialize_services():
-    """Initialize BanglaRAG services with PDF database ONLY."""
-    global db_manager, db_manager_pdf, model_manager, rag_processor
+    """Initialize BanglaRAG services over all configured collections."""
+    global db_manager, retriever, model_manager, rag_processor, question_generator
+    global module_index, job_queue, admission, query_log, cache_warmer
 
     try:
         log_info("Initializing chatbot API services...", "api")
-        from services.database_service import DatabaseFactory
         import os
 
         # Get absolute path to database directory
@@ -59,28 +100,50 @@ def initialize_services():
 
         log_info(f"📂 Database path: {db_path}", "api")
 
-        # ONLY use PDF book (Cormen algorithms) - banglarag collection
+        # Algorithm book (banglarag) first, then course materials
         try:
-            db_manager = DatabaseFactory.create_chroma_database(
-                persist_directory=db_path,  # Use absolute path
-                collection_name="banglarag",  # The collection name
+            retriever = FederatedRetriever.from_config(persist_directory=db_path)
+            db_manager = retriever.primary
+            log_info(
+                f"✅ Loaded collections: {[s.name for s in retriever.sources]}", "api"
             )
-            log_info("✅ PDF database (algorithm book) loaded successfully", "api")
-            log_info("📚 Using ONLY the algorithm book database", "api")
         except Exception as e:
-            log_error(f"❌ Failed to load PDF database: {e}", "api")
+            log_error(f"❌ Failed to load databases: {e}", "api")
             return False
 
-        # Set db_manager_pdf to None (not used)
-        db_manager_pdf = None
-
         model_manager = get_model_manager()
         rag_processor = get_rag_processor()
+        # Teacher requests run at the aqg lane's priority, below chat, so
+        # their shards leave the reserved model slots to chat
+        question_generator = QuestionGenerator(
+            model_manager, priority=ADMISSION_LANES["aqg"]["priority"]
+        )
 
-        log_info(
-            "Chatbot API services initialized with PDF database ONLY (algorithm book)",
-            "api",
+        course_source = retriever.get_source(COURSE_COLLECTION)
+        module_index = load_module_index(
+            course_source.manager if course_source else None
         )
+
+        admission = get_admission_controller()
+
+        job_queue = get_job_queue()
+        job_queue.register("generate_questions", run_question_job, PRIORITY_BATCH)
+        job_queue.register("ingest_course", run_ingest_job, PRIORITY_MAINTENANCE)
+        job_queue.start()
+
+        # Replay frequent and evaluation questions while nobody is waiting
+        query_log = get_query_log()
+        cache_warmer = CacheWarmer(
+            retriever,
+            rag_processor,
+            query_log,
+            is_relevant=is_query_relevant_to_algorithms,
+            is_busy=lambda: admission.get_stats()["queued"] > 0,
+        )
+        if WARMUP_ENABLED:
+            cache_warmer.start()
+
+        log_info("Chatbot API services initialized", "api")
         return True
     except Exception as e:
         log_error(f"Failed to initialize services: {e}", "api", exc_info=True)
@@ -193,88 +256,91 @@ def is_query_relevant_to_algorithms(query: str) -> bool:
     for keyword in irrelevant_keywords:
         if keyword in query_lower:
             log_info(
-                f"❌ Query rejected - irrelevant topic detected: '{keyword}'", "api"
+                "❌ Query rejected - irrelevant topic detected: '%s'", "api", keyword
             )
             return False
 
     # Check for CS keywords - MUST have at least one to proceed
     for keyword in cs_keywords:
         if keyword in query_lower:
-            log_info(f"✅ Query accepted - CS topic detected: '{keyword}'", "api")
+            log_debug("✅ Query accepted - CS topic detected: '%s'", "api", keyword)
             return True
 
     # If no CS keywords found, reject the query
-    log_info(f"❌ Query rejected - no algorithms/CS keywords found", "api")
+    log_info("❌ Query rejected - no algorithms/CS keywords found", "api")
     return False
 
 
-def check_context_relevance(query: str, documents: list) -> bool:
+def check_context_relevance(query: str, documents: list) -> GateDecision:
     """
     Check if retrieved documents are actually relevant to the query.
-    Returns False if documents seem completely unrelated.
+
+    Uses the calibrated relevance gate on the retrieval scores so off-topic or
+    ambiguous queries are answered without an LLM call.
     """
     if not documents:
-        return False
+        log_info("⚠️ No documents retrieved from database", "api")
+        return GateDecision.REFUSE
 
-    # If we got results from the database, trust them
-    # ChromaDB's similarity search is already doing relevance checking
-    # We just need to make sure we actually got documents back
-    if len(documents) > 0:
-        # Log the first document snippet for debugging
-        if hasattr(documents[0], "page_content"):
-            preview = documents[0].page_content[:100].replace("\n", " ")
-            log_info(
-                f"✅ Context relevance check passed. First doc preview: {preview}...",
-                "api",
-            )
-        return True
+    # Documents come in fused order; the gate expects best score first
+    scores = retrieval_scores(documents)
+    if not scores:
+        # Documents without scores (e.g. from a plain search) pass through
+        return GateDecision.ANSWER
 
-    log_info(f"⚠️ No documents retrieved from database", "api")
-    return False
+    decision = get_relevance_gate().evaluate(scores, gate_language(query))
+
+    if debug_enabled("api") and hasattr(documents[0], "page_content"):
+        log_debug(
+            "Relevance gate: %s (scores: %s). First doc preview: %s...",
+            "api",
+            decision.value,
+            [round(s, 3) for s in scores],
+            documents[0].page_content[:100].replace("\n", " "),
+        )
+    return decision
 
 
 def search_dual_databases(query: str, k: int = 3):
     """
-    Search both course materials and PDF database with smart prioritization.
+    Search every configured collection in parallel and fuse the results.
 
-    ALWAYS prioritizes PDF database (algorithm book) first.
-    Only uses course materials for course-specific questions (syllabus, schedule, etc.)
-    or as fallback if PDF has no results.
+    The algorithm book and the course materials share one query embedding;
+    results are tagged with ``search_source`` and ranked by fused score.
     """
-    global db_manager
+    global retriever
 
-    # Ensure db_manager is initialized
-    if db_manager is None:
-        log_info("⚠️ db_manager is None, initializing services...", "api")
+    # Ensure retriever is initialized
+    if retriever is None:
+        log_info("⚠️ retriever is None, initializing services...", "api")
         initialize_services()
 
     all_results = []
 
-    # Search ONLY the PDF database (algorithm book)
     try:
-        all_results = db_manager.search_with_cache(query, k=k)
-        log_info(
-            f"✅ Found {len(all_results)} results from PDF database (algorithm book)",
-            "api",
-        )
+        all_results = [doc for doc, _ in retriever.search(query, k=k)]
+        if debug_enabled("api"):
+            log_debug(
+                "✅ Found %d results from %s",
+                "api",
+                len(all_results),
+                [doc.metadata.get("search_source") for doc in all_results],
+            )
 
-        # Add source tag to mark as PDF
         for doc in all_results:
-            if hasattr(doc, "metadata"):
-                doc.metadata["search_source"] = "pdf"
-                # Ensure source shows as the algorithm book
-                if (
-                    "source" not in doc.metadata
-                    or "course_knowledge" in doc.metadata.get("source", "").lower()
-                ):
-                    doc.metadata["source"] = "Cormen - Introduction to Algorithms.pdf"
+            # Ensure source shows as the algorithm book
+            if doc.metadata.get("search_source") == "pdf" and (
+                "source" not in doc.metadata
+                or "course_knowledge" in doc.metadata.get("source", "").lower()
+            ):
+                doc.metadata["source"] = "Cormen - Introduction to Algorithms.pdf"
 
     except Exception as e:
-        log_error(f"❌ Error searching PDF database: {e}", "api")
+        log_error(f"❌ Error searching databases: {e}", "api")
         all_results = []
 
     if not all_results:
-        log_info("⚠️ No relevant results found in PDF database", "api")
+        log_info("⚠️ No relevant results found in any collection", "api")
 
     return all_results
 
@@ -311,7 +377,38 @@ def serve_static(filename):
 def health_check():
     """Health check endpoint."""
     return jsonify(
-        {"status": "ok", "service": "BanglaRAG Chatbot API", "version": "2.0.0"}
+        {
+            "status": "ok",
+            "service": "BanglaRAG Chatbot API",
+            "version": "2.0.0",
+            "relevance_gate": get_relevance_gate().get_stats(),
+            "jobs": job_queue.get_stats() if job_queue else None,
+            "admission": admission.get_stats() if admission else None,
+            "cancellation": (
+                model_manager.get_cancellation_stats() if model_manager else None
+            ),
+            "circuit_breakers": (
+                model_manager.get_breaker_stats() if model_manager else None
+            ),
+            "hedging": model_manager.get_hedge_stats() if model_manager else None,
+            "nodes": model_manager.get_node_stats() if model_manager else None,
+            "residency": (
+                model_manager.get_residency_stats() if model_manager else None
+            ),
+            "prompt_cache": (
+                model_manager.get_prompt_cache_stats() if model_manager else None
+            ),
+            "fast_path": (
+                rag_processor.get_fast_path_stats() if rag_processor else None
+            ),
+            "routing": (
+                rag_processor.router.get_stats()
+                if rag_processor and rag_processor.router
+                else None
+            ),
+            "warmup": cache_warmer.get_stats() if cache_warmer else None,
+            "logging": BanglaRAGLogger.get_stats(),
+        }
     )
 
 
@@ -323,7 +420,7 @@ def get_models():
             return jsonify({"error": "Service not initialized"}), 503
 
         models = model_manager.get_available_models()
-        current_model = model_manager._active_model or model_manager.preferred_model
+        current_model = model_manager.get_active_model()
 
         return jsonify(
             {"models": models, "current_model": current_model, "success": True}
@@ -333,6 +430,44 @@ def get_models():
         return jsonify({"error": str(e), "success": False}), 500
 
 
+@app.route("/api/nodes", methods=["GET"])
+def get_nodes():
+    """Get health, load and loaded models per Ollama node."""
+    if not model_manager:
+        return jsonify({"error": "Service not initialized"}), 503
+    return jsonify({"success": True, "nodes": model_manager.get_node_stats()})
+
+
+@app.route("/api/nodes/drain", methods=["POST"])
+def drain_node():
+    """Stop sending new requests to an Ollama node, e.g. before maintenance."""
+    return _set_node_draining(drain=True)
+
+
+@app.route("/api/nodes/restore", methods=["POST"])
+def restore_node():
+    """Put a drained Ollama node back into rotation."""
+    return _set_node_draining(drain=False)
+
+
+def _set_node_draining(drain: bool):
+    """Drain or restore the node whose url is in the request body."""
+    if not model_manager:
+        return jsonify({"error": "Service not initialized", "success": False}), 503
+
+    url = (request.json or {}).get("url")
+    if not url:
+        return jsonify({"error": "Node url required", "success": False}), 400
+
+    changed = (
+        model_manager.drain_node(url) if drain else model_manager.restore_node(url)
+    )
+    if not changed:
+        return jsonify({"error": "Unknown node", "success": False}), 404
+    log_info(f"Ollama node {url} {'draining' if drain else 'restored'}", "api")
+    return jsonify({"success": True, "nodes": model_manager.get_node_stats()})
+
+
 @app.route("/api/set-model", methods=["POST"])
 def set_model():
     """Set the active model."""
@@ -346,19 +481,13 @@ def set_model():
         if not model_manager:
             return jsonify({"error": "Service not initialized", "success": False}), 503
 
-        # Set the active model directly
-        available_models = model_manager.get_available_models()
-        if model_name in available_models:
-            model_manager._active_model = model_name
-            success = True
-        else:
-            success = False
+        # Load the model before switching, so the next user skips the cold load
+        result = model_manager.set_active_model(model_name)
 
         return jsonify(
             {
-                "success": success,
-                "current_model": model_manager._active_model
-                or model_manager.preferred_model,
+                **result,
+                "current_model": model_manager.get_active_model(),
             }
         )
     except Exception as e:
@@ -366,9 +495,121 @@ def set_model():
         return jsonify({"error": str(e), "success": False}), 500
 
 
+def request_deadline(data: Optional[Dict[str, Any]]) -> Optional[float]:
+    """Client time budget in seconds (``X-Request-Timeout`` header or ``timeout``)."""
+    value = request.headers.get("X-Request-Timeout") or (data or {}).get("timeout")
+    try:
+        return float(value) if value else None
+    except (TypeError, ValueError):
+        return None
+
+
+def ticket_deadline(ticket: Ticket) -> Optional[Deadline]:
+    """The admitted request's deadline, for the model calls it makes."""
+    return Deadline(ticket.deadline) if ticket.deadline is not None else None
+
+
+def overloaded_response(error: OverloadedException):
+    """503 with ``Retry-After`` for a shed request."""
+    retry_after = max(1, math.ceil(error.retry_after))
+    response = jsonify(
+        {
+            "success": False,
+            "error": "The assistant is busy right now. Please try again shortly.",
+            "reason": str(error),
+            "retry_after": retry_after,
+        }
+    )
+    response.status_code = 503
+    response.headers["Retry-After"] = str(retry_after)
+    return response
+
+
+def wait_for_admission(
+    ticket: Ticket, frame: Callable[[Dict[str, Any]], str]
+) -> Generator[str, None, None]:
+    """
+    Wait for a pipeline slot inside an SSE stream.
+
+    Yields a "queued, position N" status every ``ADMISSION_STATUS_INTERVAL``
+    seconds until the slot is granted. Raises ``OverloadedException`` if the
+    request can no longer finish before its deadline.
+    """
+    timeout = 0.0
+    while not ticket.wait(timeout=timeout):
+        position = ticket.position()
+        estimate = ticket.estimated_wait()
+        yield frame(
+            {
+                "type": "status",
+                "message": f"Queued, position {position} (about {estimate:.0f}s)...",
+                "queue_position": position,
+                "estimated_wait": round(estimate, 1),
+            }
+        )
+        timeout = ADMISSION_STATUS_INTERVAL
+
+
+def format_sources(documents: List[Any]) -> List[Dict[str, Any]]:
+    """Top three retrieved chunks, shortened, as sent to the widget."""
+    return [
+        {
+            "content": (
+                doc.page_content[:200] + "..."
+                if len(doc.page_content) > 200
+                else doc.page_content
+            ),
+            "metadata": doc.metadata,
+        }
+        for doc in documents[:3]
+    ]
+
+
+def fast_path_response(query: str, k: int):
+    """
+    Extractive answer for a request shed by admission control.
+
+    Retrieval and the relevance gate still run, without a pipeline slot;
+    returns None (so the caller sends 503) if there is no fast path or it
+    finds nothing to say.
+    """
+    if rag_processor is None or rag_processor.fast_path is None:
+        return None
+    try:
+        if not is_query_relevant_to_algorithms(query):
+            return None
+        relevant_docs = search_dual_databases(query, k=k)
+        if not relevant_docs:
+            return None
+        if check_context_relevance(query, relevant_docs) != GateDecision.ANSWER:
+            return None
+        result = rag_processor.answer_extractively(query, relevant_docs, "shed")
+    except Exception as e:
+        log_error(f"Fast path failed: {e}", "api")
+        return None
+    if result is None:
+        return None
+
+    return jsonify(
+        {
+            "response": result["response"],
+            "sources": format_sources(relevant_docs),
+            "model": result["model_used"],
+            "mode": result["mode"],
+            "success": True,
+        }
+    )
+
+
+def sse_frame(payload: Dict[str, Any]) -> str:
+    """Serialize one SSE event."""
+    return f"data: {json.dumps(payload)}\n\n"
+
+
 @app.route("/api/chat", methods=["POST"])
 def chat():
     """Non-streaming chat endpoint."""
+    ticket = None
     try:
         data = request.json
         query = data.get("query", "").strip()
@@ -380,10 +621,8 @@ def chat():
         if not db_manager or not rag_processor:
             return jsonify({"error": "Service not initialized", "success": False}), 503
 
-        # Search for relevant documents from both databases
-        log_info(f"Processing query: {query}", "api")
-
-        # First check if query is even related to algorithms/CS
+        # First check if query is even related to algorithms/CS; this is a
+        # keyword test, so it runs before the request takes an admission slot
         if not is_query_relevant_to_algorithms(query):
             return jsonify(
                 {
@@ -393,6 +632,17 @@ def chat():
                 }
             )
 
+        # Shed the request now rather than time out behind a saturated Ollama
+        try:
+            ticket = admission.admit("chat", request_deadline(data))
+            ticket.wait()
+        except OverloadedException as e:
+            log_info("Chat request shed: %s", "api", e)
+            return fast_path_response(query, k) or overloaded_response(e)
+
+        # Search for relevant documents from both databases
+        log_info("Processing query: %s", "api", query)
+
         relevant_docs = search_dual_databases(query, k=k)
 
         if not relevant_docs:
@@ -405,40 +655,39 @@ def chat():
             )
 
         # Check if retrieved documents are actually relevant
-        if not check_context_relevance(query, relevant_docs):
+        decision = check_context_relevance(query, relevant_docs)
+        if decision == GateDecision.REFUSE:
             return jsonify(
                 {
-                    "response": "I found some content in the textbook, but it doesn't appear to be directly relevant to your question. The 'Introduction to Algorithms' textbook focuses on algorithms, data structures, and computational complexity. Please rephrase your question to focus on these topics.",
+                    "response": OFF_TOPIC_MESSAGE,
+                    "sources": [],
+                    "success": True,
+                }
+            )
+        if decision == GateDecision.CLARIFY:
+            return jsonify(
+                {
+                    "response": CLARIFY_MESSAGE,
                     "sources": [],
                     "success": True,
                 }
             )
 
         # Generate response using RAG
-        rag_result = rag_processor.process_rag_query(query, relevant_docs)
+        rag_result = rag_processor.process_rag_query(
+            query, relevant_docs, deadline=ticket_deadline(ticket)
+        )
 
         if rag_result["success"]:
-            sources = [
-                {
-                    "content": (
-                        doc.page_content[:200] + "..."
-                        if len(doc.page_content) > 200
-                        else doc.page_content
-                    ),
-                    "metadata": doc.metadata,
-                }
-                for doc in relevant_docs[:3]
-            ]
+            query_log.record(query)
+            sources = format_sources(relevant_docs)
 
             return jsonify(
                 {
                     "response": rag_result["response"],
                     "sources": sources,
-                    "model": (
-                        model_manager.get_current_model()
-                        if model_manager
-                        else "unknown"
-                    ),
+                    "model": rag_result.get("model_used") or "unknown",
+                    "mode": rag_result.get("mode", "generated"),
                     "success": True,
                 }
             )
@@ -456,6 +705,9 @@ def chat():
     except Exception as e:
         log_error(f"Chat error: {e}", "api", exc_info=True)
         return jsonify({"error": str(e), "success": False}), 500
+    finally:
+        if ticket:
+            ticket.close()
 
 
 @app.route("/api/chat/stream", methods=["POST"])
@@ -473,119 +725,190 @@ def chat_stream():
         if not db_manager or not model_manager:
             return jsonify({"error": "Service not initialized"}), 503
 
+        # Token batching negotiated with the widget (see SSEWriter)
+        writer = SSEWriter.negotiate(data.get("stream_options"))
+
+        # First check if query is even related to algorithms/CS; this is a
+        # keyword test, so it runs before the request takes an admission slot
+        if not is_query_relevant_to_algorithms(query):
+            error_msg = "I can only help with algorithms and data structures topics from the textbook.\n\nPlease ask about sorting, searching, graphs, dynamic programming, or other CS concepts."
+            return Response(
+                writer.event({"type": "error", "message": error_msg}),
+                mimetype="text/event-stream",
+                headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+            )
+
+        try:
+            ticket = admission.admit("chat", request_deadline(data))
+        except OverloadedException as e:
+            log_info("Chat stream shed: %s", "api", e)
+            return overloaded_response(e)
+
+        def extractive_frames(result: Dict[str, Any]) -> Generator[str, None, None]:
+            """Send an extractive answer as the response."""
+            yield writer.token(result["response"])
+            yield writer.event(
+                {"type": "done", "model": result["model_used"], "mode": result["mode"]}
+            )
+            query_log.record(query)
+
         def generate() -> Generator[str, None, None]:
             """Generate streaming response."""
             try:
-                # Send initial status
-                yield f"data: {json.dumps({'type': 'status', 'message': 'Validating question...'})}\n\n"
-
-                # First check if query is even related to algorithms/CS
-                if not is_query_relevant_to_algorithms(query):
-                    error_msg = "I can only help with algorithms and data structures topics from the textbook.\n\nPlease ask about sorting, searching, graphs, dynamic programming, or other CS concepts."
-                    yield f"data: {json.dumps({'type': 'error', 'message': error_msg})}\n\n"
-                    return
+                # Queued behind other requests: report position until admitted
+                yield from wait_for_admission(ticket, writer.event)
 
                 # Send initial status
-                yield f"data: {json.dumps({'type': 'status', 'message': 'Searching knowledge base...'})}\n\n"
+                yield writer.event(
+                    {"type": "status", "message": "Searching knowledge base..."}
+                )
 
                 # Search for relevant documents from both databases
                 relevant_docs = search_dual_databases(query, k=k)
 
                 if not relevant_docs:
                     error_msg = "I couldn't find relevant information in the algorithms textbook to answer your question. Please make sure your question is about topics covered in 'Introduction to Algorithms' by Cormen et al."
-                    yield f"data: {json.dumps({'type': 'error', 'message': error_msg})}\n\n"
+                    yield writer.event({"type": "error", "message": error_msg})
                     return
 
                 # Check if retrieved documents are actually relevant
-                if not check_context_relevance(query, relevant_docs):
-                    error_msg = "I found some content in the textbook, but it doesn't appear to be directly relevant to your question. The 'Introduction to Algorithms' textbook focuses on algorithms, data structures, and computational complexity. Please rephrase your question to focus on these topics."
-                    yield f"data: {json.dumps({'type': 'error', 'message': error_msg})}\n\n"
+                decision = check_context_relevance(query, relevant_docs)
+                if decision != GateDecision.ANSWER:
+                    error_msg = (
+                        CLARIFY_MESSAGE
+                        if decision == GateDecision.CLARIFY
+                        else OFF_TOPIC_MESSAGE
+                    )
+                    yield writer.event({"type": "error", "message": error_msg})
                     return
 
                 # Send sources
-                sources = [
-                    {
-                        "content": (
-                            doc.page_content[:200] + "..."
-                            if len(doc.page_content) > 200
-                            else doc.page_content
-                        ),
-                        "metadata": doc.metadata,
-                    }
-                    for doc in relevant_docs[:3]
-                ]
-                yield f"data: {json.dumps({'type': 'sources', 'sources': sources})}\n\n"
+                sources = format_sources(relevant_docs)
+                yield writer.event({"type": "sources", "sources": sources})
+
+                # Answer extractively instead when the model can't answer in
+                # time (see RAGQueryProcessor.fast_path_reason)
+                reason = rag_processor.fast_path_reason(query)
+                if reason:
+                    extractive = rag_processor.answer_extractively(
+                        query, relevant_docs, reason
+                    )
+                    if extractive is not None:
+                        yield from extractive_frames(extractive)
+                        return
+
+                # Clients that ask for it get the extractive answer first,
+                # as its own event, while the model's answer is generated
+                if data.get("fast_first") and rag_processor.fast_path is not None:
+                    extractive = rag_processor.answer_extractively(
+                        query, relevant_docs, "fast_first"
+                    )
+                    if extractive is not None:
+                        yield writer.event(
+                            {
+                                "type": "extractive",
+                                "response": extractive["response"],
+                                "citations": extractive["citations"],
+                            }
+                        )
 
                 # Send generation status
-                yield f"data: {json.dumps({'type': 'status', 'message': 'Generating response...'})}\n\n"
-
-                # Build context from relevant documents
-                context = "\n\n".join(
-                    [
-                        f"Document {i+1}:\n{doc.page_content}"
-                        for i, doc in enumerate(relevant_docs)
-                    ]
+                yield writer.event(
+                    {"type": "status", "message": "Generating response..."}
                 )
 
-                # Create prompt with language instruction
-                language_instruction = ""
-                if language == "bangla":
-                    language_instruction = "Please answer in Bengali (বাংলা ভাষায়)."
-                else:
-                    language_instruction = "Please answer in English."
-
-                prompt = f"""Based on the following course materials, answer the question. Be specific and cite the information provided. {language_instruction}
-
-Course Materials:
-{context}
-
-Question: {query}
-
-Answer:"""
-
                 # Stream response from model
-                current_model = (
-                    model_manager._active_model or model_manager.preferred_model
+                current_model = model_manager.get_active_model()
+                max_tokens = 2048
+                route = None
+                if rag_processor.router is not None:
+                    # Model and budget for this kind of question in the
+                    # answer language, at the current load
+                    route = rag_processor.route(query, language=language)
+                    current_model = route["model"] or current_model
+                    max_tokens = route["max_tokens"]
+
+                # Same prompt layout as /api/chat: static instructions first,
+                # then the context in chunk order, then the question
+                prompt = rag_processor.build_prompt(
+                    query,
+                    relevant_docs,
+                    query_type=QueryType(route["query_type"]) if route else None,
+                    language=language,
                 )
 
-                # Use Ollama's streaming API
-                import requests
-
-                response = requests.post(
-                    "http://127.0.0.1:11434/api/generate",
-                    json={
-                        "model": current_model,
-                        "prompt": prompt,
-                        "stream": True,
-                        "options": {"temperature": 0.7, "num_predict": 2048},
-                    },
-                    stream=True,
+                # Stream tokens as they arrive, coalesced into frames. If the
+                # client disconnects, closing this generator closes the model
+                # stream, which aborts the Ollama request and frees its slot.
+                started = time.monotonic()
+                streamed = writer.stats["tokens"]
+                answered: List[str] = []  # The model streaming, after fallbacks
+                tokens = model_manager.stream_response(
+                    prompt["prompt"],
+                    system=prompt["system"],
+                    on_model=answered.append,
+                    model_name=current_model,
+                    max_tokens=max_tokens,
+                    temperature=0.7,
+                    deadline=ticket_deadline(ticket),
                 )
+                try:
+                    yield from writer.stream(tokens)
+                except Exception as e:
+                    if route is not None:
+                        rag_processor.router.record(
+                            route, time.monotonic() - started, False
+                        )
+                    # Nothing streamed yet: answer extractively rather than fail
+                    if writer.stats["tokens"] > streamed or not rag_processor.fast_path:
+                        raise
+                    extractive = rag_processor.answer_extractively(
+                        query, relevant_docs, "llm_failed"
+                    )
+                    if extractive is None:
+                        raise
+                    log_info("Model stream failed, answered extractively: %s", "api", e)
+                    yield from extractive_frames(extractive)
+                    return
+                current_model = answered[-1] if answered else current_model
+                if route is not None:
+                    rag_processor.router.record(
+                        {**route, "model": current_model},
+                        time.monotonic() - started,
+                        True,
+                    )
+                yield writer.event({"type": "done", "model": current_model})
+                query_log.record(query)
 
-                # Stream tokens as they arrive
-                for line in response.iter_lines():
-                    if line:
-                        try:
-                            chunk = json.loads(line)
-                            if "response" in chunk:
-                                token = chunk["response"]
-                                yield f"data: {json.dumps({'type': 'token', 'token': token})}\n\n"
-
-                            if chunk.get("done", False):
-                                yield f"data: {json.dumps({'type': 'done', 'model': current_model})}\n\n"
-                                break
-                        except json.JSONDecodeError:
-                            continue
-
+            except OverloadedException as e:
+                yield writer.event(
+                    {
+                        "type": "error",
+                        "message": "The assistant is busy right now. Please try again shortly.",
+                        "retry_after": max(1, math.ceil(e.retry_after)),
+                    }
+                )
             except Exception as e:
                 log_error(f"Streaming error: {e}", "api", exc_info=True)
-                yield f"data: {json.dumps({'type': 'error', 'message': str(e)})}\n\n"
+                yield writer.event({"type": "error", "message": str(e)})
+            finally:
+                ticket.close()
 
-        return Response(
+        response = Response(
             stream_with_context(generate()),
             mimetype="text/event-stream",
-            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+            headers={
+                "Cache-Control": "no-cache",
+                "X-Accel-Buffering": "no",
+                "X-SSE-Batching": (
+                    f"flush_ms={writer.policy()['flush_ms']}; "
+                    f"flush_bytes={writer.policy()['flush_bytes']}"
+                ),
+            },
         )
+        # Leave the queue even if the client disconnects before the first frame
+        response.call_on_close(ticket.close)
+        return response
 
     except Exception as e:
         log_error(f"Stream setup error: {e}", "api", exc_info=True)
@@ -596,14 +919,14 @@ Answer:"""
 def get_collections():
     """Get available collections."""
     try:
-        if not db_manager:
+        if not retriever:
             return jsonify({"error": "Service not initialized"}), 503
 
-        # For now, return default collection
         return jsonify(
             {
-                "collections": ["course_materials"],
-                "current": "course_materials",
+                "collections": [source.name for source in retriever.sources],
+                "current": retriever.sources[0].name,
+                "stats": retriever.get_stats(),
                 "success": True,
             }
         )
@@ -612,6 +935,28 @@ def get_collections():
         return jsonify({"error": str(e), "success": False}), 500
 
 
+def retrieve_course_chunks(module: str, num_questions: int) -> list:
+    """
+    Retrieve course content chunks to generate questions from.
+
+    Known modules are sampled from the module index across all of their
+    subsections; custom topics fall back to a similarity search.
+    """
+    course_source = retriever.get_source(COURSE_COLLECTION) if retriever else None
+    if module_index and course_source:
+        chunk_ids = module_index.sample(module, num_questions * AQG_CHUNKS_PER_QUESTION)
+        if chunk_ids:
+            return course_source.manager.get_documents(ids=chunk_ids)
+
+    if module == "all":
+        query = "data structures algorithms course content"
+    else:
+        query = f"{module} content topics concepts"
+
+    # Get more context for question generation
+    return db_manager.search_with_cache(query, k=min(num_questions * 2, 10))
+
+
 @app.route("/api/teachers/generate-questions", methods=["POST"])
 def generate_questions():
     """
@@ -625,6 +970,7 @@ def generate_questions():
         "question_types": ["multiple-choice", "true-false", "short-answer", "explain"]
     }
     """
+    ticket = None
     try:
         data = request.json
         module = data.get("module", "all")
@@ -638,16 +984,14 @@ def generate_questions():
             "api",
         )
 
-        # Retrieve relevant course content
-        if module == "all":
-            query = "data structures algorithms course content"
-        else:
-            query = f"{module} content topics concepts"
+        try:
+            ticket = admission.admit("aqg", request_deadline(data))
+            ticket.wait()
+        except OverloadedException as e:
+            log_info("Question generation shed: %s", "api", e)
+            return overloaded_response(e)
 
-        # Get more context for question generation
-        course_chunks = db_manager.search_with_cache(
-            query, k=min(num_questions * 2, 10)
-        )
+        course_chunks = retrieve_course_chunks(module, num_questions)
 
         if not course_chunks:
             return (
@@ -660,170 +1004,38 @@ def generate_questions():
                 404,
             )
 
-        # Prepare context from course materials
-        context = "\n\n".join(
-            [
-                f"SECTION: {chunk.metadata.get('module', 'Unknown')}\n{chunk.page_content}"
-                for chunk in course_chunks
-            ]
-        )
-
-        # Build prompt for question generation
-        type_instructions = {
-            "multiple-choice": "multiple choice questions with 4 options (A, B, C, D)",
-            "true-false": "true/false questions",
-            "short-answer": "short answer questions requiring 1-2 sentence responses",
-            "explain": "explanation questions asking to describe or explain concepts",
-        }
-
-        selected_types = [
-            type_instructions[t] for t in question_types if t in type_instructions
-        ]
-        types_text = ", ".join(selected_types)
-
-        difficulty_guidance = {
-            "easy": "Basic recall and understanding level questions",
-            "medium": "Application and analysis level questions",
-            "hard": "Advanced synthesis and evaluation level questions",
-            "mixed": "Mix of easy, medium, and hard questions",
-        }
-
-        prompt = f"""You are an expert educator creating assessment questions for a Data Structures course.
-
-COURSE CONTENT:
-{context}
-
-TASK: Generate {num_questions} high-quality assessment questions.
-
-REQUIREMENTS:
-- Question Types: {types_text}
-- Difficulty Level: {difficulty_guidance[difficulty]}
-- Module Focus: {module if module != 'all' else 'All course modules'}
-- Questions must be clear, unambiguous, and directly related to the course content above
-- For multiple choice: provide exactly 4 options with clear correct answer
-- For true/false: provide clear reasoning for the answer
-- Questions should test conceptual understanding, not just memorization
-
-CRITICAL: You MUST respond with ONLY valid JSON - no markdown, no explanation, no code blocks.
-Start your response with [ and end with ]
-
-FORMAT (JSON only):
-[
-  {{
-    "question": "What is the time complexity of...",
-    "type": "multiple-choice",
-    "options": ["O(1)", "O(n)", "O(log n)", "O(n^2)"],
-    "answer": "O(n)",
-    "difficulty": "medium",
-    "module": "{module if module != 'all' else 'General'}"
-  }}
-]
-
-Generate exactly {num_questions} questions. JSON ONLY - no other text:"""
-
-        # Generate questions using LLM
-        log_info("Sending prompt to LLM for question generation", "api")
-        response = model_manager.generate_response(prompt)
-
-        if not response:
-            return (
-                jsonify(
-                    {
-                        "success": False,
-                        "error": "No response from LLM. Please check if Ollama is running.",
-                    }
-                ),
-                500,
-            )
-
-        log_info(f"LLM Response (first 300 chars): {response[:300]}", "api")
-
-        # Parse JSON response with multiple strategies
+        # Shards run concurrently and are validated/retried independently
         questions = []
-        import re
-
-        # Strategy 1: Clean markdown and parse as JSON array
-        try:
-            response_clean = response.strip()
-            response_clean = re.sub(
-                r"^```json\s*", "", response_clean, flags=re.IGNORECASE
-            )
-            response_clean = re.sub(r"^```\s*", "", response_clean)
-            response_clean = re.sub(r"\s*```$", "", response_clean)
-
-            json_match = re.search(r"\[\s*\{[\s\S]*\}\s*\]", response_clean)
-            if json_match:
-                json_str = json_match.group()
-                questions = json.loads(json_str)
-
-                if not isinstance(questions, list):
-                    questions = []
-                else:
-                    log_info(
-                        f"Strategy 1 SUCCESS: Parsed {len(questions)} questions", "api"
-                    )
-        except Exception as e:
-            log_error(f"Strategy 1 failed: {e}", "api")
-
-        # Strategy 2: Try parsing entire cleaned response
-        if not questions:
-            try:
-                questions = json.loads(response_clean)
-                if isinstance(questions, list):
-                    log_info(
-                        f"Strategy 2 SUCCESS: Parsed {len(questions)} questions", "api"
-                    )
-                else:
-                    questions = []
-            except Exception as e:
-                log_error(f"Strategy 2 failed: {e}", "api")
-
-        # Strategy 3: Extract individual question objects
-        if not questions:
-            try:
-                question_pattern = r'\{[^{}]*"question"[^{}]*"answer"[^{}]*\}'
-                matches = re.finditer(question_pattern, response, re.DOTALL)
-
-                for match in matches:
-                    try:
-                        q = json.loads(match.group())
-                        if "question" in q and "answer" in q:
-                            questions.append(q)
-                    except:
-                        continue
-
-                if questions:
-                    log_info(
-                        f"Strategy 3 SUCCESS: Extracted {len(questions)} questions",
-                        "api",
-                    )
-            except Exception as e:
-                log_error(f"Strategy 3 failed: {e}", "api")
+        failed_shards = []
+        for event in question_generator.generate(
+            course_chunks, module, difficulty, num_questions, question_types
+        ):
+            if event["type"] == "question":
+                questions.append(event["question"])
+            elif event["error"]:
+                failed_shards.append({"shard": event["shard"], "error": event["error"]})
 
-        # If we successfully parsed questions
         if questions:
             log_info(f"Successfully generated {len(questions)} questions", "api")
 
             return jsonify(
-                {"success": True, "questions": questions, "count": len(questions)}
+                {
+                    "success": True,
+                    "questions": questions,
+                    "count": len(questions),
+                    "failed_shards": failed_shards,
+                }
             )
 
-        # All parsing strategies failed
-        log_error(f"All parsing strategies failed", "api")
-        log_error(f"Raw response (first 1000 chars): {response[:1000]}", "api")
+        log_error(f"All question shards failed: {failed_shards}", "api")
 
         return (
             jsonify(
                 {
                     "success": False,
-                    "error": "Failed to parse generated questions from LLM",
-                    "raw_response": response[:1000],
-                    "hint": "The LLM may have generated an invalid format. Try again with different settings.",
-                    "strategies_tried": [
-                        "JSON array extraction",
-                        "Direct JSON parse",
-                        "Individual object extraction",
-                    ],
+                    "error": "Failed to generate valid questions from LLM",
+                    "hint": "Please check if Ollama is running, or try again with different settings.",
+                    "failed_shards": failed_shards,
                 }
             ),
             500,
@@ -832,13 +1044,17 @@ Generate exactly {num_questions} questions. JSON ONLY - no other text:"""
     except Exception as e:
         log_error(f"Error generating questions: {e}", "api", exc_info=True)
         return jsonify({"success": False, "error": str(e)}), 500
+    finally:
+        if ticket:
+            ticket.close()
 
 
 @app.route("/api/teachers/generate-questions/stream", methods=["POST"])
 def generate_questions_stream():
     """
     Stream questions as they're generated for real-time display.
-    Uses Server-Sent Events (SSE) for streaming.
+    Uses Server-Sent Events (SSE); questions are streamed from Ollama tokens and
+    each one is sent as soon as its JSON object is complete.
     """
     try:
         data = request.json
@@ -852,198 +1068,75 @@ def generate_questions_stream():
             "api",
         )
 
+        try:
+            ticket = admission.admit("aqg", request_deadline(data))
+        except OverloadedException as e:
+            log_info("Question stream shed: %s", "api", e)
+            return overloaded_response(e)
+
         def generate_stream():
             """Generator function for SSE streaming."""
             try:
-                # Retrieve relevant course content
-                if module == "all":
-                    query = "data structures algorithms course content"
-                else:
-                    query = f"{module} content topics concepts"
+                yield from wait_for_admission(ticket, sse_frame)
 
                 # Send initial status
                 yield f"data: {json.dumps({'type': 'status', 'message': 'Searching course materials...'})}\n\n"
 
-                course_chunks = db_manager.search_with_cache(
-                    query, k=min(num_questions * 2, 10)
-                )
+                course_chunks = retrieve_course_chunks(module, num_questions)
 
                 if not course_chunks:
                     yield f"data: {json.dumps({'type': 'error', 'message': 'No course content found'})}\n\n"
                     return
 
-                # Prepare context
-                context = "\n\n".join(
-                    [
-                        f"SECTION: {chunk.metadata.get('module', 'Unknown')}\n{chunk.page_content}"
-                        for chunk in course_chunks
-                    ]
-                )
-
                 yield f"data: {json.dumps({'type': 'status', 'message': 'Generating questions...'})}\n\n"
 
-                # Build prompt for streaming
-                type_instructions = {
-                    "multiple-choice": "multiple choice questions with 4 options",
-                    "true-false": "true/false questions",
-                    "short-answer": "short answer questions",
-                    "explain": "explanation questions",
-                }
-
-                selected_types = [
-                    type_instructions[t]
-                    for t in question_types
-                    if t in type_instructions
-                ]
-                types_text = ", ".join(selected_types)
-
-                difficulty_guidance = {
-                    "easy": "Basic recall level",
-                    "medium": "Application level",
-                    "hard": "Advanced synthesis level",
-                    "mixed": "Mix of easy, medium, and hard",
-                }
-
-                # Use non-streaming API but send questions as they're generated
-                # Generate all questions at once, then stream them to client
-                prompt = f"""You are an expert educator creating assessment questions for a Data Structures course.
-
-COURSE CONTENT:
-{context[:2000]}
-
-TASK: Generate {num_questions} high-quality assessment questions.
-
-REQUIREMENTS:
-- Question Types: {types_text}
-- Difficulty Level: {difficulty_guidance[difficulty]}
-- Module Focus: {module if module != 'all' else 'All course modules'}
-- Questions must be clear, unambiguous, and directly related to the course content above
-- For multiple choice: provide exactly 4 options with clear correct answer
-- For true/false: provide clear reasoning for the answer
-- Questions should test conceptual understanding, not just memorization
-
-CRITICAL: You MUST respond with ONLY valid JSON - no markdown, no explanation, no code blocks.
-Start your response with [ and end with ]
-
-FORMAT (JSON only):
-[
-  {{
-    "question": "What is...",
-    "type": "multiple-choice",
-    "options": ["Option A", "Option B", "Option C", "Option D"],
-    "answer": "Option A",
-    "difficulty": "medium",
-    "module": "{module if module != 'all' else 'General'}"
-  }}
-]
-
-Generate exactly {num_questions} questions. JSON ONLY - no other text:"""
-
-                # Generate questions (this happens in one call)
-                response = model_manager.generate_response(prompt)
-
-                if not response:
-                    yield f"data: {json.dumps({'type': 'error', 'message': 'No response from LLM'})}\n\n"
-                    return
-
-                log_info(f"LLM Response (first 500 chars): {response[:500]}", "api")
-
-                # Parse and stream questions one by one
-                import re
-
-                questions = []
-
-                # Strategy 1: Clean and parse as JSON array
+                # Questions are sent the moment their JSON object completes
+                index = 0
+                shards_done = 0
+                events = question_generator.generate(
+                    course_chunks, module, difficulty, num_questions, question_types
+                )
                 try:
-                    response_clean = response.strip()
-                    # Remove markdown code blocks
-                    response_clean = re.sub(
-                        r"^```json\s*", "", response_clean, flags=re.IGNORECASE
-                    )
-                    response_clean = re.sub(r"^```\s*", "", response_clean)
-                    response_clean = re.sub(r"\s*```$", "", response_clean)
-
-                    # Try to extract JSON array
-                    json_match = re.search(r"\[\s*\{[\s\S]*\}\s*\]", response_clean)
-                    if json_match:
-                        json_str = json_match.group()
-                        questions = json.loads(json_str)
-                        log_info(
-                            f"Strategy 1 SUCCESS: Parsed {len(questions)} questions",
-                            "api",
-                        )
-                except Exception as e:
-                    log_error(f"Strategy 1 failed: {e}", "api")
-
-                # Strategy 2: Try parsing entire cleaned response
-                if not questions:
-                    try:
-                        questions = json.loads(response_clean)
-                        if isinstance(questions, list):
-                            log_info(
-                                f"Strategy 2 SUCCESS: Parsed {len(questions)} questions",
-                                "api",
-                            )
-                        else:
-                            questions = []
-                    except Exception as e:
-                        log_error(f"Strategy 2 failed: {e}", "api")
-
-                # Strategy 3: Extract individual question objects
-                if not questions:
-                    try:
-                        # Find all JSON objects that look like questions
-                        question_pattern = r'\{[^{}]*"question"[^{}]*"answer"[^{}]*\}'
-                        matches = re.finditer(question_pattern, response, re.DOTALL)
-
-                        for match in matches:
-                            try:
-                                q = json.loads(match.group())
-                                if "question" in q and "answer" in q:
-                                    questions.append(q)
-                            except:
-                                continue
-
-                        if questions:
-                            log_info(
-                                f"Strategy 3 SUCCESS: Extracted {len(questions)} questions",
-                                "api",
-                            )
-                    except Exception as e:
-                        log_error(f"Strategy 3 failed: {e}", "api")
-
-                # If we got questions, stream them
-                if questions:
-                    for idx, question in enumerate(questions, 1):
-                        # Ensure required fields
-                        if "question" not in question or "answer" not in question:
+                    for event in events:
+                        if event["type"] == "question":
+                            index += 1
+                            yield f"data: {json.dumps({'type': 'question', 'data': event['question'], 'index': index})}\n\n"
                             continue
 
-                        # Set defaults for missing fields
-                        question.setdefault("type", "short-answer")
-                        question.setdefault("difficulty", difficulty)
-                        question.setdefault(
-                            "module", module if module != "all" else "General"
-                        )
+                        shards_done += 1
+                        if event["error"]:
+                            log_error(
+                                f"Question shard {event['shard']} failed: {event['error']}",
+                                "api",
+                            )
 
-                        yield f"data: {json.dumps({'type': 'question', 'data': question, 'index': idx})}\n\n"
-                        time.sleep(0.3)  # Small delay for visual effect
+                        message = f"Generated {index} questions ({shards_done}/{event['total_shards']} batches done)..."
+                        yield f"data: {json.dumps({'type': 'status', 'message': message})}\n\n"
+                finally:
+                    # Client disconnected: stop the shards' model streams now
+                    events.close()
 
+                if index:
                     # Send completion
-                    yield f"data: {json.dumps({'type': 'complete', 'total': len(questions)})}\n\n"
+                    yield f"data: {json.dumps({'type': 'complete', 'total': index})}\n\n"
                 else:
-                    # All strategies failed
-                    log_error(
-                        f"All parsing strategies failed. Raw response: {response[:1000]}",
-                        "api",
-                    )
-                    yield f"data: {json.dumps({'type': 'error', 'message': 'Failed to parse questions. LLM may have generated invalid format. Please try again.', 'raw': response[:500]})}\n\n"
+                    yield f"data: {json.dumps({'type': 'error', 'message': 'Failed to generate valid questions. Please check if Ollama is running and try again.'})}\n\n"
 
+            except OverloadedException as e:
+                yield sse_frame(
+                    {
+                        "type": "error",
+                        "message": "Question generation is busy right now. Please try again shortly.",
+                        "retry_after": max(1, math.ceil(e.retry_after)),
+                    }
+                )
             except Exception as e:
                 log_error(f"Error in streaming generation: {e}", "api", exc_info=True)
                 yield f"data: {json.dumps({'type': 'error', 'message': str(e)})}\n\n"
+            finally:
+                ticket.close()
 
-        return Response(
+        response = Response(
             stream_with_context(generate_stream()),
             mimetype="text/event-stream",
             headers={
@@ -1051,13 +1144,227 @@ Generate exactly {num_questions} questions. JSON ONLY - no other text:"""
                 "X-Accel-Buffering": "no",
             },
         )
+        response.call_on_close(ticket.close)
+        return response
 
     except Exception as e:
         log_error(f"Error setting up stream: {e}", "api", exc_info=True)
         return jsonify({"success": False, "error": str(e)}), 500
 
 
+def run_question_job(context) -> dict:
+    """Background handler for ``generate_questions`` jobs."""
+    # Batch lane: waits behind chat and teacher requests, never shed by deadline
+    ticket = admission.admit("batch")
+    try:
+        while not ticket.wait(timeout=JOB_POLL_INTERVAL):
+            context.report_progress(stage="queued", position=ticket.position())
+            context.check_cancelled()
+        return generate_job_questions(context)
+    finally:
+        ticket.close()
+
+
+def generate_job_questions(context) -> dict:
+    """Generate a ``generate_questions`` job's questions once it holds a slot."""
+    payload = context.payload
+    module = payload.get("module", "all")
+    difficulty = payload.get("difficulty", "mixed")
+    num_questions = payload.get("num_questions", 5)
+    question_types = payload.get("question_types", ["multiple-choice"])
+
+    context.report_progress(stage="retrieving", questions=[])
+    course_chunks = retrieve_course_chunks(module, num_questions)
+    if not course_chunks:
+        raise JobException("No course content found for question generation")
+
+    # Same generator as the endpoints, but behind chat in the Ollama queue
+    generator = QuestionGenerator(model_manager, priority=context.priority)
+    questions = []
+    failed_shards = []
+    events = generator.generate(
+        course_chunks, module, difficulty, num_questions, question_types
+    )
+    try:
+        for event in events:
+            context.check_cancelled()
+            if event["type"] == "question":
+                questions.append(event["question"])
+            elif event["error"]:
+                failed_shards.append({"shard": event["shard"], "error": event["error"]})
+            context.report_progress(
+                stage="generating", questions=questions, total=num_questions
+            )
+    finally:
+        events.close()
+
+    if not questions:
+        raise JobException(f"All question shards failed: {failed_shards}")
+
+    return {
+        "questions": questions,
+        "count": len(questions),
+        "failed_shards": failed_shards,
+    }
+
+
+def run_ingest_job(context) -> dict:
+    """Background handler for ``ingest_course`` jobs (re-index course materials)."""
+    global module_index
+    from load_course_database import create_course_database
+
+    # Jobs are submitted without authentication: only files inside web/ may
+    # be ingested, and only into the course collection the retriever reads
+    web_dir = Path(__file__).parent.resolve()
+    knowledge_base = (
+        web_dir / str(context.payload.get("input", "course_knowledge_base.txt"))
+    ).resolve()
+    if not knowledge_base.is_relative_to(web_dir) or not knowledge_base.is_file():
+        raise JobException("Ingest input must be a file inside the web directory")
+    collection = COURSE_COLLECTION
+
+    context.report_progress(stage="ingesting", input=knowledge_base.name)
+    if not create_course_database(
+        str(knowledge_base), collection_name=collection, persist_directory=str(DB_DIR)
+    ):
+        raise JobException(f"Failed to ingest {knowledge_base.name}")
+
+    # Pick up the new chunks and module index
+    module_index = load_module_index()
+    retriever.clear_cache()
+    return {
+        "collection": collection,
+        "modules": len(module_index.modules) if module_index else 0,
+    }
+
+
+@app.route("/api/jobs", methods=["POST"])
+def submit_job():
+    """
+    Submit a background job.
+
+    Request body:
+    {
+        "kind": "generate_questions" | "ingest_course",
+        "payload": {...},
+        "priority": 10  (optional, lower runs first; at least PRIORITY_BATCH)
+    }
+    """
+    try:
+        if not job_queue:
+            return jsonify({"error": "Service not initialized"}), 503
+
+        data = request.json or {}
+        priority = data.get("priority")
+        if priority is not None:
+            try:
+                priority = int(priority)
+            except (TypeError, ValueError):
+                raise JobException("priority must be an integer")
+            # Jobs never run at chat priority, so they stay out of reserved slots
+            priority = max(priority, PRIORITY_BATCH)
+
+        job_id = job_queue.submit(
+            data.get("kind", ""), data.get("payload", {}), priority
+        )
+        return jsonify({"success": True, "job_id": job_id}), 202
+
+    except JobException as e:
+        return jsonify({"success": False, "error": str(e)}), 400
+    except Exception as e:
+        log_error(f"Error submitting job: {e}", "api")
+        return jsonify({"success": False, "error": str(e)}), 500
+
+
+@app.route("/api/jobs", methods=["GET"])
+def list_jobs():
+    """List recent background jobs."""
+    if not job_queue:
+        return jsonify({"error": "Service not initialized"}), 503
+
+    jobs = job_queue.list_jobs(status=request.args.get("status"))
+    return jsonify({"success": True, "jobs": jobs})
+
+
+@app.route("/api/jobs/<job_id>", methods=["GET"])
+def get_job(job_id):
+    """Poll a background job."""
+    if not job_queue:
+        return jsonify({"error": "Service not initialized"}), 503
+
+    job = job_queue.get(job_id)
+    if job is None:
+        return jsonify({"success": False, "error": "Job not found"}), 404
+    return jsonify({"success": True, "job": job})
+
+
+@app.route("/api/jobs/<job_id>/cancel", methods=["POST"])
+def cancel_job(job_id):
+    """Cancel a queued or running background job."""
+    if not job_queue:
+        return jsonify({"error": "Service not initialized"}), 503
+
+    if not job_queue.cancel(job_id):
+        return (
+            jsonify({"success": False, "error": "Job not found or already finished"}),
+            409,
+        )
+    return jsonify({"success": True, "job": job_queue.get(job_id)})
+
+
+@app.route("/api/jobs/<job_id>/stream", methods=["GET"])
+def stream_job(job_id):
+    """
+    Stream a job's progress with Server-Sent Events (SSE).
+
+    Sends a ``progress`` event with the job record whenever it changes, then
+    ``complete`` (with the result), ``error`` or ``cancelled``. The job keeps
+    running if the client disconnects.
+    """
+    if not job_queue:
+        return jsonify({"error": "Service not initialized"}), 503
+    if job_queue.get(job_id) is None:
+        return jsonify({"success": False, "error": "Job not found"}), 404
+
+    def generate_stream():
+        """Generator function for SSE streaming."""
+        version = None
+        while True:
+            job = job_queue.get(job_id)
+            if job["version"] != version:
+                version = job["version"]
+                yield f"data: {json.dumps({'type': 'progress', 'job': job})}\n\n"
+
+            status = JobStatus(job["status"])
+            if status in TERMINAL_STATUSES:
+                if status == JobStatus.SUCCEEDED:
+                    yield f"data: {json.dumps({'type': 'complete', 'result': job['result']})}\n\n"
+                elif status == JobStatus.CANCELLED:
+                    yield f"data: {json.dumps({'type': 'cancelled'})}\n\n"
+                else:
+                    yield f"data: {json.dumps({'type': 'error', 'message': job['error']})}\n\n"
+                return
+
+            job_queue.wait_for_change(job_id, version, timeout=JOB_POLL_INTERVAL)
+
+    return Response(
+        stream_with_context(generate_stream()),
+        mimetype="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no",
+        },
+    )
+
+
 if __name__ == "__main__":
+    # With debug=True the reloader re-runs this module in a child process
+    # (WERKZEUG_RUN_MAIN=true) that does the serving; the parent only watches
+    # files, so it must not load models or start job workers of its own.
+    if os.environ.get("WERKZEUG_RUN_MAIN") != "true":
+        app.run(debug=True, host="0.0.0.0", port=5000, threaded=True)
+        sys.exit(0)
+
     print("🚀 Starting BanglaRAG Chatbot API...")
 
     if initialize_services():
@@ -1072,6 +1379,9 @@ if __name__ == "__main__":
         print("   - GET  /api/collections")
         print("   - POST /api/teachers/generate-questions")
         print("   - POST /api/teachers/generate-questions/stream (SSE) ⚡")
+        print(
+            "   - POST /api/jobs, GET /api/jobs/<id>[/stream], POST /api/jobs/<id>/cancel"
+        )
         print("\n📄 Pages:")
         print("   - GET  /         (Student chatbot)")
         print("   - GET  /teachers (Teachers dashboard with real-time generation)")
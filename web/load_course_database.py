@@ -11,8 +11,10 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from core.logging_config import log_info, log_error
+from core.constants import DB_DIR
 from services.embedding_service import get_embedding_factory
 from services.database_service import get_database_manager
+from services.course_index_service import ModuleIndex
 from langchain.text_splitter import RecursiveCharacterTextSplitter
 from langchain.schema import Document
 import re
@@ -50,11 +52,14 @@ def parse_course_sections(content: str) -> list[Document]:
                 if len(subsection.strip()) > 50:  # Skip very short sections
                     # Include module title in content for better retrieval
                     content_with_module = f"{current_module}\n\n{subsection.strip()}"
+                    # First line is the subsection heading ("What is an Array?")
+                    section_title = subsection.strip().split("\n", 1)[0][:80]
                     doc = Document(
                         page_content=content_with_module,
                         metadata={
                             "source": "course_knowledge_base.txt",
                             "module": current_module,
+                            "section": section_title,
                             "type": "course_content",
                         },
                     )
@@ -102,8 +107,14 @@ def create_course_database(
     knowledge_base_path: str,
     collection_name: str = "course_materials",
     chunk_size: int = 500,
+    persist_directory: str = str(DB_DIR),
 ):
-    """Create ChromaDB collection from course knowledge base."""
+    """
+    Create ChromaDB collection from course knowledge base.
+
+    The collection is written under ``persist_directory``, the project's
+    ``db/`` by default, which is where the chatbot API reads it.
+    """
     try:
         print("🚀 Starting Course Database Creation")
         print("=" * 60)
@@ -130,11 +141,12 @@ def create_course_database(
         print("✅ Embedding service ready")
 
         # Create database
-        print("\n💾 Creating ChromaDB collection...")
+        print("\n💾 Creating vector collection...")
         from services.database_service import DatabaseFactory
 
-        db_manager = DatabaseFactory.create_chroma_database(
-            collection_name=collection_name
+        # Bangla chunks land in their own partition when partitioning is on
+        db_manager = DatabaseFactory.create_database(
+            persist_directory=persist_directory, collection_name=collection_name
         )
 
         # Add documents using batch method
@@ -142,6 +154,12 @@ def create_course_database(
 
         print(f"✅ Added {len(chunked_docs)} chunks to database")
 
+        # Module index lets question generation sample a module without a search
+        print("\n🗂️  Building module index...")
+        module_index = ModuleIndex.build(chunked_docs, collection=collection_name)
+        if module_index.save():
+            print(f"✅ Indexed {len(module_index.modules)} modules")
+
         # Test the database
         print("\n🔍 Testing database with sample query...")
         test_query = "What is an array?"
@@ -158,7 +176,7 @@ def create_course_database(
 
         print("\n" + "=" * 60)
         print("✅ Course database created successfully!")
-        print(f"📍 Database location: db/")
+        print(f"📍 Database location: {persist_directory}")
         print(f"📊 Total chunks: {len(chunked_docs)}")
         print(f"🎯 Collection: {collection_name}")
 